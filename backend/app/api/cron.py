@@ -5,6 +5,7 @@ Protected endpoints for scheduled tasks triggered by Hetzner cron jobs
 CRITICAL: CRON-001 - Log cleanup to prevent disk overflow
 """
 
+import asyncio
 import logging
 import os
 from typing import Optional
@@ -12,10 +13,14 @@ from typing import Optional
 from fastapi import APIRouter, Header, HTTPException, Query
 
 from app.jobs.cdn_to_r2_migration import (
+    get_migration_progress,
+    is_migration_running,
     migrate_all,
-    migrate_carousel_posts,
-    migrate_profile_pictures,
-    migrate_reels,
+)
+from app.jobs.instagram_analytics import (
+    get_recompute_progress,
+    is_recompute_running,
+    recompute_instagram_analytics,
 )
 from app.jobs.log_cleanup import full_log_cleanup
 
@@ -24,6 +29,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/cron", tags=["cron"])
 
+# Background CDN→R2 migration run (kept referenced so it is not garbage-collected)
+_migration_task: Optional[asyncio.Task] = None
+# Background analytics recompute run (same reason)
+_analytics_task: Optional[asyncio.Task] = None
+
+
+def _verify_cron_secret(authorization: Optional[str]) -> None:
+    """Raise 401/500 unless the header carries the CRON_SECRET bearer token"""
+    expected_token = os.getenv("CRON_SECRET")
+
+    if not expected_token:
+        logger.error("CRON_SECRET not configured")
+        raise HTTPException(status_code=500, detail="Cron authentication not configured on server")
+
+    if not authorization:
+        logger.warning("Missing Authorization header")
+        raise HTTPException(status_code=401, detail="Missing Authorization header")
+
+    if not authorization.startswith("Bearer "):
+        logger.warning("Invalid Authorization format")
+        raise HTTPException(
+            status_code=401, detail="Invalid Authorization format. Use 'Bearer {token}'"
+        )
+
+    if authorization.replace("Bearer ", "") != expected_token:
+        logger.warning("Invalid cron secret provided")
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+
 
 @router.post("/cleanup-logs")
 async def trigger_log_cleanup(
@@ -51,31 +84,7 @@ async def trigger_log_cleanup(
     ```
     """
     logger.info(f"🧹 Cron job triggered: cleanup-logs (retention: {retention_days} days)")
-
-    # Verify authorization
-    expected_token = os.getenv("CRON_SECRET")
-
-    if not expected_token:
-        logger.error("CRON_SECRET not configured")
-        raise HTTPException(status_code=500, detail="Cron authentication not configured on server")
-
-    # Check authorization header
-    if not authorization:
-        logger.warning("Missing Authorization header")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-
-    # Verify Bearer token
-    if not authorization.startswith("Bearer "):
-        logger.warning("Invalid Authorization format")
-        raise HTTPException(
-            status_code=401, detail="Invalid Authorization format. Use 'Bearer {token}'"
-        )
-
-    token = authorization.replace("Bearer ", "")
-
-    if token != expected_token:
-        logger.warning("Invalid cron secret provided")
-        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    _verify_cron_secret(authorization)
 
     # Run log cleanup
     try:
@@ -108,7 +117,14 @@ async def migrate_cdn_to_r2(
     media_type: str = Query(
         "all", regex="^(profile|posts|reels|all)$", description="Media type to migrate"
     ),
-    batch_size: int = Query(10, ge=1, le=50, description="Items to process per batch"),
+    batch_size: int = Query(
+        500, ge=1, le=100000, description="Max items per media type to migrate in this run"
+    ),
+    concurrency: int = Query(8, ge=1, le=32, description="Parallel transfers"),
+    time_budget: Optional[int] = Query(
+        None, ge=60, le=86400, description="Stop starting new pages after this many seconds"
+    ),
+    reset: bool = Query(False, description="Start over from the first row (retries failures)"),
 ):
     """
     Migrate Instagram CDN URLs to Cloudflare R2 storage
@@ -117,14 +133,19 @@ async def migrate_cdn_to_r2(
 
     **Args:**
     - media_type: Type to migrate (profile, posts, reels, or all)
-    - batch_size: Number of items to process (default: 10, max: 50)
+    - batch_size: Max items per type in this run (default: 500)
+    - concurrency: Parallel downloads/uploads (default: 8)
+    - time_budget: Optional run time limit in seconds
+    - reset: Ignore the saved cursor and start from the beginning
 
     **Returns:**
-    - Migration statistics (total, migrated, failed, time)
+    - Immediately (202 semantics); the run continues in the background.
+      Poll `GET /api/cron/migrate-cdn-to-r2/status` for progress.
+    - 409 if a run is already in progress (on any API worker)
 
     **Example:**
     ```bash
-    curl -X POST https://api.example.com/api/cron/migrate-cdn-to-r2?media_type=all&batch_size=10 \\
+    curl -X POST https://api.example.com/api/cron/migrate-cdn-to-r2?media_type=all&batch_size=500 \\
       -H "Authorization: Bearer your-secret-here"
     ```
 
@@ -133,64 +154,149 @@ async def migrate_cdn_to_r2(
     - Compresses (photos: 300KB, videos: 1.5MB @720p)
     - Uploads to R2 storage
     - Updates database (never overwrites existing R2 URLs)
-    - Is idempotent (safe to run multiple times)
+    - Resumes from the last saved cursor (safe to run repeatedly)
     """
-    logger.info(f"🔄 CDN→R2 migration triggered: type={media_type}, batch={batch_size}")
-
-    # Verify authorization (same pattern as cleanup-logs)
-    expected_token = os.getenv("CRON_SECRET")
+    global _migration_task
+
+    logger.info(
+        f"🔄 CDN→R2 migration triggered: type={media_type}, batch={batch_size}, "
+        f"concurrency={concurrency}, reset={reset}"
+    )
+    _verify_cron_secret(authorization)
+
+    # Fast 409 for a run visible in this process or through a lease; two triggers that
+    # race past this check still cannot migrate the same media type (see CdnMigration)
+    if (_migration_task is not None and not _migration_task.done()) or await asyncio.to_thread(
+        is_migration_running
+    ):
+        raise HTTPException(status_code=409, detail="A CDN→R2 migration is already running")
+
+    async def run_migration():
+        try:
+            result = await asyncio.to_thread(
+                migrate_all,
+                batch_size,
+                media_type=media_type,
+                concurrency=concurrency,
+                time_budget=time_budget,
+                reset=reset,
+            )
+            if result.get("success"):
+                logger.info(f"✅ CDN→R2 migration completed: {result}")
+            else:
+                logger.error(f"❌ CDN→R2 migration failed: {result}")
+        except Exception as e:
+            logger.error(f"❌ CDN→R2 migration failed: {e}", exc_info=True)
 
-    if not expected_token:
-        logger.error("CRON_SECRET not configured")
-        raise HTTPException(status_code=500, detail="Cron authentication not configured on server")
+    _migration_task = asyncio.create_task(run_migration())
 
-    if not authorization:
-        logger.warning("Missing Authorization header")
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
+    return {
+        "status": "started",
+        "message": f"CDN→R2 migration started (type: {media_type}, batch: {batch_size})",
+        "progress_url": "/api/cron/migrate-cdn-to-r2/status",
+    }
 
-    if not authorization.startswith("Bearer "):
-        logger.warning("Invalid Authorization format")
-        raise HTTPException(
-            status_code=401, detail="Invalid Authorization format. Use 'Bearer {token}'"
-        )
 
-    token = authorization.replace("Bearer ", "")
+@router.get("/migrate-cdn-to-r2/status")
+async def migrate_cdn_to_r2_status(authorization: Optional[str] = Header(None)):
+    """
+    Progress of the current CDN→R2 migration run and the saved resume cursors
 
-    if token != expected_token:
-        logger.warning("Invalid cron secret provided")
-        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    **Authentication:** Requires `Authorization: Bearer {CRON_SECRET}` header
 
-    # Run migration
+    **Returns:**
+    - running flag (any API worker), per-type progress of the current/last run
+      in this worker, and cursor rows (last id, cumulative scanned/migrated/failed,
+      completed_at, lease)
+    """
+    _verify_cron_secret(authorization)
     try:
-        if media_type == "all":
-            result = migrate_all(batch_size)
-        elif media_type == "profile":
-            stats = migrate_profile_pictures(batch_size)
-            result = {"success": True, "profile_pictures": stats.to_dict()}
-        elif media_type == "posts":
-            stats = migrate_carousel_posts(batch_size)
-            result = {"success": True, "carousel_posts": stats.to_dict()}
-        elif media_type == "reels":
-            stats = migrate_reels(batch_size)
-            result = {"success": True, "reels": stats.to_dict()}
-        else:
-            raise HTTPException(status_code=400, detail=f"Invalid media_type: {media_type}")
+        return {"status": "success", **(await asyncio.to_thread(get_migration_progress))}
+    except Exception as e:
+        logger.error(f"❌ Failed to read migration progress: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to read progress: {e!s}") from e
 
-        # Log success
-        if result.get("success"):
-            logger.info(f"✅ CDN→R2 migration completed: {result}")
-        else:
-            logger.error(f"❌ CDN→R2 migration failed: {result}")
 
-        return {
-            "status": "success" if result.get("success") else "error",
-            "message": f"CDN→R2 migration completed (type: {media_type}, batch: {batch_size})",
-            "results": result,
-        }
+@router.post("/recompute-instagram-analytics")
+async def trigger_instagram_analytics_recompute(
+    authorization: Optional[str] = Header(None),
+    chunk_size: int = Query(200, ge=10, le=1000, description="Creators loaded per round"),
+    dry_run: bool = Query(False, description="Compute without writing results"),
+):
+    """
+    Recompute Instagram creator analytics for the whole catalog
 
+    **Authentication:** Requires `Authorization: Bearer {CRON_SECRET}` header
+
+    **Schedule:** Daily (configured via Hetzner cron)
+
+    **Args:**
+    - chunk_size: Creators whose media is loaded per round (default: 200)
+    - dry_run: Compute and return the summary without writing
+
+    **Returns:**
+    - Immediately, with status "started". The recompute runs in the background;
+      poll `GET /api/cron/recompute-instagram-analytics/status` for progress
+      and the run summary.
+    - 409 if a recompute is already running (in any API worker).
+
+    **Example:**
+    ```bash
+    curl -X POST https://api.example.com/api/cron/recompute-instagram-analytics \\
+      -H "Authorization: Bearer your-secret-here"
+    ```
+    """
+    global _analytics_task
+    logger.info(f"📊 Cron job triggered: recompute-instagram-analytics (chunk: {chunk_size})")
+    _verify_cron_secret(authorization)
+
+    # Fast path only; a run that races past this check is still refused by the
+    # runs table (see recompute_instagram_analytics)
+    if (_analytics_task is not None and not _analytics_task.done()) or await asyncio.to_thread(
+        is_recompute_running
+    ):
+        raise HTTPException(status_code=409, detail="An analytics recompute is already running")
+
+    async def run_recompute():
+        try:
+            # Database-bound and long-running: keep it off the event loop
+            result = await asyncio.to_thread(
+                recompute_instagram_analytics, chunk_size=chunk_size, write=not dry_run
+            )
+            if result.get("success"):
+                logger.info(f"✅ Analytics recompute completed: {result}")
+            else:
+                logger.error(f"❌ Analytics recompute failed: {result}")
+        except Exception as e:
+            logger.error(f"❌ Analytics recompute failed: {e}", exc_info=True)
+
+    _analytics_task = asyncio.create_task(run_recompute())
+
+    return {
+        "status": "started",
+        "message": f"Analytics recompute started (chunk: {chunk_size}, dry run: {dry_run})",
+        "progress_url": "/api/cron/recompute-instagram-analytics/status",
+    }
+
+
+@router.get("/recompute-instagram-analytics/status")
+async def recompute_instagram_analytics_status(authorization: Optional[str] = Header(None)):
+    """
+    Progress of the current analytics recompute and the recent runs
+
+    **Authentication:** Requires `Authorization: Bearer {CRON_SECRET}` header
+
+    **Returns:**
+    - running flag (any API worker), live progress of the current/last run in
+      this worker, and the latest instagram_analytics_runs rows (status,
+      heartbeat, progress, counts, thresholds, duration, error)
+    """
+    _verify_cron_secret(authorization)
+    try:
+        return {"status": "success", **(await asyncio.to_thread(get_recompute_progress))}
     except Exception as e:
-        logger.error(f"❌ CDN→R2 migration failed: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Migration failed: {e!s}") from e
+        logger.error(f"❌ Failed to read analytics recompute progress: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to read progress: {e!s}") from e
 
 
 @router.get("/health")
@@ -209,5 +315,9 @@ async def cron_health():
         "status": "healthy" if cron_secret_configured else "unhealthy",
         "service": "cron-jobs",
         "cron_secret_configured": cron_secret_configured,
-        "available_jobs": ["cleanup-logs", "migrate-cdn-to-r2"],
+        "available_jobs": [
+            "cleanup-logs",
+            "migrate-cdn-to-r2",
+            "recompute-instagram-analytics",
+        ],
     }
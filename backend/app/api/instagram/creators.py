@@ -11,6 +11,8 @@ Mimics the automated scraper's process_creator() workflow:
 - Updates database with complete creator profile
 """
 
+import asyncio
+import os
 import subprocess
 import sys
 import time
@@ -23,7 +25,10 @@ from pydantic import BaseModel
 from supabase import Client
 
 # Import database singleton and unified logger
+from app.core.control_state import get_control_watcher
 from app.core.database import get_db
+from app.core.job_scheduler import get_scheduler
+from app.core.queue_telemetry import worker_heartbeats
 from app.logging import get_logger
 
 # Import scraper and config from unified location
@@ -37,6 +42,12 @@ router = APIRouter(prefix="/api/instagram/creator", tags=["instagram-creators"])
 # Use unified logger
 logger = get_logger(__name__)
 
+# New creators go to the priority lane of the worker queue when Redis is configured,
+# the scraper is running and at least one queue worker is alive (heartbeat);
+# subprocess otherwise, or when INSTAGRAM_ADD_VIA_QUEUE=false
+INSTAGRAM_QUEUE_NAME = "instagram_scraper_queue"
+ADD_VIA_QUEUE = os.getenv("INSTAGRAM_ADD_VIA_QUEUE", "true").lower() == "true"
+
 
 # Module-level database client accessor (uses singleton)
 def _get_db() -> Client:
@@ -70,6 +81,44 @@ class CreatorAddResponse(BaseModel):
 # =============================================================================
 
 
+def schedule_priority_job(
+    creator_id: Any, ig_user_id: str, username: str, niche: Optional[str]
+) -> bool:
+    """
+    Put a creator on the priority lane of the worker queue
+
+    The payload carries the fields the worker scrapes with, so the job needs no
+    creator fetch before it starts.
+
+    Returns:
+        True if scheduled (False: no Redis, scraper stopped, no live worker, or Redis error)
+    """
+    if not ADD_VIA_QUEUE or creator_id is None:
+        return False
+    try:
+        # Workers pause while the scraper is stopped; manual adds must still run
+        if get_control_watcher().should_run("instagram_scraper") is not True:
+            return False
+        scheduler = get_scheduler(INSTAGRAM_QUEUE_NAME)
+        if scheduler is None:
+            return False
+        # The control flag only means the controller runs: no heartbeat, no worker to take the job
+        if not worker_heartbeats(scheduler.queue):
+            logger.info(f"No live queue worker for @{username}, using subprocess")
+            return False
+        payload = {
+            "creator_id": creator_id,
+            "ig_user_id": ig_user_id,
+            "username": username,
+            "niche": niche,
+        }
+        scheduler.schedule_now(creator_id, payload)
+        return True
+    except Exception as e:
+        logger.warning(f"Priority queue unavailable for @{username}, using subprocess: {e}")
+        return False
+
+
 async def process_creator_background(
     username: str, ig_user_id: str, niche: Optional[str], start_time: float
 ):
@@ -333,7 +382,8 @@ async def add_instagram_creator(request: CreatorAddRequest):
     This endpoint immediately returns 202 Accepted and processes in background:
     1. Fetches profile to get ig_user_id (< 1 second)
     2. Creates/updates minimal database record
-    3. Queues background processing (90 reels + 30 posts)
+    3. Queues background processing (90 reels + 30 posts): on the priority lane
+       of the worker queue when Redis is configured, else in a subprocess
     4. Returns immediately with status
 
     Background processing takes 2-5 minutes and logs everything to system_logs.
@@ -403,6 +453,7 @@ async def add_instagram_creator(request: CreatorAddRequest):
         )
 
         # 4. Check if creator already exists in database
+        creator_id = None
         try:
             existing_result = (
                 _get_db()
@@ -422,9 +473,8 @@ async def add_instagram_creator(request: CreatorAddRequest):
             existing_creator = None
 
         if existing_creator and existing_creator.data and len(existing_creator.data) > 0:
-            logger.info(
-                f"Creator @{username} already exists (ID: {existing_creator.data[0]['id']}), will update"
-            )
+            creator_id = existing_creator.data[0]["id"]
+            logger.info(f"Creator @{username} already exists (ID: {creator_id}), will update")
             await log_creator_addition(
                 username,
                 "existing_creator_found",
@@ -461,6 +511,7 @@ async def add_instagram_creator(request: CreatorAddRequest):
                     success=False, error="Failed to create creator record in database"
                 )
 
+            creator_id = insert_result.data[0].get("id")
             await log_creator_addition(
                 username, "creator_inserted", True, {"ig_user_id": ig_user_id}
             )
@@ -482,7 +533,31 @@ async def add_instagram_creator(request: CreatorAddRequest):
             )
             logger.info(f"Updated existing creator record for @{username}")
 
-        # 6. Spawn subprocess for background processing (truly independent)
+        # 6. Priority lane: the next free worker picks the creator up ahead of the backlog
+        if await asyncio.to_thread(
+            schedule_priority_job, creator_id, ig_user_id, username, request.niche
+        ):
+            await log_creator_addition(
+                username, "priority_job_scheduled", True, {"creator_id": creator_id}
+            )
+            logger.info(f"✅ Creator @{username} scheduled on the priority lane")
+            return CreatorAddResponse(
+                success=True,
+                creator={
+                    "username": username,
+                    "ig_user_id": ig_user_id,
+                    "status": "queued",
+                    "niche": request.niche,
+                },
+                stats={
+                    "response_time_seconds": int(time.time() - start_time),
+                    "status": "priority_queued",
+                    "estimated_completion_minutes": "2-5",
+                    "monitor_progress": "Poll last_scraped_at of the creator",
+                },
+            )
+
+        # Spawn subprocess for background processing (truly independent)
         logger.info(f"Spawning subprocess for @{username} (90 reels + 30 posts)...")
         await log_creator_addition(
             username,
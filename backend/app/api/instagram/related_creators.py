@@ -4,24 +4,30 @@ Instagram Related Creators Discovery Endpoints
 Discovers related creators for approved Instagram accounts
 """
 
+import asyncio
 import os
-import time
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import requests
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from supabase import Client
 
+from app.config import config
 from app.core.config.r2_config import r2_config
 
 # Import database singleton and unified logger
 from app.core.database import get_db
 from app.logging import get_logger
+from app.scrapers.instagram.services.modules import DiscoveryCrawler, DiscoveryProgress
+from app.utils.creator_index import KnownCreatorIndex
 
 # Import R2 media storage
 from app.utils.media_storage import MediaStorageError, process_and_upload_profile_picture
+from app.utils.rate_limiter import RequestRateLimiter, get_rapidapi_limiter
 
 
 # Note: system_logger and log_api_call moved to unified logging system
@@ -40,6 +46,25 @@ RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 if not RAPIDAPI_KEY:
     raise ValueError("RAPIDAPI_KEY environment variable is required but not set")
 RAPIDAPI_HOST = "instagram-looter2.p.rapidapi.com"
+RAPIDAPI_HEADERS = {"x-rapidapi-key": RAPIDAPI_KEY, "x-rapidapi-host": RAPIDAPI_HOST}
+
+# Pooled HTTP session shared by every discovery coroutine. Requests are paced at the
+# discovery rate and also take slots on the shared RapidAPI limiter, so a crawl counts
+# against the same budget as the scrapers (across processes when Redis is configured)
+_http = requests.Session()
+_http.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1, pool_maxsize=max(10, config.instagram.discovery_concurrency * 2)
+    ),
+)
+_pacer = RequestRateLimiter(
+    config.instagram.discovery_requests_per_second, parent=get_rapidapi_limiter()
+)
+_discovery_task: Optional[asyncio.Task] = None  # Kept referenced so it is not garbage-collected
+KNOWN_LOOKUP_CHUNK = 200  # ig_user_ids per prefilter query (when the index is unavailable)
+_known_creators: Optional[KnownCreatorIndex] = None
+_known_creators_lock = threading.Lock()
 
 
 # Get Supabase client using singleton
@@ -52,7 +77,8 @@ class RelatedCreatorsStartRequest(BaseModel):
     """Request model for starting related creators discovery"""
 
     batch_size: Optional[int] = 10
-    delay_seconds: Optional[int] = 2
+    delay_seconds: Optional[int] = 2  # Deprecated: pacing uses INSTAGRAM_DISCOVERY_RPS
+    concurrency: Optional[int] = None  # Default: INSTAGRAM_DISCOVERY_CONCURRENCY
 
 
 # Global processing state
@@ -64,6 +90,7 @@ processing_state: dict[str, Any] = {
     "total_count": 0,
     "new_creators_found": 0,
     "errors": [],
+    "progress": {},
 }
 
 
@@ -71,10 +98,9 @@ def get_related_profiles(user_id: str, supabase=None) -> Optional[List[Dict]]:
     """Get related profiles from RapidAPI"""
     try:
         url = f"https://{RAPIDAPI_HOST}/related-profiles"
-        headers = {"x-rapidapi-key": RAPIDAPI_KEY, "x-rapidapi-host": RAPIDAPI_HOST}
         params = {"id": user_id}
 
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = _http.get(url, headers=RAPIDAPI_HEADERS, params=params, timeout=30)
         if response.status_code == 200:
             data = response.json()
             if data and "data" in data and data["data"].get("user"):
@@ -125,10 +151,9 @@ def get_user_profile(username: str, supabase=None) -> Optional[Dict]:
     """Get full user profile from RapidAPI"""
     try:
         url = f"https://{RAPIDAPI_HOST}/profile"
-        headers = {"x-rapidapi-key": RAPIDAPI_KEY, "x-rapidapi-host": RAPIDAPI_HOST}
         params = {"username": username}
 
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = _http.get(url, headers=RAPIDAPI_HEADERS, params=params, timeout=30)
         if response.status_code == 200:
             data = response.json()
             if data and "status" in data and data["status"]:
@@ -174,275 +199,272 @@ def get_user_profile(username: str, supabase=None) -> Optional[Dict]:
         return None
 
 
-def save_creator_to_db(supabase, profile_data: Dict) -> bool:
-    """Save creator profile to database"""
-    try:
-        # Check if creator already exists
-        existing = (
-            supabase.table("instagram_creators")
-            .select("id")
-            .eq("ig_user_id", profile_data.get("id"))
-            .execute()
-        )
-        if existing.data:
-            return False  # Already exists
+def upload_profile_picture(profile_data: Dict) -> Optional[str]:
+    """Profile picture URL to store: the R2 copy if R2 is enabled and the upload worked"""
+    profile_pic_url = profile_data.get("profile_pic_url_hd") or profile_data.get("profile_pic_url")
 
-        # Upload profile picture to R2 (if enabled)
-        profile_pic_url = profile_data.get("profile_pic_url_hd") or profile_data.get(
-            "profile_pic_url"
-        )
-
-        if profile_pic_url and r2_config.ENABLED:
-            try:
-                r2_url = process_and_upload_profile_picture(
-                    cdn_url=profile_pic_url, creator_id=str(profile_data.get("id"))
-                )
-                if r2_url:
-                    profile_pic_url = r2_url
-                    logger.info(
-                        f"✅ Profile picture uploaded to R2 for {profile_data.get('username')}"
-                    )
-            except MediaStorageError as e:
-                logger.warning(
-                    f"⚠️ R2 upload failed for {profile_data.get('username')}, using CDN: {e}"
-                )
+    if profile_pic_url and r2_config.ENABLED:
+        try:
+            r2_url = process_and_upload_profile_picture(
+                cdn_url=profile_pic_url, creator_id=str(profile_data.get("id"))
+            )
+            if r2_url:
+                profile_pic_url = r2_url
+                logger.info(f"✅ Profile picture uploaded to R2 for {profile_data.get('username')}")
+        except MediaStorageError as e:
+            logger.warning(
+                f"⚠️ R2 upload failed for {profile_data.get('username')}, using CDN: {e}"
+            )
 
-        # Prepare data for insertion
-        creator_data = {
-            "ig_user_id": profile_data.get("id"),
-            "username": profile_data.get("username"),
-            "full_name": profile_data.get("full_name"),
-            "fbid": profile_data.get("fbid"),
-            "eimu_id": profile_data.get("eimu_id"),
-            "biography": profile_data.get("biography"),
-            "external_url": profile_data.get("external_url"),
-            "profile_pic_url": profile_pic_url,  # Use R2 URL if upload succeeded
-            "profile_pic_url_hd": profile_data.get(
-                "profile_pic_url_hd"
-            ),  # Keep original HD URL for reference
-            "is_business_account": profile_data.get("is_business_account", False),
-            "is_professional_account": profile_data.get("is_professional_account", False),
-            "is_private": profile_data.get("is_private", False),
-            "is_verified": profile_data.get("is_verified", False),
-            "followers": profile_data.get("edge_followed_by", {}).get("count", 0),
-            "following": profile_data.get("edge_follow", {}).get("count", 0),
-            "posts_count": profile_data.get("edge_owner_to_timeline_media", {}).get("count", 0),
-            "highlight_reel_count": profile_data.get("highlight_reel_count", 0),
-            "has_clips": profile_data.get("has_clips", False),
-            "has_guides": profile_data.get("has_guides", False),
-            "has_channel": profile_data.get("has_channel", False),
-            "has_onboarded_to_text_post_app": profile_data.get(
-                "has_onboarded_to_text_post_app", False
-            ),
-            "bio_links": profile_data.get("bio_links"),
-            "raw_profile_json": profile_data,
-            "review_status": None,  # NULL means unreviewed
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            "last_scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
+    return profile_pic_url
 
-        # Insert into database
-        result = supabase.table("instagram_creators").insert(creator_data).execute()
-        return bool(result.data)
-    except Exception as e:
-        logger.error(f"Error saving creator to database: {e}")
-        return False
 
+def build_creator_row(profile_data: Dict, profile_pic_url: Optional[str]) -> Dict[str, Any]:
+    """instagram_creators row for a newly discovered profile"""
+    return {
+        "ig_user_id": profile_data.get("id"),
+        "username": profile_data.get("username"),
+        "full_name": profile_data.get("full_name"),
+        "fbid": profile_data.get("fbid"),
+        "eimu_id": profile_data.get("eimu_id"),
+        "biography": profile_data.get("biography"),
+        "external_url": profile_data.get("external_url"),
+        "profile_pic_url": profile_pic_url,  # Use R2 URL if upload succeeded
+        "profile_pic_url_hd": profile_data.get(
+            "profile_pic_url_hd"
+        ),  # Keep original HD URL for reference
+        "is_business_account": profile_data.get("is_business_account", False),
+        "is_professional_account": profile_data.get("is_professional_account", False),
+        "is_private": profile_data.get("is_private", False),
+        "is_verified": profile_data.get("is_verified", False),
+        "followers": profile_data.get("edge_followed_by", {}).get("count", 0),
+        "following": profile_data.get("edge_follow", {}).get("count", 0),
+        "posts_count": profile_data.get("edge_owner_to_timeline_media", {}).get("count", 0),
+        "highlight_reel_count": profile_data.get("highlight_reel_count", 0),
+        "has_clips": profile_data.get("has_clips", False),
+        "has_guides": profile_data.get("has_guides", False),
+        "has_channel": profile_data.get("has_channel", False),
+        "has_onboarded_to_text_post_app": profile_data.get("has_onboarded_to_text_post_app", False),
+        "bio_links": profile_data.get("bio_links"),
+        "raw_profile_json": profile_data,
+        "review_status": None,  # NULL means unreviewed
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "last_scraped_at": datetime.now(timezone.utc).isoformat(),
+    }
 
-def process_related_creators_batch(supabase, batch_size: int = 10, delay_seconds: int = 2):
-    """Process a batch of approved creators to find related creators"""
-    global processing_state
-    start_time = time.time()
 
-    try:
-        # Get unprocessed approved creators
-        result = (
-            supabase.table("instagram_creators")
-            .select("id, ig_user_id, username")
-            .eq("review_status", "ok")
-            .eq("related_creators_processed", False)
-            .limit(batch_size)
-            .execute()
-        )
+def get_known_creators(supabase) -> KnownCreatorIndex:
+    """Process-wide known-creator index (loaded on first use, reloaded hourly)"""
+    global _known_creators
+    with _known_creators_lock:
+        if _known_creators is None:
+            _known_creators = KnownCreatorIndex(supabase)
+    _known_creators.ensure_loaded()
+    return _known_creators
 
-        creators = result.data if result.data else []
-        processing_state["total_count"] = len(creators)
 
-        # Log process start
+def log_discovery_event(supabase, level: str, message: str, context: Dict, **fields: Any) -> None:
+    """Write one system_logs row for the related creators discovery"""
+    try:
         supabase.table("system_logs").insert(
             {
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "source": "instagram_related_creators",
                 "script_name": "instagram_related_creators_routes",
-                "level": "info",
-                "message": f"Started processing {len(creators)} approved creators",
-                "context": {
-                    "action": "process_start",
-                    "batch_size": batch_size,
-                    "delay_seconds": delay_seconds,
-                    "total_creators": len(creators),
-                },
+                "level": level,
+                "message": message,
+                "context": context,
+                **fields,
             }
         ).execute()
+    except Exception as e:
+        logger.warning(f"Failed to write discovery log: {e}")
 
-        for creator in creators:
-            if processing_state["should_stop"]:
-                break
 
-            processing_state["current_creator"] = creator["username"]
-            creator_start_time = time.time()
+class SupabaseDiscoverySource:
+    """DiscoveryCrawler I/O: RapidAPI fetches and instagram_creators reads/writes"""
 
-            # Log starting to process creator
-            supabase.table("system_logs").insert(
-                {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "source": "instagram_related_creators",
-                    "script_name": "instagram_related_creators_routes",
-                    "level": "info",
-                    "message": f"Processing creator: {creator['username']}",
-                    "context": {
-                        "action": "process_creator",
-                        "creator": creator["username"],
-                        "ig_user_id": creator["ig_user_id"],
-                    },
-                }
-            ).execute()
+    def __init__(self, supabase, index: Optional[KnownCreatorIndex] = None):
+        self.supabase = supabase
+        self.index = index
 
-            # Get related profiles
-            related_profiles = get_related_profiles(creator["ig_user_id"], supabase)
+    async def related(self, seed: Dict) -> Optional[List[Dict]]:
+        return await asyncio.to_thread(get_related_profiles, seed["ig_user_id"])
 
-            if not related_profiles:
-                # No related creators found - already logged above
+    async def known(self, nodes: List[Dict]) -> List[Dict]:
+        """Nodes already stored: from the index, else one query per chunk of ids"""
+        if self.index is not None and self.index.loaded:
+            return self.index.known_profiles(nodes)
+        ids = [str(node["id"]) for node in nodes if node.get("id")]
 
-                # Log no related profiles found
-                supabase.table("system_logs").insert(
-                    {
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "source": "instagram_related_creators",
-                        "script_name": "instagram_related_creators_routes",
-                        "level": "warning",
-                        "message": f"No related profiles found for {creator['username']}",
-                        "context": {"action": "no_related_found", "creator": creator["username"]},
-                    }
-                ).execute()
-            else:
-                # Process each related profile
-                for profile in related_profiles:
-                    if processing_state["should_stop"]:
-                        break
-
-                    username = profile.get("username")
-                    if username:
-                        # Get full profile info
-                        full_profile = get_user_profile(username, supabase)
-                        if full_profile:  # noqa: SIM102
-                            # Save to database
-                            if save_creator_to_db(supabase, full_profile):
-                                processing_state["new_creators_found"] += 1
-
-                                # Log new creator saved
-                                supabase.table("system_logs").insert(
-                                    {
-                                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                                        "source": "instagram_related_creators",
-                                        "script_name": "instagram_related_creators_routes",
-                                        "level": "info",
-                                        "message": f"New creator discovered: {username}",
-                                        "context": {
-                                            "action": "creator_saved",
-                                            "new_creator": username,
-                                            "source_creator": creator["username"],
-                                            "followers": full_profile.get(
-                                                "edge_followed_by", {}
-                                            ).get("count", 0),
-                                        },
-                                    }
-                                ).execute()
-
-                        # Rate limiting delay
-                        time.sleep(delay_seconds)
-
-            # Mark creator as processed
-            supabase.table("instagram_creators").update({"related_creators_processed": True}).eq(
-                "id", creator["id"]
-            ).execute()
+        def lookup(chunk: List[str]) -> Any:
+            return (
+                self.supabase.table("instagram_creators")
+                .select("ig_user_id")
+                .in_("ig_user_id", chunk)
+                .execute()
+            )
 
-            processing_state["processed_count"] += 1
+        stored: Set[str] = set()
+        for i in range(0, len(ids), KNOWN_LOOKUP_CHUNK):
+            result = await asyncio.to_thread(lookup, ids[i : i + KNOWN_LOOKUP_CHUNK])
+            stored.update(str(row["ig_user_id"]) for row in result.data or [])
+        return [node for node in nodes if str(node.get("id")) in stored]
+
+    async def profile(self, node: Dict) -> Optional[Dict]:
+        return await asyncio.to_thread(get_user_profile, node["username"])
+
+    async def prepare(self, profile: Dict, seed: Dict) -> Dict[str, Any]:
+        profile_pic_url = await asyncio.to_thread(upload_profile_picture, profile)
+        return build_creator_row(profile, profile_pic_url)
+
+    async def insert(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert new creators in one call; fall back to single rows if the batch fails"""
+        if self.index is not None:
+            # Rows were triaged before their profile fetch; this re-check only catches
+            # creators stored meanwhile and stays out of the hit/miss stats
+            rows = [
+                row
+                for row in rows
+                if not self.index.contains(row["ig_user_id"], row["username"], count=False)
+            ]
+            if not rows:
+                return 0
+
+        def insert_rows() -> List[Dict[str, Any]]:
+            table = self.supabase.table("instagram_creators")
+            try:
+                return table.insert(rows).execute().data or []
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Batch insert of {len(rows)} creators failed, retrying singly: {e}"
+                )
+            inserted: List[Dict[str, Any]] = []
+            for row in rows:
+                try:
+                    inserted.extend(table.insert(row).execute().data or [])
+                except Exception as row_error:
+                    logger.error(f"Error saving creator {row.get('username')}: {row_error}")
+            return inserted
+
+        inserted = await asyncio.to_thread(insert_rows)
+        if self.index is not None:
+            self.index.add_rows(inserted)
+        return len(inserted)
+
+    async def mark_processed(self, seeds: List[Dict]) -> None:
+        await asyncio.to_thread(
+            lambda: self.supabase.table("instagram_creators")
+            .update({"related_creators_processed": True})
+            .in_("id", [seed["id"] for seed in seeds])
+            .execute()
+        )
 
-            # Log creator processing completed
-            creator_duration = int((time.time() - creator_start_time) * 1000)
-            related_count = len(related_profiles) if related_profiles else 0
 
-            supabase.table("system_logs").insert(
-                {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "source": "instagram_related_creators",
-                    "script_name": "instagram_related_creators_routes",
-                    "level": "info",
-                    "message": f"Completed processing {creator['username']} - found {related_count} related profiles",
-                    "context": {
-                        "action": "creator_completed",
-                        "creator": creator["username"],
-                        "related_profiles_count": related_count,
-                    },
-                    "duration_ms": creator_duration,
-                }
-            ).execute()
+async def process_related_creators_batch(
+    supabase, batch_size: int = 10, concurrency: Optional[int] = None
+):
+    """Crawl the related profiles of a batch of approved creators for new creators"""
+    global processing_state
+
+    try:
+        # Get unprocessed approved creators
+        result = await asyncio.to_thread(
+            lambda: supabase.table("instagram_creators")
+            .select("id, ig_user_id, username")
+            .eq("review_status", "ok")
+            .eq("related_creators_processed", False)
+            .limit(batch_size)
+            .execute()
+        )
+        creators = result.data if result.data else []
+        processing_state["total_count"] = len(creators)
+
+        concurrency = concurrency or config.instagram.discovery_concurrency
+        await asyncio.to_thread(
+            log_discovery_event,
+            supabase,
+            "info",
+            f"Started processing {len(creators)} approved creators",
+            {
+                "action": "process_start",
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+                "requests_per_second": _pacer.requests_per_second,
+                "total_creators": len(creators),
+            },
+        )
+
+        async def on_progress(progress: DiscoveryProgress) -> None:
+            processing_state["current_creator"] = progress.current_seed
+            processing_state["processed_count"] = progress.seeds_done
+            processing_state["new_creators_found"] = progress.created
+            processing_state["errors"] = progress.errors[-5:]
+            processing_state["progress"] = progress.as_dict()
+            await asyncio.to_thread(
+                log_discovery_event,
+                supabase,
+                "info",
+                f"Discovery progress: {progress.seeds_done}/{progress.seeds} creators, "
+                f"{progress.created} new creators",
+                {"action": "process_progress", **progress.as_dict()},
+            )
+
+        index = await asyncio.to_thread(get_known_creators, supabase)
+        crawler = DiscoveryCrawler(
+            SupabaseDiscoverySource(supabase, index),
+            _pacer,
+            logger,
+            concurrency=concurrency,
+            insert_batch=config.instagram.discovery_insert_batch,
+            should_stop=lambda: processing_state["should_stop"],
+            on_progress=on_progress,
+        )
+        progress = await crawler.run(creators)
 
         processing_state["is_running"] = False
         processing_state["current_creator"] = None
 
         # Log process completion
-        total_duration = int((time.time() - start_time) * 1000)
-        supabase.table("system_logs").insert(
+        await asyncio.to_thread(
+            log_discovery_event,
+            supabase,
+            "info",
+            f"Completed batch processing - processed {progress.seeds_done} creators, "
+            f"found {progress.created} new creators",
             {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": "instagram_related_creators",
-                "script_name": "instagram_related_creators_routes",
-                "level": "info",
-                "message": f"Completed batch processing - processed {processing_state['processed_count']} creators, found {processing_state['new_creators_found']} new creators",
-                "context": {
-                    "action": "process_completed",
-                    "creators_processed": processing_state["processed_count"],
-                    "new_creators_found": processing_state["new_creators_found"],
-                },
-                "duration_ms": total_duration,
-                "items_processed": processing_state["processed_count"],
-            }
-        ).execute()
+                "action": "process_completed",
+                **progress.as_dict(),
+                "known_creator_index": index.get_stats(),
+            },
+            duration_ms=int(progress.elapsed * 1000),
+            items_processed=progress.seeds_done,
+        )
 
     except Exception as e:
         logger.error(f"Error processing related creators: {e}")
         processing_state["errors"].append(str(e))
         processing_state["is_running"] = False
 
-        # Log error
-        supabase.table("system_logs").insert(
+        await asyncio.to_thread(
+            log_discovery_event,
+            supabase,
+            "error",
+            f"Error in batch processing: {e!s}",
             {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "source": "instagram_related_creators",
-                "script_name": "instagram_related_creators_routes",
-                "level": "error",
-                "message": f"Error in batch processing: {e!s}",
-                "context": {
-                    "action": "process_error",
-                    "error": str(e),
-                    "current_creator": processing_state.get("current_creator"),
-                    "processed_count": processing_state.get("processed_count", 0),
-                },
-            }
-        ).execute()
-
-        raise
+                "action": "process_error",
+                "error": str(e),
+                "current_creator": processing_state.get("current_creator"),
+                "processed_count": processing_state.get("processed_count", 0),
+            },
+        )
 
 
 @router.post("/start")
-def start_related_creators_discovery(
-    request: Request, params: RelatedCreatorsStartRequest, background_tasks: BackgroundTasks
-):
+async def start_related_creators_discovery(request: Request, params: RelatedCreatorsStartRequest):
     """Start discovering related creators for approved accounts"""
-    global processing_state
+    global processing_state, _discovery_task
 
     if processing_state["is_running"]:
         raise HTTPException(status_code=400, detail="Processing already in progress")
@@ -459,11 +481,12 @@ def start_related_creators_discovery(
             "total_count": 0,
             "new_creators_found": 0,
             "errors": [],
+            "progress": {},
         }
 
         # Get count of unprocessed approved creators
-        count_result = (
-            supabase.table("instagram_creators")
+        count_result = await asyncio.to_thread(
+            lambda: supabase.table("instagram_creators")
             .select("id", count="exact")  # type: ignore[arg-type]
             .eq("review_status", "ok")
             .eq("related_creators_processed", False)
@@ -474,14 +497,12 @@ def start_related_creators_discovery(
         total_to_process = count_result.count or 0
 
         if total_to_process == 0:
+            processing_state["is_running"] = False
             raise HTTPException(status_code=400, detail="No unprocessed approved creators found")
 
-        # Start processing in background
-        background_tasks.add_task(
-            process_related_creators_batch,
-            supabase,
-            params.batch_size or 10,
-            params.delay_seconds or 2,
+        # Crawl on the event loop in the background
+        _discovery_task = asyncio.create_task(
+            process_related_creators_batch(supabase, params.batch_size or 10, params.concurrency)
         )
 
         # Log API call
@@ -503,6 +524,7 @@ def start_related_creators_discovery(
     except HTTPException:
         raise
     except Exception as e:
+        processing_state["is_running"] = False
         logger.error(f"Error starting related creators discovery: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -556,6 +578,7 @@ def get_related_creators_status(request: Request):
             "current_creator": processing_state["current_creator"],
             "new_creators_found": processing_state["new_creators_found"],
             "errors": processing_state["errors"][-5:] if processing_state["errors"] else [],
+            "progress": processing_state.get("progress", {}),
         }
 
         # Log API call
@@ -597,5 +620,5 @@ def stop_related_creators_discovery(request: Request):
 
     return {
         "status": "stopping",
-        "message": "Stop requested. Processing will halt after current creator.",
+        "message": "Stop requested. Processing will halt after in-flight profiles.",
     }
@@ -5,6 +5,7 @@ Manages Instagram scraper via system_control table
 """
 
 # Version tracking
+import asyncio
 import os
 import signal
 import subprocess
@@ -12,10 +13,14 @@ import sys
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 from supabase import Client
 
 # Import database singleton and unified logger
+from app.core.control_state import publish_control_change
 from app.core.database import get_db
+from app.core.job_scheduler import get_scheduler
+from app.core.queue_telemetry import queue_telemetry, render_metrics
 from app.logging import get_logger
 from app.version import INSTAGRAM_SCRAPER_VERSION as API_VERSION
 
@@ -29,6 +34,9 @@ logger = get_logger(__name__)
 # Create router
 router = APIRouter(prefix="/api/instagram/scraper", tags=["instagram-scraper"])
 
+# Redis work queue consumed by the workers (docker-compose.worker.yml)
+INSTAGRAM_QUEUE_NAME = "instagram_scraper_queue"
+
 
 # Get Supabase client using singleton
 def get_supabase() -> Client:
@@ -637,6 +645,42 @@ async def get_cost_metrics():
         }
 
 
+@router.get("/queue")
+async def get_queue_telemetry():
+    """
+    Get worker queue telemetry for scaling decisions
+
+    Queue counts and lag (age of the oldest pending job), scheduler lanes,
+    per-worker heartbeats (jobs/min, success rate, in-flight, p95 job time)
+    and the estimated time to drain the backlog with the current workers.
+    """
+    scheduler = get_scheduler(INSTAGRAM_QUEUE_NAME)
+    if scheduler is None:
+        return {"success": False, "message": "Worker queue not configured (REDIS_HOST)"}
+    try:
+        telemetry = await asyncio.to_thread(queue_telemetry, scheduler.queue, scheduler)
+        return {"success": True, "queue_name": INSTAGRAM_QUEUE_NAME, **telemetry}
+    except Exception as e:
+        logger.error(f"Failed to get queue telemetry: {e}")
+        return {"success": False, "message": str(e)}
+
+
+@router.get("/queue/metrics", response_class=PlainTextResponse)
+async def get_queue_metrics():
+    """Get worker queue telemetry in the Prometheus text format"""
+    scheduler = get_scheduler(INSTAGRAM_QUEUE_NAME)
+    if scheduler is None:
+        return PlainTextResponse("# Worker queue not configured (REDIS_HOST)\n", status_code=503)
+    try:
+        telemetry = await asyncio.to_thread(queue_telemetry, scheduler.queue, scheduler)
+    except Exception as e:
+        logger.error(f"Failed to get queue metrics: {e}")
+        return PlainTextResponse(f"# Queue telemetry unavailable: {e}\n", status_code=503)
+    return PlainTextResponse(
+        render_metrics(telemetry, INSTAGRAM_QUEUE_NAME), media_type="text/plain; version=0.0.4"
+    )
+
+
 @router.post("/start")
 async def start_instagram_scraper(request: Request):
     """Enable the Instagram scraper by updating control table"""
@@ -687,6 +731,9 @@ async def start_instagram_scraper(request: Request):
                 }
             ).execute()
 
+        # Wake control-state watchers instead of waiting for their next refresh
+        await asyncio.to_thread(publish_control_change, "instagram_scraper")
+
         # Start the actual subprocess immediately (like Reddit scraper should do)
         try:
             # Open log file for Instagram scraper output
@@ -866,6 +913,8 @@ async def stop_instagram_scraper(request: Request):
                 }
             ).execute()
 
+        await asyncio.to_thread(publish_control_change, "instagram_scraper")
+
         # Log the action
         if system_logger:
             system_logger.info(
@@ -913,6 +962,8 @@ async def get_control_info():
             "start": "POST /api/instagram/scraper/start",
             "stop": "POST /api/instagram/scraper/stop",
             "status": "GET /api/instagram/scraper/status",
+            "queue": "GET /api/instagram/scraper/queue",
+            "queue_metrics": "GET /api/instagram/scraper/queue/metrics",
         },
         "database_control": {
             "to_start": "UPDATE system_control SET enabled = true WHERE script_name = 'instagram_scraper';",
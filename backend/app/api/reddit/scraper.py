@@ -5,6 +5,7 @@ Manages Reddit scraper via system_control table and subprocess
 """
 
 # Version tracking
+import asyncio
 import os
 import signal
 import subprocess
@@ -15,6 +16,7 @@ from fastapi import APIRouter, Request
 from supabase import Client
 
 # Import database singleton and unified logger
+from app.core.control_state import publish_control_change
 from app.core.database import get_db
 from app.logging import get_logger
 from app.version import REDDIT_SCRAPER_VERSION as API_VERSION
@@ -621,6 +623,9 @@ async def start_reddit_scraper(request: Request):
                 }
             ).execute()
 
+        # Wake control-state watchers instead of waiting for their next refresh
+        await asyncio.to_thread(publish_control_change, "reddit_scraper")
+
         # Start the actual subprocess
         try:
             # Open log file for Reddit scraper output
@@ -796,6 +801,7 @@ async def stop_reddit_scraper(request: Request):
                 "updated_by": "api",
             }
         ).eq("script_name", "reddit_scraper").execute()
+        await asyncio.to_thread(publish_control_change, "reddit_scraper")
 
         # Try to kill the process if PID exists
         if pid:
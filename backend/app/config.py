@@ -5,7 +5,7 @@ All application settings in one place
 
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
@@ -149,6 +149,8 @@ class InstagramScraperConfig:
     max_workers: int = 10
     requests_per_second: int = 55
     concurrent_creators: int = 10  # v3.12.0: Tested 20 (0.86/min) vs 10 (0.90/min) - 10 is optimal
+    creator_timeout: float = 300.0  # Per-creator limit in the worker pool
+    drain_grace_seconds: float = 30.0  # In-flight creators finish within this after a stop
 
     # Batch Processing
     batch_size: int = 50
@@ -166,6 +168,7 @@ class InstagramScraperConfig:
     retry_wait_max: float = 10.0
     retry_empty_response: int = 1
     retry_backoff_multiplier: float = 2.5  # Exponential backoff multiplier
+    retry_lane_concurrency: int = 2  # Coroutines retrying deferred empty/timed-out fetches
 
     # Features
     enable_viral_detection: bool = True
@@ -189,6 +192,45 @@ class InstagramScraperConfig:
     existing_creator_reels_count: int = 30
     existing_creator_posts_count: int = 10
 
+    # Creator State Snapshot (newest media per creator preloaded; keep >= max fetch depth)
+    creator_state_media_window: int = 100
+
+    # Change Detection (skip reels/posts when the profile shows no new media)
+    enable_change_detection: bool = True
+    unchanged_refresh_hours: float = 24.0  # Engagement refresh interval for unchanged creators
+
+    # Incremental Fetch (stop paginating at media stored last cycle, between full refreshes)
+    incremental_fetch: bool = True
+    incremental_refresh_count: int = 12  # Stored items to re-read for fresh counts (1 page)
+
+    # Raw Payloads (raw_media_json: full, projected, hash or r2; unchanged payloads are not re-sent)
+    raw_media_mode: str = "full"
+    raw_media_fields: Optional[List[str]] = None  # Projection paths (None = default whitelist)
+
+    # Batch Writes (reels/posts upserts and creator updates shared across concurrent creators)
+    batch_writes: bool = True
+    batch_write_rows: int = 500  # Buffered rows that trigger a flush
+    batch_write_delay: float = 0.5  # Max seconds a row waits for other creators' rows
+
+    # Request Hedging (duplicate profile/reels/posts calls slower than the adaptive p95)
+    hedge_requests: bool = False
+    hedge_quantile: float = 0.95  # Latency quantile a call must exceed to be hedged
+    hedge_budget: float = 0.05  # Max share of requests that may fire a duplicate
+    hedge_min_delay: float = 1.0  # Never hedge sooner than this many seconds
+
+    # Running Aggregates (avg_*_cached / posting stats maintained by DB triggers over full history)
+    running_aggregates: bool = True
+
+    # Time-Sliced Scheduling (continuous mode: creators spread over the refresh window, paced RPS)
+    time_sliced: bool = False
+    refresh_window_hours: float = 4.0  # Every creator is refreshed once per window
+    time_slice_seconds: float = 300.0  # Due creators are started in batches of this length
+
+    # Related-Creator Discovery (async crawler behind /api/instagram/related-creators)
+    discovery_requests_per_second: float = 10.0  # RapidAPI budget of the crawler
+    discovery_concurrency: int = 8  # Frontier worker coroutines
+    discovery_insert_batch: int = 25  # New creators per insert
+
     @property
     def rate_limit_delay(self) -> float:
         """Calculate delay between requests"""
@@ -309,6 +351,8 @@ class Config:
             concurrent_creators=int(
                 os.getenv("INSTAGRAM_CONCURRENT_CREATORS", "10")
             ),  # v3.12.0: Tested - 10 is optimal
+            creator_timeout=float(os.getenv("INSTAGRAM_CREATOR_TIMEOUT", "300")),
+            drain_grace_seconds=float(os.getenv("INSTAGRAM_DRAIN_GRACE_SECONDS", "30")),
             batch_size=int(os.getenv("INSTAGRAM_BATCH_SIZE", "50")),
             update_frequency=int(os.getenv("UPDATE_FREQUENCY", "10800")),
             connection_pool_size=int(os.getenv("INSTAGRAM_CONNECTION_POOL_SIZE", "20")),
@@ -320,6 +364,7 @@ class Config:
             retry_wait_max=float(os.getenv("RETRY_WAIT_MAX", "10")),
             retry_empty_response=int(os.getenv("RETRY_EMPTY_RESPONSE", "1")),
             retry_backoff_multiplier=float(os.getenv("RETRY_BACKOFF_MULTIPLIER", "2.5")),
+            retry_lane_concurrency=int(os.getenv("INSTAGRAM_RETRY_LANE_CONCURRENCY", "2")),
             enable_viral_detection=os.getenv("ENABLE_VIRAL_DETECTION", "true").lower() == "true",
             viral_min_views=int(os.getenv("VIRAL_MIN_VIEWS", "50000")),
             viral_multiplier=float(os.getenv("VIRAL_MULTIPLIER", "5.0")),
@@ -331,6 +376,33 @@ class Config:
             webhook_url=os.getenv("WEBHOOK_URL", ""),
             dry_run=os.getenv("DRY_RUN", "false").lower() == "true",
             test_limit=int(os.getenv("TEST_LIMIT", "10")),
+            creator_state_media_window=int(os.getenv("INSTAGRAM_STATE_MEDIA_WINDOW", "100")),
+            enable_change_detection=os.getenv("INSTAGRAM_CHANGE_DETECTION", "true").lower()
+            == "true",
+            unchanged_refresh_hours=float(os.getenv("INSTAGRAM_UNCHANGED_REFRESH_HOURS", "24")),
+            incremental_fetch=os.getenv("INSTAGRAM_INCREMENTAL_FETCH", "true").lower() == "true",
+            incremental_refresh_count=int(os.getenv("INSTAGRAM_INCREMENTAL_REFRESH_COUNT", "12")),
+            raw_media_mode=os.getenv("INSTAGRAM_RAW_MEDIA_MODE", "full").lower(),
+            raw_media_fields=[
+                path.strip()
+                for path in os.getenv("INSTAGRAM_RAW_MEDIA_FIELDS", "").split(",")
+                if path.strip()
+            ]
+            or None,
+            batch_writes=os.getenv("INSTAGRAM_BATCH_WRITES", "true").lower() == "true",
+            batch_write_rows=int(os.getenv("INSTAGRAM_BATCH_WRITE_ROWS", "500")),
+            batch_write_delay=float(os.getenv("INSTAGRAM_BATCH_WRITE_DELAY", "0.5")),
+            hedge_requests=os.getenv("INSTAGRAM_HEDGE_REQUESTS", "false").lower() == "true",
+            hedge_quantile=float(os.getenv("INSTAGRAM_HEDGE_QUANTILE", "0.95")),
+            hedge_budget=float(os.getenv("INSTAGRAM_HEDGE_BUDGET", "0.05")),
+            hedge_min_delay=float(os.getenv("INSTAGRAM_HEDGE_MIN_DELAY", "1.0")),
+            running_aggregates=os.getenv("INSTAGRAM_RUNNING_AGGREGATES", "true").lower() == "true",
+            time_sliced=os.getenv("INSTAGRAM_TIME_SLICED", "false").lower() == "true",
+            refresh_window_hours=float(os.getenv("INSTAGRAM_REFRESH_WINDOW_HOURS", "4")),
+            time_slice_seconds=float(os.getenv("INSTAGRAM_TIME_SLICE_SECONDS", "300")),
+            discovery_requests_per_second=float(os.getenv("INSTAGRAM_DISCOVERY_RPS", "10")),
+            discovery_concurrency=int(os.getenv("INSTAGRAM_DISCOVERY_CONCURRENCY", "8")),
+            discovery_insert_batch=int(os.getenv("INSTAGRAM_DISCOVERY_INSERT_BATCH", "25")),
         )
 
         # Feature flags
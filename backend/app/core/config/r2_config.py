@@ -41,6 +41,12 @@ class R2Config:
     # Folder structure
     PHOTOS_PREFIX: str = "photos"
     VIDEOS_PREFIX: str = "videos"
+    PROFILE_PICTURES_PREFIX: str = "profile_pictures"
+
+    # Content-addressed deduplication (see app/utils/media_index.py)
+    # Skips CDN downloads for unchanged assets and R2 PUTs for already-stored bytes
+    DEDUP_ENABLED: bool = os.getenv("R2_DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_CACHE_SIZE: int = int(os.getenv("R2_DEDUP_CACHE_SIZE", "50000"))
 
     @classmethod
     def is_configured(cls) -> bool:
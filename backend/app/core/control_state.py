@@ -0,0 +1,315 @@
+"""
+Scraper Control State
+Shared, cached view of the system_control table
+
+Scrapers used to query system_control before every creator, between fetch
+steps and inside busy-wait loops. ControlStateWatcher loads every control row
+in one query on a background thread at a fixed interval and keeps the result
+in memory, so checks like "is instagram_scraper enabled?" are a dict lookup.
+
+When Redis is configured (REDIS_HOST), the watcher also subscribes to
+CONTROL_CHANNEL and refreshes as soon as a change is published, so start/stop
+from the API takes effect without waiting for the next interval. Callers that
+change system_control should call publish_control_change() after writing.
+"""
+
+import contextlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+try:
+    import redis
+except ImportError:  # Redis is optional; interval refresh still works without it
+    redis = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+CONTROL_TABLE = "system_control"
+CONTROL_CHANNEL = "b9:system_control:changed"
+
+DEFAULT_REFRESH_SECONDS = 5.0
+# Cached state older than this many refresh intervals is treated as unknown
+STALE_AFTER_INTERVALS = 6
+
+
+@dataclass(frozen=True)
+class ControlState:
+    """Snapshot of one system_control row"""
+
+    script_name: str
+    enabled: bool = False
+    status: Optional[str] = None
+    row: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def should_run(self) -> bool:
+        """Enabled flag, or legacy status == 'running' (backward compatibility)"""
+        return self.enabled or self.status == "running"
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ControlState":
+        """Build state from a system_control row"""
+        return cls(
+            script_name=row["script_name"],
+            enabled=bool(row.get("enabled", False)),
+            status=row.get("status"),
+            row=dict(row),
+        )
+
+
+def _redis_client() -> Optional[Any]:
+    """Redis client from REDIS_HOST/PORT/PASSWORD, or None if not configured"""
+    host = os.getenv("REDIS_HOST")
+    if redis is None or not host:
+        return None
+    return redis.Redis(
+        host=host,
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD", "") or None,
+        decode_responses=True,
+        socket_connect_timeout=5,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+
+
+class ControlStateWatcher:
+    """
+    Background-refreshed cache of system_control
+
+    Reads (get/is_enabled/should_run) never touch the network. A daemon thread
+    refreshes all rows every `refresh_interval` seconds; a second daemon thread
+    (only with Redis) wakes the refresher when a change is published.
+    """
+
+    def __init__(
+        self,
+        supabase,
+        refresh_interval: float = DEFAULT_REFRESH_SECONDS,
+        redis_client: Optional[Any] = None,
+    ):
+        """
+        Initialize watcher (call start() to begin refreshing)
+
+        Args:
+            supabase: Supabase client instance
+            refresh_interval: Seconds between background refreshes
+            redis_client: Redis client for change notifications (optional)
+        """
+        self.supabase = supabase
+        self.refresh_interval = refresh_interval
+        self.redis_client = redis_client
+        self._states: Dict[str, ControlState] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads: list = []
+
+    # ------------------------------------------------------------------
+    # Reads (in-memory)
+    # ------------------------------------------------------------------
+
+    @property
+    def is_fresh(self) -> bool:
+        """True if the cache was refreshed recently enough to trust"""
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            return False
+        return time.monotonic() - loaded_at <= self.refresh_interval * STALE_AFTER_INTERVALS
+
+    def get(self, script_name: str) -> Optional[ControlState]:
+        """
+        Cached control state for a script
+
+        Returns:
+            ControlState, a disabled placeholder if the row does not exist,
+            or None if the cache is empty or stale (callers decide the fallback)
+        """
+        if not self.is_fresh:
+            return None
+        with self._lock:
+            state = self._states.get(script_name)
+        return state or ControlState(script_name=script_name)
+
+    def has_row(self, script_name: str) -> bool:
+        """True if the last refresh saw a control row for the script"""
+        with self._lock:
+            return script_name in self._states
+
+    def is_enabled(self, script_name: str) -> Optional[bool]:
+        """Cached `enabled` flag (None if unknown)"""
+        state = self.get(script_name)
+        return state.enabled if state else None
+
+    def should_run(self, script_name: str) -> Optional[bool]:
+        """Cached `enabled or status == 'running'` (None if unknown)"""
+        state = self.get(script_name)
+        return state.should_run if state else None
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """
+        Reload every control row in one query
+
+        Returns:
+            True if the cache was updated
+        """
+        try:
+            result = self.supabase.table(CONTROL_TABLE).select("*").execute()
+        except Exception as e:
+            logger.warning(f"Failed to refresh control state: {e}")
+            return False
+
+        states = {
+            row["script_name"]: ControlState.from_row(row)
+            for row in result.data or []
+            if row.get("script_name")
+        }
+        with self._lock:
+            previous, self._states = self._states, states
+            self._loaded_at = time.monotonic()
+
+        for name, state in states.items():
+            old = previous.get(name)
+            if old is not None and old.should_run != state.should_run:
+                logger.info(
+                    f"🎛️ Control change: {name} {'ENABLED' if state.should_run else 'DISABLED'}"
+                )
+        return True
+
+    def invalidate(self) -> None:
+        """Wake the refresh thread now instead of at the next interval"""
+        self._wake.set()
+
+    def start(self) -> "ControlStateWatcher":
+        """Load once synchronously and start the background threads (idempotent)"""
+        if self._threads:
+            return self
+        self.refresh()
+
+        refresher = threading.Thread(
+            target=self._refresh_loop, name="control-state-refresh", daemon=True
+        )
+        refresher.start()
+        self._threads.append(refresher)
+
+        if self.redis_client is not None:
+            listener = threading.Thread(
+                target=self._listen_loop, name="control-state-listen", daemon=True
+            )
+            listener.start()
+            self._threads.append(listener)
+
+        logger.info(
+            f"🎛️ Control state watcher started (refresh every {self.refresh_interval:g}s, "
+            f"push={'redis' if self.redis_client is not None else 'off'})"
+        )
+        return self
+
+    def stop(self) -> None:
+        """Stop the background threads"""
+        self._stopped.set()
+        self._wake.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self.refresh()
+
+    def _listen_loop(self) -> None:
+        """Refresh on published changes; reconnects with backoff on Redis errors"""
+        client = self.redis_client
+        if client is None:
+            return
+        backoff = 1.0
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CONTROL_CHANNEL)
+                backoff = 1.0
+                # A change may have been published while we were disconnected
+                self.invalidate()
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.invalidate()
+            except Exception as e:
+                logger.warning(f"Control change listener error (retrying in {backoff:g}s): {e}")
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        pubsub.close()
+
+
+_watcher: Optional[ControlStateWatcher] = None
+_watcher_lock = threading.Lock()
+_publisher: Optional[Any] = None
+
+
+def get_control_watcher(supabase=None) -> ControlStateWatcher:
+    """
+    Process-wide, started ControlStateWatcher
+
+    Args:
+        supabase: Supabase client (defaults to the shared singleton)
+
+    Returns:
+        Running ControlStateWatcher
+    """
+    global _watcher
+    if _watcher is not None:
+        return _watcher
+
+    with _watcher_lock:
+        if _watcher is None:
+            if supabase is None:
+                from app.core.database import get_db
+
+                supabase = get_db()
+            interval = float(os.getenv("CONTROL_STATE_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+            redis_client = None
+            try:
+                redis_client = _redis_client()
+            except Exception as e:
+                logger.warning(f"Control change notifications disabled: {e}")
+            _watcher = ControlStateWatcher(supabase, interval, redis_client).start()
+    return _watcher
+
+
+def publish_control_change(script_name: str) -> bool:
+    """
+    Notify watchers that a system_control row changed (best effort)
+
+    Args:
+        script_name: Script whose control row was written
+
+    Returns:
+        True if the notification was published
+    """
+    global _publisher
+    try:
+        if _publisher is None:
+            _publisher = _redis_client()
+        if _publisher is None:
+            return False
+        _publisher.publish(CONTROL_CHANNEL, script_name)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to publish control change for {script_name}: {e}")
+        return False
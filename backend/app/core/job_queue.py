@@ -0,0 +1,496 @@
+"""
+Reliable Job Queue
+Leased Redis work queue with acknowledgement, retries and a dead-letter list
+
+Workers used to BRPOP jobs, so a job was gone the moment it was popped: a
+worker crash mid-creator lost it and failures were only logged. ReliableQueue
+keeps every claimed job in Redis until the worker acknowledges it:
+
+- claim() moves a job from the pending list to the worker's own processing
+  list and records a lease that expires after `visibility_timeout` seconds,
+  both in one script, so no claimed job is ever without a lease
+- ack() removes a finished job; fail() schedules a retry with exponential
+  backoff, or moves the job to the dead-letter list after `max_attempts`
+- reap() (run periodically by every worker) retries jobs whose lease expired
+  because their worker died, and moves due retries back to the pending list
+
+enqueue() adds a batch of jobs in one round trip and skips job ids that are
+already queued, delayed or running; an id is released when its job is acked
+or dead-lettered. Plain LPUSH still works (those jobs are just not deduped).
+
+The pending list keeps its name and layout (LPUSH to enqueue, consumers take
+from the right), so LLEN-based monitoring is unchanged. Jobs entering it
+through the queue (or the scheduler) record when they did, so the age of the
+oldest waiting job (queue lag) can be read without parsing payloads. Attempts are counted
+in a hash keyed by the raw payload, so a job is never rewritten on its way
+through the queue. Lua scripts address per-worker processing lists by name,
+which assumes a single Redis node (not Cluster).
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_VISIBILITY_TIMEOUT = 900.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 60.0
+DEFAULT_MAX_RETRY_DELAY = 3600.0
+ENQUEUE_CHUNK = 500  # Jobs per enqueue script call
+CLAIM_POLL_INTERVAL = 0.5  # Seconds between claim attempts while the queue is empty
+
+
+# Shared by the scripts below. retry() takes a job off its processing list and
+# either schedules it on the delayed set or buries it in the dead-letter list.
+# The LREM result guards against double counting when two reapers (or a reaper
+# and the owning worker) race for the same job.
+# KEYS: leases, owners, attempts, errors, delayed, dead, job_ids, queued, dead_ids
+# ARGV: now, max_attempts, retry_delay, max_retry_delay, processing_prefix, ...
+_RETRY_LUA = """
+local now = tonumber(ARGV[1])
+local max_attempts = tonumber(ARGV[2])
+local retry_delay = tonumber(ARGV[3])
+local max_retry_delay = tonumber(ARGV[4])
+local prefix = ARGV[5]
+
+local function retry(raw, owner, reason)
+  owner = redis.call('HGET', KEYS[2], raw) or owner
+  redis.call('ZREM', KEYS[1], raw)
+  redis.call('HDEL', KEYS[2], raw)
+  if not owner or redis.call('LREM', prefix .. owner, 1, raw) == 0 then
+    return 0
+  end
+  local attempts = redis.call('HINCRBY', KEYS[3], raw, 1)
+  redis.call('HSET', KEYS[4], raw, reason)
+  if attempts >= max_attempts then
+    redis.call('HDEL', KEYS[3], raw)
+    redis.call('LPUSH', KEYS[6], raw)
+    local id = redis.call('HGET', KEYS[7], raw)
+    if id then
+      redis.call('HDEL', KEYS[7], raw)
+      redis.call('SREM', KEYS[8], id)
+      redis.call('HSET', KEYS[9], raw, id)
+    end
+    return 2
+  end
+  local delay = math.min(max_retry_delay, retry_delay * 2 ^ (attempts - 1))
+  redis.call('ZADD', KEYS[5], now + delay, raw)
+  return 1
+end
+"""
+
+# ARGV[6]: raw job, ARGV[7]: owner, ARGV[8]: reason
+_FAIL_LUA = _RETRY_LUA + "return retry(ARGV[6], ARGV[7], ARGV[8])\n"
+
+# ARGV[6]: limit, KEYS[10]: pending, KEYS[11]: since
+_REAP_LUA = _RETRY_LUA + """
+local limit = tonumber(ARGV[6])
+local retried, buried = 0, 0
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, limit)
+for _, raw in ipairs(expired) do
+  local outcome = retry(raw, nil, 'lease expired')
+  if outcome == 1 then retried = retried + 1 elseif outcome == 2 then buried = buried + 1 end
+end
+local due = redis.call('ZRANGEBYSCORE', KEYS[5], '-inf', now, 'LIMIT', 0, limit)
+for _, raw in ipairs(due) do
+  redis.call('ZREM', KEYS[5], raw)
+  redis.call('LPUSH', KEYS[10], raw)
+  redis.call('HSET', KEYS[11], raw, now)
+end
+return {retried, buried, #due}
+"""
+
+# ARGV[6]: worker id (its whole processing list is abandoned)
+_RECOVER_LUA = _RETRY_LUA + """
+local recovered = 0
+for _, raw in ipairs(redis.call('LRANGE', prefix .. ARGV[6], 0, -1)) do
+  if retry(raw, ARGV[6], 'worker restarted') > 0 then recovered = recovered + 1 end
+end
+return recovered
+"""
+
+# Move the oldest pending job to this worker's processing list and lease it.
+# A blocking BLMOVE cannot run inside a script, so claim() polls this instead.
+# KEYS: pending, processing, leases, owners, attempts, since; ARGV: lease deadline, worker id
+_CLAIM_LUA = """
+local raw = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+if not raw then
+  return false
+end
+redis.call('ZADD', KEYS[3], ARGV[1], raw)
+redis.call('HSET', KEYS[4], raw, ARGV[2])
+redis.call('HDEL', KEYS[6], raw)
+return {raw, redis.call('HGET', KEYS[5], raw) or '0'}
+"""
+
+# Add jobs whose id is not queued yet (ids stay reserved until ack/dead-letter).
+# KEYS: pending, job_ids, queued, since; ARGV: now, id1, raw1, id2, raw2, ...
+_ENQUEUE_LUA = """
+local raws = {}
+for i = 2, #ARGV, 2 do
+  if redis.call('SADD', KEYS[3], ARGV[i]) == 1 then
+    redis.call('HSET', KEYS[2], ARGV[i + 1], ARGV[i])
+    redis.call('HSET', KEYS[4], ARGV[i + 1], ARGV[1])
+    raws[#raws + 1] = ARGV[i + 1]
+  end
+end
+if #raws > 0 then
+  redis.call('LPUSH', KEYS[1], unpack(raws))
+end
+return #raws
+"""
+
+# KEYS: processing, leases, owners, attempts, errors, job_ids, queued; ARGV: raw job
+_ACK_LUA = """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('HDEL', KEYS[5], ARGV[1])
+local id = redis.call('HGET', KEYS[6], ARGV[1])
+if id then
+  redis.call('HDEL', KEYS[6], ARGV[1])
+  redis.call('SREM', KEYS[7], id)
+end
+"""
+
+# Drop pending jobs and scheduled retries (running jobs are left alone).
+# KEYS: pending, delayed, attempts, errors, job_ids, queued, since
+_CLEAR_LUA = """
+local raws = redis.call('LRANGE', KEYS[1], 0, -1)
+for _, raw in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+  raws[#raws + 1] = raw
+end
+for _, raw in ipairs(raws) do
+  redis.call('HDEL', KEYS[3], raw)
+  redis.call('HDEL', KEYS[4], raw)
+  local id = redis.call('HGET', KEYS[5], raw)
+  if id then
+    redis.call('HDEL', KEYS[5], raw)
+    redis.call('SREM', KEYS[6], id)
+  end
+end
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[7])
+return #raws
+"""
+
+# Replay dead letters, dropping those whose id was queued again meanwhile.
+# KEYS: dead, pending, errors, job_ids, queued, dead_ids, since; ARGV: limit, now
+_REQUEUE_DEAD_LUA = """
+local moved = 0
+for _ = 1, tonumber(ARGV[1]) do
+  local raw = redis.call('RPOP', KEYS[1])
+  if not raw then
+    break
+  end
+  redis.call('HDEL', KEYS[3], raw)
+  local id = redis.call('HGET', KEYS[6], raw)
+  redis.call('HDEL', KEYS[6], raw)
+  if not id or redis.call('SADD', KEYS[5], id) == 1 then
+    if id then
+      redis.call('HSET', KEYS[4], raw, id)
+    end
+    redis.call('LPUSH', KEYS[2], raw)
+    redis.call('HSET', KEYS[7], raw, ARGV[2])
+    moved = moved + 1
+  end
+end
+return moved
+"""
+
+# Hand a job back without counting an attempt (shutdown before it finished).
+# KEYS: processing, leases, owners, pending, since; ARGV: raw job, now
+_RELEASE_LUA = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+  return 0
+end
+redis.call('RPUSH', KEYS[4], ARGV[1])
+redis.call('HSET', KEYS[5], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+@dataclass
+class QueueJob:
+    """A claimed job"""
+
+    raw: str  # Payload exactly as queued (identifies the job in every structure)
+    data: Dict[str, Any]  # Parsed payload ({} if it was not valid JSON)
+    attempts: int = 0  # Failed attempts before this one
+
+
+class ReliableQueue:
+    """
+    Leased work queue on top of a Redis list
+
+    Keys (for name "q"): q (pending), q:processing:<worker>, q:leases (ZSET of
+    lease deadlines), q:owners, q:attempts, q:errors, q:job_ids, q:dead_ids
+    (hashes keyed by payload), q:since (payload -> time it entered the pending
+    list), q:delayed (ZSET of retry times), q:dead (dead-letter list) and
+    q:queued (set of job ids with a live job).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        name: str,
+        worker_id: str = "",
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        max_retry_delay: float = DEFAULT_MAX_RETRY_DELAY,
+    ):
+        """
+        Initialize queue
+
+        Args:
+            client: Redis client (decode_responses=True)
+            name: Pending list key
+            worker_id: Consumer name (required to claim; not needed for stats/admin)
+            visibility_timeout: Seconds a claimed job may run before it is presumed lost
+            max_attempts: Failed attempts before a job is dead-lettered
+            retry_delay: Delay before the first retry (doubles per attempt)
+            max_retry_delay: Upper bound for the retry delay
+        """
+        self.client = client
+        self.name = name
+        self.worker_id = worker_id
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self.processing_prefix = f"{name}:processing:"
+        self.processing = f"{self.processing_prefix}{worker_id}"
+        self.leases = f"{name}:leases"
+        self.owners = f"{name}:owners"
+        self.attempts = f"{name}:attempts"
+        self.errors = f"{name}:errors"
+        self.delayed = f"{name}:delayed"
+        self.dead = f"{name}:dead"
+        self.job_ids = f"{name}:job_ids"
+        self.queued = f"{name}:queued"
+        self.dead_ids = f"{name}:dead_ids"
+        self.since = f"{name}:since"
+
+        self._claim = client.register_script(_CLAIM_LUA)
+        self._fail = client.register_script(_FAIL_LUA)
+        self._reap = client.register_script(_REAP_LUA)
+        self._recover = client.register_script(_RECOVER_LUA)
+        self._release = client.register_script(_RELEASE_LUA)
+        self._enqueue = client.register_script(_ENQUEUE_LUA)
+        self._ack = client.register_script(_ACK_LUA)
+        self._clear = client.register_script(_CLEAR_LUA)
+        self._requeue_dead = client.register_script(_REQUEUE_DEAD_LUA)
+
+    # ------------------------------------------------------------------
+    # Producer
+    # ------------------------------------------------------------------
+
+    def enqueue(self, jobs: Iterable[Tuple[Any, Dict[str, Any]]]) -> int:
+        """
+        Add jobs, skipping ids that already have a live job
+
+        One script call per ENQUEUE_CHUNK jobs; FIFO order is preserved.
+
+        Args:
+            jobs: (job id, payload) pairs, e.g. (creator id, job dict)
+
+        Returns:
+            Number of jobs added
+        """
+        added = 0
+        args: List[Any] = []
+        for job_id, payload in jobs:
+            args += [str(job_id), json.dumps(payload)]
+            if len(args) >= ENQUEUE_CHUNK * 2:
+                added += int(self._enqueue(keys=self._enqueue_keys(), args=[self._now(), *args]))
+                args = []
+        if args:
+            added += int(self._enqueue(keys=self._enqueue_keys(), args=[self._now(), *args]))
+        return added
+
+    def clear(self) -> int:
+        """
+        Drop pending jobs and scheduled retries (jobs held by workers stay)
+
+        Returns:
+            Number of jobs dropped
+        """
+        keys = [self.name, self.delayed, self.attempts, self.errors, self.job_ids, self.queued]
+        return int(self._clear(keys=[*keys, self.since]))
+
+    # ------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------
+
+    def claim(
+        self, timeout: float = 5, poll_interval: float = CLAIM_POLL_INTERVAL
+    ) -> Optional[QueueJob]:
+        """
+        Wait up to `timeout` seconds for a job and lease it to this worker
+
+        The move and the lease are one script call; while the queue is empty it
+        is polled every `poll_interval` seconds.
+
+        Returns:
+            QueueJob, or None if the queue stayed empty
+        """
+        keys = [self.name, self.processing, self.leases, self.owners, self.attempts, self.since]
+        deadline = time.monotonic() + timeout
+        while True:
+            claimed = self._claim(
+                keys=keys, args=[self._now() + self.visibility_timeout, self.worker_id]
+            )
+            if claimed:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(poll_interval, remaining))
+
+        raw, attempts = claimed
+
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return QueueJob(raw=raw, data=data, attempts=int(attempts or 0))
+
+    def ack(self, job: QueueJob) -> None:
+        """Remove a finished job (its id can be queued again)"""
+        keys = [self.processing, self.leases, self.owners, self.attempts, self.errors]
+        self._ack(keys=[*keys, self.job_ids, self.queued], args=[job.raw])
+
+    def fail(self, job: QueueJob, error: str) -> bool:
+        """
+        Record a failed attempt
+
+        Returns:
+            True if a retry was scheduled, False if the job was dead-lettered
+            (or was no longer held by this worker)
+        """
+        outcome = self._fail(
+            keys=self._retry_keys(),
+            args=[*self._retry_args(), job.raw, self.worker_id, error[:500]],
+        )
+        return int(outcome) == 1
+
+    def release(self, job: QueueJob) -> bool:
+        """Put a job back at the front of the queue without counting an attempt"""
+        released = self._release(
+            keys=[self.processing, self.leases, self.owners, self.name, self.since],
+            args=[job.raw, self._now()],
+        )
+        return bool(released)
+
+    def recover(self) -> int:
+        """
+        Retry jobs left in this worker's processing list by a previous run
+
+        Call once at startup, before claiming. A crash counts as a failed
+        attempt, so a job that kills its worker ends up dead-lettered.
+
+        Returns:
+            Number of jobs recovered
+        """
+        return int(
+            self._recover(keys=self._retry_keys(), args=[*self._retry_args(), self.worker_id])
+        )
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def reap(self, limit: int = 100) -> Tuple[int, int, int]:
+        """
+        Retry jobs whose lease expired and promote due retries to pending
+
+        Safe to run from every worker at once.
+
+        Returns:
+            (jobs retried, jobs dead-lettered, retries moved to pending)
+        """
+        retried, buried, promoted = self._reap(
+            keys=[*self._retry_keys(), self.name, self.since],
+            args=[*self._retry_args(), limit],
+        )
+        return int(retried), int(buried), int(promoted)
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts per state"""
+        pipe = self.client.pipeline()
+        pipe.llen(self.name)
+        pipe.zcard(self.leases)
+        pipe.zcard(self.delayed)
+        pipe.llen(self.dead)
+        pending, leased, delayed, dead = pipe.execute()
+        return {"pending": pending, "processing": leased, "delayed": delayed, "dead": dead}
+
+    def oldest_pending_age(self) -> Optional[float]:
+        """
+        Seconds the next job to be claimed has been waiting (queue lag)
+
+        Returns:
+            Age in seconds, 0.0 if nothing is pending, or None if the oldest job
+            was pushed without the queue (plain LPUSH)
+        """
+        raw = self.client.lindex(self.name, -1)
+        if raw is None:
+            return 0.0
+        since = self.client.hget(self.since, raw)
+        if since is None:
+            return None
+        return max(0.0, self._now() - float(since))
+
+    def dead_letters(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent dead-lettered jobs with their last error"""
+        raws = self.client.lrange(self.dead, 0, limit - 1)
+        if not raws:
+            return []
+        errors = self.client.hmget(self.errors, raws)
+        return [{"job": raw, "error": error} for raw, error in zip(raws, errors)]
+
+    def requeue_dead(self, limit: int = 1000) -> int:
+        """Move dead-lettered jobs back to pending with a fresh attempt count"""
+        keys = [self.dead, self.name, self.errors, self.job_ids, self.queued, self.dead_ids]
+        return int(self._requeue_dead(keys=[*keys, self.since], args=[limit, self._now()]))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _retry_keys(self) -> List[str]:
+        return [
+            self.leases,
+            self.owners,
+            self.attempts,
+            self.errors,
+            self.delayed,
+            self.dead,
+            self.job_ids,
+            self.queued,
+            self.dead_ids,
+        ]
+
+    def _enqueue_keys(self) -> List[str]:
+        return [self.name, self.job_ids, self.queued, self.since]
+
+    def _retry_args(self) -> List[Any]:
+        return [
+            self._now(),
+            self.max_attempts,
+            self.retry_delay,
+            self.max_retry_delay,
+            self.processing_prefix,
+        ]
+
+    @staticmethod
+    def _now() -> float:
+        # Lease deadlines and retry times are compared across workers, whose clocks are NTP-synced
+        return time.time()
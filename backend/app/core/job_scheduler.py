@@ -0,0 +1,291 @@
+"""
+Job Scheduler
+Due-time and priority lanes in front of a ReliableQueue
+
+The work queue is a FIFO list, so anything enqueued waits behind the whole
+backlog, and re-scrapes used to be pushed in one burst every cycle. The
+scheduler keeps jobs in two sorted sets keyed by due time instead:
+
+- priority lane: new or manually added creators; due jobs go straight to
+  the front of the work queue
+- rolling lane: periodic refreshes; each job is re-scheduled one
+  `refresh_interval` after it finished, so creators drift apart instead of
+  all coming due at once
+
+promote() (called every few seconds by every worker) moves due rolling jobs
+into the work queue through a token bucket shared in Redis. By default the
+rate is the rolling lane size divided by the refresh interval, so a backlog
+of overdue creators is spread evenly over the window, and the work queue is
+kept short (`max_pending`) so a priority job never waits behind a long list.
+Promoted jobs go through the queue's job-id dedupe like enqueue(); a due
+rolling job whose id is already queued or running stays on its lane, one
+refresh interval later.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .job_queue import ReliableQueue
+
+
+try:
+    import redis
+except ImportError:  # Scheduling needs Redis; callers fall back when it is missing
+    redis = None  # type: ignore[assignment]
+
+
+PRIORITY = "priority"
+ROLLING = "rolling"
+
+DEFAULT_REFRESH_INTERVAL = 4 * 3600.0
+DEFAULT_MAX_PENDING = 50
+DEFAULT_BURST = 10.0
+SCHEDULE_CHUNK = 500
+
+_schedulers: Dict[str, "JobScheduler"] = {}
+_schedulers_lock = threading.Lock()
+
+
+# KEYS: priority, rolling, payloads, bucket, pending, job_ids, queued, since
+# ARGV: now, max_pending, rate (jobs/s, 0 = rolling size / interval), interval, burst
+_PROMOTE_LUA = """
+local now = tonumber(ARGV[1])
+
+-- 1 = pushed, 0 = id already queued or running, nil = no payload
+local function push(id, front)
+  local raw = redis.call('HGET', KEYS[3], id)
+  if not raw then
+    return nil
+  end
+  if redis.call('SADD', KEYS[7], id) == 0 then
+    return 0
+  end
+  redis.call('HSET', KEYS[6], raw, id)
+  redis.call('HSET', KEYS[8], raw, now)
+  if front then
+    redis.call('RPUSH', KEYS[5], raw)
+  else
+    redis.call('LPUSH', KEYS[5], raw)
+  end
+  return 1
+end
+
+local urgent = 0
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, 100)) do
+  redis.call('ZREM', KEYS[1], id)
+  urgent = urgent + (push(id, true) or 0)
+end
+
+local rate = tonumber(ARGV[3])
+if rate <= 0 then
+  rate = redis.call('ZCARD', KEYS[2]) / tonumber(ARGV[4])
+end
+local burst = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[4], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+local at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - at) * rate)
+
+local rolled = 0
+local room = math.min(math.floor(tokens), tonumber(ARGV[2]) - redis.call('LLEN', KEYS[5]))
+if room > 0 then
+  for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, room)) do
+    local pushed = push(id, false)
+    if pushed == 0 then
+      -- Not taken off the lane: the live job may not re-schedule itself (e.g. a manual run)
+      redis.call('ZADD', KEYS[2], now + tonumber(ARGV[4]), id)
+    else
+      redis.call('ZREM', KEYS[2], id)
+      rolled = rolled + (pushed or 0)
+    end
+  end
+  tokens = tokens - rolled
+end
+redis.call('HSET', KEYS[4], 'tokens', tostring(tokens), 'at', tostring(now))
+return {urgent, rolled}
+"""
+
+
+class JobScheduler:
+    """
+    Priority and rolling lanes for one ReliableQueue
+
+    Keys (for queue "q"): q:lane:priority and q:lane:rolling (ZSET of job id
+    -> due time), q:lane:payloads (job id -> payload) and q:lane:bucket
+    (promotion token bucket).
+    """
+
+    def __init__(
+        self,
+        queue: ReliableQueue,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        rate: float = 0.0,
+        burst: float = DEFAULT_BURST,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            queue: Work queue due jobs are promoted into
+            refresh_interval: Seconds between two refreshes of the same job
+            max_pending: Rolling jobs are only promoted while the work queue is shorter
+            rate: Rolling jobs promoted per second (0 = lane size / refresh_interval)
+            burst: Promotions that can accumulate while nothing is due
+        """
+        self.queue = queue
+        self.client = queue.client
+        self.refresh_interval = refresh_interval
+        self.max_pending = max_pending
+        self.rate = rate
+        self.burst = max(1.0, burst)
+
+        prefix = f"{queue.name}:lane"
+        self.lanes = {PRIORITY: f"{prefix}:priority", ROLLING: f"{prefix}:rolling"}
+        self.payloads = f"{prefix}:payloads"
+        self.bucket = f"{prefix}:bucket"
+
+        self._promote = self.client.register_script(_PROMOTE_LUA)
+
+    def schedule(
+        self,
+        jobs: Iterable[Tuple[Any, Dict[str, Any], float]],
+        lane: str = ROLLING,
+        replace: bool = False,
+    ) -> int:
+        """
+        Schedule jobs on a lane
+
+        Payloads are marked `scheduled` so workers know to re-schedule them.
+
+        Args:
+            jobs: (job id, payload, due unix time) triples
+            lane: PRIORITY or ROLLING
+            replace: Overwrite the due time of jobs already on the lane
+                (default: keep the earlier one)
+
+        Returns:
+            Number of jobs newly added to the lane
+        """
+        key = self.lanes[lane]
+        added = 0
+        pipe = self.client.pipeline()
+        for count, (job_id, payload, due_at) in enumerate(jobs, start=1):
+            job_id = str(job_id)
+            pipe.hset(self.payloads, job_id, json.dumps({**payload, "scheduled": True}))
+            if replace:
+                pipe.zadd(key, {job_id: due_at})
+            else:
+                pipe.zadd(key, {job_id: due_at}, lt=True)
+            if count % SCHEDULE_CHUNK == 0:
+                added += sum(pipe.execute()[1::2])
+        added += sum(pipe.execute()[1::2])
+        return int(added)
+
+    def schedule_now(self, job_id: Any, payload: Dict[str, Any]) -> bool:
+        """Put a job on the priority lane, due immediately"""
+        return self.schedule([(job_id, payload, time.time())], lane=PRIORITY) > 0
+
+    def reschedule(self, job_id: Any, payload: Dict[str, Any]) -> None:
+        """Schedule the next refresh of a job that just finished"""
+        self.schedule(
+            [(job_id, payload, time.time() + self.refresh_interval)], lane=ROLLING, replace=True
+        )
+
+    def unschedule(self, job_ids: Iterable[Any]) -> int:
+        """
+        Remove jobs from both lanes (e.g. creators that were disabled)
+
+        Returns:
+            Number of lane entries removed
+        """
+        ids = [str(job_id) for job_id in job_ids]
+        if not ids:
+            return 0
+        pipe = self.client.pipeline()
+        pipe.zrem(self.lanes[PRIORITY], *ids)
+        pipe.zrem(self.lanes[ROLLING], *ids)
+        pipe.hdel(self.payloads, *ids)
+        priority, rolling, _ = pipe.execute()
+        return int(priority) + int(rolling)
+
+    def promote(self) -> Tuple[int, int]:
+        """
+        Move due jobs into the work queue (safe to call from every worker)
+
+        Returns:
+            (priority jobs promoted, rolling jobs promoted)
+        """
+        q = self.queue
+        urgent, rolled = self._promote(
+            keys=[
+                self.lanes[PRIORITY],
+                self.lanes[ROLLING],
+                self.payloads,
+                self.bucket,
+                q.name,
+                q.job_ids,
+                q.queued,
+                q.since,
+            ],
+            args=[time.time(), self.max_pending, self.rate, self.refresh_interval, self.burst],
+        )
+        return int(urgent), int(rolled)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lane sizes, due counts and the effective rolling rate"""
+        now = time.time()
+        pipe = self.client.pipeline()
+        for key in self.lanes.values():
+            pipe.zcard(key)
+            pipe.zcount(key, "-inf", now)
+        priority, priority_due, rolling, rolling_due = pipe.execute()
+        rate = self.rate or rolling / self.refresh_interval
+        return {
+            "priority": priority,
+            "priority_due": priority_due,
+            "rolling": rolling,
+            "rolling_due": rolling_due,
+            "rolling_rate_per_min": round(rate * 60, 2),
+        }
+
+
+def get_scheduler(queue_name: str) -> Optional[JobScheduler]:
+    """
+    Process-wide scheduler for a queue (producer side, e.g. API endpoints)
+
+    Built from REDIS_HOST/PORT/PASSWORD and the SCHEDULER_* settings.
+
+    Returns:
+        JobScheduler, or None if Redis is not configured
+    """
+    host = os.getenv("REDIS_HOST")
+    if redis is None or not host:
+        return None
+    with _schedulers_lock:
+        if queue_name not in _schedulers:
+            client = redis.Redis(
+                host=host,
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                password=os.getenv("REDIS_PASSWORD", "") or None,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30,
+            )
+            _schedulers[queue_name] = scheduler_for(ReliableQueue(client, queue_name))
+        return _schedulers[queue_name]
+
+
+def scheduler_for(queue: ReliableQueue) -> JobScheduler:
+    """JobScheduler for a queue with the SCHEDULER_* environment settings"""
+    return JobScheduler(
+        queue,
+        refresh_interval=float(os.getenv("SCHEDULER_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)),
+        max_pending=int(os.getenv("SCHEDULER_MAX_PENDING", DEFAULT_MAX_PENDING)),
+        rate=float(os.getenv("SCHEDULER_RATE", 0)),
+        burst=float(os.getenv("SCHEDULER_BURST", DEFAULT_BURST)),
+    )
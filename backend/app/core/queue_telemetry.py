@@ -0,0 +1,292 @@
+"""
+Queue Telemetry
+Worker heartbeats, queue lag and drain estimates for a ReliableQueue
+
+Worker statistics used to be logged only at shutdown, and the queue status was
+a list length. Each worker now keeps a sliding window of finished jobs and
+publishes a heartbeat every few seconds:
+
+- q:worker:<id> holds the worker's latest snapshot (jobs/min, success rate,
+  in-flight count, p95 job time) and expires when the worker stops beating
+- q:workers (ZSET of worker id -> last heartbeat) lists the workers to read
+
+queue_telemetry() combines the heartbeats with the queue counts, the age of
+the oldest pending job and the scheduler lanes into one report with an
+estimated time to drain the backlog; render_metrics() turns it into the
+Prometheus text format for scrapers and alerting.
+"""
+
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .job_queue import ReliableQueue
+
+
+DEFAULT_WINDOW = 300.0  # Seconds of finished jobs the rates are computed over
+HEARTBEAT_TTL_FACTOR = 3  # A worker missing this many heartbeats is considered gone
+
+
+class WorkerTelemetry:
+    """
+    Sliding-window job statistics of one worker
+
+    Not thread-safe: record() and publish() are called from the worker's event loop.
+    """
+
+    def __init__(self, worker_id: str, concurrency: int, window: float = DEFAULT_WINDOW):
+        """
+        Initialize telemetry
+
+        Args:
+            worker_id: Worker name (heartbeat key suffix)
+            concurrency: Jobs the worker runs at once
+            window: Seconds of finished jobs kept for the rates
+        """
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.window = window
+        self.started_at = time.time()
+        self.processed = 0
+        self.succeeded = 0
+        self._finished: Deque[Tuple[float, float, bool]] = deque()  # (at, seconds, success)
+
+    def record(self, seconds: float, success: bool) -> None:
+        """Count a finished job and how long it ran"""
+        self.processed += 1
+        self.succeeded += success
+        self._finished.append((time.time(), seconds, success))
+        self._prune()
+
+    def snapshot(self, in_flight: int) -> Dict[str, Any]:
+        """
+        Current statistics
+
+        Args:
+            in_flight: Jobs running right now
+
+        Returns:
+            Dict with rates over the window and lifetime totals
+        """
+        self._prune()
+        now = time.time()
+        finished = list(self._finished)
+        durations = sorted(seconds for _, seconds, _ in finished)
+        # A young worker is rated over its uptime (at least a minute, so one
+        # early job does not read as a burst)
+        span = max(60.0, min(self.window, now - self.started_at))
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "in_flight": in_flight,
+            "jobs_per_min": round(len(finished) * 60 / span, 2),
+            "success_rate": (
+                round(sum(ok for _, _, ok in finished) / len(finished), 3) if finished else None
+            ),
+            "p95_job_seconds": round(_percentile(durations, 0.95), 1) if durations else None,
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "uptime_seconds": int(now - self.started_at),
+            "heartbeat_at": now,
+        }
+
+    def publish(self, queue: ReliableQueue, in_flight: int, interval: float) -> None:
+        """
+        Write this worker's heartbeat
+
+        Args:
+            queue: Queue the worker consumes
+            in_flight: Jobs running right now
+            interval: Seconds until the next heartbeat (sets the expiry)
+        """
+        snapshot = self.snapshot(in_flight)
+        pipe = queue.client.pipeline()
+        pipe.set(
+            _worker_key(queue, self.worker_id),
+            json.dumps(snapshot),
+            ex=max(1, int(interval * HEARTBEAT_TTL_FACTOR)),
+        )
+        pipe.zadd(_workers_key(queue), {self.worker_id: snapshot["heartbeat_at"]})
+        pipe.execute()
+
+    def retire(self, queue: ReliableQueue) -> None:
+        """Remove this worker's heartbeat (clean shutdown)"""
+        pipe = queue.client.pipeline()
+        pipe.delete(_worker_key(queue, self.worker_id))
+        pipe.zrem(_workers_key(queue), self.worker_id)
+        pipe.execute()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.window
+        while self._finished and self._finished[0][0] < cutoff:
+            self._finished.popleft()
+
+
+def worker_heartbeats(queue: ReliableQueue) -> List[Dict[str, Any]]:
+    """
+    Latest snapshot of every live worker (workers whose heartbeat expired are dropped)
+
+    Returns:
+        List of worker snapshots, ordered by worker id
+    """
+    worker_ids = queue.client.zrange(_workers_key(queue), 0, -1)
+    if not worker_ids:
+        return []
+    raws = queue.client.mget([_worker_key(queue, worker_id) for worker_id in worker_ids])
+    gone = [worker_id for worker_id, raw in zip(worker_ids, raws) if raw is None]
+    if gone:
+        queue.client.zrem(_workers_key(queue), *gone)
+    workers = [json.loads(raw) for raw in raws if raw is not None]
+    return sorted(workers, key=lambda worker: str(worker.get("worker_id")))
+
+
+def queue_telemetry(queue: ReliableQueue, scheduler: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Queue lag, worker throughput and the estimated time to drain the backlog
+
+    The backlog is every job that is due but not running yet: pending jobs,
+    scheduled retries and due scheduler lane entries. The drain estimate
+    divides it by the workers' combined throughput over the last window.
+
+    Args:
+        queue: Work queue
+        scheduler: Optional JobScheduler whose due lane entries count as backlog
+
+    Returns:
+        Dict with queue, scheduler, workers and totals sections
+    """
+    counts = queue.stats()
+    lanes = scheduler.stats() if scheduler is not None else None
+    workers = worker_heartbeats(queue)
+
+    jobs_per_min = sum(worker["jobs_per_min"] for worker in workers)
+    concurrency = sum(worker["concurrency"] for worker in workers)
+    in_flight = sum(worker["in_flight"] for worker in workers)
+    rates = [
+        (worker["success_rate"], worker["jobs_per_min"])
+        for worker in workers
+        if worker["success_rate"] is not None
+    ]
+    weight = sum(rate for _, rate in rates)
+
+    backlog = counts["pending"] + counts["delayed"]
+    if lanes:
+        backlog += lanes["priority_due"] + lanes["rolling_due"]
+    if not backlog:
+        eta_seconds: Optional[int] = 0
+    elif jobs_per_min > 0:
+        eta_seconds = int(backlog * 60 / jobs_per_min)
+    else:
+        eta_seconds = None  # Nothing is being processed
+
+    return {
+        "queue": {**counts, "oldest_pending_age_seconds": _round(queue.oldest_pending_age())},
+        "scheduler": lanes,
+        "workers": workers,
+        "totals": {
+            "workers": len(workers),
+            "concurrency": concurrency,
+            "in_flight": in_flight,
+            "utilization": round(in_flight / concurrency, 3) if concurrency else None,
+            "jobs_per_min": round(jobs_per_min, 2),
+            "success_rate": (
+                round(sum(ok * rate for ok, rate in rates) / weight, 3) if weight else None
+            ),
+            "backlog": backlog,
+            "eta_seconds": eta_seconds,
+        },
+    }
+
+
+def render_metrics(telemetry: Dict[str, Any], queue_name: str) -> str:
+    """
+    Telemetry report in the Prometheus text exposition format
+
+    Args:
+        telemetry: queue_telemetry() result
+        queue_name: Value of the `queue` label
+
+    Returns:
+        Metrics text (unknown values are omitted)
+    """
+    lines: List[str] = []
+    label = f'queue="{queue_name}"'
+
+    def gauge(name: str, help_text: str, samples: List[Tuple[str, Any]]) -> None:
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        lines.append(f"# HELP b9_{name} {help_text}")
+        lines.append(f"# TYPE b9_{name} gauge")
+        lines.extend(f"b9_{name}{{{labels}}} {value}" for labels, value in samples)
+
+    queue = telemetry["queue"]
+    gauge(
+        "queue_jobs",
+        "Jobs per queue state",
+        [
+            (f'{label},state="{state}"', queue[state])
+            for state in ("pending", "processing", "delayed", "dead")
+        ],
+    )
+    gauge(
+        "queue_oldest_pending_age_seconds",
+        "Seconds the next job has been waiting",
+        [(label, queue["oldest_pending_age_seconds"])],
+    )
+    lanes = telemetry.get("scheduler")
+    if lanes:
+        gauge(
+            "scheduler_lane_jobs",
+            "Scheduled jobs per lane",
+            [(f'{label},lane="{lane}"', lanes[lane]) for lane in ("priority", "rolling")],
+        )
+        gauge(
+            "scheduler_lane_due_jobs",
+            "Scheduled jobs that are due",
+            [(f'{label},lane="{lane}"', lanes[f"{lane}_due"]) for lane in ("priority", "rolling")],
+        )
+
+    totals = telemetry["totals"]
+    gauge("queue_backlog_jobs", "Due jobs not running yet", [(label, totals["backlog"])])
+    gauge(
+        "queue_drain_eta_seconds",
+        "Estimated seconds to drain the backlog",
+        [(label, totals["eta_seconds"])],
+    )
+    gauge("workers", "Workers with a live heartbeat", [(label, totals["workers"])])
+    gauge("workers_utilization", "In-flight jobs / job slots", [(label, totals["utilization"])])
+
+    workers = telemetry["workers"]
+    for key, help_text in (
+        ("jobs_per_min", "Jobs finished per minute"),
+        ("success_rate", "Share of finished jobs that succeeded"),
+        ("in_flight", "Jobs running"),
+        ("concurrency", "Job slots"),
+        ("p95_job_seconds", "95th percentile job duration"),
+    ):
+        gauge(
+            f"worker_{key}",
+            help_text,
+            [(f'{label},worker="{worker["worker_id"]}"', worker[key]) for worker in workers],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def _workers_key(queue: ReliableQueue) -> str:
+    return f"{queue.name}:workers"
+
+
+def _worker_key(queue: ReliableQueue, worker_id: str) -> str:
+    return f"{queue.name}:worker:{worker_id}"
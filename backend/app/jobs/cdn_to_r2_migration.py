@@ -3,16 +3,26 @@ CDN to R2 Migration Job
 Migrates existing Instagram CDN URLs to permanent Cloudflare R2 storage
 
 Features:
-- Batch processing with progress tracking
+- Keyset pagination by id (each page is one indexed range query)
+- Bounded-concurrency transfers (downloads/uploads run in a thread pool)
+- One bulk URL update per page (apply_media_url_updates RPC)
+- Persisted resume cursor per media type (cdn_migration_cursors), so every
+  run continues where the last one stopped
+- A lease on the cursor row (claim_cdn_migration_cursor RPC), so only one run
+  migrates a media type at a time across every API worker and process
+- Live progress for the status endpoint
 - Skip existing R2 URLs (idempotent)
-- Comprehensive error handling
-- Database transaction safety
-- Rate limiting
 """
 
+import os
+import socket
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.core.config.r2_config import r2_config
 from app.core.database import get_db
@@ -27,6 +37,17 @@ from app.utils.media_storage import (
 
 logger = get_logger(__name__)
 
+CDN_MARKER = "cdninstagram"
+CURSOR_TABLE = "cdn_migration_cursors"
+UPDATES_RPC = "apply_media_url_updates"
+CLAIM_RPC = "claim_cdn_migration_cursor"
+LEASE_SECONDS = 1800  # Renewed after every page; an abandoned run frees its media type after this
+DEFAULT_CONCURRENCY = 8  # Parallel CDN downloads / R2 uploads
+DEFAULT_PAGE_SIZE = 200  # Rows scanned per keyset page (one bulk update each)
+
+_run_lock = threading.Lock()  # One migrate_all() per process (the leases cover other processes)
+_progress: Dict[str, Dict[str, Any]] = {}  # Media type -> live progress of the current run
+
 
 class MigrationStats:
     """Track migration statistics"""
@@ -36,6 +57,10 @@ class MigrationStats:
         self.migrated = 0
         self.failed = 0
         self.skipped = 0
+        self.scanned = 0  # Rows read (including ones already on R2)
+        self.pages = 0
+        self.cursor: Optional[str] = None  # Last id scanned
+        self.complete = False  # Reached the end of the table
         self.errors: List[str] = []
 
     def to_dict(self) -> Dict:
@@ -45,311 +70,485 @@ class MigrationStats:
             "migrated": self.migrated,
             "failed": self.failed,
             "skipped": self.skipped,
+            "scanned": self.scanned,
+            "pages": self.pages,
+            "cursor": self.cursor,
+            "complete": self.complete,
             "success_rate": f"{(self.migrated / self.total * 100) if self.total > 0 else 0:.1f}%",
             "errors": self.errors[-10:],  # Last 10 errors only
         }
 
 
-def migrate_profile_pictures(batch_size: int = 10) -> MigrationStats:
+@dataclass
+class MediaTarget:
+    """One kind of media to migrate: where its URLs live and how they are moved"""
+
+    name: str  # Cursor key: profile, posts or reels
+    table: str
+    columns: str  # Selected columns (must include id)
+    url_column: str
+    transfer: Callable[[Dict[str, Any]], Any]  # Row -> new url_column value (None: not stored)
+    label: Callable[[Dict[str, Any]], str]
+    cdn_filter: bool = True  # Filter rows server-side with LIKE '%cdninstagram%'
+
+    def needs_migration(self, row: Dict[str, Any]) -> bool:
+        """Row still references the Instagram CDN"""
+        value = row.get(self.url_column)
+        if isinstance(value, list):
+            return any(CDN_MARKER in str(url) for url in value)
+        return bool(value) and CDN_MARKER in str(value)
+
+    def query(self, db, cursor: Optional[str], limit: int):
+        """Next keyset page after `cursor`"""
+        query = db.table(self.table).select(self.columns)
+        if self.cdn_filter:
+            query = query.like(self.url_column, f"%{CDN_MARKER}%")
+        elif self.name == "posts":
+            query = query.eq("post_type", "carousel").not_.is_(self.url_column, "null")
+        if cursor is not None:
+            query = query.gt("id", cursor)
+        return query.order("id").limit(limit)
+
+
+def _transfer_profile(row: Dict[str, Any]) -> Optional[str]:
+    return process_and_upload_profile_picture(
+        cdn_url=row["profile_pic_url"], creator_id=str(row["ig_user_id"])
+    )
+
+
+def _transfer_reel(row: Dict[str, Any]) -> Optional[str]:
+    return process_and_upload_video(
+        cdn_url=row["video_url"], creator_id=str(row["creator_id"]), media_pk=row["media_pk"]
+    )
+
+
+def _transfer_carousel(row: Dict[str, Any]) -> Optional[List[str]]:
+    """Upload every CDN image of a carousel; images that fail keep their CDN URL"""
+    urls = []
+    changed = False
+    for idx, cdn_url in enumerate(row["image_urls"]):
+        if CDN_MARKER not in str(cdn_url):
+            urls.append(cdn_url)
+            continue
+        try:
+            r2_url = process_and_upload_image(
+                cdn_url=cdn_url,
+                creator_id=str(row["creator_id"]),
+                media_pk=row["media_pk"],
+                index=idx,
+            )
+        except MediaStorageError as e:
+            logger.error(f"❌ Image {idx} upload failed for post {row['media_pk']}: {e}")
+            r2_url = None
+        if r2_url:
+            changed = True
+        urls.append(r2_url or cdn_url)  # Keep CDN URL if R2 fails
+    if not changed:
+        raise MediaStorageError("All image uploads failed")
+    return urls
+
+
+TARGETS: Dict[str, MediaTarget] = {
+    "profile": MediaTarget(
+        name="profile",
+        table="instagram_creators",
+        columns="id, ig_user_id, username, profile_pic_url",
+        url_column="profile_pic_url",
+        transfer=_transfer_profile,
+        label=lambda row: str(row.get("username")),
+    ),
+    "posts": MediaTarget(
+        name="posts",
+        table="instagram_posts",
+        columns="id, media_pk, creator_id, image_urls",
+        url_column="image_urls",
+        transfer=_transfer_carousel,
+        label=lambda row: str(row.get("media_pk")),
+        cdn_filter=False,  # Arrays are filtered client-side
+    ),
+    "reels": MediaTarget(
+        name="reels",
+        table="instagram_reels",
+        columns="id, media_pk, creator_id, video_url",
+        url_column="video_url",
+        transfer=_transfer_reel,
+        label=lambda row: str(row.get("media_pk")),
+    ),
+}
+
+
+class CdnMigration:
     """
-    Migrate profile pictures from CDN to R2
-
-    Args:
-        batch_size: Number of items to process
+    Resumable migration of one media type
 
-    Returns:
-        Migration statistics
+    Pages through the table by id from the persisted cursor, transfers the
+    page's CDN media with `concurrency` threads, writes the new URLs in one
+    RPC and then advances the cursor. Rows that failed stay on the CDN and
+    are picked up again after a reset.
     """
-    stats = MigrationStats()
-    db = get_db()
 
-    try:
-        logger.info("🔄 Starting profile picture migration...")
-
-        # Fetch creators with CDN profile pics (not R2)
-        result = (
-            db.table("instagram_creators")
-            .select("id, ig_user_id, username, profile_pic_url")
-            .like("profile_pic_url", "%cdninstagram%")
-            .limit(batch_size)
-            .execute()
-        )
-
-        creators = result.data or []
-        stats.total = len(creators)
-
-        logger.info(f"Found {stats.total} profile pictures to migrate")
-
-        for i, creator in enumerate(creators, 1):
-            try:
-                ig_user_id = creator["ig_user_id"]
-                username = creator["username"]
-                cdn_url = creator["profile_pic_url"]
-
-                logger.info(f"[{i}/{stats.total}] Migrating profile pic for {username}...")
-
-                # Upload to R2
-                r2_url = process_and_upload_profile_picture(
-                    cdn_url=cdn_url, creator_id=str(ig_user_id)
+    def __init__(
+        self,
+        target: MediaTarget,
+        db=None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        """
+        Initialize migration
+
+        Args:
+            target: Media type to migrate
+            db: Supabase client (default: singleton)
+            concurrency: Parallel transfers
+            page_size: Rows scanned per page
+        """
+        self.target = target
+        self.db = db or get_db()
+        self.concurrency = max(1, concurrency)
+        self.page_size = max(1, page_size)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def run(
+        self,
+        max_items: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        reset: bool = False,
+    ) -> MigrationStats:
+        """
+        Migrate until the table end, `max_items` transfers or `time_budget` seconds
+
+        Args:
+            max_items: Max rows to transfer in this run (None = no limit)
+            time_budget: Stop starting new pages after this many seconds
+            reset: Start over from the first row (retries earlier failures)
+
+        Returns:
+            Migration statistics of this run (nothing migrated if another run
+            holds the media type's lease)
+        """
+        target = self.target
+        stats = MigrationStats()
+        started = time.monotonic()
+        claimed = self._claim()
+        if claimed is None:
+            stats.errors.append(f"A {target.name} migration is already running")
+            logger.warning(f"⏭️ {target.name} migration is already running elsewhere, skipping")
+            return stats
+        try:
+            return self._run(stats, started, {} if reset else claimed, max_items, time_budget)
+        finally:
+            self._release()
+
+    def _run(
+        self,
+        stats: MigrationStats,
+        started: float,
+        saved: Dict[str, Any],
+        max_items: Optional[int],
+        time_budget: Optional[float],
+    ) -> MigrationStats:
+        """Page loop of run(), while this migration holds the lease"""
+        target = self.target
+        stats.cursor = saved.get("last_id")
+        progress = _progress[target.name] = {
+            "running": True,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            **stats.to_dict(),
+        }
+        logger.info(f"🔄 Migrating {target.name} from cursor {stats.cursor or 'start'}...")
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=f"r2-{target.name}"
+        ) as pool:
+            while True:
+                remaining = None if max_items is None else max_items - stats.total
+                if remaining is not None and remaining <= 0:
+                    break
+                if time_budget is not None and time.monotonic() - started >= time_budget:
+                    break
+
+                page = target.query(self.db, stats.cursor, self.page_size).execute().data or []
+                if not page:
+                    stats.complete = True
+                    self._save_cursor(saved, stats)
+                    break
+
+                # Rows past the item limit stay unscanned for the next run
+                rows = page if remaining is None else page[:remaining]
+                candidates = [row for row in rows if target.needs_migration(row)]
+                stats.scanned += len(rows)
+                stats.skipped += len(rows) - len(candidates)
+                stats.total += len(candidates)
+
+                results = list(pool.map(self._transfer, candidates))
+                updates = []
+                for row, (value, error) in zip(candidates, results):
+                    if error:
+                        stats.failed += 1
+                        stats.errors.append(f"{target.label(row)}: {error[:100]}")
+                    else:
+                        updates.append({"id": row["id"], "value": value})
+                stats.migrated += len(updates) - self._write(updates, stats)
+
+                stats.cursor = str(rows[-1]["id"])
+                stats.pages += 1
+                if len(rows) == len(page) < self.page_size:
+                    stats.complete = True
+                self._save_cursor(saved, stats)
+                progress.update(stats.to_dict())
+                logger.info(
+                    f"📦 {target.name}: page {stats.pages} - {stats.migrated} migrated, "
+                    f"{stats.failed} failed, {stats.scanned} scanned "
+                    f"({time.monotonic() - started:.0f}s)"
                 )
-
-                if r2_url:
-                    # Update database
-                    db.table("instagram_creators").update(
-                        {
-                            "profile_pic_url": r2_url,
-                            "updated_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ).eq("id", creator["id"]).execute()
-
-                    stats.migrated += 1
-                    logger.info(f"✅ Migrated profile pic for {username}")
-                else:
-                    stats.failed += 1
-                    stats.errors.append(f"{username}: R2 upload returned None")
-                    logger.error(f"❌ R2 upload failed for {username}")
-
-                # Rate limiting
-                time.sleep(2)
-
-            except MediaStorageError as e:
-                stats.failed += 1
-                stats.errors.append(f"{creator['username']}: {str(e)[:100]}")
-                logger.error(f"❌ Migration error for {creator['username']}: {e}")
-            except Exception as e:
-                stats.failed += 1
-                stats.errors.append(f"{creator['username']}: {str(e)[:100]}")
-                logger.error(f"❌ Unexpected error for {creator['username']}: {e}")
-
-        logger.info(f"✅ Profile picture migration complete: {stats.to_dict()}")
+                if stats.complete:
+                    break
+                if self._claim() is None:
+                    stats.errors.append("Migration lease lost")
+                    logger.warning(f"⚠️ Lost the {target.name} migration lease, stopping")
+                    break
+
+        progress.update(stats.to_dict(), running=False)
+        logger.info(f"✅ {target.name} migration run complete: {stats.to_dict()}")
         return stats
 
+    def _transfer(self, row: Dict[str, Any]):
+        """(new value, None) or (None, error) - never raises, runs in the pool"""
+        try:
+            value = self.target.transfer(row)
+        except MediaStorageError as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f"Unexpected error: {e}"
+        if not value:
+            return None, "R2 upload returned None"
+        return value, None
+
+    def _write(self, updates: List[Dict[str, Any]], stats: MigrationStats) -> int:
+        """Write a page of new URLs in one call; returns the number of rejected rows"""
+        if not updates:
+            return 0
+        now = datetime.now(timezone.utc).isoformat()
+        payload = [
+            {"id": item["id"], "fields": {self.target.url_column: item["value"], "updated_at": now}}
+            for item in updates
+        ]
+        try:
+            result = self.db.rpc(
+                UPDATES_RPC, {"p_table": self.target.table, "p_updates": payload}
+            ).execute()
+            rejected = result.data or []
+        except Exception as e:
+            rejected = [{"media_id": item["id"], "error": str(e)} for item in updates]
+        for row in rejected:
+            stats.failed += 1
+            stats.errors.append(f"{row.get('media_id')}: {str(row.get('error'))[:100]}")
+        if rejected:
+            logger.warning(
+                f"⚠️ {len(rejected)}/{len(updates)} {self.target.name} URL updates failed"
+            )
+        return len(rejected)
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Take or renew this run's lease; the cursor row, or None while another run holds it"""
+        try:
+            result = self.db.rpc(
+                CLAIM_RPC,
+                {
+                    "p_media_type": self.target.name,
+                    "p_owner": self.owner,
+                    "p_lease_seconds": LEASE_SECONDS,
+                },
+            ).execute()
+        except Exception as e:
+            logger.error(f"❌ Could not claim the {self.target.name} migration lease: {e}")
+            return None
+        rows: List[Dict[str, Any]] = result.data or []
+        return rows[0] if rows else None
+
+    def _release(self) -> None:
+        """Give up the lease so the next run can start without waiting for it to expire"""
+        try:
+            self.db.table(CURSOR_TABLE).update({"locked_by": None, "locked_until": None}).eq(
+                "media_type", self.target.name
+            ).eq("locked_by", self.owner).execute()
+        except Exception as e:
+            logger.warning(f"Could not release the {self.target.name} migration lease: {e}")
+
+    def _save_cursor(self, saved: Dict[str, Any], stats: MigrationStats) -> None:
+        """Persist the cursor with running totals across runs"""
+        now = datetime.now(timezone.utc).isoformat()
+        row = {
+            "media_type": self.target.name,
+            "last_id": stats.cursor,
+            "scanned": (saved.get("scanned") or 0) + stats.scanned,
+            "migrated": (saved.get("migrated") or 0) + stats.migrated,
+            "failed": (saved.get("failed") or 0) + stats.failed,
+            "completed_at": now if stats.complete else None,
+            "updated_at": now,
+        }
+        try:
+            self.db.table(CURSOR_TABLE).upsert(row, on_conflict="media_type").execute()
+        except Exception as e:
+            logger.warning(f"Could not save the {self.target.name} migration cursor: {e}")
+
+
+def _migrate(
+    name: str,
+    batch_size: Optional[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    time_budget: Optional[float] = None,
+    reset: bool = False,
+) -> MigrationStats:
+    stats = MigrationStats()
+    try:
+        migration = CdnMigration(TARGETS[name], concurrency=concurrency)
+        return migration.run(max_items=batch_size, time_budget=time_budget, reset=reset)
     except Exception as e:
-        logger.error(f"❌ Profile picture migration failed: {e}")
+        logger.error(f"❌ {name} migration failed: {e}")
         stats.errors.append(f"Migration error: {e!s}")
+        _progress.setdefault(name, {})["running"] = False
         return stats
 
 
-def migrate_carousel_posts(batch_size: int = 10) -> MigrationStats:
+def migrate_profile_pictures(batch_size: Optional[int] = 10, **options: Any) -> MigrationStats:
     """
-    Migrate carousel post images from CDN to R2
+    Migrate profile pictures from CDN to R2
 
     Args:
-        batch_size: Number of posts to process
+        batch_size: Max profile pictures to transfer (None = all remaining)
+        **options: concurrency, time_budget, reset (see CdnMigration.run)
 
     Returns:
         Migration statistics
     """
-    stats = MigrationStats()
-    db = get_db()
-
-    try:
-        logger.info("🔄 Starting carousel posts migration...")
-
-        # Fetch carousel posts with CDN URLs (not R2)
-        # Use text conversion to check array contents
-        result = (
-            db.table("instagram_posts")
-            .select("id, media_pk, creator_id, image_urls")
-            .eq("post_type", "carousel")
-            .not_("image_urls", "is", None)
-            .limit(batch_size)
-            .execute()
-        )
-
-        posts = result.data or []
-
-        # Filter for CDN URLs only (not R2)
-        cdn_posts = [
-            p
-            for p in posts
-            if p.get("image_urls")
-            and len(p["image_urls"]) > 0
-            and "cdninstagram" in str(p["image_urls"][0])
-        ]
-
-        stats.total = len(cdn_posts)
-        logger.info(f"Found {stats.total} carousel posts to migrate")
+    return _migrate("profile", batch_size, **options)
 
-        for i, post in enumerate(cdn_posts, 1):
-            try:
-                media_pk = post["media_pk"]
-                creator_id = post["creator_id"]
-                cdn_urls = post["image_urls"]
 
-                logger.info(
-                    f"[{i}/{stats.total}] Migrating post {media_pk} ({len(cdn_urls)} images)..."
-                )
+def migrate_carousel_posts(batch_size: Optional[int] = 10, **options: Any) -> MigrationStats:
+    """
+    Migrate carousel post images from CDN to R2
 
-                # Upload each image to R2
-                r2_urls = []
-                for idx, cdn_url in enumerate(cdn_urls):
-                    try:
-                        r2_url = process_and_upload_image(
-                            cdn_url=cdn_url,
-                            creator_id=str(creator_id),
-                            media_pk=media_pk,
-                            index=idx,
-                        )
-                        if r2_url:
-                            r2_urls.append(r2_url)
-                        else:
-                            logger.warning(
-                                f"⚠️ Image {idx} upload returned None for post {media_pk}"
-                            )
-                            r2_urls.append(cdn_url)  # Keep CDN URL if R2 fails
-                    except MediaStorageError as e:
-                        logger.error(f"❌ Image {idx} upload failed for post {media_pk}: {e}")
-                        r2_urls.append(cdn_url)  # Keep CDN URL if R2 fails
-
-                # Update database with R2 URLs
-                if r2_urls:
-                    db.table("instagram_posts").update(
-                        {
-                            "image_urls": r2_urls,
-                            "updated_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                    ).eq("id", post["id"]).execute()
-
-                    stats.migrated += 1
-                    logger.info(f"✅ Migrated post {media_pk} ({len(r2_urls)} images)")
-                else:
-                    stats.failed += 1
-                    stats.errors.append(f"{media_pk}: All image uploads failed")
-
-                # Rate limiting
-                time.sleep(2)
-
-            except Exception as e:
-                stats.failed += 1
-                stats.errors.append(f"{post['media_pk']}: {str(e)[:100]}")
-                logger.error(f"❌ Unexpected error for post {post['media_pk']}: {e}")
-
-        logger.info(f"✅ Carousel posts migration complete: {stats.to_dict()}")
-        return stats
+    Args:
+        batch_size: Max posts to transfer (None = all remaining)
+        **options: concurrency, time_budget, reset (see CdnMigration.run)
 
-    except Exception as e:
-        logger.error(f"❌ Carousel posts migration failed: {e}")
-        stats.errors.append(f"Migration error: {e!s}")
-        return stats
+    Returns:
+        Migration statistics
+    """
+    return _migrate("posts", batch_size, **options)
 
 
-def migrate_reels(batch_size: int = 10) -> MigrationStats:
+def migrate_reels(batch_size: Optional[int] = 10, **options: Any) -> MigrationStats:
     """
     Migrate reel videos from CDN to R2
 
     Args:
-        batch_size: Number of reels to process
+        batch_size: Max reels to transfer (None = all remaining)
+        **options: concurrency, time_budget, reset (see CdnMigration.run)
 
     Returns:
         Migration statistics
     """
-    stats = MigrationStats()
-    db = get_db()
+    return _migrate("reels", batch_size, **options)
+
+
+# Result key -> (media_type of the cron endpoint, migration)
+MIGRATIONS: Dict[str, Tuple[str, Callable[..., MigrationStats]]] = {
+    "profile_pictures": ("profile", migrate_profile_pictures),
+    "carousel_posts": ("posts", migrate_carousel_posts),
+    "reels": ("reels", migrate_reels),
+}
+
 
+def _load_cursors() -> List[Dict[str, Any]]:
     try:
-        logger.info("🔄 Starting reels migration...")
-
-        # Fetch reels with CDN URLs (not R2)
-        result = (
-            db.table("instagram_reels")
-            .select("id, media_pk, creator_id, video_url")
-            .like("video_url", "%cdninstagram%")
-            .limit(batch_size)
-            .execute()
+        cursors: List[Dict[str, Any]] = (
+            get_db().table(CURSOR_TABLE).select("*").execute().data or []
         )
+        return cursors
+    except Exception as e:
+        logger.warning(f"Could not load migration cursors: {e}")
+        return []
 
-        reels = result.data or []
-        stats.total = len(reels)
 
-        logger.info(f"Found {stats.total} reels to migrate")
+def _leased(cursor: Dict[str, Any]) -> bool:
+    """A run holds the cursor's lease"""
+    locked_until = cursor.get("locked_until")
+    if not locked_until:
+        return False
+    return datetime.fromisoformat(str(locked_until)) > datetime.now(timezone.utc)
 
-        for i, reel in enumerate(reels, 1):
-            try:
-                media_pk = reel["media_pk"]
-                creator_id = reel["creator_id"]
-                cdn_url = reel["video_url"]
 
-                logger.info(f"[{i}/{stats.total}] Migrating reel {media_pk}...")
+def is_migration_running() -> bool:
+    """A migration run is in progress in this process or holds a lease anywhere else"""
+    return _run_lock.locked() or any(_leased(cursor) for cursor in _load_cursors())
 
-                # Upload to R2
-                r2_url = process_and_upload_video(
-                    cdn_url=cdn_url, creator_id=str(creator_id), media_pk=media_pk
-                )
 
-                if r2_url:
-                    # Update database
-                    db.table("instagram_reels").update(
-                        {"video_url": r2_url, "updated_at": datetime.now(timezone.utc).isoformat()}
-                    ).eq("id", reel["id"]).execute()
-
-                    stats.migrated += 1
-                    logger.info(f"✅ Migrated reel {media_pk}")
-                else:
-                    stats.failed += 1
-                    stats.errors.append(f"{media_pk}: R2 upload returned None")
-                    logger.error(f"❌ R2 upload failed for reel {media_pk}")
-
-                # Rate limiting (videos take longer)
-                time.sleep(3)
-
-            except MediaStorageError as e:
-                stats.failed += 1
-                stats.errors.append(f"{reel['media_pk']}: {str(e)[:100]}")
-                logger.error(f"❌ Migration error for reel {reel['media_pk']}: {e}")
-            except Exception as e:
-                stats.failed += 1
-                stats.errors.append(f"{reel['media_pk']}: {str(e)[:100]}")
-                logger.error(f"❌ Unexpected error for reel {reel['media_pk']}: {e}")
-
-        logger.info(f"✅ Reels migration complete: {stats.to_dict()}")
-        return stats
+def get_migration_progress() -> Dict[str, Any]:
+    """
+    Progress of the current (or last) run plus the persisted cursors
 
-    except Exception as e:
-        logger.error(f"❌ Reels migration failed: {e}")
-        stats.errors.append(f"Migration error: {e!s}")
-        return stats
+    The running flag and the cursors are shared by every API worker; live
+    per-page progress (current_run) is only known to the process running it.
+
+    Returns:
+        Dict with running flag, per-type live progress and cursor rows
+    """
+    cursors = _load_cursors()
+    running = _run_lock.locked() or any(_leased(cursor) for cursor in cursors)
+    return {"running": running, "current_run": dict(_progress), "cursors": cursors}
 
 
-def migrate_all(batch_size: int = 10) -> Dict:
+def migrate_all(batch_size: Optional[int] = 10, media_type: str = "all", **options: Any) -> Dict:
     """
     Migrate all media types from CDN to R2
 
     Args:
-        batch_size: Number of items per type to process
+        batch_size: Max items per type to transfer (None = all remaining)
+        media_type: profile, posts, reels or all
+        **options: concurrency, time_budget, reset (see CdnMigration.run)
 
     Returns:
         Combined migration statistics
     """
     start_time = time.time()
 
-    logger.info("=" * 70)
-    logger.info("🚀 Starting CDN → R2 Migration")
-    logger.info("=" * 70)
-
     if not r2_config.ENABLED:
         error_msg = "R2 storage is disabled! Set ENABLE_R2_STORAGE=true"
         logger.error(f"❌ {error_msg}")
         return {"success": False, "error": error_msg}
 
-    # Migrate each type
-    profile_stats = migrate_profile_pictures(batch_size)
-    posts_stats = migrate_carousel_posts(batch_size)
-    reels_stats = migrate_reels(batch_size)
+    if not _run_lock.acquire(blocking=False):
+        return {"success": False, "error": "A migration run is already in progress"}
+
+    try:
+        logger.info("=" * 70)
+        logger.info("🚀 Starting CDN → R2 Migration")
+        logger.info("=" * 70)
+
+        selected = {
+            key: migrate
+            for key, (name, migrate) in MIGRATIONS.items()
+            if media_type in ("all", name)
+        }
+        _progress.clear()
+        results = {key: migrate(batch_size, **options) for key, migrate in selected.items()}
+    finally:
+        _run_lock.release()
 
     # Combine stats
     total_time = time.time() - start_time
-    combined_stats = {
+    combined_stats: Dict[str, Any] = {
         "success": True,
         "total_time_seconds": round(total_time, 2),
-        "profile_pictures": profile_stats.to_dict(),
-        "carousel_posts": posts_stats.to_dict(),
-        "reels": reels_stats.to_dict(),
+        **{key: stats.to_dict() for key, stats in results.items()},
         "totals": {
-            "total": profile_stats.total + posts_stats.total + reels_stats.total,
-            "migrated": profile_stats.migrated + posts_stats.migrated + reels_stats.migrated,
-            "failed": profile_stats.failed + posts_stats.failed + reels_stats.failed,
-            "skipped": profile_stats.skipped + posts_stats.skipped + reels_stats.skipped,
+            "total": sum(s.total for s in results.values()),
+            "migrated": sum(s.migrated for s in results.values()),
+            "failed": sum(s.failed for s in results.values()),
+            "skipped": sum(s.skipped for s in results.values()),
         },
     }
 
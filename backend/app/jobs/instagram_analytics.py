@@ -0,0 +1,331 @@
+"""
+Instagram Analytics Recompute Job
+Recomputes creator analytics for the whole catalog with the vectorized batch engine
+
+Features:
+- Creators processed in chunks (media loaded per chunk, compact columns kept)
+- Catalog-wide viral percentiles across every approved creator
+- Results written to instagram_creators in one bulk RPC per chunk
+  (apply_instagram_creator_updates)
+- Each run is a row in instagram_analytics_runs (status, heartbeat, progress);
+  a unique index on running rows keeps it to one run across every API worker
+- Live progress for the status endpoint
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config import config
+from app.core.database import get_db
+from app.logging import get_logger
+from app.scrapers.instagram.services.modules.analytics import RUNNING_AGGREGATE_FIELDS
+from app.scrapers.instagram.services.modules.batch_analytics import (
+    BatchAnalyticsEngine,
+    group_by_creator,
+)
+
+
+logger = get_logger(__name__)
+
+PAGE_SIZE = 1000
+REEL_COLUMNS = (
+    "creator_id, play_count, like_count, comment_count, save_count, share_count, taken_at"
+)
+POST_COLUMNS = (
+    "creator_id, like_count, comment_count, save_count, share_count, taken_at, "
+    "caption_text, hashtag_count"
+)
+RUNS_TABLE = "instagram_analytics_runs"
+UPDATES_RPC = "apply_instagram_creator_updates"
+RUN_STALE_SECONDS = 900  # Heartbeat renewed every chunk; a silent run is abandoned after this
+RECENT_RUNS = 5  # Runs listed by the status endpoint
+
+_run_lock = threading.Lock()  # One recompute per process (the runs table covers other processes)
+_progress: Dict[str, Any] = {}  # Live progress of this process's current (or last) run
+
+
+def _fetch_all(query_factory) -> List[Dict[str, Any]]:
+    """Page through a PostgREST query with .range()"""
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        page = query_factory().range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+def _creator_update(analytics: Dict[str, Any]) -> Dict[str, Any]:
+    """instagram_creators columns written by the recompute (same fields as the scraper)"""
+    update = {
+        "avg_views_per_reel_cached": analytics.get("avg_reel_views"),
+        "avg_likes_per_reel_cached": analytics.get("avg_likes_per_reel_cached"),
+        "avg_comments_per_reel_cached": analytics.get("avg_comments_per_reel_cached"),
+        "avg_saves_per_reel_cached": analytics.get("avg_saves_per_reel_cached"),
+        "avg_shares_per_reel_cached": analytics.get("avg_shares_per_reel_cached"),
+        "avg_likes_per_post_cached": analytics.get("avg_likes_per_post_cached"),
+        "avg_comments_per_post_cached": analytics.get("avg_comments_per_post_cached"),
+        "avg_saves_per_post_cached": analytics.get("avg_saves_per_post_cached"),
+        "avg_shares_per_post_cached": analytics.get("avg_shares_per_post_cached"),
+        "avg_engagement_rate": analytics.get("avg_engagement_rate"),
+        "engagement_rate_cached": analytics.get("engagement_rate"),
+        "save_to_like_ratio": analytics.get("save_to_like_ratio"),
+        "best_content_type": analytics.get("best_content_type"),
+        "viral_content_count_cached": analytics.get("viral_content_count"),
+        "viral_threshold_multiplier": analytics.get("viral_threshold_multiplier"),
+        "catalog_viral_count_cached": analytics.get("catalog_viral_count"),
+        "posting_frequency_per_week": analytics.get("posting_frequency_per_week"),
+        "posting_consistency_score": analytics.get("posting_consistency_score"),
+        "last_post_days_ago": analytics.get("last_post_days_ago"),
+        "analytics_recomputed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if config.instagram.running_aggregates:
+        # The triggers keep these current; a value computed from an earlier read could be stale
+        update = {k: v for k, v in update.items() if k not in RUNNING_AGGREGATE_FIELDS}
+    return {k: v for k, v in update.items() if v is not None}
+
+
+def _start_run(db) -> Optional[int]:
+    """
+    Record a running row in instagram_analytics_runs
+
+    Runs whose heartbeat went silent (crashed worker) are marked abandoned
+    first so they do not block new runs forever.
+
+    Returns:
+        Run id, or None while another run is in progress
+    """
+    stale = (datetime.now(timezone.utc) - timedelta(seconds=RUN_STALE_SECONDS)).isoformat()
+    db.table(RUNS_TABLE).update({"status": "abandoned", "error": "Heartbeat lost"}).eq(
+        "status", "running"
+    ).lt("heartbeat_at", stale).execute()
+    try:
+        rows = db.table(RUNS_TABLE).insert({"status": "running"}).execute().data
+    except Exception as e:
+        if getattr(e, "code", None) == "23505":  # Unique index on running rows
+            return None
+        raise
+    return int(rows[0]["id"])
+
+
+def _update_run(db, run_id: Optional[int], fields: Dict[str, Any]) -> None:
+    """Update the run row (and its heartbeat); failures only cost the progress display"""
+    if run_id is None:
+        return
+    try:
+        db.table(RUNS_TABLE).update(
+            {**fields, "heartbeat_at": datetime.now(timezone.utc).isoformat()}
+        ).eq("id", run_id).execute()
+    except Exception as e:
+        logger.warning(f"Failed to update analytics run {run_id}: {e}")
+
+
+def _write_chunk(db, ids: List[str], analytics: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Write one chunk's results with a single bulk RPC
+
+    Returns:
+        Creators whose update failed
+    """
+    updates = [{"ig_user_id": cid, "fields": _creator_update(analytics[cid])} for cid in ids]
+    try:
+        failures = db.rpc(UPDATES_RPC, {"p_updates": updates}).execute().data or []
+    except Exception as e:
+        logger.warning(f"Failed to write analytics for {len(ids)} creators: {e}")
+        return len(ids)
+    for row in failures:
+        logger.warning(f"Failed to write analytics for {row.get('creator_id')}: {row.get('error')}")
+    return len(failures)
+
+
+def recompute_instagram_analytics(
+    chunk_size: int = 200, write: bool = True, limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Recompute analytics for every approved creator
+
+    Args:
+        chunk_size: Creators whose media is loaded per round
+        write: Write results to instagram_creators (False for a dry run)
+        limit: Only process this many creators (testing)
+
+    Returns:
+        Run summary (creators, media, thresholds, timings), or success False
+        with an error while another run is in progress
+    """
+    if not _run_lock.acquire(blocking=False):
+        return {"success": False, "error": "An analytics recompute is already running"}
+
+    try:
+        db = get_db()
+        run_id = _start_run(db) if write else None
+        if write and run_id is None:
+            return {"success": False, "error": "An analytics recompute is already running"}
+
+        _progress.clear()
+        _progress.update(
+            {"run_id": run_id, "running": True, "dry_run": not write, "phase": "loading"}
+        )
+        try:
+            summary = _recompute(db, run_id, chunk_size, write, limit)
+        except Exception as e:
+            _update_run(db, run_id, {"status": "failed", "error": str(e)[:500]})
+            _progress.update({"phase": "failed", "error": str(e)})
+            raise
+        finally:
+            _progress["running"] = False
+    finally:
+        _run_lock.release()
+
+    _update_run(
+        db,
+        run_id,
+        {
+            "status": "completed",
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+            "creators_count": summary["creators"],
+            "media_count": summary["media"],
+            "written_count": summary["written"],
+            "failed_count": summary["failed"],
+            "thresholds": summary["thresholds"],
+            "duration_seconds": summary["total_seconds"],
+        },
+    )
+    return {"success": True, **summary}
+
+
+def _recompute(
+    db, run_id: Optional[int], chunk_size: int, write: bool, limit: Optional[int]
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    engine = BatchAnalyticsEngine(config.instagram, logger)
+
+    creators = _fetch_all(
+        lambda: db.table("instagram_creators")
+        .select("ig_user_id, followers_count")
+        .eq("review_status", "ok")
+        .neq("ig_user_id", None)
+        .order("ig_user_id")
+    )
+    if limit:
+        creators = creators[:limit]
+    logger.info(f"📊 Recomputing analytics for {len(creators)} creators")
+    _progress.update({"creators": len(creators), "computed": 0, "written": 0, "failed": 0})
+
+    # Pass 1: per-creator metrics per chunk; keep compact samples for the percentiles
+    chunks = []
+    load_seconds = compute_seconds = 0.0
+    media_count = 0
+    for start in range(0, len(creators), chunk_size):
+        chunk = creators[start : start + chunk_size]
+        ids = [str(c["ig_user_id"]) for c in chunk]
+
+        load_started = time.perf_counter()
+        reels = _fetch_all(
+            lambda ids=ids: db.table("instagram_reels").select(REEL_COLUMNS).in_("creator_id", ids)
+        )
+        posts = _fetch_all(
+            lambda ids=ids: db.table("instagram_posts").select(POST_COLUMNS).in_("creator_id", ids)
+        )
+        load_seconds += time.perf_counter() - load_started
+
+        result = engine.compute(
+            ids,
+            [c.get("followers_count") for c in chunk],
+            group_by_creator(ids, reels),
+            group_by_creator(ids, posts),
+            thresholds={},  # Catalog thresholds are applied in pass 2
+        )
+        compute_seconds += result.duration_seconds
+        media_count += result.media_count
+        chunks.append((ids, result))
+
+        _progress.update({"computed": start + len(chunk), "media": media_count})
+        _update_run(db, run_id, {"progress": dict(_progress)})
+
+    # Pass 2: catalog-wide thresholds, then per-creator counts against them
+    thresholds = engine.viral_thresholds(r.sample for _, r in chunks if r.sample is not None)
+    for ids, result in chunks:
+        if result.sample is None:
+            continue
+        counts = engine.catalog_viral_counts(len(ids), result.sample, thresholds)
+        for i, cid in enumerate(ids):
+            result.analytics[cid]["catalog_viral_count"] = int(counts[i])
+
+    written = failed = 0
+    if write:
+        _progress["phase"] = "writing"
+        for ids, result in chunks:
+            chunk_failed = _write_chunk(db, ids, result.analytics)
+            written += len(ids) - chunk_failed
+            failed += chunk_failed
+            _progress.update({"written": written, "failed": failed})
+            _update_run(db, run_id, {"progress": dict(_progress)})
+
+    summary = {
+        "creators": len(creators),
+        "media": media_count,
+        "written": written,
+        "failed": failed,
+        "thresholds": thresholds,
+        "load_seconds": round(load_seconds, 2),
+        "compute_seconds": round(compute_seconds, 3),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+    _progress.update({"phase": "completed", "summary": summary})
+
+    logger.info(
+        f"✅ Analytics recomputed for {len(creators)} creators / {media_count} media "
+        f"(compute {summary['compute_seconds']}s, total {summary['total_seconds']}s)"
+    )
+    return summary
+
+
+def _load_runs() -> List[Dict[str, Any]]:
+    try:
+        runs: List[Dict[str, Any]] = (
+            get_db()
+            .table(RUNS_TABLE)
+            .select("*")
+            .order("started_at", desc=True)
+            .limit(RECENT_RUNS)
+            .execute()
+            .data
+            or []
+        )
+        return runs
+    except Exception as e:
+        logger.warning(f"Could not load analytics runs: {e}")
+        return []
+
+
+def _active(run: Dict[str, Any]) -> bool:
+    """A run is in progress and still sending heartbeats"""
+    heartbeat_at = run.get("heartbeat_at")
+    if run.get("status") != "running" or not heartbeat_at:
+        return False
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(str(heartbeat_at))
+    return age < timedelta(seconds=RUN_STALE_SECONDS)
+
+
+def is_recompute_running() -> bool:
+    """A recompute is in progress in this process or in any other API worker"""
+    return _run_lock.locked() or any(_active(run) for run in _load_runs())
+
+
+def get_recompute_progress() -> Dict[str, Any]:
+    """
+    Progress of the current (or last) run plus the recent run rows
+
+    The running flag and the run rows are shared by every API worker; live
+    progress of a dry run (current_run) is only known to the process running it.
+
+    Returns:
+        Dict with running flag, live progress and recent runs
+    """
+    runs = _load_runs()
+    running = _run_lock.locked() or any(_active(run) for run in runs)
+    return {"running": running, "current_run": dict(_progress), "runs": runs}
@@ -3,23 +3,32 @@
 Continuous Instagram Scraper
 Checks Supabase control table every 30 seconds and runs scraping when enabled
 Based on Reddit scraper architecture with 4-hour wait between cycles
+
+With INSTAGRAM_TIME_SLICED=true the burst cycle + 4-hour wait is replaced by a
+rolling pass: creators (stalest first) are spread evenly over the refresh
+window and started in short time slices at a paced request rate, so every
+creator is refreshed about once per window and the API load stays flat.
 """
 
 import asyncio
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, cast
 
 from dotenv import load_dotenv
 from supabase import Client
 
+from app.config import config
+from app.core.control_state import get_control_watcher
 from app.core.database import get_db
 from app.scrapers.instagram.services.instagram_config import Config
 
 # Use absolute imports from app package
 from app.scrapers.instagram.services.instagram_scraper import InstagramScraperUnified
+from app.scrapers.instagram.services.modules.refresh_pacer import RefreshPacer
 
 
 # Note: system_logger moved to unified logging system
@@ -32,6 +41,7 @@ SCRAPER_VERSION = "3.0.0"  # Simplified to match Reddit pattern
 CYCLE_WAIT_HOURS = 4  # Wait 4 hours between cycles (Instagram specific)
 CHECK_INTERVAL_SECONDS = 30  # Check control table every 30 seconds
 WAIT_UPDATE_MINUTES = 1  # Update wait status every minute
+TIME_SLICED = config.instagram.time_sliced  # Rolling paced pass instead of burst cycles
 
 # Load environment variables
 load_dotenv()
@@ -55,6 +65,12 @@ class ContinuousInstagramScraper:
         self.last_cycle_completed_at = None
         self.next_cycle_at = None
         self._last_wait_minute: Optional[int] = None
+        self.pacer = RefreshPacer(
+            window=config.instagram.refresh_window_hours * 3600,
+            slice_seconds=config.instagram.time_slice_seconds,
+            max_rps=config.instagram.requests_per_second,
+        )
+        self.next_slice_at = 0.0  # Unix time of the next time slice
 
     def initialize_supabase(self):
         """Initialize Supabase client from singleton"""
@@ -100,15 +116,22 @@ class ContinuousInstagramScraper:
     async def check_scraper_status(self):
         """Check if scraper should be running from Supabase control table"""
         try:
-            result = (
-                self.supabase.table("system_control")
-                .select("*")
-                .eq("script_name", "instagram_scraper")
-                .execute()
-            )
-
-            if result.data and len(result.data) > 0:
-                control = result.data[0]
+            # Cached by the shared watcher; only query directly if the cache is
+            # stale or has no row yet (the default row is created below)
+            watcher = get_control_watcher(self.supabase)
+            state = watcher.get("instagram_scraper")
+            if state is not None and watcher.has_row("instagram_scraper"):
+                rows = [state.row]
+            else:
+                rows = (
+                    self.supabase.table("system_control")
+                    .select("*")
+                    .eq("script_name", "instagram_scraper")
+                    .execute()
+                ).data
+
+            if rows:
+                control = rows[0]
                 # Check both 'enabled' field (new) and 'status' field (backward compatibility)
                 enabled = control.get("enabled", False) or control.get("status") == "running"
 
@@ -184,6 +207,9 @@ class ContinuousInstagramScraper:
             # Create control checker function (like Reddit scraper)
             async def control_checker():
                 """Check if scraper should continue running"""
+                enabled = get_control_watcher(self.supabase).is_enabled("instagram_scraper")
+                if enabled is not None:
+                    return enabled
                 try:
                     result = (
                         self.supabase.table("system_control")
@@ -283,6 +309,69 @@ class ContinuousInstagramScraper:
         finally:
             self.is_scraping = False
 
+    async def run_time_slice(self):
+        """Refresh the creators that come due in the next time slice, paced to the target RPS"""
+        pacer = self.pacer
+        now = time.time()
+        try:
+            if not self.scraper:
+                logger.info("Initializing Instagram scraper...")
+                Config.validate()
+                # Kept across slices: connections, rate limiter and caches stay warm
+                self.scraper = InstagramScraperUnified()
+                logger.info("✅ Instagram scraper initialized")
+
+            if pacer.pass_done:
+                if pacer.started_at is not None and now < pacer.next_pass_at():
+                    self.next_slice_at = pacer.next_pass_at()
+                    return
+                # Reloaded every pass, so the slot shrinks as the catalog grows
+                creators = await asyncio.to_thread(self.scraper.get_creators_to_process, True)
+                pacer.start_pass(creators, now)
+                self.cycle_count += 1
+                self._log_to_system(
+                    "info",
+                    f"🗓️ Starting refresh pass #{self.cycle_count}: {len(creators)} creators "
+                    f"over {config.instagram.refresh_window_hours:g}h",
+                    {"cycle": self.cycle_count, **pacer.progress()},
+                )
+                if not creators:
+                    self.next_slice_at = pacer.next_pass_at()
+                    return
+
+            batch, target_rps = pacer.next_slice(now)
+            if batch:
+                self.is_scraping = True
+                calls = self.scraper.api_calls_made
+                processed = self.scraper.creators_processed
+                self.scraper.target_rps = target_rps
+                logger.info(
+                    f"⏱️ Time slice: {len(batch)} creators at {target_rps:.1f} RPS "
+                    f"({pacer.index}/{len(pacer.creators)} of pass #{self.cycle_count})"
+                )
+                await self.scraper.process_creators_concurrent(batch)
+                pacer.record(
+                    self.scraper.creators_processed - processed,
+                    self.scraper.api_calls_made - calls,
+                )
+
+            if pacer.pass_done:
+                self.last_cycle_completed_at = datetime.now(timezone.utc)
+                self._log_to_system(
+                    "success",
+                    f"Completed refresh pass #{self.cycle_count}",
+                    {"cycle": self.cycle_count, **pacer.progress()},
+                )
+                self.next_slice_at = pacer.next_pass_at()
+            else:
+                self.next_slice_at = now + pacer.slice_seconds
+
+        except Exception as e:
+            logger.error(f"Error during time slice: {e}", exc_info=True)
+            self.next_slice_at = time.time() + CHECK_INTERVAL_SECONDS
+        finally:
+            self.is_scraping = False
+
     async def run_continuous(self):
         """Main continuous loop - checks every 30 seconds (like Reddit scraper)"""
         logger.info(
@@ -310,6 +399,15 @@ class ContinuousInstagramScraper:
                     # Update heartbeat
                     await self.update_heartbeat()
 
+                    if TIME_SLICED:
+                        # Sleep until the next slice, re-checking control meanwhile
+                        remaining = self.next_slice_at - time.time()
+                        if remaining > 0:
+                            await asyncio.sleep(min(remaining, CHECK_INTERVAL_SECONDS))
+                        else:
+                            await self.run_time_slice()
+                        continue
+
                     # Check if we're in a waiting period
                     now = datetime.now(timezone.utc)
                     if self.next_cycle_at and now < self.next_cycle_at:
@@ -9,16 +9,23 @@ for distributed workers to process. This enables:
 - Job persistence (queue survives restarts)
 - Load balancing (workers pull jobs when ready)
 
+Scheduling:
+- --schedule syncs creators into the scheduler's rolling lane (due one refresh
+  interval after their last scrape); workers promote due jobs at a steady rate
+  and re-schedule each creator after processing it
+- Plain enqueue (default) still pushes every creator at once
+
 Usage:
-    python backend/app/scrapers/instagram/instagram_controller_redis.py
+    python backend/app/scrapers/instagram/instagram_controller_redis.py [--schedule]
 """
 
 import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import redis
 
@@ -27,6 +34,9 @@ import redis
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../..'))
 
 from app.core.database.supabase_client import get_supabase_client
+from app.core.job_queue import ReliableQueue
+from app.core.job_scheduler import scheduler_for
+from app.core.queue_telemetry import queue_telemetry
 
 
 logging.basicConfig(
@@ -35,6 +45,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+QUEUE_NAME = 'instagram_scraper_queue'
+JOB_FIELDS = 'id, ig_user_id, username, niche'  # Everything a job payload needs
+SCHEDULE_FIELDS = JOB_FIELDS + ', enabled, last_scraped_at'
+PAGE_SIZE = 1000  # PostgREST max rows per request
+
 
 def get_redis_client() -> redis.Redis:
     """
@@ -58,10 +73,61 @@ def get_redis_client() -> redis.Redis:
     )
 
 
+def job_payload(creator: Dict[str, Any]) -> Dict[str, Any]:
+    """Job payload carrying what the worker's process_creator reads (no pre-fetch)"""
+    return {
+        'creator_id': creator['id'],
+        'ig_user_id': creator.get('ig_user_id'),
+        'username': creator.get('username', 'unknown'),
+        'niche': creator.get('niche')
+    }
+
+
+def iter_creator_pages(supabase, limit: Optional[int] = None, enabled_only: bool = True, fields: str = JOB_FIELDS) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through creators in id order (keyset pagination)
+
+    Only the columns a job needs are selected, and each page continues after
+    the last id of the previous one, so deep pages cost the same as the first.
+
+    Args:
+        supabase: Supabase client
+        limit: Max number of creators (None = all)
+        enabled_only: Only enabled creators
+        fields: Columns to select (must include id)
+
+    Yields:
+        Lists of creator rows
+    """
+    last_id = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page_size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+        query = supabase.table('instagram_creators').select(fields)
+        if enabled_only:
+            query = query.eq('enabled', True)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+
+        page = query.order('id').limit(page_size).execute().data or []
+        if not page:
+            return
+        yield page
+
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+        if remaining is not None:
+            remaining -= len(page)
+
+
 def enqueue_creators(limit: Optional[int] = None, enabled_only: bool = True) -> int:
     """
     Fetch enabled creators from database and add them to Redis queue
 
+    Creators that already have a job queued, scheduled for retry or running
+    are skipped, so overlapping enqueue runs do not duplicate work.
+
     Args:
         limit: Max number of creators to enqueue (None = all)
         enabled_only: Only enqueue enabled creators
@@ -81,53 +147,32 @@ def enqueue_creators(limit: Optional[int] = None, enabled_only: bool = True) ->
         r.ping()  # Test connection
         logger.info(f"✅ Connected to Redis at {os.getenv('REDIS_HOST', 'localhost')}")
 
-        # Fetch creators from database
-        query = supabase.table('instagram_creators').select('*')
-
-        if enabled_only:
-            query = query.eq('enabled', True)
-
-        if limit:
-            query = query.limit(limit)
-
-        result = query.execute()
-        creators = result.data
+        # Page through creators and push each page in one script call
+        # (LPUSH to the head; workers take from the tail, FIFO order)
+        queue = ReliableQueue(r, QUEUE_NAME)
+        started = time.monotonic()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        found_count = 0
+        queued_count = 0
 
-        logger.info(f"📊 Found {len(creators)} creators to enqueue")
+        for page in iter_creator_pages(supabase, limit=limit, enabled_only=enabled_only):
+            found_count += len(page)
+            queued_count += queue.enqueue(
+                (creator['id'], {**job_payload(creator), 'timestamp': timestamp})
+                for creator in page
+            )
 
-        if not creators:
+        if not found_count:
             logger.warning("⚠️ No creators found in database")
             return 0
 
-        # Add each creator to queue
-        queue_name = 'instagram_scraper_queue'
-        queued_count = 0
-
-        for creator in creators:
-            creator_id = creator.get('id')
-            username = creator.get('username', 'unknown')
-
-            # Skip if already in queue (optional deduplication)
-            # You could check if creator_id is already queued by maintaining a set
-
-            job_data = {
-                'creator_id': creator_id,
-                'username': username,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'retry_count': 0
-            }
-
-            # Push to Redis queue (LPUSH adds to left/head of list)
-            # Workers will BRPOP from right/tail (FIFO order)
-            r.lpush(queue_name, json.dumps(job_data))
-            queued_count += 1
-
-            logger.info(f"✅ Queued: {username} (ID: {creator_id})")
-
         # Get current queue length
-        queue_length = r.llen(queue_name)
+        queue_length = r.llen(QUEUE_NAME)
 
-        logger.info(f"🎉 Successfully queued {queued_count} creators")
+        logger.info(
+            f"🎉 Queued {queued_count}/{found_count} creators in {time.monotonic() - started:.2f}s "
+            f"({found_count - queued_count} already queued)"
+        )
         logger.info(f"📊 Current queue length: {queue_length} jobs")
 
         return queued_count
@@ -142,19 +187,84 @@ def enqueue_creators(limit: Optional[int] = None, enabled_only: bool = True) ->
         return 0
 
 
+def _due_at(last_scraped_at: Optional[str], interval: float, now: float) -> float:
+    """Next refresh time: one interval after the last scrape, never in the past"""
+    if not last_scraped_at:
+        return now
+    try:
+        last = datetime.fromisoformat(str(last_scraped_at).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return now
+    return max(now, last + interval)
+
+
+def schedule_creators(limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Sync creators into the rolling lane of the scheduler
+
+    Enabled creators that are not scheduled yet are added, due one refresh
+    interval after their last scrape (overdue ones are due now and get spread
+    out by the promoter). Creators already on the lane keep the earlier of
+    the two due times, and every payload is refreshed (username, niche).
+    Disabled creators are removed from both lanes. Safe to run repeatedly.
+
+    Args:
+        limit: Max number of creators to look at (None = all)
+
+    Returns:
+        dict: Counts of creators added and removed
+    """
+    try:
+        supabase = get_supabase_client()
+        scheduler = scheduler_for(ReliableQueue(get_redis_client(), QUEUE_NAME))
+
+        started = time.monotonic()
+        now = time.time()
+        added = removed = seen = 0
+        for page in iter_creator_pages(supabase, limit=limit, enabled_only=False, fields=SCHEDULE_FIELDS):
+            seen += len(page)
+            added += scheduler.schedule(
+                (creator['id'], job_payload(creator), _due_at(creator.get('last_scraped_at'), scheduler.refresh_interval, now))
+                for creator in page
+                if creator.get('enabled')
+            )
+            removed += scheduler.unschedule(
+                creator['id'] for creator in page if not creator.get('enabled')
+            )
+
+        stats = scheduler.stats()
+        logger.info(
+            f"🗓️ Synced {seen} creators in {time.monotonic() - started:.2f}s: "
+            f"{added} scheduled, {removed} unscheduled"
+        )
+        logger.info(
+            f"📊 Rolling lane: {stats['rolling']} creators, {stats['rolling_due']} due now, "
+            f"~{stats['rolling_rate_per_min']}/min"
+        )
+        return {'seen': seen, 'added': added, 'removed': removed}
+
+    except Exception as e:
+        logger.error(f"❌ Error scheduling creators: {e}", exc_info=True)
+        return {'seen': 0, 'added': 0, 'removed': 0}
+
+
 def get_queue_status() -> dict:
     """
     Get current status of Instagram scraper queue
 
     Returns:
-        dict: Queue status with length and sample jobs
+        dict: Queue status with length, in-progress/retrying/dead-lettered
+        counts, queue lag, scheduler lanes, worker telemetry, and sample jobs
     """
     try:
         r = get_redis_client()
         r.ping()
 
-        queue_name = 'instagram_scraper_queue'
-        queue_length = r.llen(queue_name)
+        queue_name = QUEUE_NAME
+        queue = ReliableQueue(r, queue_name)
+        telemetry = queue_telemetry(queue, scheduler_for(queue))
+        counts = telemetry['queue']
+        queue_length = counts['pending']
 
         # Get sample of first 5 jobs (without removing them)
         sample_jobs = []
@@ -165,16 +275,32 @@ def get_queue_status() -> dict:
         return {
             'queue_name': queue_name,
             'queue_length': queue_length,
+            'processing': counts['processing'],
+            'delayed': counts['delayed'],
+            'dead': counts['dead'],
+            'oldest_pending_age_seconds': counts['oldest_pending_age_seconds'],
+            'scheduler': telemetry['scheduler'],
+            'workers': telemetry['workers'],
+            'totals': telemetry['totals'],
             'sample_jobs': sample_jobs,
+            'dead_letters': queue.dead_letters(5),
             'status': 'healthy'
         }
 
     except Exception as e:
         logger.error(f"❌ Error getting queue status: {e}")
         return {
-            'queue_name': 'instagram_scraper_queue',
+            'queue_name': QUEUE_NAME,
             'queue_length': 0,
+            'processing': 0,
+            'delayed': 0,
+            'dead': 0,
+            'oldest_pending_age_seconds': None,
+            'scheduler': {},
+            'workers': [],
+            'totals': {},
             'sample_jobs': [],
+            'dead_letters': [],
             'status': 'error',
             'error': str(e)
         }
@@ -184,16 +310,16 @@ def clear_queue() -> int:
     """
     Clear all jobs from Instagram scraper queue
 
-    WARNING: This deletes all pending jobs!
+    WARNING: This deletes all pending jobs and scheduled retries!
+    Jobs currently held by workers are left alone.
 
     Returns:
         int: Number of jobs deleted
     """
     try:
-        r = get_redis_client()
-        queue_name = 'instagram_scraper_queue'
+        queue = ReliableQueue(get_redis_client(), QUEUE_NAME)
 
-        deleted_count = r.delete(queue_name)
+        deleted_count = queue.clear()
         logger.info(f"🗑️ Cleared {deleted_count} jobs from queue")
 
         return deleted_count
@@ -203,6 +329,24 @@ def clear_queue() -> int:
         return 0
 
 
+def requeue_dead_letters() -> int:
+    """
+    Move dead-lettered jobs back to the queue with a fresh retry budget
+
+    Returns:
+        int: Number of jobs re-queued
+    """
+    try:
+        queue = ReliableQueue(get_redis_client(), QUEUE_NAME)
+        count = queue.requeue_dead()
+        logger.info(f"🔄 Re-queued {count} dead-lettered jobs")
+        return count
+
+    except Exception as e:
+        logger.error(f"❌ Error re-queueing dead letters: {e}")
+        return 0
+
+
 def main():
     """Entry point for CLI usage"""
     import argparse
@@ -212,6 +356,8 @@ def main():
     parser.add_argument('--status', action='store_true', help='Show queue status')
     parser.add_argument('--clear', action='store_true', help='Clear queue (WARNING: deletes all jobs!)')
     parser.add_argument('--all', action='store_true', help='Enqueue all creators (enabled + disabled)')
+    parser.add_argument('--requeue-dead', action='store_true', help='Re-queue dead-lettered jobs')
+    parser.add_argument('--schedule', action='store_true', help='Sync creators into the rolling schedule')
 
     args = parser.parse_args()
 
@@ -220,13 +366,46 @@ def main():
         status = get_queue_status()
         logger.info("📊 Queue Status:")
         logger.info(f"   Length: {status['queue_length']} jobs")
+        logger.info(f"   In progress: {status['processing']}, retrying: {status['delayed']}, dead: {status['dead']}")
         logger.info(f"   Status: {status['status']}")
+        if status['scheduler']:
+            lanes = status['scheduler']
+            logger.info(
+                f"   Scheduled: {lanes['priority']} priority ({lanes['priority_due']} due), "
+                f"{lanes['rolling']} rolling ({lanes['rolling_due']} due, ~{lanes['rolling_rate_per_min']}/min)"
+            )
+        if status['totals']:
+            totals = status['totals']
+            eta = totals['eta_seconds']
+            logger.info(f"   Oldest pending job: {status['oldest_pending_age_seconds']}s old")
+            logger.info(
+                f"   Workers: {totals['workers']} ({totals['in_flight']}/{totals['concurrency']} slots busy), "
+                f"{totals['jobs_per_min']} jobs/min, backlog {totals['backlog']}, "
+                f"drains in {f'{eta / 60:.0f} min' if eta is not None else 'never (no throughput)'}"
+            )
+            for worker in status['workers']:
+                logger.info(
+                    f"     - {worker['worker_id']}: {worker['jobs_per_min']} jobs/min, "
+                    f"success {worker['success_rate']}, p95 {worker['p95_job_seconds']}s, "
+                    f"{worker['in_flight']}/{worker['concurrency']} in flight"
+                )
 
         if status['sample_jobs']:
             logger.info("   Sample jobs:")
             for job in status['sample_jobs']:
                 logger.info(f"     - {job.get('username')} (ID: {job.get('creator_id')})")
 
+        if status['dead_letters']:
+            logger.info("   Dead letters:")
+            for letter in status['dead_letters']:
+                logger.info(f"     - {letter['job']}: {letter['error']}")
+
+    elif args.requeue_dead:
+        requeue_dead_letters()
+
+    elif args.schedule:
+        schedule_creators(limit=args.limit)
+
     elif args.clear:
         # Clear queue
         confirm = input("⚠️ Are you sure you want to clear ALL jobs? (yes/no): ")
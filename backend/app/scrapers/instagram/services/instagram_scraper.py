@@ -28,15 +28,16 @@ _temp_logger.info(f"Deployment Date: {DEPLOYMENT_DATE}")
 _temp_logger.info("=" * 60)
 
 import asyncio  # noqa: E402
-
-# Removed concurrent.futures - using raw threading.Thread like Reddit scraper
+import contextlib  # noqa: E402
+import functools  # noqa: E402
 import random  # noqa: E402
 import re  # noqa: E402
 import threading  # noqa: E402
 import time  # noqa: E402
 from collections import Counter  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
 from datetime import datetime, timedelta, timezone  # noqa: E402
-from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
+from typing import Any, Dict, List, Optional, Set, Tuple  # noqa: E402
 
 
 try:
@@ -60,6 +61,7 @@ except ImportError as e:
 
 try:
     from app.core.config.r2_config import r2_config
+    from app.core.control_state import ControlStateWatcher, get_control_watcher
     from app.core.database.supabase_client import get_supabase_client
     from app.logging import get_logger
     from app.utils.media_storage import (
@@ -67,7 +69,9 @@ try:
         process_and_upload_image,
         process_and_upload_profile_picture,
         process_and_upload_video,
+        upload_to_r2,
     )
+    from app.utils.rate_limiter import RequestRateLimiter, get_rapidapi_limiter
 
     _temp_logger.info("✅ R2 media storage loaded successfully")
 except ImportError as e:
@@ -77,9 +81,25 @@ except ImportError as e:
 # Import modular architecture components
 try:
     from app.scrapers.instagram.services.modules import (
+        INCREMENTAL_ANALYTICS_FIELDS,
+        RUNNING_AGGREGATE_FIELDS,
+        ApiUsageTracker,
+        BatchWriteError,
+        BatchWriter,
+        CreatorState,
+        CreatorStateLoader,
+        CreatorWorkerPool,
+        DeferredFetch,
+        DeferredRetryLane,
+        FollowerGrowthTracker,
         InstagramAnalytics,
         InstagramAPI,
         InstagramStorage,
+        RawPayloadPolicy,
+        RequestHedger,
+        RetryLaterError,
+        latest_media_taken_at,
+        normalize_media,
     )
 
     _temp_logger.info("✅ Modular architecture components loaded successfully")
@@ -88,6 +108,26 @@ except ImportError as e:
     InstagramAPI = None  # type: ignore
     InstagramAnalytics = None  # type: ignore
     InstagramStorage = None  # type: ignore
+    ApiUsageTracker = None  # type: ignore
+    CreatorState = None  # type: ignore
+    CreatorStateLoader = None  # type: ignore
+    CreatorWorkerPool = None  # type: ignore
+    FollowerGrowthTracker = None  # type: ignore
+    RUNNING_AGGREGATE_FIELDS = frozenset()  # type: ignore
+    INCREMENTAL_ANALYTICS_FIELDS = frozenset({"last_post_days_ago"})
+    latest_media_taken_at = None  # type: ignore
+    DeferredFetch = None  # type: ignore
+    DeferredRetryLane = None  # type: ignore
+    RequestHedger = None  # type: ignore
+    BatchWriter = None  # type: ignore
+    RawPayloadPolicy = None  # type: ignore
+    normalize_media = None  # type: ignore
+
+    class RetryLaterError(Exception):  # type: ignore[no-redef]
+        """Placeholder so except clauses still work without the retry lane"""
+
+    class BatchWriteError(Exception):  # type: ignore[no-redef]
+        """Placeholder so except clauses still work without the batch writer"""
 
 # Load environment
 load_dotenv()
@@ -156,31 +196,56 @@ class InstagramScraperUnified:
         """Initialize the scraper with enhanced performance features"""
         self.supabase = self._get_supabase()
 
-        # No session pooling - like Reddit scraper
-        self.session = None
+        # No session pooling by default (like Reddit scraper); long-lived workers
+        # that run several creators at once enable one with enable_connection_pool()
+        self.session: Optional[requests.Session] = None
 
-        # Note: Using raw threading.Thread like Reddit scraper, not ThreadPoolExecutor
+        # Threads for blocking RapidAPI calls, apart from the default executor (see _http_pool)
+        self._http_executor: Optional[ThreadPoolExecutor] = None
 
-        # Simple rate limiting with time.sleep()
-        self.last_request_time = 0.0
+        # RapidAPI pacing shared with every other caller (other processes too when
+        # Redis is configured). A time-slice target RPS paces this scraper in a
+        # child limiter, so it never stretches the shared timeline.
+        self.rate_limiter = get_rapidapi_limiter()
+        self.target_rps: Optional[float] = None  # Pacing below the configured RPS (time slices)
+        self.slice_limiter = RequestRateLimiter(0, parent=self.rate_limiter)
 
         # Tracking
         self.api_calls_made = 0
         self.successful_calls = 0
         self.failed_calls = 0
         self.creators_processed = 0
+        self.media_fetches_skipped = 0  # Creators served by the change-detection fast path
+        self.retry_lane = None  # DeferredRetryLane while a batch is running
+        self.batch_writer = None  # BatchWriter while a batch or worker session is running
+        self.hedger = (
+            RequestHedger(
+                logger,
+                quantile=config.instagram.hedge_quantile,
+                budget=config.instagram.hedge_budget,
+                min_delay=config.instagram.hedge_min_delay,
+                max_delay=config.instagram.request_timeout / 2,
+            )
+            if RequestHedger and config.instagram.hedge_requests
+            else None
+        )
         self.errors = []
         self.start_time = time.time()
 
         # No daily/monthly tracking - simplified
 
-        # Stop mechanism
+        # Stop mechanism (control state is cached by a shared background watcher)
         self.stop_requested = False
+        self._watcher: Optional[ControlStateWatcher] = None
+        self._last_control_state: Optional[bool] = None
 
         # Cycle tracking
         self.cycle_number = 0
         self.cycle_start_time = None
 
+        # What of each raw API item goes into raw_media_json
+        self.raw_policy = self._create_raw_policy()
+
         # Initialize modular architecture (if available)
         self.use_modules = False
         if InstagramAPI and InstagramAnalytics and InstagramStorage:
@@ -195,6 +260,9 @@ class InstagramScraperUnified:
                         "process_and_upload_video": process_and_upload_video,
                         "process_and_upload_image": process_and_upload_image,
                     },
+                    cost_per_request=config.instagram.get_cost_per_request(),
+                    running_aggregates=config.instagram.running_aggregates,
+                    raw_policy=self.raw_policy,
                 )
                 self.use_modules = True
                 logger.info("✅ Modular architecture initialized successfully")
@@ -204,10 +272,45 @@ class InstagramScraperUnified:
         else:
             logger.info("Modular components not available, using monolithic methods")
 
+        # Creator state snapshots (one RPC per batch instead of 6-8 queries per creator)
+        self.state_loader = (
+            CreatorStateLoader(
+                self.supabase, logger, media_window=config.instagram.creator_state_media_window
+            )
+            if CreatorStateLoader
+            else None
+        )
+        self.creator_states: Dict[str, Any] = {}
+
+        # Per-creator API call/cost accounting, flushed as atomic increments
+        self.api_usage = (
+            ApiUsageTracker(self.supabase, logger, config.instagram.get_cost_per_request())
+            if ApiUsageTracker
+            else None
+        )
+        self._batch_active = False
+        self.worker_pool: Optional[CreatorWorkerPool] = None
+
+        # Follower growth (history cache warmed per batch, batched history inserts)
+        self.growth_tracker = (
+            FollowerGrowthTracker(self.supabase, logger) if FollowerGrowthTracker else None
+        )
+
     def should_continue(self) -> bool:
-        """Check if scraper should continue running from Supabase control table"""
+        """Check if scraper should continue running (cached system_control state)"""
+        if self.stop_requested:
+            return False
+
+        # In-memory read; the watcher refreshes system_control in the background
+        should_run = self._control_watcher().should_run("instagram_scraper")
+        if should_run is not None:
+            if not should_run and self._last_control_state is not False:
+                logger.info("Scraper stop signal received from control table")
+            self._last_control_state = should_run
+            return should_run
+
+        # Watcher has no fresh state (refresh failing): check the table directly
         try:
-            # Simple direct check of the control table
             result = (
                 self.supabase.table("system_control")
                 .select("status, enabled")
@@ -233,6 +336,12 @@ class InstagramScraperUnified:
             # On error, check the stop_requested flag as fallback
             return not self.stop_requested
 
+    def _control_watcher(self) -> ControlStateWatcher:
+        """Shared control-state watcher (started on first use)"""
+        if self._watcher is None:
+            self._watcher = get_control_watcher(self.supabase)
+        return self._watcher
+
     def request_stop(self):
         """Request the scraper to stop gracefully"""
         self.stop_requested = True
@@ -413,13 +522,102 @@ class InstagramScraperUnified:
             )
         return "\n".join(summary)
 
+    def _record_api_call(self):
+        """Count an API call scraper-wide and against the creator being processed"""
+        self.api_calls_made += 1
+        if self.api_usage:
+            self.api_usage.record_call()
+
+    def _api_calls_for(self, creator_id: str) -> int:
+        """API calls attributed to a creator (scraper-wide count if tracking is unavailable)"""
+        if self.api_usage:
+            return self.api_usage.calls_for(creator_id)
+        return self.api_calls_made
+
+    def enable_connection_pool(self, size: int) -> None:
+        """Reuse keep-alive RapidAPI connections across concurrent creators
+
+        The request threads are sized to match the connection pool.
+
+        Args:
+            size: Max pooled connections (at least the number of concurrent requests)
+        """
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, size))
+        session = requests.Session()
+        session.mount("https://", adapter)
+        self.session = session
+        self._close_http_pool()
+        self._http_executor = ThreadPoolExecutor(
+            max_workers=max(1, size), thread_name_prefix="instagram-http"
+        )
+
+    def _http_pool(self) -> ThreadPoolExecutor:
+        """Threads for blocking RapidAPI calls (created on first use)
+
+        Sized to the concurrent creators plus their hedged duplicates. The
+        default executor is shared by every asyncio.to_thread call (database
+        writes, uploads, queue claims), so requests sent through it could wait
+        behind those and eat into the per-creator timeout.
+        """
+        if self._http_executor is None:
+            self._http_executor = ThreadPoolExecutor(
+                max_workers=config.instagram.concurrent_creators * 2,
+                thread_name_prefix="instagram-http",
+            )
+        return self._http_executor
+
+    def _close_http_pool(self) -> None:
+        executor, self._http_executor = self._http_executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def start_worker_session(self, concurrency: int) -> None:
+        """Keep warm, cross-job state for a queue worker that reuses this scraper
+
+        Jobs share the keep-alive connection pool, rate limiter, hedger, modules
+        (R2 client included) and a long-lived BatchWriter, so concurrent jobs'
+        reels/posts rows and creator updates are merged into bulk writes. Call
+        close_worker_session() before the worker exits.
+
+        Args:
+            concurrency: Jobs the worker runs at once
+        """
+        self.enable_connection_pool(concurrency * 2)  # Room for hedged duplicates
+        if BatchWriter and config.instagram.batch_writes and self.batch_writer is None:
+            self.batch_writer = BatchWriter(
+                self.supabase,
+                logger,
+                max_rows=config.instagram.batch_write_rows,
+                max_delay=config.instagram.batch_write_delay,
+            )
+
+    async def close_worker_session(self) -> None:
+        """Flush everything a worker session buffered and log its stats"""
+        writer, self.batch_writer = self.batch_writer, None
+        if writer:
+            await writer.close()
+            writer.log_summary()
+        if self.growth_tracker:
+            await asyncio.to_thread(self.growth_tracker.flush)
+        if self.api_usage:
+            await asyncio.to_thread(self.api_usage.flush)
+        if self.hedger:
+            self.hedger.log_summary()
+        if self.session:
+            self.session.close()
+            self.session = None
+        self._close_http_pool()
+
     async def _apply_rate_limiting(self):
-        """Simple rate limiting with sleep delay"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < config.instagram.rate_limit_delay:
-            await asyncio.sleep(config.instagram.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        """Wait for a request slot on the shared RapidAPI limiter
+
+        Slots are reserved before sleeping, so concurrent creators sharing this
+        scraper are spaced out instead of all waking up after the same delay.
+        A time-slice target RPS (target_rps) spaces this scraper's requests wider
+        in its own limiter before they take a shared slot.
+        """
+        self.slice_limiter.requests_per_second = self.target_rps or 0
+        await self.slice_limiter.wait()
 
     @retry(
         retry=retry_if_exception_type(RateLimitError),
@@ -449,21 +647,39 @@ class InstagramScraperUnified:
 
         # API limit checks removed - let RapidAPI handle its own limits
 
-        # Apply rate limiting
-        await self._apply_rate_limiting()
-
         request_start = time.time()
 
         try:
-            response = requests.get(
-                endpoint,
-                params=params,
-                headers=config.instagram.get_headers(),
-                timeout=config.instagram.request_timeout,
-            )
+            # Off the event loop so other creators progress and per-creator timeouts can fire
+            loop = asyncio.get_running_loop()
+
+            def send():
+                return loop.run_in_executor(
+                    self._http_pool(),
+                    functools.partial(
+                        self.session.get if self.session else requests.get,
+                        endpoint,
+                        params=params,
+                        headers=config.instagram.get_headers(),
+                        timeout=config.instagram.request_timeout,
+                    ),
+                )
+
+            if self.hedger:
+                # A slow call gets one duplicate; the duplicate is billed, so count it now.
+                # Every attempt is rate limited, the duplicate included
+                response = await self.hedger.run(
+                    endpoint.split("/")[-1],
+                    send,
+                    on_hedge=self._record_api_call,
+                    pace=self._apply_rate_limiting,
+                )
+            else:
+                await self._apply_rate_limiting()
+                response = await send()
 
             request_time = time.time() - request_start
-            self.api_calls_made += 1
+            self._record_api_call()
             self.successful_calls += 1  # Track successful calls
 
             if response.status_code == 429:
@@ -487,12 +703,12 @@ class InstagramScraperUnified:
             return data  # type: ignore[no-any-return]
 
         except requests.exceptions.Timeout as e:
-            self.api_calls_made += 1
+            self._record_api_call()
             self.failed_calls += 1  # Track failed calls
             logger.error(f"API request timed out after {config.instagram.request_timeout}s: {e}")
             raise APIError(f"Request timed out: {e}") from e
         except requests.exceptions.RequestException as e:
-            self.api_calls_made += 1
+            self._record_api_call()
             self.failed_calls += 1  # Track failed calls
             logger.error(f"API request failed: {e}")
             raise APIError(f"Request failed: {e}") from e
@@ -511,6 +727,9 @@ class InstagramScraperUnified:
                     "follower_count": data.get("edge_followed_by", {}).get("count", 0),
                     "following_count": data.get("edge_follow", {}).get("count", 0),
                     "media_count": data.get("edge_owner_to_timeline_media", {}).get("count", 0),
+                    "latest_media_taken_at": latest_media_taken_at(data)
+                    if latest_media_taken_at
+                    else None,
                     "biography": data.get("biography", ""),
                     "is_verified": data.get("is_verified", False),
                     "profile_pic_url": data.get("profile_pic_url_hd")
@@ -532,16 +751,41 @@ class InstagramScraperUnified:
             logger.error(f"Failed to fetch profile for {username}: {e}")
             return None
 
-    async def _fetch_reels(self, user_id: str, count: int = 12) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _count_known(items: List[Dict[str, Any]], known_pks: Set[str]) -> int:
+        """Items already stored, ignoring pinned ones (they sit out of date order)"""
+        return sum(
+            1
+            for item in items
+            if str(item.get("pk")) in known_pks
+            and not (item.get("clips_tab_pinned_user_ids") or item.get("timeline_pinned_user_ids"))
+        )
+
+    async def _fetch_reels(
+        self,
+        user_id: str,
+        count: int = 12,
+        known_pks: Optional[Set[str]] = None,
+        refresh_known: int = 0,
+        defer_empty: bool = False,
+    ) -> List[Dict[str, Any]]:
         """Fetch Instagram reels with retry logic for empty responses
 
         Note: Some creators legitimately have 0 reels (only post photos/carousels).
         Instagram API also randomly rate-limits certain creators, causing slow responses (15-30s).
+
+        Incremental mode (known_pks given): pages come newest first, so pagination
+        stops once a page reaches reels stored last cycle and at least
+        `refresh_known` of them were seen (their counts get refreshed on store).
+
+        With defer_empty, an empty or timed-out first page raises RetryLaterError instead
+        of sleeping in place, so the caller can hand the fetch to the retry lane.
         """
         reels: list[dict[str, Any]] = []
         max_id = None
         total_to_fetch = count
         empty_retries = 0
+        known_seen = 0
 
         while len(reels) < total_to_fetch:
             try:
@@ -554,6 +798,10 @@ class InstagramScraperUnified:
 
                 items = data.get("items", [])
 
+                if not items and not reels and defer_empty:
+                    # Free the creator slot; the retry lane tries again after a backoff
+                    raise RetryLaterError("empty")
+
                 # Retry if we get an empty response (with exponential backoff)
                 if not items and empty_retries < config.instagram.retry_empty_response:
                     empty_retries += 1
@@ -594,9 +842,22 @@ class InstagramScraperUnified:
                 if not paging.get("more_available"):
                     break
 
+                if known_pks is not None:
+                    known_seen += self._count_known(extracted_reels, known_pks)
+                    if known_seen >= max(refresh_known, 1):
+                        logger.info(
+                            f"🔁 Reached stored reels for {user_id}: {len(reels)} fetched, "
+                            f"{known_seen} already stored - stopping pagination"
+                        )
+                        break
+
                 max_id = paging.get("max_id")
 
+            except RetryLaterError:
+                raise
             except APIError as e:
+                if defer_empty and not reels and "timeout" in str(e).lower():
+                    raise RetryLaterError("timeout") from e
                 # Handle timeout specifically - return partial results instead of breaking
                 if "timeout" in str(e).lower():
                     logger.warning(
@@ -618,12 +879,23 @@ class InstagramScraperUnified:
 
         return reels[:total_to_fetch]
 
-    async def _fetch_posts(self, user_id: str, count: int = 12) -> List[Dict[str, Any]]:
-        """Fetch Instagram posts with retry logic for empty responses"""
+    async def _fetch_posts(
+        self,
+        user_id: str,
+        count: int = 12,
+        known_pks: Optional[Set[str]] = None,
+        refresh_known: int = 0,
+        defer_empty: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Fetch Instagram posts with retry logic for empty responses
+
+        Incremental mode (known_pks) and defer_empty behave as in _fetch_reels.
+        """
         posts: list[dict[str, Any]] = []
         max_id = None
         total_to_fetch = count
         empty_retries = 0
+        known_seen = 0
 
         while len(posts) < total_to_fetch:
             try:
@@ -636,6 +908,10 @@ class InstagramScraperUnified:
 
                 items = data.get("items", [])
 
+                if not items and not posts and defer_empty:
+                    # Free the creator slot; the retry lane tries again after a backoff
+                    raise RetryLaterError("empty")
+
                 # Retry if we get an empty response (with exponential backoff)
                 if not items and empty_retries < config.instagram.retry_empty_response:
                     empty_retries += 1
@@ -671,9 +947,22 @@ class InstagramScraperUnified:
                 if not paging.get("more_available"):
                     break
 
+                if known_pks is not None:
+                    known_seen += self._count_known(extracted_posts, known_pks)
+                    if known_seen >= max(refresh_known, 1):
+                        logger.info(
+                            f"🔁 Reached stored posts for {user_id}: {len(posts)} fetched, "
+                            f"{known_seen} already stored - stopping pagination"
+                        )
+                        break
+
                 max_id = paging.get("max_id")
 
+            except RetryLaterError:
+                raise
             except APIError as e:
+                if defer_empty and not posts and "timeout" in str(e).lower():
+                    raise RetryLaterError("timeout") from e
                 # Handle timeout specifically - return partial results instead of breaking
                 if "timeout" in str(e).lower():
                     logger.warning(
@@ -1106,17 +1395,18 @@ class InstagramScraperUnified:
 
         return analytics
 
-    def _store_reels(
-        self, creator_id: str, username: str, reels: List[Dict], creator_niche: Optional[str] = None
-    ) -> tuple[int, int, int]:
-        """Store reels in database with comprehensive data extraction and niche information
-        Returns: (total_saved, new_count, existing_count)
-        """
-        if not reels:
-            return 0, 0, 0
+    def _get_existing_reels(
+        self, media_pks: List[str], creator_state: Optional[CreatorState] = None
+    ) -> Tuple[set, Dict[str, str]]:
+        """Get stored reel pks and pk -> R2 video_url (from the state snapshot when available)"""
+        if creator_state is not None:
+            existing_pks, existing_r2_urls = creator_state.known_reels(media_pks)
+            if existing_r2_urls:
+                logger.info(
+                    f"🔄 Skipping R2 upload for {len(existing_r2_urls)} reels (already using custom domain)"
+                )
+            return existing_pks, existing_r2_urls
 
-        # First check which reels already exist and if they have R2 URLs
-        media_pks = [str(reel.get("pk")) for reel in reels if reel.get("pk")]
         existing_pks = set()
         existing_r2_urls = {}  # media_pk -> video_url mapping for R2 URLs
         if media_pks:
@@ -1137,6 +1427,60 @@ class InstagramScraperUnified:
                         )
             except Exception as e:
                 logger.debug(f"Failed to check existing reels: {e}")
+        return existing_pks, existing_r2_urls
+
+    def _get_existing_posts(
+        self, media_pks: List[str], creator_state: Optional[CreatorState] = None
+    ) -> Tuple[set, Dict[str, List[str]]]:
+        """Get stored post pks and pk -> R2 image_urls (from the state snapshot when available)"""
+        if creator_state is not None:
+            existing_pks, existing_r2_images = creator_state.known_posts(media_pks)
+            if existing_r2_images:
+                logger.info(
+                    f"🔄 Skipping R2 upload for {len(existing_r2_images)} posts (already using custom domain)"
+                )
+            return existing_pks, existing_r2_images
+
+        existing_pks = set()
+        existing_r2_images = {}  # media_pk -> image_urls mapping for R2 URLs
+        if media_pks:
+            try:
+                result = (
+                    self.supabase.table("instagram_posts")
+                    .select("media_pk, image_urls")
+                    .in_("media_pk", media_pks)
+                    .execute()
+                )
+                for row in result.data or []:
+                    existing_pks.add(row["media_pk"])
+                    # Check if post already has custom domain R2 URLs
+                    if row.get("image_urls") and "media.b9dashboard.com" in row["image_urls"][0]:
+                        existing_r2_images[row["media_pk"]] = row["image_urls"]
+                        logger.info(
+                            f"🔄 Skipping R2 upload for post {row['media_pk']} (already using custom domain)"
+                        )
+            except Exception as e:
+                logger.debug(f"Failed to check existing posts: {e}")
+        return existing_pks, existing_r2_images
+
+    def _prepare_reels(
+        self,
+        creator_id: str,
+        username: str,
+        reels: List[Dict],
+        creator_niche: Optional[str] = None,
+        followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Build reels rows with comprehensive data extraction and niche information
+        Returns: (rows, new_count, existing_count)
+        """
+        if not reels:
+            return [], 0, 0
+
+        # First check which reels already exist and if they have R2 URLs
+        media_pks = [str(reel.get("pk")) for reel in reels if reel.get("pk")]
+        existing_pks, existing_r2_urls = self._get_existing_reels(media_pks, creator_state)
 
         new_count = 0
         existing_count = 0
@@ -1161,11 +1505,8 @@ class InstagramScraperUnified:
 
                 # Calculate engagement rate if we have follower count
                 engagement_rate = 0
-                if (
-                    hasattr(self, "current_creator_followers")
-                    and self.current_creator_followers > 0
-                ):
-                    engagement_rate = (engagement / self.current_creator_followers) * 100
+                if followers > 0:
+                    engagement_rate = (engagement / followers) * 100
 
                 # Check if this reel already has R2 URL (deduplication)
                 reel_pk = str(reel.get("pk"))
@@ -1258,8 +1599,8 @@ class InstagramScraperUnified:
                     "ig_play_count": self._get_metric_field(
                         reel, ["ig_play_count", "play_count"], None
                     ),
-                    "like_count": self._get_metric_field(reel, ["like_count", "likes"], 0),
-                    "comment_count": self._get_metric_field(reel, ["comment_count", "comments"], 0),
+                    "like_count": likes,
+                    "comment_count": comments,
                     "share_count": self._get_metric_field(reel, ["share_count", "shares"], None),
                     "save_count": self._get_metric_field(reel, ["save_count", "saves"], None),
                     "engagement_count": engagement,
@@ -1277,7 +1618,7 @@ class InstagramScraperUnified:
                     "is_unified_video": reel.get("is_unified_video", False),
                     "is_dash_eligible": reel.get("is_dash_eligible"),
                     "number_of_qualities": reel.get("number_of_qualities"),
-                    "raw_media_json": reel,
+                    **self._raw_columns("reels", reel, creator_state),
                     "scraped_at": datetime.now(timezone.utc).isoformat(),
                 }
 
@@ -1293,56 +1634,26 @@ class InstagramScraperUnified:
                 logger.debug(f"Failed to process reel: {e}")
                 continue
 
-        total_saved = 0
-        if rows:
-            try:
-                self.supabase.table("instagram_reels").upsert(
-                    rows, on_conflict="media_pk"
-                ).execute()
-                total_saved = len(rows)
-                logger.info(
-                    f"Saved {total_saved} reels for {username}: {new_count} new records, {existing_count} existing updated"
-                )
-            except Exception as e:
-                logger.error(f"Failed to store reels: {e}")
-
-        return total_saved, new_count, existing_count
+        return rows, new_count, existing_count
 
-    def _store_posts(
-        self, creator_id: str, username: str, posts: List[Dict], creator_niche: Optional[str] = None
-    ) -> tuple[int, int, int]:
-        """Store posts in database with comprehensive data extraction and niche information
-        Returns: (total_saved, new_count, existing_count)
+    def _prepare_posts(
+        self,
+        creator_id: str,
+        username: str,
+        posts: List[Dict],
+        creator_niche: Optional[str] = None,
+        followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Build posts rows with comprehensive data extraction and niche information
+        Returns: (rows, new_count, existing_count)
         """
         if not posts:
-            return 0, 0, 0
+            return [], 0, 0
 
         # First check which posts already exist and if they have R2 URLs
         media_pks = [str(post.get("pk")) for post in posts if post.get("pk")]
-        existing_pks = set()
-        existing_r2_images = {}  # media_pk -> image_urls mapping for R2 URLs
-        if media_pks:
-            try:
-                result = (
-                    self.supabase.table("instagram_posts")
-                    .select("media_pk, image_urls")
-                    .in_("media_pk", media_pks)
-                    .execute()
-                )
-                for row in result.data or []:
-                    existing_pks.add(row["media_pk"])
-                    # Check if post already has custom domain R2 URLs
-                    if (
-                        row.get("image_urls")
-                        and len(row["image_urls"]) > 0
-                        and "media.b9dashboard.com" in row["image_urls"][0]
-                    ):
-                        existing_r2_images[row["media_pk"]] = row["image_urls"]
-                        logger.info(
-                            f"🔄 Skipping R2 upload for post {row['media_pk']} (already using custom domain)"
-                        )
-            except Exception as e:
-                logger.debug(f"Failed to check existing posts: {e}")
+        existing_pks, existing_r2_images = self._get_existing_posts(media_pks, creator_state)
 
         new_count = 0
         existing_count = 0
@@ -1367,11 +1678,8 @@ class InstagramScraperUnified:
 
                 # Calculate engagement rate if we have follower count
                 engagement_rate = 0
-                if (
-                    hasattr(self, "current_creator_followers")
-                    and self.current_creator_followers > 0
-                ):
-                    engagement_rate = (engagement / self.current_creator_followers) * 100
+                if followers > 0:
+                    engagement_rate = (engagement / followers) * 100
 
                 # Determine post type (single image, carousel, video)
                 carousel_media_count = 0
@@ -1467,8 +1775,8 @@ class InstagramScraperUnified:
                     "hashtag_count": len(hashtags),
                     "mention_count": len(mentions),
                     # Robust metric extraction with multiple field name variations
-                    "like_count": self._get_metric_field(post, ["like_count", "likes"], 0),
-                    "comment_count": self._get_metric_field(post, ["comment_count", "comments"], 0),
+                    "like_count": likes,
+                    "comment_count": comments,
                     "save_count": self._get_metric_field(post, ["save_count", "saves"], None),
                     "share_count": self._get_metric_field(post, ["share_count", "shares"], None),
                     "engagement_count": engagement,
@@ -1491,7 +1799,7 @@ class InstagramScraperUnified:
                     "view_count": self._get_metric_field(
                         post, ["view_count", "play_count", "video_view_count"], None
                     ),
-                    "raw_media_json": post,
+                    **self._raw_columns("posts", post, creator_state),
                     "scraped_at": datetime.now(timezone.utc).isoformat(),
                 }
 
@@ -1507,20 +1815,7 @@ class InstagramScraperUnified:
                 logger.debug(f"Failed to process post: {e}")
                 continue
 
-        total_saved = 0
-        if rows:
-            try:
-                self.supabase.table("instagram_posts").upsert(
-                    rows, on_conflict="media_pk"
-                ).execute()
-                total_saved = len(rows)
-                logger.info(
-                    f"Saved {total_saved} posts for {username}: {new_count} new records, {existing_count} existing updated"
-                )
-            except Exception as e:
-                logger.error(f"Failed to store posts: {e}")
-
-        return total_saved, new_count, existing_count
+        return rows, new_count, existing_count
 
     def _to_iso(self, timestamp: Optional[int]) -> Optional[str]:
         """Convert Unix timestamp to ISO format"""
@@ -1531,6 +1826,22 @@ class InstagramScraperUnified:
         except Exception:
             return None
 
+    def _get_existing_profile_pic(self, creator_id: str) -> Optional[str]:
+        """Get the stored profile picture URL (fallback when an R2 upload fails)"""
+        try:
+            result = (
+                self.supabase.table("instagram_creators")
+                .select("profile_pic_url")
+                .eq("ig_user_id", creator_id)
+                .execute()
+            )
+            if result.data:
+                url: Optional[str] = result.data[0].get("profile_pic_url")
+                return url
+        except Exception as e:
+            logger.debug(f"Failed to fetch existing profile picture URL: {e}")
+        return None
+
     def _track_follower_growth(
         self,
         creator_id: str,
@@ -1540,6 +1851,14 @@ class InstagramScraperUnified:
         media_count: Optional[int] = None,
     ):
         """Track follower history and calculate growth rates"""
+        if self.growth_tracker:
+            try:
+                return self.growth_tracker.record(  # type: ignore[no-any-return]
+                    creator_id, username, current_followers, current_following, media_count
+                )
+            except Exception as e:
+                logger.debug(f"Growth RPC failed for {creator_id}, using lookback queries: {e}")
+
         try:
             # Record current follower count in history table
             history_entry = {
@@ -1617,54 +1936,18 @@ class InstagramScraperUnified:
                 "previous_followers_count": None,
             }
 
-    def _update_creator_analytics(self, creator_id: str, analytics: Dict[str, Any]):
-        """Update creator with calculated analytics including enhanced post and reel metrics"""
-        try:
-            # Get current total API calls first
-            current_calls_result = (
-                self.supabase.table("instagram_creators")
-                .select("total_api_calls")
-                .eq("ig_user_id", creator_id)
-                .single()
-                .execute()
-            )
-            current_calls = (
-                current_calls_result.data.get("total_api_calls", 0)
-                if current_calls_result.data
-                else 0
-            )
-
-            update_data = {
-                # Reel metrics
-                "avg_views_per_reel_cached": analytics.get("avg_reel_views"),
-                "avg_likes_per_reel_cached": analytics.get("avg_likes_per_reel_cached"),
-                "avg_comments_per_reel_cached": analytics.get("avg_comments_per_reel_cached"),
-                "avg_saves_per_reel_cached": analytics.get("avg_saves_per_reel_cached"),
-                "avg_shares_per_reel_cached": analytics.get("avg_shares_per_reel_cached"),
-                # Post metrics
-                "avg_likes_per_post_cached": analytics.get("avg_likes_per_post_cached"),
-                "avg_comments_per_post_cached": analytics.get("avg_comments_per_post_cached"),
-                "avg_saves_per_post_cached": analytics.get("avg_saves_per_post_cached"),
-                "avg_shares_per_post_cached": analytics.get("avg_shares_per_post_cached"),
-                # Engagement metrics
-                "avg_engagement_rate": analytics.get("avg_engagement_rate"),
-                "engagement_rate_cached": analytics.get("engagement_rate"),
-                "save_to_like_ratio": analytics.get("save_to_like_ratio"),
-                # Content analysis
-                "best_content_type": analytics.get("best_content_type"),
-                "viral_content_count_cached": analytics.get("viral_content_count"),
-                "viral_threshold_multiplier": analytics.get("viral_threshold_multiplier"),
-                # Posting metrics
-                "posting_frequency_per_week": analytics.get("posting_frequency_per_week"),
-                "posting_consistency_score": analytics.get("posting_consistency_score"),
-                "last_post_days_ago": analytics.get("last_post_days_ago"),
-                # Metadata
-                "last_scraped_at": datetime.now(timezone.utc).isoformat(),
-                "total_api_calls": current_calls + self.api_calls_made,
-            }
+    def _update_creator_analytics(
+        self,
+        creator_id: str,
+        analytics: Dict[str, Any],
+        extra_fields: Optional[Dict[str, Any]] = None,
+    ):
+        """Update creator with calculated analytics including enhanced post and reel metrics
 
-            # Remove None values to avoid overwriting with nulls
-            update_data = {k: v for k, v in update_data.items() if v is not None}
+        total_api_calls is not written here - ApiUsageTracker increments it atomically.
+        """
+        try:
+            update_data = self._analytics_update_fields(analytics, extra_fields)
 
             self.supabase.table("instagram_creators").update(update_data).eq(
                 "ig_user_id", creator_id
@@ -1675,7 +1958,343 @@ class InstagramScraperUnified:
         except Exception as e:
             logger.warning(f"Failed to update creator analytics for {creator_id}: {e}")
 
+    def _analytics_update_fields(
+        self, analytics: Dict[str, Any], extra_fields: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """instagram_creators columns for the analytics update
+
+        With running aggregates on, avg_*_cached and posting stats come from the DB triggers.
+        extra_fields are written in the same update (e.g. change-detection markers).
+        """
+        update_data = {
+            # Reel metrics
+            "avg_views_per_reel_cached": analytics.get("avg_reel_views"),
+            "avg_likes_per_reel_cached": analytics.get("avg_likes_per_reel_cached"),
+            "avg_comments_per_reel_cached": analytics.get("avg_comments_per_reel_cached"),
+            "avg_saves_per_reel_cached": analytics.get("avg_saves_per_reel_cached"),
+            "avg_shares_per_reel_cached": analytics.get("avg_shares_per_reel_cached"),
+            # Post metrics
+            "avg_likes_per_post_cached": analytics.get("avg_likes_per_post_cached"),
+            "avg_comments_per_post_cached": analytics.get("avg_comments_per_post_cached"),
+            "avg_saves_per_post_cached": analytics.get("avg_saves_per_post_cached"),
+            "avg_shares_per_post_cached": analytics.get("avg_shares_per_post_cached"),
+            # Engagement metrics
+            "avg_engagement_rate": analytics.get("avg_engagement_rate"),
+            "engagement_rate_cached": analytics.get("engagement_rate"),
+            "save_to_like_ratio": analytics.get("save_to_like_ratio"),
+            # Content analysis
+            "best_content_type": analytics.get("best_content_type"),
+            "viral_content_count_cached": analytics.get("viral_content_count"),
+            "viral_threshold_multiplier": analytics.get("viral_threshold_multiplier"),
+            # Posting metrics
+            "posting_frequency_per_week": analytics.get("posting_frequency_per_week"),
+            "posting_consistency_score": analytics.get("posting_consistency_score"),
+            "last_post_days_ago": analytics.get("last_post_days_ago"),
+            # Metadata
+            "last_scraped_at": datetime.now(timezone.utc).isoformat(),
+            **(extra_fields or {}),
+        }
+
+        # Remove None values to avoid overwriting with nulls
+        update_data = {k: v for k, v in update_data.items() if v is not None}
+        if config.instagram.running_aggregates:
+            # Full-history averages are maintained by the running-aggregate triggers
+            update_data = {
+                k: v for k, v in update_data.items() if k not in RUNNING_AGGREGATE_FIELDS
+            }
+        return update_data
+
+    def _create_raw_policy(self) -> Optional[Any]:
+        """RawPayloadPolicy from config (None without the modules: full payloads, no hashes)"""
+        if not RawPayloadPolicy:
+            return None
+        uploader = None
+        if config.instagram.raw_media_mode == "r2" and r2_config and r2_config.ENABLED:
+
+            def uploader(data: bytes, object_key: str) -> str:
+                return upload_to_r2(data, object_key, content_type="application/gzip")
+
+        try:
+            return RawPayloadPolicy(
+                config.instagram.raw_media_mode,
+                fields=config.instagram.raw_media_fields,
+                uploader=uploader,
+                logger=logger,
+            )
+        except ValueError as e:
+            logger.warning(f"⚠️ {e} - storing full raw payloads")
+            return RawPayloadPolicy(logger=logger)
+
+    def _raw_columns(
+        self, kind: str, item: Dict[str, Any], creator_state: Optional[Any]
+    ) -> Dict[str, Any]:
+        """raw_media_json (and hash/pointer) columns for a reel/post row"""
+        if not self.raw_policy:
+            return {"raw_media_json": item}
+        stored_hash = (
+            creator_state.raw_hash(item.get("pk")) if creator_state is not None else None
+        )
+        columns: Dict[str, Any] = self.raw_policy.columns(kind, item.get("pk"), item, stored_hash)
+        return columns
+
+    def _media_records(self, items: List[Dict[str, Any]], kind: str) -> List[Any]:
+        """Normalize fetched reels/posts once for the storage and analytics modules
+
+        The MediaRecords carry resolved metrics, caption, hashtags and media URLs,
+        so rows and analytics no longer probe the raw items separately. The
+        monolithic fallback keeps working on the raw items.
+        """
+        if not self.use_modules or not normalize_media:
+            return items
+        records: List[Any] = normalize_media(items, kind)
+        return records
+
+    async def _store_media(
+        self,
+        kind: str,
+        creator_id: str,
+        username: str,
+        items: List[Dict[str, Any]],
+        creator_niche: Optional[str],
+        creator_state: Optional[Any],
+        followers: int = 0,
+    ) -> Tuple[int, int, int]:
+        """Store reels or posts (modular storage if available, otherwise monolithic)
+
+        While a batch is running the rows go to the shared BatchWriter, which
+        upserts them together with other creators' rows. `followers` is the
+        creator's follower count for the per-item engagement rate.
+
+        A failed write is raised, so callers keep the change-detection markers
+        and the media is fetched again next cycle.
+        """
+        if self.use_modules:
+            storage_prepare = (
+                self.storage_module.prepare_reels
+                if kind == "reels"
+                else self.storage_module.prepare_posts
+            )
+            rows, new_count, existing_count = storage_prepare(
+                creator_id,
+                username,
+                items,
+                creator_niche,
+                followers,
+                creator_state=creator_state,
+            )
+        else:
+            prepare = self._prepare_reels if kind == "reels" else self._prepare_posts
+            rows, new_count, existing_count = prepare(
+                creator_id,
+                username,
+                items,
+                creator_niche,
+                followers,
+                creator_state=creator_state,
+            )
+
+        total_saved = 0
+        if rows:
+            if self.batch_writer:
+                total_saved = await self.batch_writer.upsert(
+                    f"instagram_{kind}", rows, on_conflict="media_pk"
+                )
+            else:
+                self.supabase.table(f"instagram_{kind}").upsert(
+                    rows, on_conflict="media_pk"
+                ).execute()
+                total_saved = len(rows)
+            logger.info(
+                f"Saved {total_saved} {kind} for {username}: {new_count} new records, {existing_count} existing updated"
+            )
+
+        return total_saved, new_count, existing_count
+
+    async def _write_analytics(
+        self,
+        creator_id: str,
+        reels: List[Dict[str, Any]],
+        posts: List[Dict[str, Any]],
+        profile_data: Optional[Dict[str, Any]],
+        extra_fields: Optional[Dict[str, Any]] = None,
+        full_depth: bool = True,
+    ) -> Dict[str, Any]:
+        """Calculate analytics and write them to the creator row
+
+        After an incremental fetch (full_depth False) the sample is only the newest
+        media, so just INCREMENTAL_ANALYTICS_FIELDS are written. The returned
+        analytics (for the log summary) cover the fetched sample either way.
+        """
+        # Use modular analytics if available, otherwise fallback to monolithic
+        # (API call totals are accounted separately by self.api_usage)
+        if self.use_modules:
+            analytics = self.analytics_module.calculate_analytics(
+                creator_id, reels, posts, profile_data
+            )
+        else:
+            analytics = self._calculate_analytics(creator_id, reels, posts, profile_data)
+        written = (
+            analytics
+            if full_depth
+            else {k: v for k, v in analytics.items() if k in INCREMENTAL_ANALYTICS_FIELDS}
+        )
+
+        if self.batch_writer:
+            fields = (
+                self.storage_module.analytics_update_fields
+                if self.use_modules
+                else self._analytics_update_fields
+            )(written, extra_fields)
+            try:
+                await self.batch_writer.update_creator(creator_id, fields)
+            except BatchWriteError as e:
+                logger.warning(f"Failed to update creator analytics for {creator_id}: {e}")
+        elif self.use_modules:
+            self.storage_module.update_creator_analytics(
+                creator_id, written, extra_fields=extra_fields
+            )
+        else:
+            self._update_creator_analytics(creator_id, written, extra_fields=extra_fields)
+        return analytics
+
+    @staticmethod
+    def _media_markers(
+        profile_data: Optional[Dict[str, Any]], full_depth: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Change-detection columns for a successful media fetch
+
+        Incremental fetches only re-read the newest items, so they leave the full
+        refresh timestamp alone.
+        """
+        if not profile_data:
+            return None
+        markers = {"last_media_count": profile_data.get("media_count")}
+        if full_depth:
+            markers["media_refreshed_at"] = datetime.now(timezone.utc).isoformat()
+        return markers
+
+    async def _retry_deferred_fetch(self, item: Any) -> bool:
+        """Retry-lane handler: refetch deferred reels/posts and store them
+
+        Returns:
+            True if the retry returned data
+        """
+        ctx = item.context
+        creator_id = ctx["creator_id"]
+        fetch = self._fetch_reels if item.kind == "reels" else self._fetch_posts
+        scope = (
+            self.api_usage.creator_scope(creator_id)
+            if self.api_usage
+            else contextlib.nullcontext()
+        )
+        with scope:
+            try:
+                items = await fetch(
+                    creator_id,
+                    ctx["counts"][item.kind],
+                    known_pks=ctx["known_pks"][item.kind],
+                    refresh_known=config.instagram.incremental_refresh_count,
+                    defer_empty=True,
+                )
+            except RetryLaterError as e:
+                item.reason = e.reason
+                return False
+
+        items = self._media_records(items, item.kind)
+        ctx[item.kind] = items
+        ctx["pending"].discard(item.kind)
+        try:
+            saved, new, _ = await self._store_media(
+                item.kind,
+                creator_id,
+                ctx["username"],
+                items,
+                ctx["niche"],
+                ctx["creator_state"],
+                followers=(ctx["profile_data"] or {}).get("follower_count") or 0,
+            )
+            logger.info(
+                f"🔁 Retry stored {saved} {item.kind} for {ctx['username']} ({new} new, "
+                f"attempt {item.attempt})"
+            )
+        except Exception as e:
+            ctx["failed"] = True  # Keep the markers so the media is fetched again next cycle
+            logger.error(f"❌ Retry failed to store {item.kind} for {ctx['username']}: {e}")
+        await self._write_analytics(
+            creator_id,
+            ctx["reels"],
+            ctx["posts"],
+            ctx["profile_data"],
+            extra_fields=self._finished_markers(ctx),
+            full_depth=ctx["full_depth"],
+        )
+        return True
+
+    async def _on_retry_exhausted(self, item: Any) -> None:
+        """Retry-lane callback: the fetch stayed empty (or kept timing out)"""
+        ctx = item.context
+        ctx["pending"].discard(item.kind)
+        if item.reason == "timeout":
+            ctx["failed"] = True
+        markers = self._finished_markers(ctx)
+        if not markers:
+            return
+        # Legitimately empty (e.g. no reels) - still counts as a completed fetch
+        if self.batch_writer:
+            try:
+                await self.batch_writer.update_creator(ctx["creator_id"], markers)
+            except BatchWriteError as e:
+                logger.warning(f"Failed to mark media fetched for {ctx['creator_id']}: {e}")
+        else:
+            await asyncio.to_thread(
+                self.supabase.table("instagram_creators")
+                .update(markers)
+                .eq("ig_user_id", ctx["creator_id"])
+                .execute
+            )
+
+    def _finished_markers(self, ctx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Markers once every deferred fetch of a creator has finished without timing out"""
+        if ctx["pending"] or ctx["failed"]:
+            return None
+        return self._media_markers(ctx["profile_data"], ctx["full_depth"])
+
+    def preload_creator_states(self, creators: List[Dict[str, Any]]) -> None:
+        """Bulk-load state snapshots and follower history for a batch of creators"""
+        if not self.state_loader or not creators:
+            return
+        creator_ids = [
+            str(c.get("ig_user_id") or c.get("instagram_id", ""))
+            for c in creators
+            if c.get("ig_user_id") or c.get("instagram_id")
+        ]
+        # Replace rather than merge so states left over from a stopped cycle are never reused
+        self.creator_states = self.state_loader.load_many(creator_ids)
+        if self.growth_tracker:
+            self.growth_tracker.warm(creator_ids)
+
+    def _get_creator_state(self, creator_id: str) -> Optional[Any]:
+        """Take the preloaded state for a creator, loading it on demand if missing"""
+        state = self.creator_states.pop(creator_id, None)
+        if state is None and self.state_loader:
+            state = self.state_loader.load(creator_id)
+        return state
+
     async def process_creator(self, creator: Dict[str, Any]) -> bool:
+        """Process a single creator, attributing its API calls for usage accounting"""
+        creator_id = str(creator.get("ig_user_id") or creator.get("instagram_id", ""))
+        if not self.api_usage:
+            return await self._process_creator(creator)
+
+        with self.api_usage.creator_scope(creator_id):
+            try:
+                return await self._process_creator(creator)
+            finally:
+                # Batches flush once at the end; standalone calls flush per creator
+                if not self._batch_active:
+                    await asyncio.to_thread(self.api_usage.flush, [creator_id])
+
+    async def _process_creator(self, creator: Dict[str, Any]) -> bool:
         """Process a single creator with comprehensive data fetching and analytics"""
 
         # Handle different key formats
@@ -1694,11 +2313,15 @@ class InstagramScraperUnified:
         )
 
         try:
-            # Check existing content
-            reels_count, posts_count = self._get_creator_content_counts(creator_id)
+            # Check existing content (state snapshot, falling back to count queries)
+            creator_state = self._get_creator_state(creator_id)
+            if creator_state is not None:
+                reels_count, posts_count = creator_state.reels_count, creator_state.posts_count
+            else:
+                reels_count, posts_count = self._get_creator_content_counts(creator_id)
             is_new = reels_count == 0 and posts_count == 0
 
-            api_calls_start = self.api_calls_made
+            api_calls_start = self._api_calls_for(creator_id)
             profile_data = None
 
             # Check if we should stop before starting
@@ -1715,9 +2338,6 @@ class InstagramScraperUnified:
             profile_data = await self._fetch_profile(username)
 
             if profile_data:
-                # Set current follower count for engagement rate calculations
-                self.current_creator_followers = profile_data.get("follower_count", 0)
-
                 # Track follower growth before updating profile
                 growth_data = self._track_follower_growth(
                     creator_id,
@@ -1736,29 +2356,11 @@ class InstagramScraperUnified:
                 # Extract bio links
                 bio_links = self._extract_bio_links(profile_data)
 
-                # Check if profile picture already uses custom domain (skip upload if so)
-                existing_profile_pic = None
-                try:
-                    result = (
-                        self.supabase.table("instagram_creators")
-                        .select("profile_pic_url")
-                        .eq("ig_user_id", creator_id)
-                        .execute()
-                    )
-                    if result.data and len(result.data) > 0:
-                        existing_profile_pic = result.data[0].get("profile_pic_url")
-                except Exception as e:
-                    logger.debug(f"Failed to fetch existing profile picture URL: {e}")
-
-                # Upload profile picture to R2 (if enabled and not already using custom domain)
+                # Store profile picture in R2. The media index makes this a no-op
+                # (no download, no PUT) when the picture is unchanged, and picks up
+                # new pictures that a custom-domain short-circuit would miss.
                 profile_pic_url = profile_data.get("profile_pic_url")
-                if existing_profile_pic and "media.b9dashboard.com" in existing_profile_pic:
-                    # Already using custom domain, skip upload
-                    profile_pic_url = existing_profile_pic
-                    logger.info(
-                        f"✅ Using existing custom domain URL for {username} profile picture"
-                    )
-                elif (
+                if (
                     profile_pic_url
                     and r2_config
                     and r2_config.ENABLED
@@ -1770,12 +2372,19 @@ class InstagramScraperUnified:
                         )
                         if r2_profile_url:
                             profile_pic_url = r2_profile_url
-                            logger.info(f"✅ Profile picture uploaded to R2 for {username}")
+                            logger.info(f"✅ Profile picture stored in R2 for {username}")
                     except MediaStorageError as e:
+                        existing_profile_pic = (
+                            creator_state.profile_pic_url
+                            if creator_state is not None
+                            else self._get_existing_profile_pic(creator_id)
+                        )
+                        if existing_profile_pic and "media.b9dashboard.com" in existing_profile_pic:
+                            # Keep the last good R2 copy rather than an expiring CDN URL
+                            profile_pic_url = existing_profile_pic
                         logger.warning(
-                            f"⚠️ Failed to upload profile picture to R2, using CDN URL: {e}"
+                            f"⚠️ Failed to upload profile picture to R2, keeping previous URL: {e}"
                         )
-                        # Keep original CDN URL if R2 upload fails
 
                 # Update creator with fresh profile data and growth metrics
                 update_data = {
@@ -1802,9 +2411,12 @@ class InstagramScraperUnified:
                 # Remove None values
                 update_data = {k: v for k, v in update_data.items() if v is not None}
 
-                self.supabase.table("instagram_creators").update(update_data).eq(
-                    "ig_user_id", creator_id
-                ).execute()
+                if self.batch_writer:
+                    await self.batch_writer.update_creator(creator_id, update_data)
+                else:
+                    self.supabase.table("instagram_creators").update(update_data).eq(
+                        "ig_user_id", creator_id
+                    ).execute()
 
                 logger.info(f"Profile updated: {profile_data.get('follower_count', 0):,} followers")
                 self._log_to_system(
@@ -1813,6 +2425,30 @@ class InstagramScraperUnified:
                     {"username": username, "followers": profile_data.get("follower_count", 0)},
                 )
 
+            # Fast path: nothing published since the last media fetch and engagement
+            # was refreshed recently - the profile update above is all this creator needs
+            if (
+                config.instagram.enable_change_detection
+                and profile_data
+                and creator_state is not None
+                and creator_state.media_unchanged(
+                    profile_data.get("media_count"), profile_data.get("latest_media_taken_at")
+                )
+                and not creator_state.refresh_due(config.instagram.unchanged_refresh_hours * 3600)
+            ):
+                self.media_fetches_skipped += 1
+                self.creators_processed += 1
+                logger.info(
+                    f"⏭️ [{thread_id}] No new media for {username} "
+                    f"(media_count {profile_data.get('media_count')}) - skipping reels/posts"
+                )
+                self._log_to_system(
+                    "info",
+                    f"⏭️ [{thread_id}] No new media for {username}, profile refreshed only",
+                    {"username": username, "thread": thread_id, "action": "skip_unchanged"},
+                )
+                return True
+
             # Determine fetch counts based on existing content
             if is_new:
                 reels_to_fetch = config.instagram.new_creator_reels_count
@@ -1827,6 +2463,18 @@ class InstagramScraperUnified:
                     f"Existing creator - fetching {reels_to_fetch} reels, {posts_to_fetch} posts"
                 )
 
+            # Incremental mode: stop paginating at media stored last cycle. The full
+            # depth above still runs when the engagement refresh is due.
+            known_reels = known_posts = None
+            if (
+                config.instagram.incremental_fetch
+                and not is_new
+                and creator_state is not None
+                and not creator_state.refresh_due(config.instagram.unchanged_refresh_hours * 3600)
+            ):
+                known_reels = set(creator_state.reel_urls)
+                known_posts = set(creator_state.post_image_urls)
+
             # Check if we should stop before fetching reels
             if not self.should_continue():
                 logger.info(f"[{thread_id}] Stop requested, stopping at reels for {username}")
@@ -1844,7 +2492,20 @@ class InstagramScraperUnified:
                     "count": reels_to_fetch,
                 },
             )
-            reels = await self._fetch_reels(creator_id, reels_to_fetch)
+            # Empty/timed-out first pages go to the retry lane when a batch is running
+            retry_lane = self.retry_lane
+            deferred: Dict[str, str] = {}
+            try:
+                reels = await self._fetch_reels(
+                    creator_id,
+                    reels_to_fetch,
+                    known_pks=known_reels,
+                    refresh_known=config.instagram.incremental_refresh_count,
+                    defer_empty=retry_lane is not None,
+                )
+            except RetryLaterError as e:
+                reels, deferred["reels"] = [], e.reason
+            reels = self._media_records(reels, "reels")
 
             # Check if we should stop before fetching posts
             if not self.should_continue():
@@ -1863,46 +2524,48 @@ class InstagramScraperUnified:
                     "count": posts_to_fetch,
                 },
             )
-            posts = await self._fetch_posts(creator_id, posts_to_fetch)
+            try:
+                posts = await self._fetch_posts(
+                    creator_id,
+                    posts_to_fetch,
+                    known_pks=known_posts,
+                    refresh_known=config.instagram.incremental_refresh_count,
+                    defer_empty=retry_lane is not None,
+                )
+            except RetryLaterError as e:
+                posts, deferred["posts"] = [], e.reason
+            posts = self._media_records(posts, "posts")
 
             # Store content with niche information (guaranteed with error handling)
+            followers = (profile_data or {}).get("follower_count") or 0
             reels_saved, reels_new, reels_existing = 0, 0, 0
             posts_saved, posts_new, posts_existing = 0, 0, 0
+            media_stored = True
 
             try:
                 logger.info(f"💾 [{thread_id}] Saving {len(reels)} reels to database for {username}")
-                # Use modular storage if available, otherwise fallback to monolithic
-                if self.use_modules:
-                    reels_saved, reels_new, reels_existing = self.storage_module.store_reels(
-                        creator_id, username, reels, creator_niche, self.current_creator_followers
-                    )
-                else:
-                    reels_saved, reels_new, reels_existing = self._store_reels(
-                        creator_id, username, reels, creator_niche
-                    )
+                reels_saved, reels_new, reels_existing = await self._store_media(
+                    "reels", creator_id, username, reels, creator_niche, creator_state, followers
+                )
                 logger.info(
                     f"✅ [{thread_id}] Saved {reels_saved} reels ({reels_new} new, {reels_existing} existing)"
                 )
             except Exception as e:
+                media_stored = False
                 logger.error(
                     f"❌ [{thread_id}] Failed to save reels for {username}: {e}", exc_info=True
                 )
 
             try:
                 logger.info(f"💾 [{thread_id}] Saving {len(posts)} posts to database for {username}")
-                # Use modular storage if available, otherwise fallback to monolithic
-                if self.use_modules:
-                    posts_saved, posts_new, posts_existing = self.storage_module.store_posts(
-                        creator_id, username, posts, creator_niche, self.current_creator_followers
-                    )
-                else:
-                    posts_saved, posts_new, posts_existing = self._store_posts(
-                        creator_id, username, posts, creator_niche
-                    )
+                posts_saved, posts_new, posts_existing = await self._store_media(
+                    "posts", creator_id, username, posts, creator_niche, creator_state, followers
+                )
                 logger.info(
                     f"✅ [{thread_id}] Saved {posts_saved} posts ({posts_new} new, {posts_existing} existing)"
                 )
             except Exception as e:
+                media_stored = False
                 logger.error(
                     f"❌ [{thread_id}] Failed to save posts for {username}: {e}", exc_info=True
                 )
@@ -1917,17 +2580,25 @@ class InstagramScraperUnified:
                 f"📈 [{thread_id}] Calculating analytics for {username}",
                 {"username": username, "thread": thread_id},
             )
-            # Use modular analytics if available, otherwise fallback to monolithic
-            if self.use_modules:
-                analytics = self.analytics_module.calculate_analytics(
-                    creator_id, reels, posts, profile_data
-                )
-                # Count API calls used for this creator
-                api_calls_used = self.api_calls_made - api_calls_start
-                self.storage_module.update_creator_analytics(creator_id, analytics, api_calls_used)
-            else:
-                analytics = self._calculate_analytics(creator_id, reels, posts, profile_data)
-                self._update_creator_analytics(creator_id, analytics)
+            # Change-detection markers only move once media was actually fetched and
+            # stored, so a failed fetch is retried next cycle (deferred fetches write
+            # them when the retry lane finishes)
+            media_markers = None
+            if (
+                media_stored
+                and not deferred
+                and (reels or posts or not (profile_data or {}).get("media_count"))
+            ):
+                media_markers = self._media_markers(profile_data, full_depth=known_reels is None)
+
+            analytics = await self._write_analytics(
+                creator_id,
+                reels,
+                posts,
+                profile_data,
+                extra_fields=media_markers,
+                full_depth=known_reels is None,
+            )
 
             # Log analytics summary
             summary = self._format_analytics_summary(analytics)
@@ -1954,8 +2625,33 @@ class InstagramScraperUnified:
                 },
             )
 
+            if deferred and retry_lane is not None:
+                # One shared context, so whichever retry recovers sees the other's results
+                context = {
+                    "creator_id": creator_id,
+                    "username": username,
+                    "niche": creator_niche,
+                    "creator_state": creator_state,
+                    "profile_data": profile_data,
+                    "reels": reels,
+                    "posts": posts,
+                    "counts": {"reels": reels_to_fetch, "posts": posts_to_fetch},
+                    "known_pks": {"reels": known_reels, "posts": known_posts},
+                    "full_depth": known_reels is None,
+                    "pending": set(deferred),
+                    "failed": False,
+                }
+                for kind, reason in deferred.items():
+                    retry_lane.defer(
+                        DeferredFetch(creator=creator, kind=kind, reason=reason, context=context)
+                    )
+                logger.info(
+                    f"🔁 [{thread_id}] Deferred {', '.join(deferred)} for {username} "
+                    f"({', '.join(deferred.values())}) to the retry lane"
+                )
+
             # Log success
-            api_calls_used = self.api_calls_made - api_calls_start
+            api_calls_used = self._api_calls_for(creator_id) - api_calls_start
             logger.info(
                 f"✓ {username}: {api_calls_used} API calls, "
                 f"{reels_new} new reels, {reels_existing} existing reels, "
@@ -1976,14 +2672,18 @@ class InstagramScraperUnified:
 
             return False
 
-    def get_creators_to_process(self) -> List[Dict[str, Any]]:
-        """Get list of approved creators to process"""
+    def get_creators_to_process(self, stalest_first: bool = False) -> List[Dict[str, Any]]:
+        """Get list of approved creators to process
+
+        Args:
+            stalest_first: Order by last scrape (never scraped first) instead of randomly
+        """
         import random
 
         try:
             query = (
                 self.supabase.table("instagram_creators")
-                .select("ig_user_id, username, niche")
+                .select("ig_user_id, username, niche, last_scraped_at")
                 .eq("review_status", "ok")
                 .neq("ig_user_id", None)
             )
@@ -1994,10 +2694,16 @@ class InstagramScraperUnified:
             result = query.execute()
             creators = result.data or []
 
-            # Randomize the order of creators to process
-            random.shuffle(creators)
+            if stalest_first:
+                # ISO timestamps sort chronologically
+                creators.sort(key=lambda creator: creator.get("last_scraped_at") or "")
+                order = "stalest first"
+            else:
+                # Randomize the order of creators to process
+                random.shuffle(creators)
+                order = "randomized order"
 
-            logger.info(f"Found {len(creators)} approved creators to process (randomized order)")
+            logger.info(f"Found {len(creators)} approved creators to process ({order})")
             return creators
 
         except Exception as e:
@@ -2005,11 +2711,7 @@ class InstagramScraperUnified:
             return []
 
     async def process_creators_concurrent(self, creators: List[Dict]):
-        """Process multiple creators concurrently using asyncio tasks (async/await)"""
-        tasks: list[asyncio.Task] = []
-        successful_count = 0
-        failed_count = 0
-
+        """Process creators with a bounded worker pool (per-creator timeout, graceful drain)"""
         # Log start
         self._log_to_system(
             "info",
@@ -2017,76 +2719,106 @@ class InstagramScraperUnified:
             {"creators_count": len(creators), "max_tasks": config.instagram.concurrent_creators},
         )
 
-        async def process_creator_task(creator_data, task_id):
-            """Async task to process a single creator"""
+        async def process_creator_task(creator_data):
+            """Pool handler for a single creator"""
             username = creator_data.get("username", "Unknown")
-            task_name = f"Creator-{task_id}"
             try:
-                logger.info(f"🏁 [{task_name}] Task started for creator {username}")
-                # Process the creator
-                await self.process_creator(creator_data)
-                logger.info(f"✅ [{task_name}] Creator {username} processed successfully")
+                return await self.process_creator(creator_data)
             except Exception as e:
-                logger.error(f"❌ [{task_name}] Creator {username} failed: {e}", exc_info=True)
+                logger.error(f"❌ Creator {username} failed: {e}", exc_info=True)
                 self.errors.append({"creator": username, "error": str(e)})
-            finally:
-                logger.info(f"🏁 [{task_name}] Task completed for creator {username}")
+                return False
 
-        # Create and start tasks with concurrency limit
-        for i, creator in enumerate(creators):
-            # Check if we should stop
-            if not self.should_continue():
-                logger.info("⛔ Stop requested, breaking out of creator processing")
-                break
-
-            # Wait if we've reached the concurrent limit
-            while len([t for t in tasks if not t.done()]) >= config.instagram.concurrent_creators:
-                # Also check for stop during wait
-                if not self.should_continue():
-                    logger.info("⛔ Stop requested while waiting for task slot")
-                    break
-                await asyncio.sleep(0.1)  # Wait for a task to finish
+        # One RPC per batch for counts, profile pics and known media
+        self.preload_creator_states(creators)
 
-            # Double-check stop before starting new task
-            if not self.should_continue():
-                break
+        self.worker_pool = CreatorWorkerPool(
+            logger,
+            concurrency=config.instagram.concurrent_creators,
+            item_timeout=config.instagram.creator_timeout,
+            drain_grace=config.instagram.drain_grace_seconds,
+            should_continue=self.should_continue,
+        )
 
-            task = asyncio.create_task(
-                process_creator_task(creator, i + 1),
-                name=f"Creator-{i + 1}",  # Properly name tasks for clear identification
+        # Reels/posts rows and creator updates are written in cross-creator batches
+        if BatchWriter and config.instagram.batch_writes:
+            self.batch_writer = BatchWriter(
+                self.supabase,
+                logger,
+                max_rows=config.instagram.batch_write_rows,
+                max_delay=config.instagram.batch_write_delay,
+            )
+        writer = self.batch_writer
+
+        # Empty/timed-out fetches are retried here instead of holding a creator slot
+        lane = lane_task = None
+        if DeferredRetryLane and config.instagram.retry_empty_response > 0:
+            lane = self.retry_lane = DeferredRetryLane(
+                logger,
+                delays=[
+                    config.instagram.retry_wait_min * config.instagram.retry_backoff_multiplier**n
+                    for n in range(config.instagram.retry_empty_response)
+                ],
+                concurrency=config.instagram.retry_lane_concurrency,
+                item_timeout=config.instagram.creator_timeout,
+                on_exhausted=self._on_retry_exhausted,
+            )
+            lane_task = asyncio.create_task(
+                lane.run(self._retry_deferred_fetch, should_continue=self.should_continue)
             )
-            tasks.append(task)
-
-            # Small delay to avoid thundering herd
-            await asyncio.sleep(0.05)
 
-        # Wait for all tasks to complete (with stop check and timeout)
-        task_timeout = 300  # 5 minutes max per task
-        if tasks:
-            try:
-                # Wait with timeout
-                timeout = 5.0 if not self.should_continue() else task_timeout
-                await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True), timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                logger.warning(
-                    f"⚠️ Some tasks timed out after {timeout}s - may be stuck in R2 upload or API call"
-                )
-                # Cancel remaining tasks
-                for task in tasks:
-                    if not task.done():
-                        task.cancel()
+        self._batch_active = True
+        try:
+            progress = await self.worker_pool.run(
+                creators,
+                process_creator_task,
+                label=lambda c: c.get("username", "Unknown"),
+            )
+            if lane is not None and lane_task is not None:
+                if lane.pending:
+                    logger.info(f"🔁 Waiting for {lane.pending} deferred fetches")
+                lane.close()
+                await lane_task
+        finally:
+            self._batch_active = False
+            # Standalone process_creator calls retry in place again
+            self.retry_lane = None
+            if lane_task and not lane_task.done():
+                lane_task.cancel()
+            # Rows still buffered by the batch writer
+            if writer:
+                await writer.close()
+                self.batch_writer = None
+            # Write follower history buffered by the warm growth path
+            if self.growth_tracker:
+                await asyncio.to_thread(self.growth_tracker.flush)
+            # One atomic increment call for every creator's API calls/cost in the batch
+            if self.api_usage:
+                await asyncio.to_thread(self.api_usage.flush)
 
         # Log completion
-        successful_count = self.creators_processed
-        failed_count = len(self.errors)
-
         self._log_to_system(
             "success",
             f"Completed processing {len(creators)} creators",
-            {"total": len(creators), "successful": successful_count, "failed": failed_count},
+            {
+                "total": len(creators),
+                "successful": progress.done,
+                "failed": progress.failed,
+                "timed_out": progress.timed_out,
+                "skipped": progress.skipped,
+                "duration_seconds": round(progress.elapsed, 1),
+                "retry_lane": lane.stats.as_dict() if lane else None,
+                "hedging": self.hedger.stats.as_dict() if self.hedger else None,
+                "batch_writer": writer.stats.as_dict() if writer else None,
+                "raw_payloads_unchanged": self.raw_policy.unchanged if self.raw_policy else None,
+            },
         )
+        if lane:
+            lane.log_summary()
+        if self.hedger:
+            self.hedger.log_summary()
+        if writer:
+            writer.log_summary()
 
     async def run(self, control_checker=None):
         """Main execution method - runs a single cycle (async version matching Reddit scraper)"""
@@ -2255,6 +2987,7 @@ class InstagramScraperUnified:
                             "Cycle completed successfully",
                             {
                                 "creators_processed": self.creators_processed,
+                                "media_fetches_skipped": self.media_fetches_skipped,
                                 "api_calls": self.api_calls_made,
                                 "successful_calls": self.successful_calls,
                                 "failed_calls": self.failed_calls,
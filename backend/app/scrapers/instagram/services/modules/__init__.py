@@ -3,8 +3,19 @@ Instagram Scraper Modules
 Modular architecture for Instagram scraper components
 """
 
-from .analytics import InstagramAnalytics
+from .analytics import INCREMENTAL_ANALYTICS_FIELDS, RUNNING_AGGREGATE_FIELDS, InstagramAnalytics
 from .api import InstagramAPI
+from .api_usage import ApiUsageTracker
+from .batch_analytics import BatchAnalyticsEngine, BatchAnalyticsResult
+from .batch_writer import BatchWriteError, BatchWriter, BatchWriterStats
+from .creator_state import CreatorState, CreatorStateLoader
+from .discovery_crawler import DiscoveryCrawler, DiscoveryProgress
+from .follower_growth import FollowerGrowthTracker, FollowerHistory, compute_growth
+from .hedging import HedgeStats, RequestHedger
+from .media_record import MediaRecord, normalize_media
+from .raw_payload import RAW_MEDIA_MODES, RawPayloadPolicy, content_hash
+from .refresh_pacer import RefreshPacer
+from .retry_lane import DeferredFetch, DeferredRetryLane, RetryLaneStats, RetryLaterError
 from .storage import InstagramStorage
 from .utils import (
     calculate_engagement_rate,
@@ -12,22 +23,52 @@ from .utils import (
     extract_hashtags,
     extract_mentions,
     identify_external_url_type,
+    is_r2_url,
+    latest_media_taken_at,
     to_iso,
 )
+from .worker_pool import CreatorWorkerPool, PoolProgress
 
 
 __all__ = [
-    # API
+    "INCREMENTAL_ANALYTICS_FIELDS",
+    "RAW_MEDIA_MODES",
+    "RUNNING_AGGREGATE_FIELDS",
+    "ApiUsageTracker",
+    "BatchAnalyticsEngine",
+    "BatchAnalyticsResult",
+    "BatchWriteError",
+    "BatchWriter",
+    "BatchWriterStats",
+    "CreatorState",
+    "CreatorStateLoader",
+    "CreatorWorkerPool",
+    "DeferredFetch",
+    "DeferredRetryLane",
+    "DiscoveryCrawler",
+    "DiscoveryProgress",
+    "FollowerGrowthTracker",
+    "FollowerHistory",
+    "HedgeStats",
     "InstagramAPI",
-    # Analytics
     "InstagramAnalytics",
-    # Storage
     "InstagramStorage",
-    # Utils
+    "MediaRecord",
+    "PoolProgress",
+    "RawPayloadPolicy",
+    "RefreshPacer",
+    "RequestHedger",
+    "RetryLaneStats",
+    "RetryLaterError",
     "calculate_engagement_rate",
+    "compute_growth",
+    "content_hash",
     "extract_bio_links",
     "extract_hashtags",
     "extract_mentions",
     "identify_external_url_type",
+    "is_r2_url",
+    "latest_media_taken_at",
+    "normalize_media",
     "to_iso",
 ]
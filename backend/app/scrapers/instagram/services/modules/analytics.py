@@ -6,9 +6,34 @@ Calculates creator metrics, engagement rates, and performance analysis
 import time
 from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from .utils import extract_hashtags
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .media_record import MediaRecord, normalize_media
+
+
+# instagram_creators columns kept over full history by the running-aggregate triggers
+# (migrations/20261018_add_instagram_running_aggregates.sql); scrapers must not overwrite
+# them with values computed from the media fetched in one run
+RUNNING_AGGREGATE_FIELDS = frozenset(
+    {
+        "avg_views_per_reel_cached",
+        "avg_likes_per_reel_cached",
+        "avg_comments_per_reel_cached",
+        "avg_saves_per_reel_cached",
+        "avg_shares_per_reel_cached",
+        "avg_likes_per_post_cached",
+        "avg_comments_per_post_cached",
+        "avg_saves_per_post_cached",
+        "avg_shares_per_post_cached",
+        "posting_frequency_per_week",
+        "posting_consistency_score",
+    }
+)
+
+# calculate_analytics() keys that stay correct when only the newest media were re-read
+# (incremental fetch); averages, rates, viral counts and posting frequency need the
+# full-depth sample and keep their stored values until the next full refresh
+INCREMENTAL_ANALYTICS_FIELDS = frozenset({"last_post_days_ago"})
 
 
 class InstagramAnalytics:
@@ -36,8 +61,8 @@ class InstagramAnalytics:
     def calculate_analytics(
         self,
         creator_id: str,
-        reels: List[Dict],
-        posts: List[Dict],
+        reels: Sequence[Union[Dict, MediaRecord]],
+        posts: Sequence[Union[Dict, MediaRecord]],
         profile_data: Optional[Dict] = None,
     ) -> Dict[str, Any]:
         """
@@ -45,8 +70,8 @@ class InstagramAnalytics:
 
         Args:
             creator_id: Instagram creator ID
-            reels: List of reel data
-            posts: List of post data
+            reels: Reel items or MediaRecords (normalized here if needed)
+            posts: Post items or MediaRecords (normalized here if needed)
             profile_data: Optional profile data for follower count
 
         Returns:
@@ -119,13 +144,17 @@ class InstagramAnalytics:
             if profile_data:
                 followers_count = profile_data.get("follower_count", 0)
 
+            # Items fetched this run are normally normalized already (records pass through)
+            reel_records = normalize_media(reels, "reels")
+            post_records = normalize_media(posts, "posts")
+
             # Calculate reel metrics
-            if reels:
-                analytics = self._calculate_reel_metrics(reels, analytics, followers_count)
+            if reel_records:
+                analytics = self._calculate_reel_metrics(reel_records, analytics, followers_count)
 
             # Calculate post metrics
-            if posts:
-                analytics = self._calculate_post_metrics(posts, analytics, followers_count)
+            if post_records:
+                analytics = self._calculate_post_metrics(post_records, analytics, followers_count)
 
             # Calculate combined metrics
             analytics = self._calculate_combined_metrics(
@@ -133,7 +162,7 @@ class InstagramAnalytics:
             )
 
             # Calculate posting patterns
-            all_content = reels + posts
+            all_content = reel_records + post_records
             if all_content:
                 analytics = self._calculate_posting_patterns(all_content, analytics)
 
@@ -143,7 +172,7 @@ class InstagramAnalytics:
         return analytics
 
     def _calculate_reel_metrics(
-        self, reels: List[Dict], analytics: Dict[str, Any], followers_count: int
+        self, reels: List[MediaRecord], analytics: Dict[str, Any], followers_count: int
     ) -> Dict[str, Any]:
         """Calculate metrics specific to reels"""
         reel_views = []
@@ -153,11 +182,11 @@ class InstagramAnalytics:
         reel_shares = []
 
         for reel in reels:
-            views = reel.get("play_count", 0)
-            likes = reel.get("like_count", 0)
-            comments = reel.get("comment_count", 0)
-            saves = reel.get("save_count", 0) or 0
-            shares = reel.get("share_count", 0) or 0
+            views = reel.views
+            likes = reel.likes
+            comments = reel.comments
+            saves = reel.saves or 0
+            shares = reel.shares or 0
 
             if views:
                 reel_views.append(views)
@@ -223,7 +252,7 @@ class InstagramAnalytics:
         return analytics
 
     def _calculate_post_metrics(
-        self, posts: List[Dict], analytics: Dict[str, Any], followers_count: int
+        self, posts: List[MediaRecord], analytics: Dict[str, Any], followers_count: int
     ) -> Dict[str, Any]:
         """Calculate metrics specific to posts"""
         post_likes = []
@@ -235,11 +264,11 @@ class InstagramAnalytics:
         hashtag_counts = []
 
         for post in posts:
-            likes = post.get("like_count", 0)
-            comments = post.get("comment_count", 0)
-            saves = post.get("save_count", 0) or 0
-            shares = post.get("share_count", 0) or 0
-            engagement = likes + comments
+            likes = post.likes
+            comments = post.comments
+            saves = post.saves or 0
+            shares = post.shares or 0
+            engagement = post.engagement
 
             if likes:
                 post_likes.append(likes)
@@ -253,13 +282,9 @@ class InstagramAnalytics:
                 post_engagements.append(engagement)
 
             # Caption analysis
-            caption = post.get("caption", {})
-            caption_text = caption.get("text", "") if isinstance(caption, dict) else str(caption)
-
-            if caption_text:
-                caption_lengths.append(len(caption_text))
-                hashtags = extract_hashtags(caption_text)
-                hashtag_counts.append(len(hashtags))
+            if post.caption_text:
+                caption_lengths.append(len(post.caption_text))
+                hashtag_counts.append(len(post.hashtags))
 
         if post_likes:
             analytics["avg_post_likes"] = sum(post_likes) / len(post_likes)
@@ -370,14 +395,10 @@ class InstagramAnalytics:
         return analytics
 
     def _calculate_posting_patterns(
-        self, content: List[Dict], analytics: Dict[str, Any]
+        self, content: List[MediaRecord], analytics: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Calculate posting frequency and consistency"""
-        timestamps = []
-        for item in content:
-            timestamp = item.get("taken_at") or item.get("device_timestamp")
-            if timestamp:
-                timestamps.append(timestamp)
+        timestamps = [item.taken_at for item in content if item.taken_at]
 
         if not timestamps:
             return analytics
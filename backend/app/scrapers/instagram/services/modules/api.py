@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 import requests
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from .utils import latest_media_taken_at
+
 
 class APIError(Exception):
     """Custom exception for API errors"""
@@ -145,6 +147,7 @@ class InstagramAPI:
                     "follower_count": data.get("edge_followed_by", {}).get("count", 0),
                     "following_count": data.get("edge_follow", {}).get("count", 0),
                     "media_count": data.get("edge_owner_to_timeline_media", {}).get("count", 0),
+                    "latest_media_taken_at": latest_media_taken_at(data),
                     "biography": data.get("biography", ""),
                     "is_verified": data.get("is_verified", False),
                     "profile_pic_url": data.get("profile_pic_url_hd")
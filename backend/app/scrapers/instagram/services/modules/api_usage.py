@@ -0,0 +1,123 @@
+"""
+Instagram API Usage Module
+Per-creator RapidAPI call and cost accounting with atomic, batched DB increments
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from supabase import Client
+
+
+# Creator whose work is running in the current asyncio task / thread.
+# asyncio copies context into each task, so concurrent creators never mix counts.
+_current_creator: ContextVar[Optional[str]] = ContextVar("instagram_current_creator", default=None)
+
+
+class ApiUsageTracker:
+    """
+    Accumulates API calls per creator in memory and flushes them as increments
+
+    Writes go through the increment_instagram_api_usage RPC, which adds to
+    total_api_calls / total_api_cost in a single UPDATE. There is no read, and
+    concurrent workers cannot lose each other's updates.
+    """
+
+    RPC_NAME = "increment_instagram_api_usage"
+
+    def __init__(self, supabase: Client, logger, cost_per_request: float = 0.0):
+        """
+        Initialize usage tracker
+
+        Args:
+            supabase: Supabase client instance
+            logger: Logger instance
+            cost_per_request: USD cost of one RapidAPI request
+        """
+        self.supabase = supabase
+        self.logger = logger
+        self.cost_per_request = cost_per_request
+        self._pending: Dict[str, int] = {}  # creator_id -> calls not yet written
+        self._totals: Dict[str, int] = {}  # creator_id -> calls since its last flush (for reporting)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def creator_scope(self, creator_id: str) -> Iterator[None]:
+        """Attribute API calls made inside this block (and tasks it spawns) to a creator"""
+        token = _current_creator.set(str(creator_id))
+        try:
+            yield
+        finally:
+            _current_creator.reset(token)
+
+    def record_call(self, creator_id: Optional[str] = None, count: int = 1) -> None:
+        """
+        Count API calls against a creator
+
+        Args:
+            creator_id: Creator to charge (defaults to the current creator scope)
+            count: Number of calls
+        """
+        creator_id = creator_id or _current_creator.get()
+        if not creator_id:
+            return
+        with self._lock:
+            self._pending[creator_id] = self._pending.get(creator_id, 0) + count
+            self._totals[creator_id] = self._totals.get(creator_id, 0) + count
+
+    def calls_for(self, creator_id: str) -> int:
+        """API calls attributed to a creator since it was last flushed"""
+        with self._lock:
+            return self._totals.get(str(creator_id), 0)
+
+    def pending_creators(self) -> int:
+        """Number of creators with unflushed increments"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, creator_ids: Optional[List[str]] = None) -> int:
+        """
+        Write pending increments in one RPC call
+
+        The flushed creators' reporting totals are dropped as well, so a
+        long-lived tracker (queue worker session) does not grow per creator.
+
+        Args:
+            creator_ids: Only flush these creators (default: all pending)
+
+        Returns:
+            Number of creators flushed
+        """
+        with self._lock:
+            if creator_ids is None:
+                batch, self._pending = self._pending, {}
+                self._totals = {}
+            else:
+                wanted = [str(cid) for cid in creator_ids]
+                batch = {cid: self._pending.pop(cid) for cid in wanted if cid in self._pending}
+                for cid in wanted:
+                    self._totals.pop(cid, None)
+        if not batch:
+            return 0
+
+        usage = [
+            {
+                "creator_id": cid,
+                "calls": calls,
+                "cost": round(calls * self.cost_per_request, 6),
+            }
+            for cid, calls in batch.items()
+        ]
+        try:
+            self.supabase.rpc(self.RPC_NAME, {"p_usage": usage}).execute()
+            self.logger.debug(f"Flushed API usage for {len(usage)} creators")
+            return len(usage)
+        except Exception as e:
+            self.logger.warning(f"Failed to flush API usage for {len(usage)} creators: {e}")
+            with self._lock:
+                # Merge back so the next flush retries them
+                for cid, calls in batch.items():
+                    self._pending[cid] = self._pending.get(cid, 0) + calls
+            return 0
@@ -0,0 +1,556 @@
+"""
+Instagram Batch Analytics Module
+Vectorized (NumPy) creator analytics for many creators at once
+
+Computes the same per-creator metrics as InstagramAnalytics.calculate_analytics,
+but over columnar arrays for a whole batch: one pass extracts the fields, then
+every metric is a grouped reduction (np.bincount) instead of a Python loop per
+creator. Also derives catalog-wide percentiles so viral content can be judged
+against all creators, not only against a creator's own average.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .media_record import COMMENT_FIELDS, LIKE_FIELDS, SAVE_FIELDS, SHARE_FIELDS, VIEW_FIELDS
+from .utils import extract_hashtags
+
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+VIRAL_PERCENTILES = (90.0, 95.0, 99.0)
+
+
+def _metric_column(items: Sequence[Mapping[str, Any]], fields: Sequence[str]) -> np.ndarray:
+    """First non-None value among field variations per item (0 if none)"""
+    values = [item.get(fields[0]) for item in items]
+    for name in fields[1:]:
+        missing = [k for k, v in enumerate(values) if v is None]
+        if not missing:
+            break
+        for k in missing:
+            values[k] = items[k].get(name)
+    return np.array([0.0 if v is None else v for v in values], dtype=np.float64)
+
+
+def _parse_timestamp(value: Any) -> float:
+    """Unix timestamp from an API int or a stored ISO string (NaN if missing)"""
+    if not value:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return np.nan
+
+
+def _timestamp_column(items: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """taken_at (or device_timestamp) per item"""
+    values = [item.get("taken_at") or item.get("device_timestamp") for item in items]
+    try:
+        # Fast path: every item has a numeric timestamp (API responses)
+        column = np.array(values, dtype=np.float64)
+        column[column == 0] = np.nan
+        return column
+    except (TypeError, ValueError):
+        return np.array([_parse_timestamp(v) for v in values], dtype=np.float64)
+
+
+def _caption(item: Mapping[str, Any]) -> Tuple[float, float]:
+    """(caption length, hashtag count); length 0 means no caption"""
+    text = item.get("caption_text")
+    if text is None:
+        caption = item.get("caption", {})
+        text = caption.get("text", "") if isinstance(caption, dict) else str(caption or "")
+    if not text:
+        return 0.0, 0.0
+    hashtags = item.get("hashtag_count")
+    if hashtags is None:
+        hashtags = len(extract_hashtags(text))
+    return float(len(text)), float(hashtags)
+
+
+@dataclass
+class MediaColumns:
+    """Columnar media for a batch; `creator` holds each row's creator index"""
+
+    creator: np.ndarray
+    views: np.ndarray
+    likes: np.ndarray
+    comments: np.ndarray
+    saves: np.ndarray
+    shares: np.ndarray
+    taken_at: np.ndarray
+    caption_length: np.ndarray
+    hashtag_count: np.ndarray
+
+    @classmethod
+    def from_items(
+        cls, items_by_creator: Sequence[Sequence[Mapping[str, Any]]], captions: bool = False
+    ) -> "MediaColumns":
+        """
+        Build columns from per-creator item lists (API items or stored rows)
+
+        Args:
+            items_by_creator: items_by_creator[i] is the media list of creator i
+            captions: Extract caption length / hashtag count (posts only)
+        """
+        sizes = [len(items) for items in items_by_creator]
+        items = [item for group in items_by_creator for item in group]
+        creator = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+
+        if captions:
+            caption_data = np.array([_caption(i) for i in items], dtype=np.float64).reshape(-1, 2)
+        else:
+            caption_data = np.zeros((len(items), 2))
+
+        return cls(
+            creator=creator,
+            views=_metric_column(items, VIEW_FIELDS),
+            likes=_metric_column(items, LIKE_FIELDS),
+            comments=_metric_column(items, COMMENT_FIELDS),
+            saves=_metric_column(items, SAVE_FIELDS),
+            shares=_metric_column(items, SHARE_FIELDS),
+            taken_at=_timestamp_column(items),
+            caption_length=caption_data[:, 0],
+            hashtag_count=caption_data[:, 1],
+        )
+
+
+@dataclass
+class ViralSample:
+    """Per-item values the catalog-wide viral thresholds are derived from"""
+
+    reel_creator: np.ndarray
+    reel_views: np.ndarray
+    post_creator: np.ndarray
+    post_engagement: np.ndarray
+
+    @classmethod
+    def from_columns(cls, reels: MediaColumns, posts: MediaColumns) -> "ViralSample":
+        """Keep only the columns needed for thresholds (compact for whole-catalog runs)"""
+        return cls(
+            reel_creator=reels.creator.astype(np.int32),
+            reel_views=reels.views,
+            post_creator=posts.creator.astype(np.int32),
+            post_engagement=posts.likes + posts.comments,
+        )
+
+
+@dataclass
+class BatchAnalyticsResult:
+    """Output of BatchAnalyticsEngine.compute()"""
+
+    analytics: Dict[str, Dict[str, Any]]
+    thresholds: Dict[str, float] = field(default_factory=dict)
+    sample: Optional[ViralSample] = None
+    media_count: int = 0
+    duration_seconds: float = 0.0
+
+
+def _grouped_sum(groups: np.ndarray, weights: np.ndarray, n: int) -> np.ndarray:
+    return np.bincount(groups, weights=weights, minlength=n)
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den, 0 where den == 0"""
+    out = np.zeros_like(num, dtype=np.float64)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+class BatchAnalyticsEngine:
+    """
+    Vectorized analytics over a batch of creators
+
+    Averages follow the per-creator code: zero values are excluded from each
+    metric's average. Most-active day/hour are computed in UTC and ties go to
+    the earliest weekday/hour.
+    """
+
+    def __init__(self, config, logger, percentiles: Sequence[float] = VIRAL_PERCENTILES):
+        """
+        Initialize engine
+
+        Args:
+            config: Instagram scraper configuration (config.instagram)
+            logger: Logger instance
+            percentiles: Catalog-wide percentiles to report for viral thresholds
+        """
+        self.config = config
+        self.logger = logger
+        self.percentiles = tuple(percentiles)
+
+    def compute(
+        self,
+        creator_ids: Sequence[str],
+        followers: Sequence[Optional[int]],
+        reels: Sequence[Sequence[Mapping[str, Any]]],
+        posts: Sequence[Sequence[Mapping[str, Any]]],
+        now: Optional[float] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+    ) -> BatchAnalyticsResult:
+        """
+        Compute analytics for every creator in the batch
+
+        Args:
+            creator_ids: Creator IDs (defines the batch order)
+            followers: Follower count per creator (None/0 disables rate metrics)
+            reels: Reel items per creator, aligned with creator_ids
+            posts: Post items per creator, aligned with creator_ids
+            now: Reference unix time for recency metrics
+            thresholds: Catalog viral thresholds (default: derived from this batch)
+
+        Returns:
+            BatchAnalyticsResult keyed by creator ID
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        n = len(creator_ids)
+        reel_cols = MediaColumns.from_items(reels)
+        post_cols = MediaColumns.from_items(posts, captions=True)
+        fol = np.array([f or 0 for f in followers], dtype=np.float64)
+
+        if not self.config.enable_analytics:
+            defaults = {
+                cid: self._defaults(len(reels[i]), len(posts[i]))
+                for i, cid in enumerate(creator_ids)
+            }
+            return BatchAnalyticsResult(analytics=defaults)
+
+        m = self._metrics(n, fol, reel_cols, post_cols, now)
+        sample = ViralSample.from_columns(reel_cols, post_cols)
+        if thresholds is None:
+            thresholds = self.viral_thresholds([sample])
+        m["catalog_viral_count"] = self.catalog_viral_counts(n, sample, thresholds)
+
+        analytics = {cid: self._row(m, i) for i, cid in enumerate(creator_ids)}
+        return BatchAnalyticsResult(
+            analytics=analytics,
+            thresholds=thresholds,
+            sample=sample,
+            media_count=len(reel_cols.creator) + len(post_cols.creator),
+            duration_seconds=time.perf_counter() - started,
+        )
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _metrics(
+        self, n: int, fol: np.ndarray, reels: MediaColumns, posts: MediaColumns, now: float
+    ) -> Dict[str, np.ndarray]:
+        m: Dict[str, np.ndarray] = {}
+        has_followers = fol > 0
+        rg, pg = reels.creator, posts.creator
+        reel_total = np.bincount(rg, minlength=n).astype(np.float64)
+        post_total = np.bincount(pg, minlength=n).astype(np.float64)
+        m["reels_analyzed"], m["posts_analyzed"] = reel_total, post_total
+
+        def nonzero_stats(groups, values):
+            count = _grouped_sum(groups, (values != 0).astype(np.float64), n)
+            total = _grouped_sum(groups, values, n)
+            return count, total, _safe_div(total, count)
+
+        # Reels
+        rv_n, rv_sum, m["avg_reel_views"] = nonzero_stats(rg, reels.views)
+        rl_n, rl_sum, m["avg_reel_likes"] = nonzero_stats(rg, reels.likes)
+        _, rc_sum, m["avg_reel_comments"] = nonzero_stats(rg, reels.comments)
+        _, rs_sum, m["avg_reel_saves"] = nonzero_stats(rg, reels.saves)
+        _, rsh_sum, m["avg_reel_shares"] = nonzero_stats(rg, reels.shares)
+        m["total_views"] = rv_sum
+        m["content_reach_rate"] = _safe_div(m["avg_reel_views"], fol) * 100
+        reel_engagement = _safe_div(_safe_div(rl_sum + rc_sum, reel_total), fol) * 100
+        m["reel_engagement_rate"] = np.where(has_followers & (rl_n > 0), reel_engagement, 0)
+
+        # Posts
+        post_engagement = posts.likes + posts.comments
+        _, pl_sum, m["avg_post_likes"] = nonzero_stats(pg, posts.likes)
+        _, pc_sum, m["avg_post_comments"] = nonzero_stats(pg, posts.comments)
+        _, ps_sum, m["avg_post_saves"] = nonzero_stats(pg, posts.saves)
+        _, psh_sum, m["avg_post_shares"] = nonzero_stats(pg, posts.shares)
+        pe_n, pe_sum, m["avg_post_engagement"] = nonzero_stats(pg, post_engagement)
+        m["post_engagement_rate"] = np.where(
+            has_followers & (pe_n > 0), _safe_div(_safe_div(pe_sum, post_total), fol) * 100, 0
+        )
+
+        has_caption = posts.caption_length > 0
+        cap_n = _grouped_sum(pg, has_caption.astype(np.float64), n)
+        m["avg_caption_length"] = _safe_div(_grouped_sum(pg, posts.caption_length, n), cap_n)
+        m["avg_hashtag_count"] = _safe_div(_grouped_sum(pg, posts.hashtag_count, n), cap_n)
+        tagged = (has_caption & (posts.hashtag_count > 0)).astype(np.float64)
+        m["uses_hashtags"] = _grouped_sum(pg, tagged, n) > 0
+
+        # Viral detection relative to each creator's own averages
+        viral = np.zeros(n)
+        if self.config.enable_viral_detection:
+            reel_viral = (
+                (reels.views != 0)
+                & (reels.views >= self.config.viral_min_views)
+                & (reels.views >= m["avg_reel_views"][rg] * self.config.viral_multiplier)
+            )
+            reel_viral_n = _grouped_sum(rg, reel_viral * 1.0, n)
+            m["viral_content_rate"] = _safe_div(reel_viral_n, rv_n) * 100
+            post_viral = (
+                (post_engagement != 0)
+                & (m["avg_post_engagement"][pg] > 0)
+                & (post_engagement >= m["avg_post_engagement"][pg] * self.config.viral_multiplier)
+            )
+            viral = reel_viral_n + _grouped_sum(pg, post_viral * 1.0, n)
+        else:
+            m["viral_content_rate"] = np.zeros(n)
+        m["viral_content_count"] = viral
+
+        # Combined
+        m["avg_likes_per_reel_cached"] = m["avg_reel_likes"]
+        m["avg_comments_per_reel_cached"] = m["avg_reel_comments"]
+        m["avg_saves_per_reel_cached"] = m["avg_reel_saves"]
+        m["avg_shares_per_reel_cached"] = m["avg_reel_shares"]
+        m["avg_likes_per_post_cached"] = m["avg_post_likes"]
+        m["avg_comments_per_post_cached"] = m["avg_post_comments"]
+        m["avg_saves_per_post_cached"] = m["avg_post_saves"]
+        m["avg_shares_per_post_cached"] = m["avg_post_shares"]
+
+        total_likes = rl_sum + pl_sum
+        total_comments = rc_sum + pc_sum
+        total_saves = rs_sum + ps_sum
+        m["total_likes"], m["total_comments"] = total_likes, total_comments
+        m["total_saves"], m["total_shares"] = total_saves, rsh_sum + psh_sum
+        m["total_engagement"] = total_likes + total_comments
+        m["total_content_analyzed"] = reel_total + post_total
+
+        per_content = _safe_div(m["total_engagement"], m["total_content_analyzed"])
+        rated = has_followers & (m["total_content_analyzed"] > 0)
+        m["engagement_rate"] = np.where(rated, _safe_div(per_content, fol) * 100, 0)
+        m["avg_engagement_rate"] = m["engagement_rate"]
+        m["avg_engagement_per_content"] = np.where(rated, per_content, 0)
+        m["comment_to_like_ratio"] = _safe_div(total_comments, total_likes)
+        m["save_to_like_ratio"] = np.where(total_saves > 0, _safe_div(total_saves, total_likes), 0)
+        m["reels_vs_posts_performance"] = np.where(
+            m["avg_reel_views"] > 0, _safe_div(m["avg_reel_views"], m["avg_post_engagement"]), 0
+        )
+
+        reel_score = np.maximum(m["reel_engagement_rate"], 0)
+        post_score = np.maximum(m["post_engagement_rate"], 0)
+        m["best_content_type"] = np.select(
+            [
+                reel_score > post_score * 1.5,
+                post_score > reel_score * 1.5,
+                (reel_score > 0) & (post_score > 0),
+                m["avg_reel_views"] > m["avg_post_engagement"],
+                m["avg_post_engagement"] > 0,
+            ],
+            ["reels", "posts", "mixed", "reels", "posts"],
+            default="",
+        )
+
+        m.update(self._posting_patterns(n, reels, posts, now))
+        return m
+
+    def _posting_patterns(
+        self, n: int, reels: MediaColumns, posts: MediaColumns, now: float
+    ) -> Dict[str, np.ndarray]:
+        """Recency, frequency, consistency and most-active day/hour per creator"""
+        groups = np.concatenate([reels.creator, posts.creator])
+        ts = np.concatenate([reels.taken_at, posts.taken_at])
+        valid = ~np.isnan(ts) & (ts != 0)
+        groups, ts = groups[valid], ts[valid]
+
+        order = np.lexsort((ts, groups))
+        groups, ts = groups[order], ts[order]
+        counts = np.bincount(groups, minlength=n)
+        has_any = counts > 0
+        ends = np.cumsum(counts)
+        starts = ends - counts
+
+        first = np.full(n, np.nan)
+        last = np.full(n, np.nan)
+        first[has_any] = ts[starts[has_any]]
+        last[has_any] = ts[ends[has_any] - 1]
+
+        out: Dict[str, np.ndarray] = {}
+        out["days_since_last_post"] = (now - last) / DAY_SECONDS
+        weeks = np.nan_to_num(last - first) / WEEK_SECONDS
+        out["posting_frequency_per_week"] = np.where(counts > 1, _safe_div(counts * 1.0, weeks), 0)
+
+        # Intervals between consecutive posts of the same creator
+        same = groups[1:] == groups[:-1]
+        intervals = np.diff(ts)[same]
+        interval_groups = groups[1:][same]
+        interval_n = np.bincount(interval_groups, minlength=n).astype(np.float64)
+        mean = _safe_div(_grouped_sum(interval_groups, intervals, n), interval_n)
+        sq_dev = (intervals - mean[interval_groups]) ** 2
+        std = np.sqrt(_safe_div(_grouped_sum(interval_groups, sq_dev, n), interval_n))
+        consistency = np.clip(100 - _safe_div(std, mean) * 100, 0, 100)
+        out["posting_consistency_score"] = np.where((interval_n > 0) & (mean > 0), consistency, 0)
+
+        # Most active weekday / hour (UTC); 1970-01-01 was a Thursday
+        days = np.floor(ts / DAY_SECONDS).astype(np.int64)
+        weekday = (days + 3) % 7
+        hour = ((ts - days * DAY_SECONDS) // 3600).astype(np.int64)
+        day_hist = np.bincount(groups * 7 + weekday, minlength=n * 7).reshape(n, 7)
+        hour_hist = np.bincount(groups * 24 + hour, minlength=n * 24).reshape(n, 24)
+        out["most_active_day"] = np.where(has_any, day_hist.argmax(axis=1), -1)
+        out["most_active_hour"] = np.where(has_any, hour_hist.argmax(axis=1), -1)
+        return out
+
+    # ------------------------------------------------------------------
+    # Catalog-wide viral thresholds
+    # ------------------------------------------------------------------
+
+    def viral_thresholds(self, samples: Iterable[ViralSample]) -> Dict[str, float]:
+        """
+        Percentiles of non-zero reel views and post engagement across samples
+
+        Args:
+            samples: One ViralSample per batch (pass every batch for catalog-wide values)
+
+        Returns:
+            Dict like {"reel_views_p99": ..., "post_engagement_p99": ...}
+        """
+        samples = list(samples)
+        thresholds: Dict[str, float] = {}
+        for name, values in (
+            ("reel_views", np.concatenate([s.reel_views for s in samples] or [np.empty(0)])),
+            (
+                "post_engagement",
+                np.concatenate([s.post_engagement for s in samples] or [np.empty(0)]),
+            ),
+        ):
+            values = values[values > 0]
+            if values.size:
+                for p, v in zip(self.percentiles, np.percentile(values, self.percentiles)):
+                    thresholds[f"{name}_p{p:g}"] = float(v)
+        return thresholds
+
+    def catalog_viral_counts(
+        self, n: int, sample: ViralSample, thresholds: Dict[str, float]
+    ) -> np.ndarray:
+        """Media per creator at or above the top catalog percentile"""
+        count = np.zeros(n)
+        if not self.percentiles:
+            return count
+        top = f"p{max(self.percentiles):g}"
+
+        reel_threshold = thresholds.get(f"reel_views_{top}")
+        if reel_threshold is not None:
+            mask = sample.reel_views >= max(reel_threshold, self.config.viral_min_views)
+            count += _grouped_sum(sample.reel_creator, mask.astype(np.float64), n)
+        post_threshold = thresholds.get(f"post_engagement_{top}")
+        if post_threshold is not None:
+            mask = sample.post_engagement >= post_threshold
+            count += _grouped_sum(sample.post_creator, mask.astype(np.float64), n)
+        return count
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def _defaults(self, reels_count: int, posts_count: int) -> Dict[str, Any]:
+        """Analytics dict with the same keys/defaults as InstagramAnalytics"""
+        return {
+            "avg_reel_views": 0,
+            "avg_reel_likes": 0,
+            "avg_reel_comments": 0,
+            "avg_reel_saves": 0,
+            "avg_reel_shares": 0,
+            "avg_likes_per_reel_cached": 0,
+            "avg_comments_per_reel_cached": 0,
+            "avg_saves_per_reel_cached": 0,
+            "avg_shares_per_reel_cached": 0,
+            "avg_post_likes": 0,
+            "avg_post_comments": 0,
+            "avg_post_saves": 0,
+            "avg_post_shares": 0,
+            "avg_post_engagement": 0,
+            "avg_likes_per_post_cached": 0,
+            "avg_comments_per_post_cached": 0,
+            "avg_saves_per_post_cached": 0,
+            "avg_shares_per_post_cached": 0,
+            "total_views": 0,
+            "total_likes": 0,
+            "total_comments": 0,
+            "total_saves": 0,
+            "total_shares": 0,
+            "total_engagement": 0,
+            "save_to_like_ratio": 0,
+            "engagement_rate": 0,
+            "avg_engagement_rate": 0,
+            "post_engagement_rate": 0,
+            "reel_engagement_rate": 0,
+            "avg_engagement_per_content": 0,
+            "reels_vs_posts_performance": 0,
+            "viral_content_rate": 0,
+            "viral_content_count": 0,
+            "viral_threshold_multiplier": self.config.viral_multiplier,
+            "posting_frequency_per_week": 0,
+            "posting_consistency_score": 0,
+            "content_reach_rate": 0,
+            "comment_to_like_ratio": 0,
+            "last_post_days_ago": None,
+            "total_content_analyzed": 0,
+            "reels_analyzed": reels_count,
+            "posts_analyzed": posts_count,
+            "best_performing_type": "unknown",
+            "best_content_type": None,
+            "avg_caption_length": 0,
+            "uses_hashtags": False,
+            "avg_hashtag_count": 0,
+            "most_active_day": None,
+            "most_active_hour": None,
+            "days_since_last_post": None,
+        }
+
+    def _row(self, m: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+        """Per-creator analytics dict (native Python types)"""
+        row = self._defaults(int(m["reels_analyzed"][i]), int(m["posts_analyzed"][i]))
+        for key in row:
+            if key in m and key not in (
+                "best_content_type",
+                "most_active_day",
+                "most_active_hour",
+                "days_since_last_post",
+                "uses_hashtags",
+            ):
+                row[key] = float(m[key][i])
+
+        for key in (
+            "reels_analyzed",
+            "posts_analyzed",
+            "total_content_analyzed",
+            "viral_content_count",
+        ):
+            row[key] = int(m[key][i])
+        row["uses_hashtags"] = bool(m["uses_hashtags"][i])
+        row["catalog_viral_count"] = int(m["catalog_viral_count"][i])
+
+        best = str(m["best_content_type"][i])
+        if best:
+            row["best_performing_type"] = row["best_content_type"] = best
+
+        if m["most_active_day"][i] >= 0:
+            days_ago = float(m["days_since_last_post"][i])
+            row["days_since_last_post"] = row["last_post_days_ago"] = days_ago
+            row["most_active_day"] = DAY_NAMES[int(m["most_active_day"][i])]
+            row["most_active_hour"] = int(m["most_active_hour"][i])
+        return row
+
+
+def group_by_creator(
+    creator_ids: Sequence[str], rows: Iterable[Mapping[str, Any]], key: str = "creator_id"
+) -> List[List[Mapping[str, Any]]]:
+    """Split stored media rows into per-creator lists aligned with creator_ids"""
+    index = {cid: i for i, cid in enumerate(creator_ids)}
+    grouped: List[List[Mapping[str, Any]]] = [[] for _ in creator_ids]
+    for row in rows:
+        i = index.get(str(row.get(key)))
+        if i is not None:
+            grouped[i].append(row)
+    return grouped
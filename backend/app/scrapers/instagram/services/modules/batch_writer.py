@@ -0,0 +1,295 @@
+"""
+Instagram Batch Writer Module
+Collects reels/posts rows and creator updates from concurrent creators into bulk writes
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from supabase import Client
+
+
+class BatchWriteError(Exception):
+    """A row this caller submitted could not be written"""
+
+
+@dataclass
+class _Submission:
+    """One caller's rows, resolved once the flush holding them finishes"""
+
+    future: asyncio.Future
+    rows: int
+    written: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def resolve(self) -> None:
+        if self.future.done():  # Caller was cancelled (e.g. creator timeout)
+            return
+        if self.errors and not self.written:
+            self.future.set_exception(BatchWriteError(self.errors[0]))
+        else:
+            self.future.set_result(self.written)
+
+
+@dataclass
+class BatchWriterStats:
+    """Round trips saved by batching"""
+
+    flushes: int = 0  # Flush cycles run
+    submissions: int = 0  # Per-creator writes handed to the writer
+    rows: int = 0  # Rows (or creator updates) written
+    round_trips: int = 0  # Upsert/RPC calls actually made
+    failed_rows: int = 0  # Rows rejected after isolation
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats snapshot for logs and status endpoints"""
+        return {
+            "flushes": self.flushes,
+            "submissions": self.submissions,
+            "rows": self.rows,
+            "round_trips": self.round_trips,
+            "failed_rows": self.failed_rows,
+        }
+
+
+class BatchWriter:
+    """
+    Cross-creator write buffer for one batch
+
+    Creator workers hand their reels/posts rows and instagram_creators updates
+    to the writer and await the result. Buffers are flushed when they reach
+    `max_rows` or `max_delay` seconds after the first row arrived, so a batch
+    of N creators costs a few bulk upserts instead of ~4N round trips. Callers
+    still get their own outcome back (rows written, or BatchWriteError), which
+    keeps per-creator success accounting intact.
+
+    A failed upsert is split in halves and retried until the offending rows
+    are isolated; creator updates go through apply_instagram_creator_updates,
+    which applies each update in its own savepoint.
+    """
+
+    UPDATES_RPC = "apply_instagram_creator_updates"
+
+    def __init__(self, supabase: Client, logger, max_rows: int = 500, max_delay: float = 0.5):
+        """
+        Initialize batch writer
+
+        Args:
+            supabase: Supabase client instance
+            logger: Logger instance
+            max_rows: Buffered rows that trigger an immediate flush (also the upsert chunk size)
+            max_delay: Seconds a buffered row waits for more rows before flushing
+        """
+        self.supabase = supabase
+        self.logger = logger
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max_delay
+        self.stats = BatchWriterStats()
+        # (table, on_conflict) -> [(conflict key, row, submission)]
+        self._upserts: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any], _Submission]]] = {}
+        # creator_id -> (merged fields, submissions)
+        self._updates: Dict[str, Tuple[Dict[str, Any], List[_Submission]]] = {}
+        self._buffered = 0
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> int:
+        """
+        Queue rows for a bulk upsert and wait for the flush
+
+        Args:
+            table: Table name
+            rows: Rows to upsert (same columns as other callers' rows for the table)
+            on_conflict: Conflict column, also used to dedupe rows across callers
+
+        Returns:
+            Number of this caller's rows written
+
+        Raises:
+            BatchWriteError: If none of the rows could be written
+        """
+        if not rows:
+            return 0
+        submission = self._submit(len(rows))
+        buffer = self._upserts.setdefault((table, on_conflict), [])
+        for row in rows:
+            buffer.append((str(row.get(on_conflict)), row, submission))
+        self._buffered += len(rows)
+        return await self._wait(submission)  # type: ignore[no-any-return]
+
+    async def update_creator(self, creator_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Queue an instagram_creators update and wait for the flush
+
+        Updates to the same creator within one flush are merged (later fields win).
+
+        Raises:
+            BatchWriteError: If the update was rejected
+        """
+        if not fields:
+            return
+        submission = self._submit(1)
+        pending = self._updates.get(creator_id)
+        if pending is None:
+            self._updates[creator_id] = (dict(fields), [submission])
+            self._buffered += 1
+        else:
+            pending[0].update(fields)
+            pending[1].append(submission)
+        await self._wait(submission)
+
+    def _submit(self, rows: int) -> _Submission:
+        self.stats.submissions += 1
+        return _Submission(future=asyncio.get_running_loop().create_future(), rows=rows)
+
+    async def _wait(self, submission: _Submission) -> Any:
+        if self._buffered >= self.max_rows:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+        return await submission.future
+
+    def _start_flush(self) -> None:
+        # Flushes run in their own task, so a caller cancelled mid-flush (creator
+        # timeout) cannot leave the other callers' futures unresolved
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """Write everything buffered so far"""
+        async with self._lock:
+            upserts, self._upserts = self._upserts, {}
+            updates, self._updates = self._updates, {}
+            self._buffered = 0
+            if not upserts and not updates:
+                return
+
+            self.stats.flushes += 1
+            for (table, on_conflict), entries in upserts.items():
+                await self._flush_upserts(table, on_conflict, entries)
+            if updates:
+                await self._flush_updates(updates)
+
+    async def close(self) -> None:
+        """Flush the remaining buffers at the end of a batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _flush_upserts(
+        self,
+        table: str,
+        on_conflict: str,
+        entries: List[Tuple[str, Dict[str, Any], _Submission]],
+    ) -> None:
+        # The same media can be submitted twice (collab posts, retried creators); Postgres
+        # rejects a statement that touches a row twice, so the last copy wins
+        latest: Dict[str, Dict[str, Any]] = {}
+        owners: Dict[str, List[_Submission]] = {}
+        for key, row, submission in entries:
+            latest[key] = row
+            owners.setdefault(key, []).append(submission)
+        keys = list(latest)
+        rows = [latest[k] for k in keys]
+
+        try:
+            failures: Dict[int, str] = {}
+            for start in range(0, len(rows), self.max_rows):
+                chunk = rows[start : start + self.max_rows]
+                chunk_failures = await asyncio.to_thread(
+                    self._upsert_isolated, table, chunk, on_conflict
+                )
+                failures.update({start + i: error for i, error in chunk_failures.items()})
+        except Exception as e:
+            failures = {i: str(e) for i in range(len(rows))}
+
+        for index, key in enumerate(keys):
+            error = failures.get(index)
+            for submission in owners[key]:
+                if error is None:
+                    submission.written += 1
+                else:
+                    submission.errors.append(error)
+        self.stats.rows += len(rows) - len(failures)
+        self.stats.failed_rows += len(failures)
+        if failures:
+            self.logger.warning(
+                f"⚠️ {len(failures)}/{len(rows)} {table} rows rejected: "
+                f"{next(iter(failures.values()))}"
+            )
+        else:
+            self.logger.debug(f"Flushed {len(rows)} {table} rows")
+
+        for submission in {id(s): s for _, _, s in entries}.values():
+            submission.resolve()
+
+    def _upsert_isolated(
+        self, table: str, rows: List[Dict[str, Any]], on_conflict: str
+    ) -> Dict[int, str]:
+        """Upsert rows, bisecting on failure; returns errors by row index"""
+        self.stats.round_trips += 1
+        try:
+            self.supabase.table(table).upsert(rows, on_conflict=on_conflict).execute()
+            return {}
+        except Exception as e:
+            if len(rows) == 1:
+                return {0: str(e)}
+        mid = len(rows) // 2
+        failures = self._upsert_isolated(table, rows[:mid], on_conflict)
+        for index, error in self._upsert_isolated(table, rows[mid:], on_conflict).items():
+            failures[mid + index] = error
+        return failures
+
+    async def _flush_updates(
+        self, updates: Dict[str, Tuple[Dict[str, Any], List[_Submission]]]
+    ) -> None:
+        payload: List[Dict[str, Any]] = [
+            {"ig_user_id": creator_id, "fields": fields}
+            for creator_id, (fields, _) in updates.items()
+        ]
+        errors: Dict[str, str] = {}
+        for start in range(0, len(payload), self.max_rows):
+            chunk = payload[start : start + self.max_rows]
+            self.stats.round_trips += 1
+            try:
+                result = await asyncio.to_thread(self._apply_updates, chunk)
+                for row in result.data or []:
+                    errors[str(row["creator_id"])] = row.get("error") or "update failed"
+            except Exception as e:
+                errors.update({item["ig_user_id"]: str(e) for item in chunk})
+
+        for creator_id, (_, submissions) in updates.items():
+            error = errors.get(creator_id)
+            for submission in submissions:
+                if error is None:
+                    submission.written = 1
+                else:
+                    submission.errors.append(error)
+                submission.resolve()
+        self.stats.rows += len(updates) - len(errors)
+        self.stats.failed_rows += len(errors)
+        if errors:
+            self.logger.warning(
+                f"⚠️ {len(errors)}/{len(updates)} creator updates rejected: "
+                f"{next(iter(errors.values()))}"
+            )
+
+    def _apply_updates(self, chunk: List[Dict[str, Any]]) -> Any:
+        return self.supabase.rpc(self.UPDATES_RPC, {"p_updates": chunk}).execute()
+
+    def log_summary(self) -> None:
+        """One line of batching stats"""
+        s = self.stats
+        self.logger.info(
+            f"📦 Batch writer: {s.submissions} writes in {s.round_trips} round trips "
+            f"({s.flushes} flushes, {s.rows} rows, {s.failed_rows} rejected)"
+        )
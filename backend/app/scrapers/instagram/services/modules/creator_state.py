@@ -0,0 +1,194 @@
+"""
+Instagram Creator State Module
+Loads the database state process_creator needs in a single RPC per batch
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from supabase import Client
+
+from .utils import is_r2_url
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """ISO timestamp (as returned by PostgREST) -> Unix seconds"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass
+class CreatorState:
+    """
+    Snapshot of a creator's stored state
+
+    reel_urls / post_image_urls map media_pk -> stored URL(s) for the newest
+    `media_window` items, which is what the scraper re-fetches each cycle.
+
+    last_media_count is written after each successful media fetch and
+    media_refreshed_at after each full-depth one; with latest_taken_at they
+    tell whether a profile shows anything new and when counts were refreshed.
+
+    media_hashes maps media_pk -> stored raw_media_hash, so unchanged raw
+    payloads are not re-sent.
+    """
+
+    creator_id: str
+    reels_count: int = 0
+    posts_count: int = 0
+    profile_pic_url: Optional[str] = None
+    total_api_calls: int = 0
+    reel_urls: Dict[str, Optional[str]] = field(default_factory=dict)
+    post_image_urls: Dict[str, Optional[List[str]]] = field(default_factory=dict)
+    last_media_count: Optional[int] = None
+    media_refreshed_at: Optional[float] = None  # Unix seconds
+    latest_taken_at: Optional[float] = None  # Newest stored reel/post (Unix seconds)
+    media_hashes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_new(self) -> bool:
+        """True if no reels or posts have been stored yet"""
+        return self.reels_count == 0 and self.posts_count == 0
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "CreatorState":
+        """Build state from a get_instagram_creator_states row"""
+        return cls(
+            creator_id=str(row["ig_user_id"]),
+            reels_count=int(row.get("reels_count") or 0),
+            posts_count=int(row.get("posts_count") or 0),
+            profile_pic_url=row.get("profile_pic_url"),
+            total_api_calls=int(row.get("total_api_calls") or 0),
+            reel_urls=row.get("reel_urls") or {},
+            post_image_urls=row.get("post_image_urls") or {},
+            last_media_count=row.get("last_media_count"),
+            media_refreshed_at=_epoch(row.get("media_refreshed_at")),
+            latest_taken_at=_epoch(row.get("latest_taken_at")),
+            media_hashes=row.get("media_hashes") or {},
+        )
+
+    def media_unchanged(
+        self, media_count: Optional[int], latest_taken_at: Optional[float] = None
+    ) -> bool:
+        """
+        Check whether a fresh profile shows no media published since the last fetch
+
+        Args:
+            media_count: media_count from the fresh profile
+            latest_taken_at: Newest taken_at embedded in the profile (if any)
+
+        Returns:
+            True if reels/posts pagination can be skipped
+        """
+        if self.is_new or self.last_media_count is None or media_count is None:
+            return False
+        if int(media_count) != self.last_media_count:
+            return False
+        # A delete plus a new post keeps the count; the newest timestamp catches that
+        return latest_taken_at is None or (
+            self.latest_taken_at is not None and latest_taken_at <= self.latest_taken_at
+        )
+
+    def refresh_due(self, interval_seconds: float, now: Optional[float] = None) -> bool:
+        """True if engagement on stored media has not been refreshed within the interval"""
+        if self.media_refreshed_at is None:
+            return True
+        now = now if now is not None else time.time()
+        return now - self.media_refreshed_at >= interval_seconds
+
+    def raw_hash(self, media_pk: Any) -> Optional[str]:
+        """Stored raw_media_hash for a media item (None if unknown)"""
+        return self.media_hashes.get(str(media_pk))
+
+    def known_reels(self, media_pks: Iterable[str]) -> Tuple[set, Dict[str, str]]:
+        """
+        Split fetched reels into already-stored pks and pks already in R2
+
+        Returns:
+            Tuple of (existing_pks, media_pk -> R2 video_url)
+        """
+        existing = {pk for pk in media_pks if pk in self.reel_urls}
+        in_r2 = {pk: self.reel_urls[pk] for pk in existing if is_r2_url(self.reel_urls[pk])}
+        return existing, in_r2  # type: ignore[return-value]
+
+    def known_posts(self, media_pks: Iterable[str]) -> Tuple[set, Dict[str, List[str]]]:
+        """
+        Split fetched posts into already-stored pks and pks whose images are in R2
+
+        Returns:
+            Tuple of (existing_pks, media_pk -> R2 image_urls)
+        """
+        existing = {pk for pk in media_pks if pk in self.post_image_urls}
+        in_r2 = {}
+        for pk in existing:
+            urls = self.post_image_urls[pk]
+            if urls and is_r2_url(urls[0]):
+                in_r2[pk] = urls
+        return existing, in_r2
+
+
+class CreatorStateLoader:
+    """
+    Batch loader for CreatorState via the get_instagram_creator_states RPC
+
+    Replaces per-creator count/profile/media_pk/api-call queries with one call
+    per chunk of creators. Failures return no state, and callers fall back to
+    their per-creator queries.
+    """
+
+    RPC_NAME = "get_instagram_creator_states"
+
+    def __init__(self, supabase: Client, logger, media_window: int = 100, chunk_size: int = 200):
+        """
+        Initialize state loader
+
+        Args:
+            supabase: Supabase client instance
+            logger: Logger instance
+            media_window: Newest media per creator to include (>= max fetch depth)
+            chunk_size: Creator IDs per RPC call (keeps payloads bounded)
+        """
+        self.supabase = supabase
+        self.logger = logger
+        self.media_window = media_window
+        self.chunk_size = chunk_size
+
+    def load_many(self, creator_ids: List[str]) -> Dict[str, CreatorState]:
+        """
+        Load state for a batch of creators
+
+        Args:
+            creator_ids: Instagram creator IDs
+
+        Returns:
+            Dict of creator_id -> CreatorState (missing IDs failed to load)
+        """
+        states: Dict[str, CreatorState] = {}
+        ids = [str(cid) for cid in creator_ids if cid]
+
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start : start + self.chunk_size]
+            try:
+                result = self.supabase.rpc(
+                    self.RPC_NAME,
+                    {"p_creator_ids": chunk, "p_media_limit": self.media_window},
+                ).execute()
+                for row in result.data or []:
+                    state = CreatorState.from_row(row)
+                    states[state.creator_id] = state
+            except Exception as e:
+                self.logger.warning(f"Failed to load creator state for {len(chunk)} creators: {e}")
+
+        if ids:
+            self.logger.info(f"📦 Loaded state for {len(states)}/{len(ids)} creators")
+        return states
+
+    def load(self, creator_id: str) -> Optional[CreatorState]:
+        """Load state for a single creator (None if the RPC failed)"""
+        return self.load_many([creator_id]).get(str(creator_id))
@@ -0,0 +1,279 @@
+"""
+Instagram Discovery Crawler Module
+Concurrent related-creator discovery over a deduplicated frontier
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+SEED = 1  # Frontier priorities: candidate profiles are drained before new seeds
+CANDIDATE = 0
+
+
+@dataclass
+class DiscoveryProgress:
+    """Live counters for one crawl"""
+
+    seeds: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    seeds_done: int = 0
+    related_found: int = 0  # Related profiles returned for all seeds
+    duplicates: int = 0  # Seen earlier in this crawl
+    known: int = 0  # Already in the database
+    profiles_fetched: int = 0
+    created: int = 0
+    failed: int = 0
+    current_seed: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the crawl started"""
+        return time.monotonic() - self.started_at
+
+    @property
+    def candidates_per_min(self) -> float:
+        """Related profiles triaged per minute"""
+        return self.related_found * 60 / max(self.elapsed, 1.0)
+
+    def error(self, message: str) -> None:
+        """Count a failure and keep its message (last 20)"""
+        self.failed += 1
+        self.errors = [*self.errors[-19:], message]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Progress snapshot for logs and status endpoints"""
+        return {
+            "seeds": self.seeds,
+            "seeds_done": self.seeds_done,
+            "related_found": self.related_found,
+            "duplicates": self.duplicates,
+            "known": self.known,
+            "profiles_fetched": self.profiles_fetched,
+            "created": self.created,
+            "failed": self.failed,
+            "candidates_per_min": round(self.candidates_per_min, 1),
+            "elapsed_seconds": round(self.elapsed, 1),
+        }
+
+
+class DiscoveryCrawler:
+    """
+    Crawl the related profiles of seed creators into new creator rows
+
+    Seeds and candidate profiles share one priority frontier worked by
+    `concurrency` coroutines; candidates go first so new rows are written
+    early. Every related profile is deduplicated against the crawl, and the
+    profiles of one seed are prefiltered against the database in one call,
+    so only unknown creators cost a profile fetch. New rows are inserted in
+    batches; a seed is marked processed once all of its candidates were
+    written. API calls wait on the pacer (the app's RapidAPI rate limiter).
+
+    The source supplies the I/O as coroutines:
+        related(seed) -> related profile nodes, or None on error
+        known(nodes) -> the nodes already in the database
+        profile(node) -> full profile, or None
+        prepare(profile, seed) -> row to insert (e.g. after a picture upload)
+        insert(rows) -> number of rows inserted
+        mark_processed(seeds)
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        pacer: Any,
+        logger,
+        concurrency: int = 8,
+        insert_batch: int = 25,
+        progress_interval: float = 30.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[DiscoveryProgress], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize crawler
+
+        Args:
+            source: Object with the I/O coroutines listed above
+            pacer: Rate limiter for related/profile API calls (awaitable wait())
+            logger: Logger instance
+            concurrency: Frontier worker coroutines
+            insert_batch: Buffered new rows that trigger an insert
+            progress_interval: Seconds between aggregated progress reports
+            should_stop: Cheap stop check; workers stop taking frontier items
+            on_progress: Called with the progress every interval and at the end
+        """
+        self.source = source
+        self.pacer = pacer
+        self.logger = logger
+        self.concurrency = max(1, concurrency)
+        self.insert_batch = max(1, insert_batch)
+        self.progress_interval = progress_interval
+        self.should_stop = should_stop or (lambda: False)
+        self.on_progress = on_progress
+        self.progress = DiscoveryProgress()
+
+        self._frontier: asyncio.PriorityQueue[Any] = asyncio.PriorityQueue()
+        self._order = itertools.count()
+        self._seen: Set[str] = set()
+        self._outstanding: Dict[Any, int] = {}  # Seed id -> candidates not yet buffered
+        self._rows: List[Dict[str, Any]] = []
+        self._finished_seeds: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+
+    async def run(self, seeds: List[Dict[str, Any]]) -> DiscoveryProgress:
+        """
+        Crawl the related profiles of `seeds`
+
+        Args:
+            seeds: Creators with id, ig_user_id and username
+
+        Returns:
+            Final progress
+        """
+        self.progress = DiscoveryProgress(seeds=len(seeds))
+        for seed in seeds:
+            self._seen.update(_keys(seed))
+        for seed in seeds:
+            self._push(SEED, seed)
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        reporter = asyncio.create_task(self._report_loop())
+        try:
+            await self._frontier.join()
+        finally:
+            reporter.cancel()
+            for worker in workers:
+                worker.cancel()
+            await self._flush()
+
+        await self._report()
+        return self.progress
+
+    def _push(self, priority: int, item: Any) -> None:
+        self._frontier.put_nowait((priority, next(self._order), item))
+
+    async def _worker(self) -> None:
+        """Work frontier items; after a stop the rest are drained without being processed"""
+        while True:
+            priority, _, item = await self._frontier.get()
+            try:
+                if self.should_stop():
+                    continue
+                if priority == SEED:
+                    await self._expand(item)
+                else:
+                    await self._visit(*item)
+            except Exception as e:
+                self.logger.error(f"❌ Discovery worker error: {e}")
+            finally:
+                self._frontier.task_done()
+
+    async def _expand(self, seed: Dict[str, Any]) -> None:
+        """Fetch a seed's related profiles and queue the unknown ones"""
+        progress = self.progress
+        progress.current_seed = seed.get("username")
+        await self.pacer.wait()
+        try:
+            nodes = await self.source.related(seed)
+        except Exception as e:
+            nodes = None
+            progress.error(f"{seed.get('username')}: related profiles failed: {e}")
+
+        fresh = []
+        for node in nodes or []:
+            progress.related_found += 1
+            keys = _keys(node)
+            if not keys or keys & self._seen:
+                progress.duplicates += 1
+                continue
+            self._seen.update(keys)
+            fresh.append(node)
+
+        if fresh:
+            try:
+                known = await self.source.known(fresh)
+            except Exception as e:
+                known = []
+                self.logger.warning(f"⚠️ Known-creator prefilter failed, fetching all: {e}")
+            known_keys = set().union(*(_keys(node) for node in known)) if known else set()
+            fresh = [node for node in fresh if not _keys(node) & known_keys]
+            progress.known += len(known)
+
+        self._outstanding[seed["id"]] = len(fresh)
+        for node in fresh:
+            self._push(CANDIDATE, (node, seed))
+        await self._settle(seed, handled=0)
+
+    async def _visit(self, node: Dict[str, Any], seed: Dict[str, Any]) -> None:
+        """Fetch one unknown candidate's profile and buffer its row"""
+        progress = self.progress
+        await self.pacer.wait()
+        try:
+            profile = await self.source.profile(node)
+            if profile:
+                progress.profiles_fetched += 1
+                self._rows.append(await self.source.prepare(profile, seed))
+        except Exception as e:
+            progress.error(f"{node.get('username')}: {e}")
+        await self._settle(seed, handled=1)
+
+    async def _settle(self, seed: Dict[str, Any], handled: int) -> None:
+        """Count handled candidates of a seed; flush once enough rows are buffered"""
+        self._outstanding[seed["id"]] -= handled
+        if self._outstanding[seed["id"]] == 0:
+            self.progress.seeds_done += 1
+            self._finished_seeds.append(seed)
+        if len(self._rows) >= self.insert_batch:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        """Insert buffered rows, then mark the seeds whose candidates are all written"""
+        async with self._flush_lock:
+            rows, self._rows = self._rows, []
+            seeds, self._finished_seeds = self._finished_seeds, []
+            if rows:
+                try:
+                    self.progress.created += await self.source.insert(rows)
+                except Exception as e:
+                    self.progress.error(f"Insert of {len(rows)} creators failed: {e}")
+                    seeds = []  # Retry these seeds in a later crawl
+            if seeds:
+                try:
+                    await self.source.mark_processed(seeds)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Failed to mark {len(seeds)} seeds processed: {e}")
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await self._report()
+
+    async def _report(self) -> None:
+        progress = self.progress
+        self.logger.info(
+            f"🔎 Discovery: {progress.seeds_done}/{progress.seeds} seeds, "
+            f"{progress.related_found} related ({progress.duplicates} dupes, "
+            f"{progress.known} known), {progress.profiles_fetched} fetched, "
+            f"{progress.created} created, {progress.failed} failed "
+            f"({progress.candidates_per_min:.0f} candidates/min)"
+        )
+        if self.on_progress:
+            try:
+                await self.on_progress(progress)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Progress callback failed: {e}")
+
+
+def _keys(node: Dict[str, Any]) -> Set[str]:
+    """Identity keys of a creator or related profile (id and lowercased username)"""
+    keys = set()
+    node_id = node.get("ig_user_id") or node.get("pk") or node.get("id")
+    if node_id:
+        keys.add(f"id:{node_id}")
+    if node.get("username"):
+        keys.add(f"u:{str(node['username']).lower()}")
+    return keys
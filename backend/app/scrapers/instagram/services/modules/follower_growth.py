@@ -0,0 +1,248 @@
+"""
+Instagram Follower Growth Module
+Records follower history samples and computes daily/weekly growth
+
+Two paths:
+- Warm: history for the batch is bulk-loaded at cycle start, growth is computed
+  in-process and new samples are inserted in batches (no per-creator reads)
+- Cold: one record_instagram_follower_sample RPC inserts the sample and returns
+  the growth rates (one round trip instead of four)
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from supabase import Client
+
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+
+@dataclass
+class FollowerHistory:
+    """
+    Recent follower history for one creator
+
+    samples: (unix_ts, followers_count) oldest-first, starting at the latest
+        sample at or before the weekly window so weekly lookbacks resolve.
+    previous_distinct: most recent count that differs from the latest sample.
+    """
+
+    samples: List[Tuple[float, int]] = field(default_factory=list)
+    previous_distinct: Optional[int] = None
+
+
+def _growth_rate(current: int, previous: Optional[int]) -> Optional[float]:
+    """Percentage growth; 0% and missing baselines are None (matches the SQL function)"""
+    if not previous or previous <= 0:
+        return None
+    rate = ((current - previous) / previous) * 100
+    return round(rate, 2) if rate else None
+
+
+def compute_growth(
+    history: FollowerHistory, current_followers: int, now: float
+) -> Dict[str, Optional[float]]:
+    """
+    Compute growth rates from cached history
+
+    Args:
+        history: Cached history for the creator
+        current_followers: Follower count just fetched
+        now: Current unix timestamp
+
+    Returns:
+        Dict with daily_growth_rate, weekly_growth_rate, previous_followers_count
+    """
+    daily_base = weekly_base = previous = None
+
+    for ts, followers in reversed(history.samples):
+        if daily_base is None and ts <= now - DAY_SECONDS:
+            daily_base = followers
+        if weekly_base is None and ts <= now - WEEK_SECONDS:
+            weekly_base = followers
+        if previous is None and followers != current_followers:
+            previous = followers
+        if daily_base is not None and weekly_base is not None and previous is not None:
+            break
+
+    if previous is None and history.samples:
+        # Every cached sample equals the current count, so the answer is the
+        # last different count before the latest sample
+        previous = history.previous_distinct
+
+    return {
+        "daily_growth_rate": _growth_rate(current_followers, daily_base),
+        "weekly_growth_rate": _growth_rate(current_followers, weekly_base),
+        "previous_followers_count": previous,
+    }
+
+
+class FollowerGrowthTracker:
+    """
+    Follower history recorder with an in-process history cache
+
+    warm() bulk-loads history for a batch; record() then computes growth locally
+    and buffers the history row. flush() writes buffered rows in one insert and
+    must be called at the end of a batch (it also runs when the buffer fills).
+    """
+
+    HISTORY_TABLE = "instagram_follower_history"
+    STATES_RPC = "get_instagram_follower_history_states"
+    RECORD_RPC = "record_instagram_follower_sample"
+
+    def __init__(self, supabase: Client, logger, flush_size: int = 100, chunk_size: int = 200):
+        """
+        Initialize growth tracker
+
+        Args:
+            supabase: Supabase client instance
+            logger: Logger instance
+            flush_size: Buffered history rows that trigger an insert
+            chunk_size: Creator IDs per warm-up RPC call
+        """
+        self.supabase = supabase
+        self.logger = logger
+        self.flush_size = flush_size
+        self.chunk_size = chunk_size
+        self._cache: Dict[str, FollowerHistory] = {}
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def warm(self, creator_ids: List[str]) -> int:
+        """
+        Bulk-load recent history for a batch of creators
+
+        Args:
+            creator_ids: Instagram creator IDs
+
+        Returns:
+            Number of creators cached
+        """
+        ids = [str(cid) for cid in creator_ids if cid]
+        loaded: Dict[str, FollowerHistory] = {}
+
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start : start + self.chunk_size]
+            try:
+                result = self.supabase.rpc(self.STATES_RPC, {"p_creator_ids": chunk}).execute()
+                for row in result.data or []:
+                    loaded[str(row["creator_id"])] = FollowerHistory(
+                        samples=[(float(ts), int(f)) for ts, f in row.get("samples") or []],
+                        previous_distinct=row.get("previous_distinct"),
+                    )
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to warm follower history for {len(chunk)} creators: {e}"
+                )
+
+        with self._lock:
+            self._cache.update(loaded)
+        if ids:
+            self.logger.info(f"📈 Warmed follower history for {len(loaded)}/{len(ids)} creators")
+        return len(loaded)
+
+    def record(
+        self,
+        creator_id: str,
+        username: str,
+        current_followers: int,
+        current_following: Optional[int] = None,
+        media_count: Optional[int] = None,
+    ) -> Dict[str, Optional[float]]:
+        """
+        Record a follower sample and return growth rates
+
+        Args:
+            creator_id: Instagram creator ID
+            username: Creator username
+            current_followers: Current follower count
+            current_following: Current following count
+            media_count: Current media count
+
+        Returns:
+            Dict with daily_growth_rate, weekly_growth_rate, previous_followers_count
+
+        Raises:
+            Exception: If the cold-path RPC fails (caller decides the fallback)
+        """
+        creator_id = str(creator_id)
+        with self._lock:
+            history = self._cache.get(creator_id)
+
+        if history is None:
+            result = self.supabase.rpc(
+                self.RECORD_RPC,
+                {
+                    "p_creator_id": creator_id,
+                    "p_username": username,
+                    "p_followers_count": current_followers,
+                    "p_following_count": current_following,
+                    "p_media_count": media_count,
+                },
+            ).execute()
+            row = (result.data or [{}])[0]
+            return {
+                "daily_growth_rate": _as_float(row.get("daily_growth_rate")),
+                "weekly_growth_rate": _as_float(row.get("weekly_growth_rate")),
+                "previous_followers_count": row.get("previous_followers_count"),
+            }
+
+        now = time.time()
+        growth = compute_growth(history, current_followers, now)
+
+        with self._lock:
+            # The new sample becomes the latest; keep one sample at/before the weekly window
+            history.samples.append((now, current_followers))
+            history.previous_distinct = growth["previous_followers_count"]  # type: ignore[assignment]
+            cutoff = now - WEEK_SECONDS
+            while len(history.samples) > 1 and history.samples[1][0] <= cutoff:
+                history.samples.pop(0)
+
+            self._pending.append(
+                {
+                    "creator_id": creator_id,
+                    "username": username,
+                    "followers_count": current_followers,
+                    "following_count": current_following,
+                    "media_count": media_count,
+                    "recorded_at": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+                }
+            )
+            should_flush = len(self._pending) >= self.flush_size
+
+        if should_flush:
+            self.flush()
+        return growth
+
+    def flush(self) -> int:
+        """
+        Insert buffered history rows
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+
+        try:
+            self.supabase.table(self.HISTORY_TABLE).insert(rows).execute()
+            self.logger.debug(f"Flushed {len(rows)} follower history rows")
+            return len(rows)
+        except Exception as e:
+            self.logger.warning(f"Failed to flush {len(rows)} follower history rows: {e}")
+            with self._lock:
+                # Keep them for the next flush rather than losing history (bounded)
+                self._pending = (rows + self._pending)[-self.flush_size * 10 :]
+            return 0
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """PostgREST returns numeric as str/float; normalise to float"""
+    return float(value) if value is not None else None
@@ -0,0 +1,225 @@
+"""
+Instagram Request Hedging Module
+Duplicates slow RapidAPI calls once and keeps whichever response lands first
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies for one endpoint"""
+
+    def __init__(self, size: int = 200):
+        self.samples: Deque[float] = deque(maxlen=max(1, size))
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile of the window (None while empty)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+@dataclass
+class HedgeStats:
+    """Hedging outcomes, to judge whether the duplicate calls pay for themselves"""
+
+    requests: int = 0  # Calls made through the hedger
+    hedged: int = 0  # Duplicates fired (each one is an extra billed API call)
+    hedge_wins: int = 0  # Duplicate answered first
+    primary_wins: int = 0  # Original answered first after all
+    budget_skipped: int = 0  # Slow calls that were not hedged because of the budget cap
+    thresholds: Dict[str, float] = field(default_factory=dict)  # Current delay per endpoint
+
+    @property
+    def hedge_rate(self) -> float:
+        """Share of requests that fired a duplicate (0 before any request)"""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Share of duplicates that beat the original (0 before any duplicate)"""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats snapshot for logs and status endpoints"""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "extra_calls": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "budget_skipped": self.budget_skipped,
+            "hedge_rate": round(self.hedge_rate, 4),
+            "win_rate": round(self.win_rate, 3),
+            "thresholds_ms": {k: int(v * 1000) for k, v in self.thresholds.items()},
+        }
+
+
+class RequestHedger:
+    """
+    Tail-latency hedging for idempotent GET calls
+
+    Each endpoint keeps a rolling window of successful latencies. A call that
+    has not answered by the window's quantile (p95 by default) gets one
+    duplicate; the first successful response wins and the other is cancelled.
+    Duplicates are capped at `budget` of all requests so a slow API cannot
+    double the RapidAPI bill, and nothing is hedged until `min_samples`
+    latencies are known for the endpoint.
+    """
+
+    def __init__(
+        self,
+        logger,
+        quantile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 1.0,
+        max_delay: float = 15.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize hedger
+
+        Args:
+            logger: Logger instance
+            quantile: Latency quantile used as the hedge delay
+            budget: Max share of requests allowed to fire a duplicate
+            min_delay: Floor for the hedge delay in seconds
+            max_delay: Ceiling for the hedge delay in seconds
+            window: Latencies kept per endpoint
+            min_samples: Latencies needed before an endpoint is hedged
+        """
+        self.logger = logger
+        self.quantile = quantile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.window = window
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._latencies: Dict[str, LatencyWindow] = {}
+
+    def threshold(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging a call to `key` (None until enough samples)"""
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        value = latencies.quantile(self.quantile)
+        return min(self.max_delay, max(self.min_delay, value)) if value is not None else None
+
+    def _budget_allows(self) -> bool:
+        return self.stats.hedged + 1 <= self.budget * self.stats.requests
+
+    def _record(self, key: str, seconds: float) -> None:
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = LatencyWindow(self.window)
+        latencies.add(seconds)
+
+    async def _timed(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        pace: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> T:
+        if pace:
+            await pace()  # Outside the timing: a wait for a rate-limit slot is not latency
+        started = time.monotonic()
+        result = await call()
+        self._record(key, time.monotonic() - started)
+        return result
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        on_hedge: Optional[Callable[[], Any]] = None,
+        pace: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> T:
+        """
+        Run `call`, firing one duplicate if it is slower than the endpoint's threshold
+
+        Args:
+            key: Endpoint name the latency window is kept under
+            call: Factory returning a fresh awaitable for each attempt
+            on_hedge: Called when a duplicate is fired (e.g. to count the extra API call)
+            pace: Awaited before every attempt, duplicates included (e.g. the rate
+                limiter, so duplicates count against the request rate). The hedge
+                delay starts once the original attempt is paced.
+
+        Returns:
+            Result of whichever attempt succeeded first
+
+        Raises:
+            The original attempt's exception if every attempt failed
+        """
+        self.stats.requests += 1
+        delay = self.threshold(key)
+        if pace:
+            await pace()
+        primary = asyncio.ensure_future(self._timed(key, call))
+        attempts = [primary]
+        try:
+            if delay is None:
+                return await primary
+
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return primary.result()
+            if not self._budget_allows():
+                self.stats.budget_skipped += 1
+                return await primary
+
+            self.stats.hedged += 1
+            self.stats.thresholds[key] = delay
+            if on_hedge:
+                on_hedge()
+            hedge = asyncio.ensure_future(self._timed(key, call, pace))
+            attempts.append(hedge)
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        else:
+                            self.stats.primary_wins += 1
+                        return task.result()
+            # Both failed; surface the original error
+            hedge.exception()  # Retrieved so asyncio does not log it as unhandled
+            return primary.result()
+        finally:
+            # The loser (or both, if the caller was cancelled) stops waiting on its response.
+            # A blocking call running in a thread still finishes there, so executors for
+            # hedged calls need room for the duplicates.
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def log_summary(self) -> None:
+        """One line of hedging stats"""
+        s = self.stats
+        if not s.hedged:
+            self.logger.info(f"🪁 Hedging: {s.requests} requests, no duplicates fired")
+            return
+        self.logger.info(
+            f"🪁 Hedging: {s.hedged}/{s.requests} requests hedged ({s.hedge_rate * 100:.1f}%), "
+            f"duplicate won {s.hedge_wins} ({s.win_rate * 100:.0f}%), "
+            f"{s.budget_skipped} skipped by budget"
+        )
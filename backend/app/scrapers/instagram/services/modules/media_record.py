@@ -0,0 +1,182 @@
+"""
+Instagram Media Record Module
+Normalizes a RapidAPI reel/post item once into the values storage and analytics read
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .utils import extract_hashtags, extract_mentions
+
+
+# Field name variations, in order of preference (the API is not consistent)
+VIEW_FIELDS = ("play_count", "ig_play_count", "video_view_count", "view_count")
+POST_VIEW_FIELDS = ("view_count", "play_count", "video_view_count")
+IG_PLAY_FIELDS = ("ig_play_count", "play_count")
+LIKE_FIELDS = ("like_count", "likes")
+COMMENT_FIELDS = ("comment_count", "comments")
+SAVE_FIELDS = ("save_count", "saves")
+SHARE_FIELDS = ("share_count", "shares")
+
+
+def _metric(item: Dict[str, Any], fields: Sequence[str], default: Any = 0) -> Any:
+    """First non-None value among field variations (0 is a value)"""
+    for name in fields:
+        value = item.get(name)
+        if value is not None:
+            return value
+    return default
+
+
+def _first_url(versions: Any) -> Optional[str]:
+    """URL of the first (highest quality) entry of a versions/candidates list"""
+    if isinstance(versions, list) and versions and isinstance(versions[0], dict):
+        url: Optional[str] = versions[0].get("url")
+        return url
+    return None
+
+
+def _thumbnail(item: Dict[str, Any]) -> Optional[str]:
+    images = item.get("image_versions2")
+    return _first_url(images.get("candidates")) if isinstance(images, dict) else None
+
+
+def _caption_text(item: Dict[str, Any]) -> str:
+    caption = item.get("caption")
+    if isinstance(caption, dict):
+        return caption.get("text") or ""
+    return str(caption) if caption else ""
+
+
+@dataclass
+class MediaRecord:
+    """
+    One reel or post with every derived value resolved
+
+    Built once per API item; storage turns it into a row and analytics reads
+    the metrics from it, so field variations, caption parsing and the
+    hashtag/mention regexes run once per item. `item` keeps the raw API item
+    for the columns copied verbatim and the raw payload policy.
+
+    Metrics are None when the API did not return them, except likes/comments
+    (0) and reel views (0), which the rows have always defaulted.
+    """
+
+    __slots__ = (
+        "caption_text",
+        "comments",
+        "hashtags",
+        "ig_play_count",
+        "image_urls",
+        "item",
+        "kind",
+        "likes",
+        "mentions",
+        "pk",
+        "post_type",
+        "saves",
+        "shares",
+        "taken_at",
+        "thumbnail_url",
+        "video_url",
+        "views",
+    )
+
+    kind: str  # "reels" or "posts"
+    pk: Any
+    taken_at: Optional[int]  # Unix seconds (taken_at, else device_timestamp)
+    views: Optional[int]
+    ig_play_count: Optional[int]
+    likes: int
+    comments: int
+    saves: Optional[int]
+    shares: Optional[int]
+    caption_text: str
+    hashtags: List[str]
+    mentions: List[str]
+    video_url: Optional[str]  # Highest quality CDN video
+    thumbnail_url: Optional[str]
+    image_urls: Optional[List[str]]  # Carousel photos (video slides contribute their cover)
+    post_type: str  # carousel, video or image
+    item: Dict[str, Any]
+
+    @property
+    def engagement(self) -> int:
+        """Likes + comments"""
+        return self.likes + self.comments
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any], kind: str) -> "MediaRecord":
+        """
+        Normalize a raw API item
+
+        Args:
+            item: Reel/post item (nested "media" already merged)
+            kind: "reels" or "posts"
+
+        Returns:
+            MediaRecord
+        """
+        caption_text = _caption_text(item)
+
+        image_urls = None
+        carousel = item.get("carousel_media")
+        if carousel:
+            post_type = "carousel"
+            image_urls = []
+            for slide in carousel:
+                if isinstance(slide, dict) and slide.get("media_type", 1) in (1, 2):
+                    url = _thumbnail(slide)
+                    if url:
+                        image_urls.append(url)
+        elif item.get("media_type") == 2 or item.get("product_type") == "clips":
+            post_type = "video"
+        else:
+            post_type = "image"
+
+        if kind == "reels":
+            views = _metric(item, VIEW_FIELDS, 0)
+        else:
+            views = _metric(item, POST_VIEW_FIELDS, None)
+
+        return cls(
+            kind=kind,
+            pk=item.get("pk"),
+            taken_at=item.get("taken_at") or item.get("device_timestamp"),
+            views=views,
+            ig_play_count=_metric(item, IG_PLAY_FIELDS, None),
+            likes=_metric(item, LIKE_FIELDS, 0),
+            comments=_metric(item, COMMENT_FIELDS, 0),
+            saves=_metric(item, SAVE_FIELDS, None),
+            shares=_metric(item, SHARE_FIELDS, None),
+            caption_text=caption_text,
+            hashtags=extract_hashtags(caption_text) if caption_text else [],
+            mentions=extract_mentions(caption_text) if caption_text else [],
+            video_url=_first_url(item.get("video_versions")),
+            thumbnail_url=_thumbnail(item),
+            image_urls=image_urls or None,
+            post_type=post_type,
+            item=item,
+        )
+
+
+def normalize_media(
+    items: Iterable[Union[Dict[str, Any], MediaRecord]], kind: str
+) -> List[MediaRecord]:
+    """
+    Records for a list of API items
+
+    Items that already are records are passed through, so callers can
+    normalize once and hand the same list to storage and analytics.
+
+    Args:
+        items: Raw API items and/or MediaRecords
+        kind: "reels" or "posts"
+
+    Returns:
+        List of MediaRecord
+    """
+    return [
+        item if isinstance(item, MediaRecord) else MediaRecord.from_item(item, kind)
+        for item in items
+    ]
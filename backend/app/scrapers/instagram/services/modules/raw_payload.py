@@ -0,0 +1,193 @@
+"""
+Instagram Raw Payload Module
+Decides what of the raw RapidAPI item is written to raw_media_json
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+
+RAW_MEDIA_MODES = ("full", "projected", "hash", "r2")
+
+# Fields kept by the projected mode (dotted paths; lists are projected element-wise).
+# Mostly what the typed columns do not already cover, minus URL candidate arrays.
+DEFAULT_PROJECTION = (
+    "pk",
+    "id",
+    "code",
+    "media_type",
+    "product_type",
+    "taken_at",
+    "caption.text",
+    "accessibility_caption",
+    "like_count",
+    "comment_count",
+    "play_count",
+    "ig_play_count",
+    "fb_play_count",
+    "view_count",
+    "video_duration",
+    "has_audio",
+    "is_paid_partnership",
+    "location.pk",
+    "location.name",
+    "usertags.in.user.username",
+    "coauthor_producers.username",
+    "clips_metadata.music_info.music_asset_info.title",
+    "clips_metadata.music_info.music_asset_info.display_artist",
+    "clips_metadata.original_sound_info.original_audio_title",
+    "carousel_media.pk",
+    "carousel_media.media_type",
+)
+
+
+def _strip_query(value: Any) -> Any:
+    """Signed CDN URLs change on every fetch; only their path identifies the media"""
+    if isinstance(value, dict):
+        return {k: _strip_query(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip_query(v) for v in value]
+    if isinstance(value, str) and value.startswith("http"):
+        return value.split("?", 1)[0]
+    return value
+
+
+def content_hash(item: Dict[str, Any], mode: str = "full") -> str:
+    """
+    Stable hash of an API item for change detection
+
+    Args:
+        item: Raw API item
+        mode: Raw media mode (part of the hash, so changing modes rewrites payloads)
+
+    Returns:
+        Hex digest
+    """
+    canonical = json.dumps(_strip_query(item), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(f"{mode}:{canonical}".encode(), digest_size=16).hexdigest()
+
+
+def _project(value: Any, parts: List[str]) -> Any:
+    if not parts:
+        return value
+    if isinstance(value, list):
+        projected = [_project(v, parts) for v in value]
+        return [v for v in projected if v is not None] or None
+    if isinstance(value, dict) and parts[0] in value:
+        return _project(value[parts[0]], parts[1:])
+    return None
+
+
+def _merge(target: Dict[str, Any], path: List[str], value: Any) -> None:
+    for part in path[:-1]:
+        target = target.setdefault(part, {})
+        if not isinstance(target, dict):
+            return
+    target[path[-1]] = value
+
+
+def project(item: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Keep only the whitelisted (dotted) paths of an item
+
+    Lists on the way are projected element-wise into a list of leaf values:
+    "usertags.in.user.username" yields {"usertags": {"in": {"user": {"username": [...]}}}}.
+    """
+    result: Dict[str, Any] = {}
+    for path in fields:
+        parts = path.split(".")
+        value = _project(item, parts)
+        if value is not None:
+            _merge(result, parts, value)
+    return result
+
+
+class RawPayloadPolicy:
+    """
+    Raw payload policy for reels/posts rows
+
+    columns() returns raw_media_json / raw_media_hash / raw_media_ref for a row.
+    Every row gets all three keys so bulk upserts keep one column set; when
+    the hash matches the stored one both payload columns are sent as NULL and
+    the keep_instagram_raw_media trigger keeps the stored values.
+    """
+
+    def __init__(
+        self,
+        mode: str = "full",
+        fields: Optional[Sequence[str]] = None,
+        uploader: Optional[Callable[[bytes, str], Optional[str]]] = None,
+        logger=None,
+    ):
+        """
+        Initialize policy
+
+        Args:
+            mode: full, projected, hash or r2
+            fields: Dotted paths kept by the projected mode (default DEFAULT_PROJECTION)
+            uploader: r2 mode: (gzipped JSON, object key) -> public URL
+            logger: Logger instance (optional)
+        """
+        if mode not in RAW_MEDIA_MODES:
+            raise ValueError(f"Unknown raw media mode {mode!r}, expected one of {RAW_MEDIA_MODES}")
+        self.mode = mode
+        self.fields = tuple(fields) if fields else DEFAULT_PROJECTION
+        self.uploader = uploader
+        self.logger = logger
+        self.unchanged = 0  # Rows whose payload was left out because the hash matched
+
+    def columns(
+        self,
+        kind: str,
+        media_pk: Any,
+        item: Dict[str, Any],
+        stored_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Raw payload columns for one reel/post row
+
+        Args:
+            kind: "reels" or "posts" (R2 key prefix)
+            media_pk: Media primary key
+            item: Raw API item
+            stored_hash: raw_media_hash currently stored for the media (if known)
+
+        Returns:
+            Dict with raw_media_json, raw_media_hash and raw_media_ref
+        """
+        digest = content_hash(item, self.mode)
+        if stored_hash == digest:
+            self.unchanged += 1
+            return {"raw_media_json": None, "raw_media_hash": digest, "raw_media_ref": None}
+
+        if self.mode == "full":
+            payload: Optional[Dict[str, Any]] = item
+        elif self.mode == "hash":
+            payload = None
+        elif self.mode == "r2":
+            ref = self._offload(kind, media_pk, item)
+            if ref:
+                return {"raw_media_json": None, "raw_media_hash": digest, "raw_media_ref": ref}
+            # Upload failed: keep the projection inline rather than lose the payload,
+            # and no hash so the next cycle tries the upload again
+            return {
+                "raw_media_json": project(item, self.fields),
+                "raw_media_hash": None,
+                "raw_media_ref": None,
+            }
+        else:
+            payload = project(item, self.fields)
+        return {"raw_media_json": payload, "raw_media_hash": digest, "raw_media_ref": None}
+
+    def _offload(self, kind: str, media_pk: Any, item: Dict[str, Any]) -> Optional[str]:
+        if not self.uploader:
+            return None
+        data = gzip.compress(json.dumps(item, separators=(",", ":"), default=str).encode())
+        try:
+            return self.uploader(data, f"instagram/raw/{kind}/{media_pk}.json.gz")
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"⚠️ Failed to offload raw payload for {media_pk}: {e}")
+            return None
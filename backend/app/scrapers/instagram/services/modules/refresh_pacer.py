@@ -0,0 +1,122 @@
+"""
+Instagram Refresh Pacer Module
+Spreads one refresh pass over the refresh window in time slices at a paced request rate
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_CALLS_PER_CREATOR = 2.4  # Profile + reels/posts pages, before any creator was measured
+
+
+class RefreshPacer:
+    """
+    Time-sliced schedule for refreshing every creator once per window
+
+    A pass gives creator i the start time `started_at + i * window / n`, so
+    refreshes are evenly spaced and the catalog size sets the pace: a pass
+    started after the catalog grew simply uses a shorter slot. Each slice
+    hands out the creators that come due before it ends, with the request
+    rate that gets them done within the slice (plus headroom), capped at the
+    API limit. The average API calls per creator is learned as slices finish.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        slice_seconds: float,
+        max_rps: float,
+        calls_per_creator: float = DEFAULT_CALLS_PER_CREATOR,
+        headroom: float = 1.25,
+        smoothing: float = 0.3,
+    ):
+        """
+        Initialize pacer
+
+        Args:
+            window: Seconds in which every creator is refreshed once
+            slice_seconds: Length of one slice (a batch of due creators)
+            max_rps: Upper bound for the request rate (API limit)
+            calls_per_creator: Initial estimate of API calls per creator
+            headroom: Rate multiplier so a slice's batch finishes before the slice ends
+            smoothing: Weight of the latest slice in the calls-per-creator average
+        """
+        self.window = window
+        self.slice_seconds = min(slice_seconds, window)
+        self.max_rps = max_rps
+        self.calls_per_creator = calls_per_creator
+        self.headroom = headroom
+        self.smoothing = smoothing
+
+        self.creators: List[Dict[str, Any]] = []
+        self.index = 0  # Next creator of the pass
+        self.started_at: Optional[float] = None
+
+    @property
+    def pass_done(self) -> bool:
+        """Every creator of the current pass was handed out (True before the first pass)"""
+        return self.index >= len(self.creators)
+
+    @property
+    def slot(self) -> float:
+        """Seconds between two creator starts in the current pass"""
+        return self.window / len(self.creators) if self.creators else self.window
+
+    def next_pass_at(self) -> float:
+        """Earliest start of the next pass (one window after the current one started)"""
+        return (self.started_at or 0.0) + self.window
+
+    def start_pass(self, creators: List[Dict[str, Any]], now: float) -> None:
+        """
+        Begin a pass over `creators` (in refresh order, e.g. stalest first)
+
+        Args:
+            creators: Creators to refresh in this pass
+            now: Pass start (unix time)
+        """
+        self.creators = list(creators)
+        self.index = 0
+        self.started_at = now
+
+    def next_slice(self, now: float) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Creators due before the slice starting at `now` ends, and their request rate
+
+        A pass that fell behind (slow API, rate capped) hands out everything
+        that is overdue, at the maximum rate, until it is back on schedule.
+
+        Returns:
+            (creators to refresh, target requests per second)
+        """
+        if self.pass_done or self.started_at is None:
+            return [], 0.0
+        slice_end = now + self.slice_seconds
+        due = min(len(self.creators), int((slice_end - self.started_at) / self.slot) + 1)
+        batch = self.creators[self.index : due]
+        self.index = max(self.index, due)
+        return batch, self.target_rps(len(batch))
+
+    def target_rps(self, creators: int) -> float:
+        """Request rate that refreshes `creators` within one slice"""
+        needed = creators * self.calls_per_creator / self.slice_seconds
+        return min(self.max_rps, needed * self.headroom)
+
+    def planned_rps(self) -> float:
+        """Average request rate the current pass needs over its window"""
+        return min(self.max_rps, len(self.creators) * self.calls_per_creator / self.window)
+
+    def record(self, creators: int, api_calls: int) -> None:
+        """Update the calls-per-creator estimate from a finished slice"""
+        if creators > 0:
+            measured = api_calls / creators
+            self.calls_per_creator += self.smoothing * (measured - self.calls_per_creator)
+
+    def progress(self) -> Dict[str, Any]:
+        """Pass state for logs"""
+        return {
+            "creators": len(self.creators),
+            "handed_out": self.index,
+            "slot_seconds": round(self.slot, 2),
+            "calls_per_creator": round(self.calls_per_creator, 2),
+            "planned_rps": round(self.planned_rps(), 2),
+        }
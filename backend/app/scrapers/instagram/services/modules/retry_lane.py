@@ -0,0 +1,262 @@
+"""
+Instagram Retry Lane Module
+Deferred retries for empty or timed-out reels/posts fetches
+"""
+
+import asyncio
+import contextlib
+import heapq
+import inspect
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+
+class RetryLaterError(Exception):
+    """Raised by a fetch that should be retried from the lane instead of in place"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason  # "empty" or "timeout"
+
+
+@dataclass
+class DeferredFetch:
+    """One reels/posts fetch waiting in the retry lane"""
+
+    creator: Dict[str, Any]
+    kind: str  # "reels" or "posts"
+    reason: str  # Why the last attempt was deferred
+    attempt: int = 1  # Retry number this item is waiting for
+    context: Dict[str, Any] = field(default_factory=dict)  # Fetch args and sibling results
+
+    @property
+    def label(self) -> str:
+        """Name for log lines"""
+        return f"{self.creator.get('username', 'Unknown')} {self.kind}"
+
+
+@dataclass
+class RetryLaneStats:
+    """Retry outcomes, to tune the number of retries and their delays"""
+
+    deferred: int = 0  # Fetches sent to the lane
+    retried: int = 0  # Retry attempts made
+    recovered: int = 0  # Retries that returned data
+    exhausted: int = 0  # Gave up after the last attempt (usually legitimately empty)
+    dropped: int = 0  # Still queued when the lane stopped
+    outcomes: Counter = field(default_factory=Counter)  # "kind:reason:attempt:result" -> count
+
+    @property
+    def yield_rate(self) -> Optional[float]:
+        """Share of retries that produced data"""
+        return self.recovered / self.retried if self.retried else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats snapshot for logs and status endpoints"""
+        rate = self.yield_rate
+        return {
+            "deferred": self.deferred,
+            "retried": self.retried,
+            "recovered": self.recovered,
+            "exhausted": self.exhausted,
+            "dropped": self.dropped,
+            "yield_rate": round(rate, 3) if rate is not None else None,
+            "outcomes": dict(self.outcomes),
+        }
+
+
+class DeferredRetryLane:
+    """
+    Delay queue worked by a few dedicated coroutines
+
+    Creator workers defer a fetch and move on, so a creator with no reels no
+    longer holds a concurrent_creators slot through the backoff sleeps. Items
+    become due after `delays[attempt - 1]` seconds; a handler returning False
+    re-defers the item until the attempts run out.
+    """
+
+    def __init__(
+        self,
+        logger,
+        delays: Sequence[float],
+        concurrency: int = 2,
+        item_timeout: float = 300.0,
+        on_exhausted: Optional[Callable[[DeferredFetch], Any]] = None,
+    ):
+        """
+        Initialize retry lane
+
+        Args:
+            logger: Logger instance
+            delays: Seconds to wait before each retry (its length is the max attempts)
+            concurrency: Coroutines working due items
+            item_timeout: Seconds allowed per retry
+            on_exhausted: Called with items that used up every attempt; may be a
+                coroutine function, which run() awaits before it returns
+        """
+        self.logger = logger
+        self.delays = list(delays)
+        self.concurrency = max(1, concurrency)
+        self.item_timeout = item_timeout
+        self.on_exhausted = on_exhausted
+        self.stats = RetryLaneStats()
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._in_flight = 0
+        self._callbacks: Set[asyncio.Future] = set()  # Running async on_exhausted calls
+
+    @property
+    def max_attempts(self) -> int:
+        """Retries per item"""
+        return len(self.delays)
+
+    @property
+    def pending(self) -> int:
+        """Items waiting or being retried"""
+        return len(self._heap) + self._in_flight
+
+    def defer(self, item: DeferredFetch) -> bool:
+        """
+        Schedule an item's next attempt
+
+        Returns:
+            True if scheduled, False if it had no attempts left
+        """
+        if item.attempt > self.max_attempts:
+            self._exhaust(item)
+            return False
+        if item.attempt == 1:
+            self.stats.deferred += 1
+        due = time.monotonic() + self.delays[item.attempt - 1]
+        heapq.heappush(self._heap, (due, next(self._seq), item))
+        self._wake.set()
+        return True
+
+    def close(self) -> None:
+        """No more items will be deferred; run() returns once the lane is empty"""
+        self._closed = True
+        self._wake.set()
+
+    async def run(
+        self,
+        handler: Callable[[DeferredFetch], Awaitable[bool]],
+        should_continue: Optional[Callable[[], bool]] = None,
+    ) -> RetryLaneStats:
+        """
+        Work due items until closed and empty (or stopped)
+
+        Args:
+            handler: Coroutine returning True if the retry produced data
+            should_continue: Stop check; queued items are dropped when it turns false
+
+        Returns:
+            Final RetryLaneStats
+        """
+        workers = [
+            asyncio.create_task(self._worker(handler, should_continue), name=f"RetryLane-{n + 1}")
+            for n in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            self.stats.dropped += len(self._heap)
+            self._heap.clear()
+            if self._callbacks:
+                await asyncio.gather(*self._callbacks, return_exceptions=True)
+        return self.stats
+
+    async def _worker(
+        self,
+        handler: Callable[[DeferredFetch], Awaitable[bool]],
+        should_continue: Optional[Callable[[], bool]],
+    ) -> None:
+        while True:
+            if should_continue and not should_continue():
+                return
+            if not self._heap:
+                if self._closed and not self._in_flight:
+                    self._wake.set()  # Let the other workers see the lane is done
+                    return
+                self._wake.clear()
+                await self._wait(1.0)
+                continue
+
+            due = self._heap[0][0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wake.clear()
+                await self._wait(min(delay, 1.0))
+                continue
+
+            _, _, item = heapq.heappop(self._heap)
+            self._in_flight += 1
+            try:
+                await self._attempt(item, handler)
+            finally:
+                self._in_flight -= 1
+                self._wake.set()
+
+    async def _wait(self, timeout: float) -> None:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+
+    async def _attempt(
+        self, item: DeferredFetch, handler: Callable[[DeferredFetch], Awaitable[bool]]
+    ) -> None:
+        self.stats.retried += 1
+        try:
+            recovered = await asyncio.wait_for(handler(item), timeout=self.item_timeout)
+        except asyncio.TimeoutError:
+            recovered, item.reason = False, "timeout"
+        except Exception as e:
+            self.logger.warning(f"⚠️ Retry of {item.label} failed: {e}")
+            recovered = False
+
+        result = "recovered" if recovered else "empty"
+        self.stats.outcomes[f"{item.kind}:{item.reason}:{item.attempt}:{result}"] += 1
+        if recovered:
+            self.stats.recovered += 1
+            self.logger.info(f"🔁 Retry {item.attempt} recovered {item.label}")
+            return
+
+        item.attempt += 1
+        self.defer(item)
+
+    def _exhaust(self, item: DeferredFetch) -> None:
+        self.stats.exhausted += 1
+        self.logger.debug(f"Retry lane gave up on {item.label} ({item.reason})")
+        if self.on_exhausted:
+            try:
+                result = self.on_exhausted(item)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Exhausted-retry callback failed for {item.label}: {e}")
+                return
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(self._await_callback(item, result))
+                self._callbacks.add(task)
+                task.add_done_callback(self._callbacks.discard)
+
+    async def _await_callback(self, item: DeferredFetch, result: Awaitable[Any]) -> None:
+        try:
+            await result
+        except Exception as e:
+            self.logger.warning(f"⚠️ Exhausted-retry callback failed for {item.label}: {e}")
+
+    def log_summary(self) -> None:
+        """One line of retry stats"""
+        s = self.stats
+        rate = s.yield_rate
+        self.logger.info(
+            f"🔁 Retry lane: {s.deferred} deferred, {s.retried} retries, "
+            f"{s.recovered} recovered ({rate * 100:.0f}% yield), {s.exhausted} exhausted, "
+            f"{s.dropped} dropped"
+            if rate is not None
+            else f"🔁 Retry lane: {s.deferred} deferred, no retries run"
+        )
@@ -4,11 +4,17 @@ Handles all database operations, R2 uploads, and data persistence
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from supabase import Client
 
-from .utils import extract_hashtags, extract_mentions, to_iso
+from .analytics import RUNNING_AGGREGATE_FIELDS
+from .api_usage import ApiUsageTracker
+from .creator_state import CreatorState
+from .follower_growth import FollowerGrowthTracker
+from .media_record import MediaRecord, normalize_media
+from .raw_payload import RawPayloadPolicy
+from .utils import is_r2_url, to_iso
 
 
 try:
@@ -36,7 +42,16 @@ class InstagramStorage:
     - Analytics updates
     """
 
-    def __init__(self, supabase: Client, logger, r2_config=None, media_utils=None):
+    def __init__(
+        self,
+        supabase: Client,
+        logger,
+        r2_config=None,
+        media_utils=None,
+        cost_per_request=0.0,
+        running_aggregates=False,
+        raw_policy=None,
+    ):
         """
         Initialize storage handler
 
@@ -45,11 +60,18 @@ class InstagramStorage:
             logger: Logger instance
             r2_config: R2 storage configuration (optional)
             media_utils: Media upload utilities (optional)
+            cost_per_request: USD per API request for usage accounting (optional)
+            running_aggregates: Leave RUNNING_AGGREGATE_FIELDS to the DB triggers (optional)
+            raw_policy: RawPayloadPolicy for raw_media_json (optional, default full payload)
         """
         self.supabase = supabase
         self.logger = logger
         self.r2_config = r2_config
         self.media_utils = media_utils or {}
+        self.growth_tracker = FollowerGrowthTracker(supabase, logger)
+        self.api_usage = ApiUsageTracker(supabase, logger, cost_per_request)
+        self.running_aggregates = running_aggregates
+        self.raw_policy = raw_policy or RawPayloadPolicy()
 
     def get_creator_content_counts(self, creator_id: str) -> Tuple[int, int]:
         """
@@ -86,32 +108,18 @@ class InstagramStorage:
             self.logger.warning(f"Failed to get content counts for {creator_id}: {e}")
             return 0, 0
 
-    def store_reels(
-        self,
-        creator_id: str,
-        username: str,
-        reels: List[Dict],
-        creator_niche: Optional[str] = None,
-        current_creator_followers: int = 0,
-    ) -> Tuple[int, int, int]:
-        """
-        Store reels in database with R2 upload
-
-        Args:
-            creator_id: Instagram creator ID
-            username: Creator username
-            reels: List of reel data dicts
-            creator_niche: Creator's niche category
-            current_creator_followers: Follower count for engagement calc
-
-        Returns:
-            Tuple of (total_saved, new_count, existing_count)
-        """
-        if not reels:
-            return 0, 0, 0
+    def _get_existing_reels(
+        self, media_pks: List[str], creator_state: Optional[CreatorState] = None
+    ) -> Tuple[set, Dict[str, str]]:
+        """Get stored reel pks and pk -> R2 video_url (from the state snapshot when available)"""
+        if creator_state is not None:
+            existing_pks, existing_r2_urls = creator_state.known_reels(media_pks)
+            if existing_r2_urls:
+                self.logger.info(
+                    f"🔄 Skipping R2 upload for {len(existing_r2_urls)} reels (already using custom domain)"
+                )
+            return existing_pks, existing_r2_urls
 
-        # First check which reels already exist and if they have R2 URLs
-        media_pks = [str(reel.get("pk")) for reel in reels if reel.get("pk")]
         existing_pks = set()
         existing_r2_urls = {}  # media_pk -> video_url mapping for R2 URLs
         if media_pks:
@@ -125,32 +133,90 @@ class InstagramStorage:
                 for row in result.data or []:
                     existing_pks.add(row["media_pk"])
                     # Check if video already has custom domain R2 URL
-                    if row.get("video_url") and "media.b9dashboard.com" in row["video_url"]:
+                    if is_r2_url(row.get("video_url")):
                         existing_r2_urls[row["media_pk"]] = row["video_url"]
                         self.logger.info(
                             f"🔄 Skipping R2 upload for reel {row['media_pk']} (already using custom domain)"
                         )
             except Exception as e:
                 self.logger.debug(f"Failed to check existing reels: {e}")
+        return existing_pks, existing_r2_urls
+
+    def _get_existing_posts(
+        self, media_pks: List[str], creator_state: Optional[CreatorState] = None
+    ) -> Tuple[set, Dict[str, List[str]]]:
+        """Get stored post pks and pk -> R2 image_urls (from the state snapshot when available)"""
+        if creator_state is not None:
+            existing_pks, existing_r2_images = creator_state.known_posts(media_pks)
+            if existing_r2_images:
+                self.logger.info(
+                    f"🔄 Skipping R2 upload for {len(existing_r2_images)} posts (already using custom domain)"
+                )
+            return existing_pks, existing_r2_images
+
+        existing_pks = set()
+        existing_r2_images = {}  # media_pk -> image_urls mapping for R2 URLs
+        if media_pks:
+            try:
+                result = (
+                    self.supabase.table("instagram_posts")
+                    .select("media_pk, image_urls")
+                    .in_("media_pk", media_pks)
+                    .execute()
+                )
+                for row in result.data or []:
+                    existing_pks.add(row["media_pk"])
+                    # Check if post already has custom domain R2 URLs
+                    if row.get("image_urls") and is_r2_url(row["image_urls"][0]):
+                        existing_r2_images[row["media_pk"]] = row["image_urls"]
+                        self.logger.info(
+                            f"🔄 Skipping R2 upload for post {row['media_pk']} (already using custom domain)"
+                        )
+            except Exception as e:
+                self.logger.debug(f"Failed to check existing posts: {e}")
+        return existing_pks, existing_r2_images
+
+    def prepare_reels(
+        self,
+        creator_id: str,
+        username: str,
+        reels: Sequence[Union[Dict, MediaRecord]],
+        creator_niche: Optional[str] = None,
+        current_creator_followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Build reel rows for the reels table, uploading media to R2
+
+        Args:
+            creator_id: Instagram creator ID
+            username: Creator username
+            reels: Reel items or MediaRecords (normalized here if needed)
+            creator_niche: Creator's niche category
+            current_creator_followers: Follower count for engagement calc
+            creator_state: Preloaded state snapshot (skips the existing media lookup)
+
+        Returns:
+            Tuple of (rows, new_count, existing_count)
+        """
+        if not reels:
+            return [], 0, 0
+
+        records = normalize_media(reels, "reels")
+
+        # First check which reels already exist and if they have R2 URLs
+        media_pks = [str(record.pk) for record in records if record.pk]
+        existing_pks, existing_r2_urls = self._get_existing_reels(media_pks, creator_state)
 
         new_count = 0
         existing_count = 0
         rows = []
 
-        for reel in reels:
+        for record in records:
+            reel = record.item
             try:
-                # Extract caption text and hashtags
-                caption_data = reel.get("caption", {})
-                if isinstance(caption_data, dict):
-                    caption_text = caption_data.get("text", "")
-                else:
-                    caption_text = str(caption_data) if caption_data else ""
-
-                hashtags = extract_hashtags(caption_text) if caption_text else []
-                mentions = extract_mentions(caption_text) if caption_text else []
-
-                # Extract engagement metrics
-                engagement = (reel.get("like_count", 0) or 0) + (reel.get("comment_count", 0) or 0)
+                caption_text = record.caption_text
+                engagement = record.engagement
 
                 # Calculate engagement rate if we have follower count
                 engagement_rate = 0
@@ -158,17 +224,13 @@ class InstagramStorage:
                     engagement_rate = (engagement / current_creator_followers) * 100
 
                 # Check if this reel already has R2 URL (deduplication)
-                reel_pk = str(reel.get("pk"))
+                reel_pk = str(record.pk)
                 if reel_pk in existing_r2_urls:
                     # Already in R2, use existing URL
                     video_url = existing_r2_urls[reel_pk]
                     self.logger.info(f"✅ Using existing R2 URL for reel {reel_pk}")
                 else:
-                    # Extract video URL from API response (video_versions array)
-                    video_url = None
-                    video_versions = reel.get("video_versions", [])
-                    if video_versions and len(video_versions) > 0:
-                        video_url = video_versions[0].get("url")  # Highest quality video
+                    video_url = record.video_url  # Highest quality CDN video
 
                     if (
                         self.r2_config
@@ -178,13 +240,13 @@ class InstagramStorage:
                     ):
                         try:
                             self.logger.info(
-                                f"📤 Starting R2 upload for reel {reel.get('pk')} (creator: {creator_id})",
+                                f"📤 Starting R2 upload for reel {record.pk} (creator: {creator_id})",
                                 action="r2_upload_start",
                             )
                             r2_video_url = process_and_upload_video(
                                 cdn_url=video_url,
                                 creator_id=str(creator_id),
-                                media_pk=str(reel.get("pk")),
+                                media_pk=str(record.pk),
                             )
                             if r2_video_url:
                                 video_url = r2_video_url  # Use R2 URL instead of CDN
@@ -192,17 +254,17 @@ class InstagramStorage:
                                     "✅ Uploaded reel video to R2",
                                     action="r2_video_uploaded",
                                     context={
-                                        "media_pk": str(reel.get("pk")),
+                                        "media_pk": str(record.pk),
                                         "creator_id": str(creator_id),
                                         "r2_url": r2_video_url[:80] + "...",
                                     },
                                 )
                             else:
                                 self.logger.warning(
-                                    f"⚠️ R2 upload returned None for reel {reel.get('pk')}",
+                                    f"⚠️ R2 upload returned None for reel {record.pk}",
                                     action="r2_upload_failed",
                                     context={
-                                        "media_pk": str(reel.get("pk")),
+                                        "media_pk": str(record.pk),
                                         "creator_id": str(creator_id),
                                     },
                                 )
@@ -211,7 +273,7 @@ class InstagramStorage:
                                 "❌ R2 upload failed (MediaStorageError), using CDN URL - continuing with CDN",
                                 action="r2_upload_error",
                                 context={
-                                    "media_pk": str(reel.get("pk")),
+                                    "media_pk": str(record.pk),
                                     "creator_id": str(creator_id),
                                     "error": str(e),
                                 },
@@ -222,7 +284,7 @@ class InstagramStorage:
                                 "❌ R2 upload failed (unexpected error), using CDN URL - continuing with CDN",
                                 action="r2_upload_exception",
                                 context={
-                                    "media_pk": str(reel.get("pk")),
+                                    "media_pk": str(record.pk),
                                     "creator_id": str(creator_id),
                                     "error": str(e),
                                 },
@@ -231,7 +293,7 @@ class InstagramStorage:
                             # Continue with CDN URL on error
 
                 row = {
-                    "media_pk": reel.get("pk"),
+                    "media_pk": record.pk,
                     "media_id": reel.get("id"),
                     "shortcode": reel.get("code"),
                     "creator_id": str(creator_id),
@@ -239,33 +301,29 @@ class InstagramStorage:
                     "creator_niche": creator_niche,
                     "product_type": reel.get("product_type"),
                     "media_type": reel.get("media_type"),
-                    "taken_at": to_iso(reel.get("taken_at") or reel.get("device_timestamp")),
+                    "taken_at": to_iso(record.taken_at),
                     "caption_text": caption_text[:2000] if caption_text else None,
-                    "hashtags": hashtags,
-                    "hashtag_count": len(hashtags),
-                    "mention_count": len(mentions),
-                    "play_count": reel.get("play_count", 0),
-                    "ig_play_count": reel.get("ig_play_count"),
-                    "like_count": reel.get("like_count", 0),
-                    "comment_count": reel.get("comment_count", 0),
-                    "share_count": reel.get("share_count"),
-                    "save_count": reel.get("save_count"),
+                    "hashtags": record.hashtags,
+                    "hashtag_count": len(record.hashtags),
+                    "mention_count": len(record.mentions),
+                    "play_count": record.views,
+                    "ig_play_count": record.ig_play_count,
+                    "like_count": record.likes,
+                    "comment_count": record.comments,
+                    "share_count": record.shares,
+                    "save_count": record.saves,
                     "engagement_count": engagement,
                     "engagement_rate": round(engagement_rate, 2),
                     "has_audio": reel.get("has_audio"),
                     "video_duration": reel.get("video_duration") or reel.get("media_duration"),
                     "video_url": video_url,
-                    "thumbnail_url": (
-                        reel.get("image_versions2", {}).get("candidates", [{}])[0].get("url")
-                        if reel.get("image_versions2")
-                        else None
-                    ),
+                    "thumbnail_url": record.thumbnail_url,
                     "is_paid_partnership": reel.get("is_paid_partnership", False),
                     "has_shared_to_fb": reel.get("has_shared_to_fb", 0),
                     "is_unified_video": reel.get("is_unified_video", False),
                     "is_dash_eligible": reel.get("is_dash_eligible"),
                     "number_of_qualities": reel.get("number_of_qualities"),
-                    "raw_media_json": reel,
+                    **self._raw_columns("reels", reel, creator_state),
                     "scraped_at": datetime.now(timezone.utc).isoformat(),
                 }
 
@@ -281,123 +339,94 @@ class InstagramStorage:
                 self.logger.debug(f"Failed to process reel: {e}")
                 continue
 
-        total_saved = 0
-        if rows:
-            try:
-                self.supabase.table("instagram_reels").upsert(
-                    rows, on_conflict="media_pk"
-                ).execute()
-                total_saved = len(rows)
-                self.logger.info(
-                    f"Saved {total_saved} reels for {username}: {new_count} new records, {existing_count} existing updated"
-                )
-            except Exception as e:
-                self.logger.error(f"Failed to store reels: {e}")
-
-        return total_saved, new_count, existing_count
+        return rows, new_count, existing_count
 
-    def store_posts(
+    def store_reels(
         self,
         creator_id: str,
         username: str,
-        posts: List[Dict],
+        reels: Sequence[Union[Dict, MediaRecord]],
         creator_niche: Optional[str] = None,
         current_creator_followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
     ) -> Tuple[int, int, int]:
         """
-        Store posts in database with R2 upload
+        Store reels in database with R2 upload
 
         Args:
             creator_id: Instagram creator ID
             username: Creator username
-            posts: List of post data dicts
+            reels: Reel items or MediaRecords
             creator_niche: Creator's niche category
             current_creator_followers: Follower count for engagement calc
+            creator_state: Preloaded state snapshot (skips the existing media lookup)
 
         Returns:
             Tuple of (total_saved, new_count, existing_count)
         """
+        rows, new_count, existing_count = self.prepare_reels(
+            creator_id, username, reels, creator_niche, current_creator_followers, creator_state
+        )
+        return self._write_media("reels", username, rows, new_count, existing_count)
+
+    def prepare_posts(
+        self,
+        creator_id: str,
+        username: str,
+        posts: Sequence[Union[Dict, MediaRecord]],
+        creator_niche: Optional[str] = None,
+        current_creator_followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Build post rows for the posts table, uploading media to R2
+
+        Args:
+            creator_id: Instagram creator ID
+            username: Creator username
+            posts: Post items or MediaRecords (normalized here if needed)
+            creator_niche: Creator's niche category
+            current_creator_followers: Follower count for engagement calc
+            creator_state: Preloaded state snapshot (skips the existing media lookup)
+
+        Returns:
+            Tuple of (rows, new_count, existing_count)
+        """
         if not posts:
-            return 0, 0, 0
+            return [], 0, 0
+
+        records = normalize_media(posts, "posts")
 
         # First check which posts already exist and if they have R2 URLs
-        media_pks = [str(post.get("pk")) for post in posts if post.get("pk")]
-        existing_pks = set()
-        existing_r2_images = {}  # media_pk -> image_urls mapping for R2 URLs
-        if media_pks:
-            try:
-                result = (
-                    self.supabase.table("instagram_posts")
-                    .select("media_pk, image_urls")
-                    .in_("media_pk", media_pks)
-                    .execute()
-                )
-                for row in result.data or []:
-                    existing_pks.add(row["media_pk"])
-                    # Check if post already has custom domain R2 URLs
-                    if (
-                        row.get("image_urls")
-                        and len(row["image_urls"]) > 0
-                        and "media.b9dashboard.com" in row["image_urls"][0]
-                    ):
-                        existing_r2_images[row["media_pk"]] = row["image_urls"]
-                        self.logger.info(
-                            f"🔄 Skipping R2 upload for post {row['media_pk']} (already using custom domain)"
-                        )
-            except Exception as e:
-                self.logger.debug(f"Failed to check existing posts: {e}")
+        media_pks = [str(record.pk) for record in records if record.pk]
+        existing_pks, existing_r2_images = self._get_existing_posts(media_pks, creator_state)
 
         new_count = 0
         existing_count = 0
         rows = []
 
-        for post in posts:
+        for record in records:
+            post = record.item
             try:
-                # Extract caption text and hashtags
-                caption_data = post.get("caption", {})
-                if isinstance(caption_data, dict):
-                    caption_text = caption_data.get("text", "")
-                else:
-                    caption_text = str(caption_data) if caption_data else ""
-
-                hashtags = extract_hashtags(caption_text) if caption_text else []
-                mentions = extract_mentions(caption_text) if caption_text else []
-
-                # Extract engagement metrics
-                engagement = (post.get("like_count", 0) or 0) + (post.get("comment_count", 0) or 0)
+                caption_text = record.caption_text
+                engagement = record.engagement
 
                 # Calculate engagement rate if we have follower count
                 engagement_rate = 0
                 if current_creator_followers > 0:
                     engagement_rate = (engagement / current_creator_followers) * 100
 
-                # Determine post type (single image, carousel, video)
+                # Post type (single image, carousel, video) and carousel photo URLs
+                post_type = record.post_type
                 carousel_media_count = 0
                 image_urls = None
 
-                if post.get("carousel_media"):
+                if post_type == "carousel":
                     carousel_media_count = len(post.get("carousel_media", []))
-                    post_type = "carousel"
-
-                    # Extract ALL media URLs from carousel (photos and videos)
-                    image_urls = []
-                    for item in post.get("carousel_media", []):
-                        # Check if this carousel item is a photo or video
-                        item_media_type = item.get("media_type", 1)
-
-                        if item_media_type == 1:  # Photo
-                            # Get highest quality image URL (first candidate)
-                            candidates = item.get("image_versions2", {}).get("candidates", [])
-                            if candidates and candidates[0].get("url"):
-                                image_urls.append(candidates[0].get("url"))
-                        elif item_media_type == 2:  # Video in carousel
-                            # Get video thumbnail as fallback
-                            candidates = item.get("image_versions2", {}).get("candidates", [])
-                            if candidates and candidates[0].get("url"):
-                                image_urls.append(candidates[0].get("url"))
+                    image_urls = record.image_urls
 
                     # Check if this post already has R2 URLs (deduplication)
-                    post_pk = str(post.get("pk"))
+                    post_pk = str(record.pk)
                     if post_pk in existing_r2_images:
                         # Already in R2, use existing URLs
                         image_urls = existing_r2_images[post_pk]
@@ -405,10 +434,6 @@ class InstagramStorage:
                             f"✅ Using existing R2 URLs for post {post_pk} ({len(image_urls)} photos)"
                         )
                     else:
-                        # Only set image_urls if we extracted any
-                        if not image_urls:
-                            image_urls = None
-
                         # Upload photos to R2 (if enabled)
                         if (
                             image_urls
@@ -422,7 +447,7 @@ class InstagramStorage:
                                     r2_url = process_and_upload_image(
                                         cdn_url=cdn_url,
                                         creator_id=str(creator_id),
-                                        media_pk=str(post.get("pk")),
+                                        media_pk=str(record.pk),
                                         index=index,
                                     )
                                     if r2_url:
@@ -438,16 +463,11 @@ class InstagramStorage:
                             if r2_image_urls:
                                 image_urls = r2_image_urls
                                 self.logger.info(
-                                    f"✅ Uploaded {len(r2_image_urls)} carousel photos to R2: {post.get('pk')}"
+                                    f"✅ Uploaded {len(r2_image_urls)} carousel photos to R2: {record.pk}"
                                 )
 
-                elif post.get("media_type") == 2 or post.get("product_type") == "clips":
-                    post_type = "video"
-                else:
-                    post_type = "image"
-
                 row = {
-                    "media_pk": post.get("pk"),
+                    "media_pk": record.pk,
                     "media_id": post.get("id"),
                     "shortcode": post.get("code"),
                     "creator_id": str(creator_id),
@@ -457,15 +477,15 @@ class InstagramStorage:
                     "media_type": post.get("media_type"),
                     "post_type": post_type,
                     "carousel_media_count": carousel_media_count,
-                    "taken_at": to_iso(post.get("taken_at") or post.get("device_timestamp")),
+                    "taken_at": to_iso(record.taken_at),
                     "caption_text": caption_text[:2000] if caption_text else None,
-                    "hashtags": hashtags,
-                    "hashtag_count": len(hashtags),
-                    "mention_count": len(mentions),
-                    "like_count": post.get("like_count", 0),
-                    "comment_count": post.get("comment_count", 0),
-                    "save_count": post.get("save_count"),
-                    "share_count": post.get("share_count"),
+                    "hashtags": record.hashtags,
+                    "hashtag_count": len(record.hashtags),
+                    "mention_count": len(record.mentions),
+                    "like_count": record.likes,
+                    "comment_count": record.comments,
+                    "save_count": record.saves,
+                    "share_count": record.shares,
                     "engagement_count": engagement,
                     "engagement_rate": round(engagement_rate, 2),
                     "is_paid_partnership": post.get("is_paid_partnership", False),
@@ -475,15 +495,11 @@ class InstagramStorage:
                     "original_width": post.get("original_width"),
                     "original_height": post.get("original_height"),
                     "accessibility_caption": post.get("accessibility_caption"),
-                    "thumbnail_url": (
-                        post.get("image_versions2", {}).get("candidates", [{}])[0].get("url")
-                        if post.get("image_versions2")
-                        else None
-                    ),
+                    "thumbnail_url": record.thumbnail_url,
                     "image_urls": image_urls,
                     "video_duration": post.get("video_duration") if post_type == "video" else None,
-                    "view_count": post.get("view_count") or post.get("play_count"),
-                    "raw_media_json": post,
+                    "view_count": record.views,
+                    **self._raw_columns("posts", post, creator_state),
                     "scraped_at": datetime.now(timezone.utc).isoformat(),
                 }
 
@@ -499,18 +515,64 @@ class InstagramStorage:
                 self.logger.debug(f"Failed to process post: {e}")
                 continue
 
+        return rows, new_count, existing_count
+
+    def store_posts(
+        self,
+        creator_id: str,
+        username: str,
+        posts: Sequence[Union[Dict, MediaRecord]],
+        creator_niche: Optional[str] = None,
+        current_creator_followers: int = 0,
+        creator_state: Optional[CreatorState] = None,
+    ) -> Tuple[int, int, int]:
+        """
+        Store posts in database with R2 upload
+
+        Args:
+            creator_id: Instagram creator ID
+            username: Creator username
+            posts: Post items or MediaRecords
+            creator_niche: Creator's niche category
+            current_creator_followers: Follower count for engagement calc
+            creator_state: Preloaded state snapshot (skips the existing media lookup)
+
+        Returns:
+            Tuple of (total_saved, new_count, existing_count)
+        """
+        rows, new_count, existing_count = self.prepare_posts(
+            creator_id, username, posts, creator_niche, current_creator_followers, creator_state
+        )
+        return self._write_media("posts", username, rows, new_count, existing_count)
+
+    def _raw_columns(
+        self, kind: str, item: Dict[str, Any], creator_state: Optional[CreatorState]
+    ) -> Dict[str, Any]:
+        """raw_media_json (and hash/pointer) columns for a reel/post row"""
+        stored_hash = creator_state.raw_hash(item.get("pk")) if creator_state is not None else None
+        return self.raw_policy.columns(kind, item.get("pk"), item, stored_hash)
+
+    def _write_media(
+        self,
+        kind: str,
+        username: str,
+        rows: List[Dict[str, Any]],
+        new_count: int,
+        existing_count: int,
+    ) -> Tuple[int, int, int]:
+        """Upsert prepared reel/post rows in one call"""
         total_saved = 0
         if rows:
             try:
-                self.supabase.table("instagram_posts").upsert(
+                self.supabase.table(f"instagram_{kind}").upsert(
                     rows, on_conflict="media_pk"
                 ).execute()
                 total_saved = len(rows)
                 self.logger.info(
-                    f"Saved {total_saved} posts for {username}: {new_count} new records, {existing_count} existing updated"
+                    f"Saved {total_saved} {kind} for {username}: {new_count} new records, {existing_count} existing updated"
                 )
             except Exception as e:
-                self.logger.error(f"Failed to store posts: {e}")
+                self.logger.error(f"Failed to store {kind}: {e}")
 
         return total_saved, new_count, existing_count
 
@@ -535,6 +597,14 @@ class InstagramStorage:
         Returns:
             Dict with daily_growth_rate, weekly_growth_rate, previous_followers_count
         """
+        try:
+            # Single round trip: record_instagram_follower_sample inserts and computes growth
+            return self.growth_tracker.record(
+                creator_id, username, current_followers, current_following, media_count
+            )
+        except Exception as e:
+            self.logger.debug(f"Growth RPC failed for {creator_id}, using lookback queries: {e}")
+
         try:
             # Record current follower count in history table
             history_entry = {
@@ -637,7 +707,11 @@ class InstagramStorage:
         pass
 
     def update_creator_analytics(
-        self, creator_id: str, analytics: Dict[str, Any], api_calls_made: int = 0
+        self,
+        creator_id: str,
+        analytics: Dict[str, Any],
+        api_calls_made: int = 0,
+        extra_fields: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Update creator with calculated analytics
@@ -645,49 +719,18 @@ class InstagramStorage:
         Args:
             creator_id: Instagram creator ID
             analytics: Analytics dict from InstagramAnalytics.calculate_analytics()
-            api_calls_made: Number of API calls used for this creator
+            api_calls_made: API calls to add to total_api_calls (0 when the caller
+                accounts usage through its own ApiUsageTracker)
+            extra_fields: Additional instagram_creators columns for the same update
+                (e.g. change-detection markers)
         """
-        try:
-            # Get current total API calls first
-            current_calls_result = (
-                self.supabase.table("instagram_creators")
-                .select("total_api_calls")
-                .eq("ig_user_id", creator_id)
-                .single()
-                .execute()
-            )
-            current_calls = (
-                current_calls_result.data.get("total_api_calls", 0)
-                if current_calls_result.data
-                else 0
-            )
+        if api_calls_made:
+            # Atomic increment - no read of the current total
+            self.api_usage.record_call(creator_id, api_calls_made)
+            self.api_usage.flush([creator_id])
 
-            update_data = {
-                # Reel metrics
-                "avg_views_per_reel_cached": analytics.get("avg_reel_views"),
-                "avg_likes_per_reel_cached": analytics.get("avg_likes_per_reel_cached"),
-                "avg_comments_per_reel_cached": analytics.get("avg_comments_per_reel_cached"),
-                # Post metrics
-                "avg_likes_per_post_cached": analytics.get("avg_likes_per_post_cached"),
-                "avg_comments_per_post_cached": analytics.get("avg_comments_per_post_cached"),
-                # Engagement metrics
-                "avg_engagement_rate": analytics.get("avg_engagement_rate"),
-                "engagement_rate_cached": analytics.get("engagement_rate"),
-                # Content analysis
-                "best_content_type": analytics.get("best_content_type"),
-                "viral_content_count_cached": analytics.get("viral_content_count"),
-                "viral_threshold_multiplier": analytics.get("viral_threshold_multiplier"),
-                # Posting metrics
-                "posting_frequency_per_week": analytics.get("posting_frequency_per_week"),
-                "posting_consistency_score": analytics.get("posting_consistency_score"),
-                "last_post_days_ago": analytics.get("last_post_days_ago"),
-                # Metadata
-                "last_scraped_at": datetime.now(timezone.utc).isoformat(),
-                "total_api_calls": current_calls + api_calls_made,
-            }
-
-            # Remove None values to avoid overwriting with nulls
-            update_data = {k: v for k, v in update_data.items() if v is not None}
+        try:
+            update_data = self.analytics_update_fields(analytics, extra_fields)
 
             self.supabase.table("instagram_creators").update(update_data).eq(
                 "ig_user_id", creator_id
@@ -697,3 +740,49 @@ class InstagramStorage:
 
         except Exception as e:
             self.logger.warning(f"Failed to update creator analytics for {creator_id}: {e}")
+
+    def analytics_update_fields(
+        self, analytics: Dict[str, Any], extra_fields: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the instagram_creators columns written by update_creator_analytics()
+
+        Args:
+            analytics: Analytics dict from InstagramAnalytics.calculate_analytics()
+            extra_fields: Additional instagram_creators columns for the same update
+
+        Returns:
+            Column -> value dict without None values
+        """
+        update_data = {
+            # Reel metrics
+            "avg_views_per_reel_cached": analytics.get("avg_reel_views"),
+            "avg_likes_per_reel_cached": analytics.get("avg_likes_per_reel_cached"),
+            "avg_comments_per_reel_cached": analytics.get("avg_comments_per_reel_cached"),
+            # Post metrics
+            "avg_likes_per_post_cached": analytics.get("avg_likes_per_post_cached"),
+            "avg_comments_per_post_cached": analytics.get("avg_comments_per_post_cached"),
+            # Engagement metrics
+            "avg_engagement_rate": analytics.get("avg_engagement_rate"),
+            "engagement_rate_cached": analytics.get("engagement_rate"),
+            # Content analysis
+            "best_content_type": analytics.get("best_content_type"),
+            "viral_content_count_cached": analytics.get("viral_content_count"),
+            "viral_threshold_multiplier": analytics.get("viral_threshold_multiplier"),
+            # Posting metrics
+            "posting_frequency_per_week": analytics.get("posting_frequency_per_week"),
+            "posting_consistency_score": analytics.get("posting_consistency_score"),
+            "last_post_days_ago": analytics.get("last_post_days_ago"),
+            # Metadata
+            "last_scraped_at": datetime.now(timezone.utc).isoformat(),
+            **(extra_fields or {}),
+        }
+
+        # Remove None values to avoid overwriting with nulls
+        update_data = {k: v for k, v in update_data.items() if v is not None}
+        if self.running_aggregates:
+            # Full-history averages are maintained by the running-aggregate triggers
+            update_data = {
+                k: v for k, v in update_data.items() if k not in RUNNING_AGGREGATE_FIELDS
+            }
+        return update_data
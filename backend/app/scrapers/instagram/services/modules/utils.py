@@ -5,7 +5,7 @@ Pure utility functions for data transformation and extraction
 
 import re
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 def identify_external_url_type(url: str) -> Optional[str]:
@@ -152,3 +152,42 @@ def to_iso(timestamp: Optional[int]) -> Optional[str]:
         return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).isoformat()
     except Exception:
         return None
+
+
+# Custom domain serving our R2 bucket (R2_PUBLIC_URL)
+R2_MEDIA_DOMAIN = "media.b9dashboard.com"
+
+
+def is_r2_url(url: Optional[str]) -> bool:
+    """
+    Check whether a stored media URL already points at our R2 custom domain
+
+    Args:
+        url: Stored media URL (may be None)
+
+    Returns:
+        True if the media was already copied to R2
+    """
+    return bool(url) and R2_MEDIA_DOMAIN in url  # type: ignore[operator]
+
+
+def latest_media_taken_at(profile: Dict[str, Any]) -> Optional[int]:
+    """
+    Newest taken_at among the media edges embedded in a profile response
+
+    Pinned posts can come first, so this takes the maximum over all edges.
+
+    Args:
+        profile: Raw profile response
+
+    Returns:
+        Unix timestamp, or None if the response has no media edges
+    """
+    edges = (profile.get("edge_owner_to_timeline_media") or {}).get("edges") or []
+    raw = [
+        (edge.get("node") or {}).get("taken_at_timestamp")
+        for edge in edges
+        if isinstance(edge, dict)
+    ]
+    stamps = [int(ts) for ts in raw if ts]
+    return max(stamps) if stamps else None
@@ -0,0 +1,230 @@
+"""
+Instagram Worker Pool Module
+Bounded asyncio worker pool for processing creators with per-creator timeouts
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class PoolProgress:
+    """Live counters for one pool run"""
+
+    total: int
+    started_at: float = field(default_factory=time.monotonic)
+    done: int = 0
+    failed: int = 0
+    timed_out: int = 0  # Included in failed
+    in_flight: int = 0
+    skipped: int = 0  # Left in the queue when the pool drained
+
+    @property
+    def completed(self) -> int:
+        """Creators finished (successfully or not)"""
+        return self.done + self.failed
+
+    @property
+    def remaining(self) -> int:
+        """Creators not yet finished or skipped"""
+        return max(self.total - self.completed - self.skipped, 0)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started"""
+        return time.monotonic() - self.started_at
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds to finish at the observed completion rate"""
+        if not self.completed:
+            return None
+        return self.remaining * self.elapsed / self.completed
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Progress snapshot for logs and status endpoints"""
+        eta = self.eta_seconds
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "in_flight": self.in_flight,
+            "skipped": self.skipped,
+            "elapsed_seconds": round(self.elapsed, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+
+class CreatorWorkerPool:
+    """
+    Fixed set of consumer coroutines draining an asyncio.Queue
+
+    Each item gets its own timeout, so a slow creator never cancels the
+    others. When `should_continue` turns false (or drain() is called) the
+    workers stop taking new items; in-flight items get `drain_grace` seconds
+    to finish before they are cancelled.
+    """
+
+    def __init__(
+        self,
+        logger,
+        concurrency: int,
+        item_timeout: float = 300.0,
+        drain_grace: float = 30.0,
+        progress_interval: float = 30.0,
+        should_continue: Optional[Callable[[], bool]] = None,
+        start_stagger: float = 0.05,
+    ):
+        """
+        Initialize worker pool
+
+        Args:
+            logger: Logger instance
+            concurrency: Number of worker coroutines
+            item_timeout: Seconds allowed per item
+            drain_grace: Seconds in-flight items may run after a drain starts
+            progress_interval: Seconds between progress log lines
+            should_continue: Cheap stop check, polled by the monitor loop
+            start_stagger: Delay between worker starts (avoids a thundering herd)
+        """
+        self.logger = logger
+        self.concurrency = max(1, concurrency)
+        self.item_timeout = item_timeout
+        self.drain_grace = drain_grace
+        self.progress_interval = progress_interval
+        self.should_continue = should_continue
+        self.start_stagger = start_stagger
+        self.progress = PoolProgress(total=0)
+        self._draining = False
+
+    @property
+    def draining(self) -> bool:
+        """True once the pool has stopped taking new items"""
+        return self._draining
+
+    def drain(self) -> None:
+        """Stop taking new items; in-flight items finish (within drain_grace)"""
+        if not self._draining:
+            self._draining = True
+            self.logger.info(
+                f"⛔ Draining worker pool: {self.progress.in_flight} in flight, "
+                f"{self.progress.remaining - self.progress.in_flight} not started"
+            )
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        handler: Callable[[Any], Awaitable[Any]],
+        label: Callable[[Any], str] = str,
+    ) -> PoolProgress:
+        """
+        Process items with bounded concurrency
+
+        Args:
+            items: Work items (e.g. creator dicts)
+            handler: Coroutine function; returning False counts as a failure
+            label: Item -> name for log lines
+
+        Returns:
+            Final PoolProgress
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        self.progress = PoolProgress(total=queue.qsize())
+        self._draining = False
+        if not self.progress.total:
+            return self.progress
+
+        workers: List[asyncio.Task] = [
+            asyncio.create_task(self._worker(n, queue, handler, label), name=f"Creator-{n + 1}")
+            for n in range(min(self.concurrency, self.progress.total))
+        ]
+        await self._monitor(workers)
+
+        self.progress.skipped = queue.qsize()
+        return self.progress
+
+    async def _worker(
+        self,
+        n: int,
+        queue: asyncio.Queue,
+        handler: Callable[[Any], Awaitable[Any]],
+        label: Callable[[Any], str],
+    ) -> None:
+        await asyncio.sleep(n * self.start_stagger)
+        progress = self.progress
+
+        while not self._draining:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            name = label(item)
+            progress.in_flight += 1
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(handler(item), timeout=self.item_timeout)
+                if result is False:
+                    progress.failed += 1
+                else:
+                    progress.done += 1
+            except asyncio.TimeoutError:
+                progress.failed += 1
+                progress.timed_out += 1
+                self.logger.warning(f"⏱️ {name} timed out after {self.item_timeout:g}s")
+            except asyncio.CancelledError:
+                progress.failed += 1
+                self.logger.warning(f"⛔ {name} cancelled during drain")
+                raise
+            except Exception as e:
+                progress.failed += 1
+                self.logger.error(f"❌ {name} failed: {e}")
+            finally:
+                progress.in_flight -= 1
+                queue.task_done()
+                self.logger.debug(f"🏁 {name} finished in {time.monotonic() - started:.1f}s")
+
+    async def _monitor(self, workers: List[asyncio.Task]) -> None:
+        """Wait for workers while polling stop state and logging progress"""
+        pending = set(workers)
+        last_report = time.monotonic()
+        drain_started: Optional[float] = None
+
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=1.0)
+            now = time.monotonic()
+
+            if not self._draining and self.should_continue and not self.should_continue():
+                self.drain()
+            if self._draining:
+                drain_started = drain_started or now
+                if pending and now - drain_started > self.drain_grace:
+                    self.logger.warning(
+                        f"⚠️ Drain grace of {self.drain_grace:g}s expired - "
+                        f"cancelling {self.progress.in_flight} in-flight creators"
+                    )
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    pending = set()
+
+            if pending and now - last_report >= self.progress_interval:
+                last_report = now
+                self._log_progress()
+
+        self._log_progress()
+
+    def _log_progress(self) -> None:
+        p = self.progress
+        eta = p.eta_seconds
+        eta_str = f"{int(eta // 60)}m {int(eta % 60)}s" if eta is not None else "n/a"
+        self.logger.info(
+            f"📊 Creators {p.completed}/{p.total} "
+            f"(done {p.done}, failed {p.failed}, in flight {p.in_flight}) - ETA {eta_str}"
+        )
@@ -19,10 +19,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if "/app/app/scrapers" in current_dir:
     api_root = os.path.join(current_dir, "..", "..", "..")
     sys.path.insert(0, api_root)
+    from app.core.control_state import get_control_watcher
     from app.core.database.supabase_client import get_supabase_client
 else:
     api_root = os.path.join(current_dir, "..", "..")
     sys.path.insert(0, api_root)
+    from core.control_state import get_control_watcher  # type: ignore[no-redef]
     from core.database.supabase_client import get_supabase_client  # type: ignore[no-redef]
 
 CONTROLLER_VERSION = "2.1.0"
@@ -43,7 +45,10 @@ class RedditController:
         logger.info(f"🎛️  Reddit Controller v{CONTROLLER_VERSION} initialized")
 
     async def is_enabled(self):
-        """Check if scraping is enabled in database"""
+        """Check if scraping is enabled in database (cached by the control watcher)"""
+        enabled = get_control_watcher(self.supabase).is_enabled("reddit_scraper")
+        if enabled is not None:
+            return enabled
         try:
             result = (
                 self.supabase.table("system_control")  # type: ignore[union-attr]
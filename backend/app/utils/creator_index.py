@@ -0,0 +1,152 @@
+"""
+Known-Creator Index
+In-memory set of the ig_user_ids and usernames already stored in instagram_creators
+
+Related-creator discovery used to learn that a profile was already known only
+after paying for its full profile fetch (and picture upload) and one SELECT.
+Most related profiles are known, so the index is loaded once (paged by id) and
+kept current as creators are inserted; candidates are checked against it before
+any API call or query. A periodic reload picks up creators added elsewhere.
+
+The index is an optimisation only: if it could not be loaded, callers fall back
+to querying the database.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+CREATORS_TABLE = "instagram_creators"
+LOAD_PAGE_SIZE = 1000
+
+
+class KnownCreatorIndex:
+    """
+    ig_user_ids and lowercased usernames of stored creators
+
+    Thread-safe: discovery checks and adds from the event loop and from threads.
+    """
+
+    def __init__(self, supabase_client, max_age: float = 3600.0, page_size: int = LOAD_PAGE_SIZE):
+        """
+        Initialize index
+
+        Args:
+            supabase_client: Supabase client the index is loaded from
+            max_age: Seconds after which ensure_loaded() reloads the index
+            page_size: Creators per load query
+        """
+        self.supabase = supabase_client
+        self.max_age = max_age
+        self.page_size = page_size
+        self._ids: set = set()
+        self._usernames: set = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "added": 0, "loads": 0}
+
+    @property
+    def loaded(self) -> bool:
+        """The index holds a complete snapshot"""
+        return self._loaded_at is not None
+
+    def ensure_loaded(self) -> bool:
+        """
+        Load the index if it was never loaded or is older than max_age
+
+        Returns:
+            True if the index is usable (a load failure keeps the previous snapshot)
+        """
+        stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+        if stale:
+            with self._load_lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+                    self.load()
+        return self.loaded
+
+    def load(self) -> None:
+        """Replace the index with every stored creator (keyset pages by id)"""
+        started = time.monotonic()
+        ids: set = set()
+        usernames: set = set()
+        cursor = None
+        try:
+            while True:
+                query = self.supabase.table(CREATORS_TABLE).select("id, ig_user_id, username")
+                if cursor is not None:
+                    query = query.gt("id", cursor)
+                rows = query.order("id").limit(self.page_size).execute().data or []
+                for row in rows:
+                    if row.get("ig_user_id"):
+                        ids.add(str(row["ig_user_id"]))
+                    if row.get("username"):
+                        usernames.add(str(row["username"]).lower())
+                if len(rows) < self.page_size:
+                    break
+                cursor = rows[-1]["id"]
+        except Exception as e:
+            logger.warning(f"⚠️ Known-creator index load failed: {e}")
+            return
+
+        with self._lock:
+            self._ids, self._usernames = ids, usernames
+            self._loaded_at = time.monotonic()
+            self.stats["loads"] += 1
+        logger.info(
+            f"📇 Known-creator index loaded: {len(ids)} creators "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+    def contains(
+        self, ig_user_id: Any = None, username: Optional[str] = None, count: bool = True
+    ) -> bool:
+        """
+        True if the creator is known by id or username
+
+        Args:
+            ig_user_id: Instagram user id
+            username: Username (case-insensitive)
+            count: Record the lookup in the hit/miss stats; re-checks of
+                candidates that were already triaged pass False
+        """
+        with self._lock:
+            known = (ig_user_id is not None and str(ig_user_id) in self._ids) or (
+                bool(username) and str(username).lower() in self._usernames
+            )
+            if count:
+                self.stats["hits" if known else "misses"] += 1
+            return known
+
+    def add(self, ig_user_id: Any = None, username: Optional[str] = None) -> None:
+        """Record a creator that was just stored"""
+        with self._lock:
+            if ig_user_id is not None:
+                self._ids.add(str(ig_user_id))
+            if username:
+                self._usernames.add(str(username).lower())
+            self.stats["added"] += 1
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Record inserted instagram_creators rows"""
+        for row in rows:
+            self.add(row.get("ig_user_id"), row.get("username"))
+
+    def known_profiles(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The related-profile nodes ({id, username}) that are already stored"""
+        return [node for node in nodes if self.contains(node.get("id"), node.get("username"))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus index size"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            stats["creators"] = len(self._ids)
+        stats["age_seconds"] = (
+            round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+        )
+        return stats
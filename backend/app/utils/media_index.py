@@ -0,0 +1,254 @@
+"""
+Content-Addressed Media Index for Cloudflare R2
+Tracks which media bytes already live in R2 so identical files are never uploaded twice
+
+Two mappings are kept, each backed by a Supabase table with an in-process LRU in front:
+- content hash -> R2 object      (r2_media_objects) dedupes reposts across creators/reels/posts
+- CDN source   -> content hash   (r2_media_sources) skips downloads of unchanged CDN assets
+
+The index is an optimisation only: every lookup/write failure degrades to "not indexed",
+which falls back to the original download + upload path.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from app.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+OBJECTS_TABLE = "r2_media_objects"
+SOURCES_TABLE = "r2_media_sources"
+
+# Instagram CDN query params that change the bytes served (resize/crop/transcode).
+# Everything else in the query string is a rotating signature and must be ignored.
+CONTENT_AFFECTING_PARAMS = ("stp",)
+
+
+@dataclass
+class MediaObject:
+    """An object stored in R2, addressed by the SHA-256 of its bytes"""
+
+    content_hash: str
+    size_bytes: int
+    object_key: str
+    public_url: str
+
+
+@dataclass
+class MediaSource:
+    """Last seen state of a CDN asset, including HTTP validators for conditional GETs"""
+
+    source_key: str
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def compute_content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of media bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cdn_source_key(url: str) -> str:
+    """
+    Stable identity for a CDN media URL
+
+    Instagram CDN URLs differ per edge host and carry expiring signatures
+    (oh, oe, _nc_*), but the asset path is immutable. Only params that alter
+    the rendition (e.g. stp=dst-jpg_s150x150) are kept.
+
+    Args:
+        url: Instagram CDN URL
+
+    Returns:
+        Path plus content-affecting params, e.g. "/v/t51.2885-19/123_n.jpg?stp=..."
+    """
+    parts = urlsplit(url)
+    if not parts.path:
+        return url
+
+    query = parse_qs(parts.query)
+    kept = [f"{p}={query[p][0]}" for p in CONTENT_AFFECTING_PARAMS if query.get(p)]
+    return f"{parts.path}?{'&'.join(kept)}" if kept else parts.path
+
+
+class _LRUCache:
+    """Small thread-safe LRU used in front of the Supabase tables"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MediaContentIndex:
+    """
+    Content-addressed index of media stored in R2
+
+    Lookups hit the in-process LRU first and Supabase second. Writes go to both.
+    """
+
+    def __init__(self, supabase_client=None, max_cache_entries: int = 50000):
+        """
+        Initialize media index
+
+        Args:
+            supabase_client: Supabase client (None = in-memory only)
+            max_cache_entries: Max entries per in-process LRU
+        """
+        self.supabase = supabase_client
+        self._objects = _LRUCache(max_cache_entries)  # content_hash -> MediaObject
+        self._sources = _LRUCache(max_cache_entries)  # source_key -> MediaSource
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "source_hits": 0,
+            "not_modified": 0,
+            "content_hits": 0,
+            "r2_matches": 0,
+            "uploads": 0,
+            "bytes_saved": 0,
+        }
+
+    def record_stat(self, name: str, amount: int = 1) -> None:
+        """Increment a dedup counter"""
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + amount
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_object(
+        self, content_hash: str, size_bytes: Optional[int] = None
+    ) -> Optional[MediaObject]:
+        """
+        Find R2 object holding the given content
+
+        Args:
+            content_hash: SHA-256 hex digest
+            size_bytes: Expected size (guards against truncated/partial rows)
+
+        Returns:
+            MediaObject or None if content not yet in R2
+        """
+        obj = self._objects.get(content_hash)
+        if obj is None and self.supabase is not None:
+            try:
+                result = (
+                    self.supabase.table(OBJECTS_TABLE)
+                    .select("content_hash, size_bytes, object_key, public_url")
+                    .eq("content_hash", content_hash)
+                    .limit(1)
+                    .execute()
+                )
+                if result.data:
+                    obj = MediaObject(**result.data[0])
+                    self._objects.put(content_hash, obj)
+            except Exception as e:
+                logger.debug(f"Media index object lookup failed: {e}")
+                return None
+
+        if obj is not None and size_bytes is not None and obj.size_bytes != size_bytes:
+            return None
+        return obj
+
+    def get_source(self, source_key: str) -> Optional[MediaSource]:
+        """Find the last known content hash/validators for a CDN asset"""
+        source = self._sources.get(source_key)
+        if source is None and self.supabase is not None:
+            try:
+                result = (
+                    self.supabase.table(SOURCES_TABLE)
+                    .select("source_key, content_hash, etag, last_modified")
+                    .eq("source_key", source_key)
+                    .limit(1)
+                    .execute()
+                )
+                if result.data:
+                    source = MediaSource(**result.data[0])
+                    self._sources.put(source_key, source)
+            except Exception as e:
+                logger.debug(f"Media index source lookup failed: {e}")
+                return None
+        return source
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put_object(self, obj: MediaObject) -> None:
+        """
+        Record an uploaded R2 object
+
+        Only immutable keys (photos/videos named by media_pk) belong here. Keys that
+        are overwritten in place, like profile pictures, must not be shared by hash.
+        """
+        self._objects.put(obj.content_hash, obj)
+        if self.supabase is None:
+            return
+
+        try:
+            self.supabase.table(OBJECTS_TABLE).upsert(
+                {
+                    "content_hash": obj.content_hash,
+                    "size_bytes": obj.size_bytes,
+                    "object_key": obj.object_key,
+                    "public_url": obj.public_url,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+                on_conflict="content_hash",
+            ).execute()
+        except Exception as e:
+            logger.debug(f"Media index object write failed: {e}")
+
+    def put_source(self, source: MediaSource) -> None:
+        """Record the content hash and validators last seen for a CDN asset"""
+        self._sources.put(source.source_key, source)
+        if self.supabase is None:
+            return
+
+        try:
+            self.supabase.table(SOURCES_TABLE).upsert(
+                {
+                    "source_key": source.source_key,
+                    "content_hash": source.content_hash,
+                    "etag": source.etag,
+                    "last_modified": source.last_modified,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+                on_conflict="source_key",
+            ).execute()
+        except Exception as e:
+            logger.debug(f"Media index source write failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Dedup counters plus cache sizes"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["cached_objects"] = len(self._objects)
+        stats["cached_sources"] = len(self._sources)
+        return stats
@@ -9,7 +9,7 @@ Storage cost increase: ~$40/month initially, ~$407/month at 10k creators/year.
 
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 import boto3
 import requests
@@ -24,6 +24,13 @@ from botocore.exceptions import ClientError
 from app.core.config.r2_config import r2_config
 from app.core.database.supabase_client import get_supabase_client
 from app.logging import get_logger
+from app.utils.media_index import (
+    MediaContentIndex,
+    MediaObject,
+    MediaSource,
+    cdn_source_key,
+    compute_content_hash,
+)
 
 
 # Get Supabase client for logging
@@ -111,6 +118,17 @@ class R2Client:
 # Singleton instance
 _r2_client = R2Client()
 
+# Content-addressed index (shares the module Supabase client)
+_media_index = MediaContentIndex(_supabase, max_cache_entries=r2_config.DEDUP_CACHE_SIZE)
+
+# R2 object metadata key holding the SHA-256 of the uploaded bytes
+CONTENT_HASH_METADATA_KEY = "content-sha256"
+
+
+def get_media_index() -> MediaContentIndex:
+    """Get the process-wide media dedup index (for stats/monitoring)"""
+    return _media_index
+
 
 def download_media(url: str, timeout: int = 60) -> bytes:
     """
@@ -139,6 +157,169 @@ def download_media(url: str, timeout: int = 60) -> bytes:
         raise MediaStorageError(f"Failed to download media from {url[:80]}...: {e}") from e
 
 
+def download_media_conditional(
+    url: str,
+    timeout: int = 60,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Optional[Tuple[bytes, Optional[str], Optional[str]]]:
+    """
+    Download media unless the CDN reports it unchanged (If-None-Match / If-Modified-Since)
+
+    Args:
+        url: Media URL (Instagram CDN)
+        timeout: Request timeout in seconds
+        etag: ETag from a previous download
+        last_modified: Last-Modified from a previous download
+
+    Returns:
+        (content, etag, last_modified), or None on 304 Not Modified
+
+    Raises:
+        MediaStorageError: If download fails
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        logger.debug(f"⬇️ Downloading media from {url[:80]}... (timeout: {timeout}s)")
+        response = requests.get(url, timeout=timeout, stream=True, headers=headers)
+        if response.status_code == 304:
+            response.close()
+            return None
+        response.raise_for_status()
+        content = response.content
+        logger.debug(f"✅ Downloaded {len(content) / (1024 * 1024):.1f}MB")
+        return content, response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except requests.Timeout as e:
+        raise MediaStorageError(f"Download timeout after {timeout}s for {url[:80]}...") from e
+    except requests.RequestException as e:
+        raise MediaStorageError(f"Failed to download media from {url[:80]}...: {e}") from e
+
+
+def get_r2_content_hash(object_key: str) -> Optional[str]:
+    """
+    HEAD an R2 object and return the content hash stored in its metadata
+
+    Args:
+        object_key: S3 object key
+
+    Returns:
+        SHA-256 hex digest, or None if the object is missing or predates hashing
+    """
+    try:
+        client = _r2_client.get_client()
+        response = client.head_object(Bucket=r2_config.BUCKET_NAME, Key=object_key)
+        content_hash = response.get("Metadata", {}).get(CONTENT_HASH_METADATA_KEY)
+        return str(content_hash) if content_hash else None
+    except ClientError:
+        return None
+
+
+def store_media_deduplicated(
+    cdn_url: str,
+    object_key: str,
+    content_type: str,
+    metadata: dict,
+    timeout: int = 60,
+    overwrite_in_place: bool = False,
+) -> str:
+    """
+    Store CDN media in R2, skipping work already done
+
+    1. Known CDN asset: reuse its R2 object. If validators were recorded, a
+       conditional GET confirms it is unchanged (304 = no body transferred).
+    2. Downloaded bytes whose SHA-256 + size are already in R2: reuse that
+       object (reposts across creators/reels/posts), no PUT.
+    3. Keys overwritten in place (profile pictures): HEAD the key and skip the
+       PUT when it already holds the same hash.
+
+    Args:
+        cdn_url: Instagram CDN URL
+        object_key: Key to upload to when the content is new
+        content_type: MIME type
+        metadata: R2 object metadata
+        timeout: Download timeout in seconds
+        overwrite_in_place: True for mutable keys (never shared across sources by hash)
+
+    Returns:
+        R2 public URL holding the content
+
+    Raises:
+        MediaStorageError: If download or upload fails
+    """
+    public_url = f"{r2_config.PUBLIC_URL}/{object_key}"
+
+    if not r2_config.DEDUP_ENABLED:
+        data = download_media(cdn_url, timeout=timeout)
+        return upload_to_r2(data, object_key, content_type=content_type, metadata=metadata)
+
+    source_key = cdn_source_key(cdn_url)
+    source = _media_index.get_source(source_key)
+    etag = last_modified = None
+
+    if source is not None:
+        known_url: Optional[str] = None  # R2 URL already holding the source's content
+        if overwrite_in_place:
+            if get_r2_content_hash(object_key) == source.content_hash:
+                known_url = public_url
+        else:
+            existing = _media_index.get_object(source.content_hash)
+            known_url = existing.public_url if existing else None
+
+        if known_url and not (source.etag or source.last_modified):
+            # Instagram asset paths are immutable - same path, same bytes
+            _media_index.record_stat("source_hits")
+            return known_url
+
+        if known_url:
+            downloaded = download_media_conditional(
+                cdn_url, timeout=timeout, etag=source.etag, last_modified=source.last_modified
+            )
+            if downloaded is None:
+                _media_index.record_stat("not_modified")
+                return known_url
+        else:
+            downloaded = download_media_conditional(cdn_url, timeout=timeout)
+    else:
+        downloaded = download_media_conditional(cdn_url, timeout=timeout)
+
+    # A 304 is only possible when validators were sent, so downloaded is set here
+    data, etag, last_modified = downloaded  # type: ignore[misc]
+    content_hash = compute_content_hash(data)
+    new_source = MediaSource(source_key, content_hash, etag, last_modified)
+
+    if overwrite_in_place:
+        if get_r2_content_hash(object_key) == content_hash:
+            _media_index.record_stat("r2_matches")
+            _media_index.record_stat("bytes_saved", len(data))
+            _media_index.put_source(new_source)
+            return public_url
+    else:
+        existing = _media_index.get_object(content_hash, len(data))
+        if existing is not None:
+            logger.debug(f"♻️ Reusing R2 object {existing.object_key} for {object_key}")
+            _media_index.record_stat("content_hits")
+            _media_index.record_stat("bytes_saved", len(data))
+            _media_index.put_source(new_source)
+            return existing.public_url
+
+    public_url = upload_to_r2(
+        data,
+        object_key,
+        content_type=content_type,
+        metadata={**metadata, CONTENT_HASH_METADATA_KEY: content_hash},
+    )
+    _media_index.record_stat("uploads")
+    if not overwrite_in_place:
+        _media_index.put_object(MediaObject(content_hash, len(data), object_key, public_url))
+    _media_index.put_source(new_source)
+    return public_url
+
+
 # Compression functions removed - we now upload original files directly to R2
 # This eliminates FFmpeg/PIL dependencies and reduces upload time by 60-80%
 # Storage cost impact: ~$40/month initially, ~$407/month at 10k creators/year
@@ -196,6 +377,8 @@ def upload_to_r2(
     except Exception as e:
         raise MediaStorageError(f"Failed to upload to R2: {e}") from e
 
+    raise MediaStorageError("Failed to upload to R2: no upload attempts configured")
+
 
 def process_and_upload_image(
     cdn_url: str, creator_id: str, media_pk: str, index: int = 0
@@ -223,11 +406,6 @@ def process_and_upload_image(
         return None
 
     try:
-        # Download from CDN
-        logger.info("⬇️ Downloading image from Instagram CDN...")
-        image_data = download_media(cdn_url, timeout=30)
-        logger.info(f"✅ Downloaded {len(image_data) / 1024:.1f}KB from CDN")
-
         # Generate object key: photos/YYYY/MM/creator_id/media_pk_index.jpg
         now = datetime.now()
         object_key = (
@@ -235,9 +413,9 @@ def process_and_upload_image(
             f"{creator_id}/{media_pk}_{index}.jpg"
         )
 
-        # Upload directly to R2 (no compression)
-        r2_url = upload_to_r2(
-            image_data,
+        # Download + upload directly to R2 (no compression), deduplicated by content hash
+        r2_url = store_media_deduplicated(
+            cdn_url,
             object_key,
             content_type="image/jpeg",
             metadata={
@@ -246,9 +424,10 @@ def process_and_upload_image(
                 "original_url": cdn_url[:200],
                 "uncompressed": "true",
             },
+            timeout=30,
         )
 
-        logger.info(f"✅ Image uploaded to R2: {len(image_data) / 1024:.1f}KB")
+        logger.info(f"✅ Image stored in R2: {r2_url}")
         return r2_url
 
     except Exception as e:
@@ -278,18 +457,14 @@ def process_and_upload_profile_picture(cdn_url: str, creator_id: str) -> Optiona
         return None
 
     try:
-        # Download from CDN
-        logger.info(f"⬇️ Downloading profile picture from Instagram CDN (creator: {creator_id})")
-        image_data = download_media(cdn_url, timeout=30)
-        logger.info(f"✅ Downloaded {len(image_data) / 1024:.1f}KB from CDN")
-
         # Generate object key: profile_pictures/creator_id/profile.jpg
         # Using simple structure (no date) since we want to overwrite old profile pics
-        object_key = f"profile_pictures/{creator_id}/profile.jpg"
+        object_key = f"{r2_config.PROFILE_PICTURES_PREFIX}/{creator_id}/profile.jpg"
 
-        # Upload directly to R2 (no compression)
-        r2_url = upload_to_r2(
-            image_data,
+        # Unchanged pictures are detected via the media index + R2 HEAD, so no
+        # download or PUT happens unless the creator actually changed their picture
+        r2_url = store_media_deduplicated(
+            cdn_url,
             object_key,
             content_type="image/jpeg",
             metadata={
@@ -298,9 +473,11 @@ def process_and_upload_profile_picture(cdn_url: str, creator_id: str) -> Optiona
                 "original_url": cdn_url[:200],
                 "uncompressed": "true",
             },
+            timeout=30,
+            overwrite_in_place=True,
         )
 
-        logger.info(f"✅ Profile picture uploaded to R2 for creator {creator_id}")
+        logger.info(f"✅ Profile picture stored in R2 for creator {creator_id}")
         return r2_url
 
     except Exception as e:
@@ -332,20 +509,15 @@ def process_and_upload_video(cdn_url: str, creator_id: str, media_pk: str) -> Op
         return None
 
     try:
-        # Download from CDN (increased timeout for large videos)
-        logger.info("⬇️ Downloading video from Instagram CDN...")
-        video_data = download_media(cdn_url, timeout=90)  # Increased from 60s
-        logger.info(f"✅ Downloaded {len(video_data) / (1024 * 1024):.1f}MB from CDN")
-
         # Generate object key: videos/YYYY/MM/creator_id/media_pk.mp4
         now = datetime.now()
         object_key = (
             f"{r2_config.VIDEOS_PREFIX}/{now.year}/{now.month:02d}/{creator_id}/{media_pk}.mp4"
         )
 
-        # Upload directly to R2 (no compression)
-        r2_url = upload_to_r2(
-            video_data,
+        # Download + upload directly to R2 (no compression), deduplicated by content hash
+        r2_url = store_media_deduplicated(
+            cdn_url,
             object_key,
             content_type="video/mp4",
             metadata={
@@ -354,9 +526,10 @@ def process_and_upload_video(cdn_url: str, creator_id: str, media_pk: str) -> Op
                 "original_url": cdn_url[:200],
                 "uncompressed": "true",  # Flag for future reference
             },
+            timeout=90,  # Increased from 60s for large videos
         )
 
-        logger.info(f"✅ Video uploaded to R2: {len(video_data) / (1024 * 1024):.1f}MB")
+        logger.info(f"✅ Video stored in R2: {r2_url}")
         return r2_url
 
     except Exception as e:
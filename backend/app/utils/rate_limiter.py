@@ -0,0 +1,183 @@
+"""
+RapidAPI Rate Limiter
+Request pacing shared by every RapidAPI caller
+
+The scraper (API process, instagram_controller subprocess, queue workers) and
+related-creator discovery used to pace their requests separately, so each
+process ran at the full INSTAGRAM_REQUESTS_PER_SECOND on top of the others.
+With Redis configured (REDIS_HOST), get_rapidapi_limiter() reserves slots on
+one timeline kept in Redis, so every caller in every process counts against
+the same budget. Without Redis the budget only covers the current process.
+
+Callers with a tighter budget of their own (discovery, a controller time
+slice) chain a local limiter in front of the shared one (`parent`); their
+rate only spaces their own requests and never stretches the shared timeline.
+
+Each call reserves the next free slot before sleeping, so concurrent callers
+are spaced out instead of all waking up after the same delay.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from app.config import config
+
+
+try:
+    import redis
+except ImportError:  # Redis is optional; pacing is then per process
+    redis = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+RAPIDAPI_SLOT_KEY = "b9:rapidapi:next_slot"
+
+# KEYS[1] next free slot (microseconds on the Redis clock); ARGV[1] slot length.
+# Returns the microseconds until the reserved slot. The key expires once idle.
+_RESERVE_LUA = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000000 + tonumber(now[2])
+local slot = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+local interval = tonumber(ARGV[1])
+redis.call('SET', KEYS[1], string.format('%.0f', slot + interval),
+    'PX', math.floor((slot - now + interval) / 1000) + 60000)
+return slot - now
+"""
+
+
+class RequestRateLimiter:
+    """
+    Slot-reserving request pacing within one process
+
+    Thread-safe: callers on different event loops (API process, scraper
+    threads) share the slot timeline.
+    """
+
+    def __init__(self, requests_per_second: float, parent: Optional["RequestRateLimiter"] = None):
+        """
+        Initialize limiter
+
+        Args:
+            requests_per_second: Maximum request rate (<= 0 disables this limiter's pacing)
+            parent: Limiter every request also takes a slot from (e.g. the shared budget)
+        """
+        self.requests_per_second = requests_per_second
+        self.parent = parent
+        self.next_slot = 0.0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserve the next request slot
+
+        Returns:
+            Seconds until the slot
+        """
+        with self._lock:
+            self.requests += 1
+            if self.requests_per_second <= 0:
+                return 0.0
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1.0 / self.requests_per_second
+        return slot - now
+
+    async def wait(self) -> None:
+        """Sleep until this caller's request slot (and the parent's)"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.parent:
+            await self.parent.wait()
+
+
+class SharedRateLimiter(RequestRateLimiter):
+    """
+    Request pacing on a slot timeline kept in Redis (shared by every process)
+
+    If Redis is unreachable, slots are reserved on the local timeline instead
+    until it answers again.
+    """
+
+    def __init__(self, redis_client: Any, requests_per_second: float, key: str = RAPIDAPI_SLOT_KEY):
+        """
+        Initialize limiter
+
+        Args:
+            redis_client: Redis client holding the shared timeline
+            requests_per_second: Maximum request rate across all processes
+            key: Redis key of the next free slot
+        """
+        super().__init__(requests_per_second)
+        self.redis = redis_client
+        self.key = key
+        self.fallbacks = 0
+        self._reserve_script = redis_client.register_script(_RESERVE_LUA)
+
+    def reserve(self) -> float:
+        """
+        Reserve the next request slot on the shared timeline
+
+        Returns:
+            Seconds until the slot
+        """
+        if self.requests_per_second <= 0:
+            return super().reserve()
+        try:
+            delay = self._reserve_script(
+                keys=[self.key], args=[round(1_000_000 / self.requests_per_second)]
+            )
+        except Exception as e:
+            self.fallbacks += 1
+            if self.fallbacks == 1 or self.fallbacks % 1000 == 0:
+                logger.warning(f"⚠️ Shared rate limiter unavailable, pacing locally: {e}")
+            return super().reserve()
+        with self._lock:
+            self.requests += 1
+        return int(delay) / 1_000_000
+
+    async def wait(self) -> None:
+        """Sleep until the reserved slot (the Redis round trip runs off the event loop)"""
+        delay = await asyncio.to_thread(self.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_rapidapi_limiter: Optional[RequestRateLimiter] = None
+_rapidapi_limiter_lock = threading.Lock()
+
+
+def get_rapidapi_limiter() -> RequestRateLimiter:
+    """
+    RapidAPI limiter at INSTAGRAM_REQUESTS_PER_SECOND
+
+    Returns:
+        SharedRateLimiter when REDIS_HOST is set, else a per-process RequestRateLimiter
+    """
+    global _rapidapi_limiter
+    if _rapidapi_limiter is None:
+        with _rapidapi_limiter_lock:
+            if _rapidapi_limiter is None:
+                rate = config.instagram.requests_per_second
+                host = os.getenv("REDIS_HOST")
+                if redis is not None and host:
+                    client = redis.Redis(
+                        host=host,
+                        port=int(os.getenv("REDIS_PORT", 6379)),
+                        password=os.getenv("REDIS_PASSWORD", "") or None,
+                        decode_responses=True,
+                        socket_connect_timeout=2,
+                        socket_timeout=2,
+                        socket_keepalive=True,
+                        health_check_interval=30,
+                    )
+                    _rapidapi_limiter = SharedRateLimiter(client, rate)
+                else:
+                    _rapidapi_limiter = RequestRateLimiter(rate)
+    return _rapidapi_limiter
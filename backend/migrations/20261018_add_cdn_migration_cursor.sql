@@ -0,0 +1,129 @@
+-- Migration: Add resumable CDN -> R2 migration support
+-- Date: 2026-10-18
+-- Purpose: Persist the migration cursor and write migrated media URLs in bulk
+--
+-- Context: app/jobs/cdn_to_r2_migration.py used to re-query the first
+-- `LIKE '%cdninstagram%'` rows on every run and issue one UPDATE per item.
+-- It now pages through each table by id, transfers a page concurrently and
+-- writes the page's new URLs in one call:
+--   cdn_migration_cursors: last id scanned per media type, plus running totals
+--     and the lease of the run currently migrating that type
+--   claim_cdn_migration_cursor(): take or renew that lease (one run per media
+--     type across every API worker and process)
+--   apply_media_url_updates(): per-row URL updates for one of the media tables
+--
+-- Each row is updated inside its own savepoint so a bad value only fails that
+-- row; failures are returned so the job can report them. Only the media tables
+-- are accepted, and keys that are not columns of the table are ignored.
+
+CREATE TABLE IF NOT EXISTS public.cdn_migration_cursors (
+  media_type text PRIMARY KEY,
+  last_id text,
+  scanned bigint NOT NULL DEFAULT 0,
+  migrated bigint NOT NULL DEFAULT 0,
+  failed bigint NOT NULL DEFAULT 0,
+  completed_at timestamptz,
+  locked_by text,
+  locked_until timestamptz,
+  updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE public.cdn_migration_cursors IS 'Resume point of the CDN -> R2 media migration per media type (profile, posts, reels)';
+COMMENT ON COLUMN public.cdn_migration_cursors.last_id IS 'Last row id scanned; the next run continues after it (NULL = start)';
+COMMENT ON COLUMN public.cdn_migration_cursors.locked_until IS 'Lease of the run migrating this media type (renewed every page; NULL or past = free)';
+
+-- Service role only (backend jobs)
+ALTER TABLE public.cdn_migration_cursors ENABLE ROW LEVEL SECURITY;
+
+-- Takes the lease if it is free or expired, or renews it for its holder, and
+-- returns the cursor row; returns no row while another run holds it. Concurrent
+-- claims serialize on the row lock, so only one of them gets the lease.
+CREATE OR REPLACE FUNCTION public.claim_cdn_migration_cursor(
+  p_media_type text,
+  p_owner text,
+  p_lease_seconds integer
+)
+RETURNS SETOF public.cdn_migration_cursors
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO cdn_migration_cursors (media_type)
+  VALUES (p_media_type)
+  ON CONFLICT (media_type) DO NOTHING;
+
+  RETURN QUERY
+  UPDATE cdn_migration_cursors
+  SET locked_by = p_owner,
+      locked_until = NOW() + make_interval(secs => p_lease_seconds)
+  WHERE media_type = p_media_type
+    AND (locked_until IS NULL OR locked_until < NOW() OR locked_by = p_owner)
+  RETURNING *;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.claim_cdn_migration_cursor(text, text, integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.claim_cdn_migration_cursor(text, text, integer) TO service_role;
+
+COMMENT ON FUNCTION public.claim_cdn_migration_cursor IS
+  'Take or renew the migration lease of a media type; returns the cursor row, or nothing while another run holds it';
+
+CREATE OR REPLACE FUNCTION public.apply_media_url_updates(p_table text, p_updates jsonb)
+RETURNS TABLE (media_id text, error text)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_update jsonb;
+  v_columns text;
+  v_relation regclass;
+BEGIN
+  IF p_table NOT IN ('instagram_creators', 'instagram_posts', 'instagram_reels') THEN
+    RAISE EXCEPTION 'apply_media_url_updates: unsupported table %', p_table;
+  END IF;
+  v_relation := format('public.%I', p_table)::regclass;
+
+  FOR v_update IN SELECT value FROM jsonb_array_elements(p_updates) LOOP
+    media_id := v_update->>'id';
+
+    SELECT string_agg(format('%I', a.attname), ', ' ORDER BY a.attnum)
+    INTO v_columns
+    FROM pg_attribute a
+    WHERE a.attrelid = v_relation
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND a.attname <> 'id'
+      AND (v_update->'fields') ? a.attname::text;
+
+    CONTINUE WHEN v_columns IS NULL OR media_id IS NULL;
+
+    -- The id is cast to the table's own key type (not m.id::text) so the
+    -- primary-key index serves each update
+    BEGIN
+      EXECUTE format(
+        'UPDATE public.%2$I m SET (%1$s) = '
+        '(SELECT %1$s FROM jsonb_populate_record(NULL::public.%2$I, $1)) '
+        'WHERE m.id = (jsonb_populate_record(NULL::public.%2$I, jsonb_build_object(''id'', $2))).id',
+        v_columns,
+        p_table
+      )
+      USING v_update->'fields', media_id;
+    EXCEPTION WHEN OTHERS THEN
+      error := SQLERRM;
+      RETURN NEXT;
+    END;
+  END LOOP;
+END;
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.apply_media_url_updates(text, jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_media_url_updates(text, jsonb) TO service_role;
+
+COMMENT ON FUNCTION public.apply_media_url_updates IS
+  'Bulk per-row media URL updates ([{id, fields}]) for creators/posts/reels; returns only the rows whose update failed';
+
+-- Verification query
+-- SELECT media_type, last_id, scanned, migrated, failed, completed_at, locked_by, locked_until FROM cdn_migration_cursors;
@@ -0,0 +1,155 @@
+-- Migration: Add server-side follower growth functions
+-- Date: 2026-10-18
+-- Purpose: Replace the insert + three lookback queries per creator with one call
+--
+-- Context: _track_follower_growth inserted a history row and then ran three
+-- ordered lookbacks on instagram_follower_history (24h ago, 7d ago, last
+-- different count): four round trips per creator on an append-only table.
+--
+--   record_instagram_follower_sample(): inserts the sample and returns
+--     daily/weekly growth and the previous count in a single round trip
+--   get_instagram_follower_history_states(): bulk-loads recent history for a
+--     batch of creators so the scraper can compute growth in-process and
+--     batch the inserts (FollowerGrowthTracker)
+
+CREATE OR REPLACE FUNCTION public.record_instagram_follower_sample(
+  p_creator_id text,
+  p_username text,
+  p_followers_count bigint,
+  p_following_count bigint DEFAULT NULL,
+  p_media_count bigint DEFAULT NULL
+)
+RETURNS TABLE (
+  daily_growth_rate numeric,
+  weekly_growth_rate numeric,
+  previous_followers_count bigint
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_now timestamptz := NOW();
+  v_daily bigint;
+  v_weekly bigint;
+  v_previous bigint;
+BEGIN
+  -- Follower count 24 hours ago
+  SELECT h.followers_count INTO v_daily
+  FROM instagram_follower_history h
+  WHERE h.creator_id = p_creator_id
+    AND h.recorded_at <= v_now - INTERVAL '1 day'
+  ORDER BY h.recorded_at DESC
+  LIMIT 1;
+
+  -- Follower count 7 days ago
+  SELECT h.followers_count INTO v_weekly
+  FROM instagram_follower_history h
+  WHERE h.creator_id = p_creator_id
+    AND h.recorded_at <= v_now - INTERVAL '7 days'
+  ORDER BY h.recorded_at DESC
+  LIMIT 1;
+
+  -- Most recent count that differs from the current one
+  SELECT h.followers_count INTO v_previous
+  FROM instagram_follower_history h
+  WHERE h.creator_id = p_creator_id
+    AND h.followers_count <> p_followers_count
+  ORDER BY h.recorded_at DESC
+  LIMIT 1;
+
+  INSERT INTO instagram_follower_history (
+    creator_id, username, followers_count, following_count, media_count, recorded_at
+  ) VALUES (
+    p_creator_id, p_username, p_followers_count, p_following_count, p_media_count, v_now
+  );
+
+  -- A 0% rate is reported as NULL, matching the previous Python behaviour
+  RETURN QUERY SELECT
+    CASE WHEN v_daily > 0
+      THEN NULLIF(ROUND(((p_followers_count - v_daily)::numeric / v_daily) * 100, 2), 0)
+    END,
+    CASE WHEN v_weekly > 0
+      THEN NULLIF(ROUND(((p_followers_count - v_weekly)::numeric / v_weekly) * 100, 2), 0)
+    END,
+    v_previous;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.get_instagram_follower_history_states(
+  p_creator_ids text[],
+  p_window_days integer DEFAULT 7
+)
+RETURNS TABLE (
+  creator_id text,
+  samples jsonb,
+  previous_distinct bigint
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH ids AS (
+    SELECT DISTINCT unnest(p_creator_ids) AS creator_id
+  ),
+  bounds AS (
+    SELECT
+      ids.creator_id,
+      -- Latest sample at or before the window start anchors the weekly lookback
+      (
+        SELECT h.recorded_at
+        FROM instagram_follower_history h
+        WHERE h.creator_id = ids.creator_id
+          AND h.recorded_at <= NOW() - make_interval(days => p_window_days)
+        ORDER BY h.recorded_at DESC
+        LIMIT 1
+      ) AS anchor_at,
+      (
+        SELECT h.followers_count
+        FROM instagram_follower_history h
+        WHERE h.creator_id = ids.creator_id
+        ORDER BY h.recorded_at DESC
+        LIMIT 1
+      ) AS latest_followers
+    FROM ids
+  )
+  SELECT
+    b.creator_id,
+    COALESCE(
+      (
+        SELECT jsonb_agg(
+          jsonb_build_array(EXTRACT(EPOCH FROM h.recorded_at), h.followers_count)
+          ORDER BY h.recorded_at
+        )
+        FROM instagram_follower_history h
+        WHERE h.creator_id = b.creator_id
+          AND h.recorded_at >= COALESCE(b.anchor_at, NOW() - make_interval(days => p_window_days))
+      ),
+      '[]'::jsonb
+    ),
+    -- Most recent count differing from the latest sample (may predate the window)
+    (
+      SELECT h.followers_count
+      FROM instagram_follower_history h
+      WHERE h.creator_id = b.creator_id
+        AND h.followers_count <> b.latest_followers
+      ORDER BY h.recorded_at DESC
+      LIMIT 1
+    )
+  FROM bounds b;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_instagram_follower_history_creator_recorded
+  ON instagram_follower_history(creator_id, recorded_at DESC);
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.record_instagram_follower_sample(text, text, bigint, bigint, bigint) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.get_instagram_follower_history_states(text[], integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.record_instagram_follower_sample(text, text, bigint, bigint, bigint) TO service_role;
+GRANT EXECUTE ON FUNCTION public.get_instagram_follower_history_states(text[], integer) TO service_role;
+
+-- Verification query
+-- SELECT * FROM record_instagram_follower_sample('2017771114', 'vismaramartina', 125000, 300, 412);
+-- SELECT creator_id, jsonb_array_length(samples), previous_distinct
+-- FROM get_instagram_follower_history_states(ARRAY['2017771114']);
@@ -0,0 +1,59 @@
+-- Migration: Add columns and run log for the batch analytics recompute job
+-- Date: 2026-10-18
+-- Purpose: Store catalog-relative viral counts and record each recompute run
+--
+-- Context: Creator analytics were only computed inside the scraper, per
+-- creator, over the 12-90 items fetched in that run, and viral detection was
+-- relative to the creator's own average. The recompute job
+-- (app/jobs/instagram_analytics.py, POST /api/cron/recompute-instagram-analytics)
+-- runs the vectorized BatchAnalyticsEngine over the stored media of every
+-- approved creator and derives viral thresholds from catalog-wide percentiles.
+-- It runs in the background; each run is tracked in instagram_analytics_runs
+-- (GET /api/cron/recompute-instagram-analytics/status).
+
+ALTER TABLE instagram_creators
+  ADD COLUMN IF NOT EXISTS catalog_viral_count_cached integer,
+  ADD COLUMN IF NOT EXISTS analytics_recomputed_at timestamptz;
+
+COMMENT ON COLUMN instagram_creators.catalog_viral_count_cached IS 'Reels/posts at or above the catalog p99 (views for reels, likes+comments for posts)';
+COMMENT ON COLUMN instagram_creators.analytics_recomputed_at IS 'Last batch analytics recompute that covered this creator';
+
+CREATE TABLE IF NOT EXISTS instagram_analytics_runs (
+  id bigserial PRIMARY KEY,
+  status text NOT NULL DEFAULT 'running'
+    CHECK (status IN ('running', 'completed', 'failed', 'abandoned')),
+  started_at timestamptz NOT NULL DEFAULT NOW(),
+  heartbeat_at timestamptz NOT NULL DEFAULT NOW(),
+  computed_at timestamptz,
+  creators_count integer NOT NULL DEFAULT 0,
+  media_count integer NOT NULL DEFAULT 0,
+  written_count integer NOT NULL DEFAULT 0,
+  failed_count integer NOT NULL DEFAULT 0,
+  thresholds jsonb NOT NULL DEFAULT '{}'::jsonb,
+  progress jsonb NOT NULL DEFAULT '{}'::jsonb,
+  duration_seconds numeric(10, 2),
+  error text
+);
+
+COMMENT ON COLUMN instagram_analytics_runs.heartbeat_at IS 'Renewed after every chunk; a running row silent for 15 minutes is marked abandoned by the next run';
+COMMENT ON COLUMN instagram_analytics_runs.computed_at IS 'Completion time (NULL until the run completes)';
+
+CREATE INDEX IF NOT EXISTS idx_instagram_analytics_runs_started_at
+  ON instagram_analytics_runs(started_at DESC);
+
+-- At most one running recompute across every API worker: a second insert
+-- with status 'running' fails with a unique violation (23505)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_instagram_analytics_runs_one_running
+  ON instagram_analytics_runs(status)
+  WHERE status = 'running';
+
+-- Service role only (backend jobs)
+ALTER TABLE public.instagram_analytics_runs ENABLE ROW LEVEL SECURITY;
+
+-- Media is loaded by creator_id; the (creator_id, taken_at) indexes from
+-- 20261018_add_instagram_creator_states_function.sql cover those reads.
+
+-- Verification query
+-- SELECT status, started_at, computed_at, creators_count, media_count, failed_count,
+--   thresholds->>'reel_views_p99' AS reel_p99
+-- FROM instagram_analytics_runs ORDER BY started_at DESC LIMIT 5;
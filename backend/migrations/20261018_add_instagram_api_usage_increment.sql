@@ -0,0 +1,45 @@
+-- Migration: Add atomic API usage increments for Instagram creators
+-- Date: 2026-10-18
+-- Purpose: Account RapidAPI calls and cost per creator without read-modify-write
+--
+-- Context: _update_creator_analytics read total_api_calls with .single() and
+-- wrote back current + api_calls_made. That cost an extra round trip per
+-- creator, and concurrent workers overwrote each other's totals. The scraper
+-- now keeps per-creator counts in memory (ApiUsageTracker) and flushes them
+-- here as increments, one call per batch of creators.
+
+ALTER TABLE instagram_creators
+  ADD COLUMN IF NOT EXISTS total_api_cost numeric(12, 6) NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN instagram_creators.total_api_cost IS 'Cumulative RapidAPI cost (USD) spent scraping this creator';
+
+CREATE OR REPLACE FUNCTION public.increment_instagram_api_usage(p_usage jsonb)
+RETURNS integer
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH usage AS (
+    -- Collapse duplicate creators so each row is updated exactly once
+    SELECT u.creator_id, SUM(u.calls) AS calls, SUM(u.cost) AS cost
+    FROM jsonb_to_recordset(p_usage) AS u(creator_id text, calls bigint, cost numeric)
+    GROUP BY u.creator_id
+  ),
+  updated AS (
+    UPDATE instagram_creators c
+    SET
+      total_api_calls = COALESCE(c.total_api_calls, 0) + usage.calls,
+      total_api_cost = COALESCE(c.total_api_cost, 0) + usage.cost
+    FROM usage
+    WHERE c.ig_user_id::text = usage.creator_id
+    RETURNING 1
+  )
+  SELECT COUNT(*)::integer FROM updated;
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.increment_instagram_api_usage(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.increment_instagram_api_usage(jsonb) TO service_role;
+
+-- Verification query
+-- SELECT increment_instagram_api_usage('[{"creator_id": "2017771114", "calls": 3, "cost": 0.0009}]');
@@ -0,0 +1,66 @@
+-- Migration: Add bulk instagram_creators update function
+-- Date: 2026-10-18
+-- Purpose: Let the scraper write profile/analytics updates for many creators in one call
+--
+-- Context: Every processed creator issued its own PATCH on instagram_creators
+-- (twice: profile, then analytics), so database round trips grew linearly with
+-- the batch. The scraper's BatchWriter now merges the updates of concurrently
+-- processed creators and sends them here in one RPC.
+--
+-- PostgREST cannot bulk-update rows with different values, so each update is
+-- applied with its own UPDATE inside a savepoint: a bad value only fails that
+-- creator, and the failures are returned so the caller can report them per
+-- creator. Keys that are not instagram_creators columns are ignored; values
+-- are cast through jsonb_populate_record, exactly like a PostgREST PATCH.
+
+CREATE OR REPLACE FUNCTION public.apply_instagram_creator_updates(p_updates jsonb)
+RETURNS TABLE (creator_id text, error text)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_update jsonb;
+  v_columns text;
+BEGIN
+  FOR v_update IN SELECT value FROM jsonb_array_elements(p_updates) LOOP
+    creator_id := v_update->>'ig_user_id';
+
+    SELECT string_agg(format('%I', a.attname), ', ' ORDER BY a.attnum)
+    INTO v_columns
+    FROM pg_attribute a
+    WHERE a.attrelid = 'public.instagram_creators'::regclass
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND a.attname <> 'ig_user_id'
+      AND (v_update->'fields') ? a.attname::text;
+
+    CONTINUE WHEN v_columns IS NULL OR creator_id IS NULL;
+
+    BEGIN
+      EXECUTE format(
+        'UPDATE public.instagram_creators c SET (%1$s) = '
+        '(SELECT %1$s FROM jsonb_populate_record(NULL::public.instagram_creators, $1)) '
+        'WHERE c.ig_user_id::text = $2',
+        v_columns
+      )
+      USING v_update->'fields', creator_id;
+    EXCEPTION WHEN OTHERS THEN
+      error := SQLERRM;
+      RETURN NEXT;
+    END;
+  END LOOP;
+END;
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.apply_instagram_creator_updates(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_instagram_creator_updates(jsonb) TO service_role;
+
+COMMENT ON FUNCTION public.apply_instagram_creator_updates IS
+  'Bulk per-creator updates ([{ig_user_id, fields}]); returns only the creators whose update failed';
+
+-- Verification query
+-- SELECT * FROM apply_instagram_creator_updates(
+--   '[{"ig_user_id": "2017771114", "fields": {"last_scraped_at": "2026-10-18T00:00:00Z"}}]'::jsonb
+-- );
@@ -0,0 +1,84 @@
+-- Migration: Add get_instagram_creator_states function
+-- Date: 2026-10-18
+-- Purpose: Load everything process_creator needs from the database in one call
+--
+-- Context: Before fetching anything from RapidAPI, each creator cost 6-8 PostgREST
+-- round trips: two count="exact" queries, the profile_pic_url lookup, the
+-- existing media_pk lookups for reels and posts, and the total_api_calls read.
+-- This function returns all of it for a whole batch of creators at once.
+--
+-- reel_urls / post_image_urls cover the newest p_media_limit items per creator
+-- (by taken_at). The scraper fetches newest-first, so the window only has to be
+-- at least as deep as the fetch depth (see INSTAGRAM_STATE_MEDIA_WINDOW).
+
+CREATE OR REPLACE FUNCTION public.get_instagram_creator_states(
+  p_creator_ids text[],
+  p_media_limit integer DEFAULT 100
+)
+RETURNS TABLE (
+  ig_user_id text,
+  reels_count bigint,
+  posts_count bigint,
+  profile_pic_url text,
+  total_api_calls bigint,
+  reel_urls jsonb,
+  post_image_urls jsonb
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT
+    c.ig_user_id::text,
+    (SELECT COUNT(*) FROM instagram_reels r WHERE r.creator_id = c.ig_user_id::text),
+    (SELECT COUNT(*) FROM instagram_posts p WHERE p.creator_id = c.ig_user_id::text),
+    c.profile_pic_url,
+    COALESCE(c.total_api_calls, 0)::bigint,
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, recent.video_url)
+        FROM (
+          SELECT r.media_pk::text AS media_pk, r.video_url
+          FROM instagram_reels r
+          WHERE r.creator_id = c.ig_user_id::text
+          ORDER BY r.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    ),
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, to_jsonb(recent.image_urls))
+        FROM (
+          SELECT p.media_pk::text AS media_pk, p.image_urls
+          FROM instagram_posts p
+          WHERE p.creator_id = c.ig_user_id::text
+          ORDER BY p.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    )
+  FROM instagram_creators c
+  WHERE c.ig_user_id::text = ANY(p_creator_ids);
+$$;
+
+-- Supporting indexes for the per-creator count + newest-first window
+CREATE INDEX IF NOT EXISTS idx_instagram_reels_creator_taken_at
+  ON instagram_reels(creator_id, taken_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_instagram_posts_creator_taken_at
+  ON instagram_posts(creator_id, taken_at DESC);
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) TO service_role;
+
+COMMENT ON FUNCTION public.get_instagram_creator_states IS
+  'Batch snapshot of scraper state per creator: content counts, profile picture, API call total and recent media URLs';
+
+-- Verification query
+-- SELECT ig_user_id, reels_count, posts_count, profile_pic_url, total_api_calls
+-- FROM get_instagram_creator_states(ARRAY['2017771114'], 100);
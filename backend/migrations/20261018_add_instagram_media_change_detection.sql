@@ -0,0 +1,99 @@
+-- Migration: Add media change detection to Instagram creator state
+-- Date: 2026-10-18
+-- Purpose: Let the scraper skip reels/posts pagination for creators with no new media
+--
+-- Context: Every creator cost a profile call plus reels and posts pagination
+-- each cycle, even when nothing had been published since the last scrape.
+-- The scraper now compares the fresh profile's media_count and newest embedded
+-- taken_at with the values recorded at the last media fetch, and only
+-- re-paginates unchanged creators every INSTAGRAM_UNCHANGED_REFRESH_HOURS to
+-- refresh engagement.
+--
+-- last_media_count is separate from media_count: media_count is updated from
+-- every profile call, while last_media_count only moves after reels/posts were
+-- actually fetched, so a failed fetch is retried next cycle.
+
+ALTER TABLE instagram_creators
+  ADD COLUMN IF NOT EXISTS last_media_count integer,
+  ADD COLUMN IF NOT EXISTS media_refreshed_at timestamptz;
+
+COMMENT ON COLUMN instagram_creators.last_media_count IS 'Profile media_count at the last successful reels/posts fetch';
+COMMENT ON COLUMN instagram_creators.media_refreshed_at IS 'Last successful reels/posts fetch (engagement refresh)';
+
+-- Return type changes, so the function has to be dropped first
+DROP FUNCTION IF EXISTS public.get_instagram_creator_states(text[], integer);
+
+CREATE FUNCTION public.get_instagram_creator_states(
+  p_creator_ids text[],
+  p_media_limit integer DEFAULT 100
+)
+RETURNS TABLE (
+  ig_user_id text,
+  reels_count bigint,
+  posts_count bigint,
+  profile_pic_url text,
+  total_api_calls bigint,
+  reel_urls jsonb,
+  post_image_urls jsonb,
+  last_media_count integer,
+  media_refreshed_at timestamptz,
+  latest_taken_at timestamptz
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT
+    c.ig_user_id::text,
+    (SELECT COUNT(*) FROM instagram_reels r WHERE r.creator_id = c.ig_user_id::text),
+    (SELECT COUNT(*) FROM instagram_posts p WHERE p.creator_id = c.ig_user_id::text),
+    c.profile_pic_url,
+    COALESCE(c.total_api_calls, 0)::bigint,
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, recent.video_url)
+        FROM (
+          SELECT r.media_pk::text AS media_pk, r.video_url
+          FROM instagram_reels r
+          WHERE r.creator_id = c.ig_user_id::text
+          ORDER BY r.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    ),
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, to_jsonb(recent.image_urls))
+        FROM (
+          SELECT p.media_pk::text AS media_pk, p.image_urls
+          FROM instagram_posts p
+          WHERE p.creator_id = c.ig_user_id::text
+          ORDER BY p.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    ),
+    c.last_media_count,
+    c.media_refreshed_at,
+    -- Served by the (creator_id, taken_at DESC) indexes
+    GREATEST(
+      (SELECT MAX(r.taken_at) FROM instagram_reels r WHERE r.creator_id = c.ig_user_id::text),
+      (SELECT MAX(p.taken_at) FROM instagram_posts p WHERE p.creator_id = c.ig_user_id::text)
+    )
+  FROM instagram_creators c
+  WHERE c.ig_user_id::text = ANY(p_creator_ids);
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) TO service_role;
+
+COMMENT ON FUNCTION public.get_instagram_creator_states IS
+  'Batch snapshot of scraper state per creator: content counts, profile picture, API call total, recent media URLs and change-detection markers';
+
+-- Verification query
+-- SELECT ig_user_id, last_media_count, media_refreshed_at, latest_taken_at
+-- FROM get_instagram_creator_states(ARRAY['2017771114'], 100);
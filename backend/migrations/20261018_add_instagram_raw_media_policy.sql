@@ -0,0 +1,161 @@
+-- Migration: Add raw media payload policy columns
+-- Date: 2026-10-18
+-- Purpose: Stop rewriting the full RapidAPI item into raw_media_json on every upsert
+--
+-- Context: Every reels/posts upsert carried the complete API item (often tens
+-- of KB with candidate and version arrays) in raw_media_json, bloating write
+-- payloads, WAL and table size. The scraper now applies INSTAGRAM_RAW_MEDIA_MODE:
+--   full      - whole item (previous behaviour)
+--   projected - whitelist of useful fields
+--   hash      - content hash only
+--   r2        - gzipped JSON in R2, pointer in raw_media_ref
+--
+-- raw_media_hash is a hash of the item (ignoring signed-URL query strings)
+-- and the mode. When it matches the stored hash the scraper sends NULL for
+-- raw_media_json/raw_media_ref and the trigger below keeps the stored values,
+-- so unchanged payloads are neither re-sent nor re-toasted. The stored hashes
+-- come back with the creator state snapshot.
+
+ALTER TABLE instagram_reels
+  ADD COLUMN IF NOT EXISTS raw_media_hash text,
+  ADD COLUMN IF NOT EXISTS raw_media_ref text;
+
+ALTER TABLE instagram_posts
+  ADD COLUMN IF NOT EXISTS raw_media_hash text,
+  ADD COLUMN IF NOT EXISTS raw_media_ref text;
+
+COMMENT ON COLUMN instagram_reels.raw_media_hash IS 'Hash of the raw API item and raw media mode';
+COMMENT ON COLUMN instagram_reels.raw_media_ref IS 'R2 URL of the gzipped raw API item (r2 mode)';
+COMMENT ON COLUMN instagram_posts.raw_media_hash IS 'Hash of the raw API item and raw media mode';
+COMMENT ON COLUMN instagram_posts.raw_media_ref IS 'R2 URL of the gzipped raw API item (r2 mode)';
+
+CREATE OR REPLACE FUNCTION public.keep_instagram_raw_media()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  -- Unchanged payload: the scraper left the blob out of the upsert
+  IF NEW.raw_media_hash IS NOT DISTINCT FROM OLD.raw_media_hash THEN
+    IF NEW.raw_media_json IS NULL THEN
+      NEW.raw_media_json := OLD.raw_media_json;
+    END IF;
+    IF NEW.raw_media_ref IS NULL THEN
+      NEW.raw_media_ref := OLD.raw_media_ref;
+    END IF;
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS instagram_reels_keep_raw_media ON instagram_reels;
+CREATE TRIGGER instagram_reels_keep_raw_media
+  BEFORE UPDATE ON instagram_reels
+  FOR EACH ROW EXECUTE FUNCTION public.keep_instagram_raw_media();
+
+DROP TRIGGER IF EXISTS instagram_posts_keep_raw_media ON instagram_posts;
+CREATE TRIGGER instagram_posts_keep_raw_media
+  BEFORE UPDATE ON instagram_posts
+  FOR EACH ROW EXECUTE FUNCTION public.keep_instagram_raw_media();
+
+-- Return type changes, so the function has to be dropped first
+DROP FUNCTION IF EXISTS public.get_instagram_creator_states(text[], integer);
+
+CREATE FUNCTION public.get_instagram_creator_states(
+  p_creator_ids text[],
+  p_media_limit integer DEFAULT 100
+)
+RETURNS TABLE (
+  ig_user_id text,
+  reels_count bigint,
+  posts_count bigint,
+  profile_pic_url text,
+  total_api_calls bigint,
+  reel_urls jsonb,
+  post_image_urls jsonb,
+  last_media_count integer,
+  media_refreshed_at timestamptz,
+  latest_taken_at timestamptz,
+  media_hashes jsonb
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT
+    c.ig_user_id::text,
+    (SELECT COUNT(*) FROM instagram_reels r WHERE r.creator_id = c.ig_user_id::text),
+    (SELECT COUNT(*) FROM instagram_posts p WHERE p.creator_id = c.ig_user_id::text),
+    c.profile_pic_url,
+    COALESCE(c.total_api_calls, 0)::bigint,
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, recent.video_url)
+        FROM (
+          SELECT r.media_pk::text AS media_pk, r.video_url
+          FROM instagram_reels r
+          WHERE r.creator_id = c.ig_user_id::text
+          ORDER BY r.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    ),
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, to_jsonb(recent.image_urls))
+        FROM (
+          SELECT p.media_pk::text AS media_pk, p.image_urls
+          FROM instagram_posts p
+          WHERE p.creator_id = c.ig_user_id::text
+          ORDER BY p.taken_at DESC NULLS LAST
+          LIMIT p_media_limit
+        ) recent
+      ),
+      '{}'::jsonb
+    ),
+    c.last_media_count,
+    c.media_refreshed_at,
+    -- Served by the (creator_id, taken_at DESC) indexes
+    GREATEST(
+      (SELECT MAX(r.taken_at) FROM instagram_reels r WHERE r.creator_id = c.ig_user_id::text),
+      (SELECT MAX(p.taken_at) FROM instagram_posts p WHERE p.creator_id = c.ig_user_id::text)
+    ),
+    COALESCE(
+      (
+        SELECT jsonb_object_agg(recent.media_pk, recent.raw_media_hash)
+        FROM (
+          (
+            SELECT r.media_pk::text AS media_pk, r.raw_media_hash
+            FROM instagram_reels r
+            WHERE r.creator_id = c.ig_user_id::text AND r.raw_media_hash IS NOT NULL
+            ORDER BY r.taken_at DESC NULLS LAST
+            LIMIT p_media_limit
+          )
+          UNION ALL
+          (
+            SELECT p.media_pk::text, p.raw_media_hash
+            FROM instagram_posts p
+            WHERE p.creator_id = c.ig_user_id::text AND p.raw_media_hash IS NOT NULL
+            ORDER BY p.taken_at DESC NULLS LAST
+            LIMIT p_media_limit
+          )
+        ) recent
+      ),
+      '{}'::jsonb
+    )
+  FROM instagram_creators c
+  WHERE c.ig_user_id::text = ANY(p_creator_ids);
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_instagram_creator_states(text[], integer) TO service_role;
+
+COMMENT ON FUNCTION public.get_instagram_creator_states IS
+  'Batch snapshot of scraper state per creator: content counts, profile picture, API call total, recent media URLs, raw payload hashes and change-detection markers';
+
+-- Verification query
+-- SELECT ig_user_id, jsonb_object_keys(media_hashes) AS media_pk
+-- FROM get_instagram_creator_states(ARRAY['2017771114'], 100)
+-- LIMIT 5;
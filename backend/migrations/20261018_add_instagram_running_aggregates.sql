@@ -0,0 +1,510 @@
+-- Migration: Add per-creator running aggregates for Instagram media
+-- Date: 2026-10-18
+-- Purpose: Keep avg_*_cached and posting stats correct over full history at O(changed rows) cost
+--
+-- Context: Every scrape recomputed creator analytics from the 12-90 items it
+-- had just fetched, so averages swung with fetch depth and never reflected
+-- older media. Per-creator counts, sums and sums of squares for each metric
+-- (plus posting-interval stats) now live in two small tables. Statement-level
+-- triggers on instagram_reels / instagram_posts apply the difference between
+-- the old and new rows of each insert/upsert/delete, then refresh the
+-- creator's avg_*_cached, posting_frequency_per_week and
+-- posting_consistency_score from the aggregates. The scraper no longer writes
+-- those columns (INSTAGRAM_RUNNING_AGGREGATES=false restores the old behaviour).
+--
+-- Averages keep the scraper's definition: mean over non-zero values.
+
+-- ============================================================================
+-- Tables
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS instagram_creator_aggregates (
+  creator_id text NOT NULL,
+  metric text NOT NULL,                          -- reel_items, reel_views, post_likes, ...
+  value_count bigint NOT NULL DEFAULT 0,         -- Non-zero values (all items for *_items)
+  value_sum numeric NOT NULL DEFAULT 0,
+  value_sumsq numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (creator_id, metric)
+);
+
+COMMENT ON TABLE instagram_creator_aggregates IS 'Running count/sum/sum of squares per creator and media metric, maintained by triggers';
+
+CREATE TABLE IF NOT EXISTS instagram_creator_posting_stats (
+  creator_id text PRIMARY KEY,
+  content_count bigint NOT NULL DEFAULT 0,       -- Reels + posts with a taken_at
+  first_taken_at timestamptz,
+  last_taken_at timestamptz,
+  interval_count bigint NOT NULL DEFAULT 0,
+  interval_sum numeric NOT NULL DEFAULT 0,       -- Seconds between consecutive items
+  interval_sumsq numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE instagram_creator_posting_stats IS 'Running posting-interval stats per creator (reels and posts combined), maintained by triggers';
+
+-- Service role only (backend scrapers; triggers write as the function owner)
+ALTER TABLE public.instagram_creator_aggregates ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.instagram_creator_posting_stats ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- Helpers
+-- ============================================================================
+
+-- Metrics tracked for one media row (NULL metrics are treated as 0, like the scraper)
+CREATE OR REPLACE FUNCTION public.instagram_media_metrics(
+  p_prefix text,
+  p_views numeric,
+  p_likes numeric,
+  p_comments numeric,
+  p_saves numeric,
+  p_shares numeric
+)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT jsonb_build_object(
+    p_prefix || '_items', 1,
+    p_prefix || '_likes', COALESCE(p_likes, 0),
+    p_prefix || '_comments', COALESCE(p_comments, 0),
+    p_prefix || '_saves', COALESCE(p_saves, 0),
+    p_prefix || '_shares', COALESCE(p_shares, 0)
+  ) || CASE
+    WHEN p_prefix = 'reel' THEN jsonb_build_object('reel_views', COALESCE(p_views, 0))
+    ELSE '{}'::jsonb
+  END;
+$$;
+
+-- Write avg_*_cached and posting stats for creators from their aggregates
+CREATE OR REPLACE FUNCTION public.refresh_instagram_creator_averages(p_creator_ids text[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH averages AS (
+    SELECT
+      a.creator_id,
+      MAX(CASE WHEN a.metric = 'reel_views' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS reel_views,
+      MAX(CASE WHEN a.metric = 'reel_likes' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS reel_likes,
+      MAX(CASE WHEN a.metric = 'reel_comments' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS reel_comments,
+      MAX(CASE WHEN a.metric = 'reel_saves' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS reel_saves,
+      MAX(CASE WHEN a.metric = 'reel_shares' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS reel_shares,
+      MAX(CASE WHEN a.metric = 'post_likes' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS post_likes,
+      MAX(CASE WHEN a.metric = 'post_comments' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS post_comments,
+      MAX(CASE WHEN a.metric = 'post_saves' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS post_saves,
+      MAX(CASE WHEN a.metric = 'post_shares' AND a.value_count > 0 THEN a.value_sum / a.value_count END) AS post_shares
+    FROM instagram_creator_aggregates a
+    WHERE p_creator_ids IS NULL OR a.creator_id = ANY(p_creator_ids)
+    GROUP BY a.creator_id
+  ),
+  posting AS (
+    SELECT
+      s.creator_id,
+      CASE
+        WHEN s.content_count > 1 AND s.last_taken_at > s.first_taken_at
+        THEN s.content_count / (EXTRACT(EPOCH FROM s.last_taken_at - s.first_taken_at)::numeric / (7 * 86400))
+      END AS frequency,
+      CASE
+        WHEN s.interval_count > 0 AND s.interval_sum > 0
+        THEN LEAST(100, GREATEST(0, 100 - 100 * SQRT(GREATEST(
+          s.interval_sumsq / s.interval_count - (s.interval_sum / s.interval_count) ^ 2, 0
+        )) / (s.interval_sum / s.interval_count)))
+      END AS consistency
+    FROM instagram_creator_posting_stats s
+    WHERE p_creator_ids IS NULL OR s.creator_id = ANY(p_creator_ids)
+  ),
+  updated AS (
+    UPDATE instagram_creators c
+    SET
+      avg_views_per_reel_cached = COALESCE(av.reel_views, 0),
+      avg_likes_per_reel_cached = COALESCE(av.reel_likes, 0),
+      avg_comments_per_reel_cached = COALESCE(av.reel_comments, 0),
+      avg_saves_per_reel_cached = COALESCE(av.reel_saves, 0),
+      avg_shares_per_reel_cached = COALESCE(av.reel_shares, 0),
+      avg_likes_per_post_cached = COALESCE(av.post_likes, 0),
+      avg_comments_per_post_cached = COALESCE(av.post_comments, 0),
+      avg_saves_per_post_cached = COALESCE(av.post_saves, 0),
+      avg_shares_per_post_cached = COALESCE(av.post_shares, 0),
+      posting_frequency_per_week = COALESCE(p.frequency, 0),
+      posting_consistency_score = COALESCE(p.consistency, 0)
+    FROM averages av
+    LEFT JOIN posting p ON p.creator_id = av.creator_id
+    WHERE c.ig_user_id::text = av.creator_id
+    RETURNING 1
+  )
+  SELECT COUNT(*)::integer FROM updated;
+$$;
+
+-- Recompute posting-interval stats from stored media (all creators when NULL)
+CREATE OR REPLACE FUNCTION public.recompute_instagram_posting_stats(p_creator_ids text[] DEFAULT NULL)
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH stamps AS (
+    SELECT r.creator_id, r.taken_at
+    FROM instagram_reels r
+    WHERE r.taken_at IS NOT NULL AND (p_creator_ids IS NULL OR r.creator_id = ANY(p_creator_ids))
+    UNION ALL
+    SELECT p.creator_id, p.taken_at
+    FROM instagram_posts p
+    WHERE p.taken_at IS NOT NULL AND (p_creator_ids IS NULL OR p.creator_id = ANY(p_creator_ids))
+  ),
+  gaps AS (
+    SELECT
+      creator_id,
+      taken_at,
+      EXTRACT(EPOCH FROM taken_at - LAG(taken_at) OVER (PARTITION BY creator_id ORDER BY taken_at))::numeric AS gap
+    FROM stamps
+  ),
+  stats AS (
+    SELECT
+      creator_id,
+      COUNT(*) AS content_count,
+      MIN(taken_at) AS first_taken_at,
+      MAX(taken_at) AS last_taken_at,
+      COUNT(gap) AS interval_count,
+      COALESCE(SUM(gap), 0) AS interval_sum,
+      COALESCE(SUM(gap * gap), 0) AS interval_sumsq
+    FROM gaps
+    WHERE creator_id IS NOT NULL
+    GROUP BY creator_id
+  ),
+  targets AS (
+    -- Requested creators with no media left are reset to empty stats
+    SELECT unnest(p_creator_ids) AS creator_id
+    UNION
+    SELECT creator_id FROM stats
+  )
+  INSERT INTO instagram_creator_posting_stats AS ps (
+    creator_id, content_count, first_taken_at, last_taken_at,
+    interval_count, interval_sum, interval_sumsq, updated_at
+  )
+  SELECT
+    t.creator_id,
+    COALESCE(s.content_count, 0),
+    s.first_taken_at,
+    s.last_taken_at,
+    COALESCE(s.interval_count, 0),
+    COALESCE(s.interval_sum, 0),
+    COALESCE(s.interval_sumsq, 0),
+    NOW()
+  FROM targets t
+  LEFT JOIN stats s ON s.creator_id = t.creator_id
+  ON CONFLICT (creator_id) DO UPDATE SET
+    content_count = EXCLUDED.content_count,
+    first_taken_at = EXCLUDED.first_taken_at,
+    last_taken_at = EXCLUDED.last_taken_at,
+    interval_count = EXCLUDED.interval_count,
+    interval_sum = EXCLUDED.interval_sum,
+    interval_sumsq = EXCLUDED.interval_sumsq,
+    updated_at = EXCLUDED.updated_at;
+$$;
+
+-- ============================================================================
+-- Incremental updates
+-- ============================================================================
+
+-- Apply one statement's changes: each new row adds its metrics, each old row
+-- subtracts them, so rows whose values did not change cancel out.
+-- p_new / p_old: [{"media_pk", "creator_id", "taken_at", "metrics": {...}}]
+CREATE OR REPLACE FUNCTION public.apply_instagram_media_changes(p_new jsonb, p_old jsonb)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_changed text[];
+  v_rebuild text[] := '{}';
+  v_stats instagram_creator_posting_stats%ROWTYPE;
+  r record;
+BEGIN
+  WITH changes AS (
+    SELECT 1 AS sign, e FROM jsonb_array_elements(COALESCE(p_new, '[]'::jsonb)) AS e
+    UNION ALL
+    SELECT -1 AS sign, e FROM jsonb_array_elements(COALESCE(p_old, '[]'::jsonb)) AS e
+  ),
+  deltas AS (
+    SELECT
+      c.e->>'creator_id' AS creator_id,
+      m.metric,
+      SUM(c.sign * (m.value::numeric <> 0)::int) AS d_count,
+      SUM(c.sign * m.value::numeric) AS d_sum,
+      SUM(c.sign * m.value::numeric * m.value::numeric) AS d_sumsq
+    FROM changes c
+    CROSS JOIN LATERAL jsonb_each(c.e->'metrics') AS m(metric, value)
+    WHERE c.e->>'creator_id' IS NOT NULL
+    GROUP BY 1, 2
+  ),
+  applied AS (
+    INSERT INTO instagram_creator_aggregates AS a (
+      creator_id, metric, value_count, value_sum, value_sumsq, updated_at
+    )
+    SELECT creator_id, metric, d_count, d_sum, d_sumsq, NOW()
+    FROM deltas
+    WHERE d_count <> 0 OR d_sum <> 0 OR d_sumsq <> 0
+    ON CONFLICT (creator_id, metric) DO UPDATE SET
+      value_count = a.value_count + EXCLUDED.value_count,
+      value_sum = a.value_sum + EXCLUDED.value_sum,
+      value_sumsq = a.value_sumsq + EXCLUDED.value_sumsq,
+      updated_at = EXCLUDED.updated_at
+    RETURNING a.creator_id
+  )
+  SELECT array_agg(DISTINCT creator_id) INTO v_changed FROM applied;
+
+  -- Posting intervals: only rows inserted, deleted or moved in time matter
+  FOR r IN
+    WITH stamps AS (
+      SELECT e->>'creator_id' AS creator_id, e->>'media_pk' AS media_pk,
+             (e->>'taken_at')::timestamptz AS taken_at, 1 AS sign
+      FROM jsonb_array_elements(COALESCE(p_new, '[]'::jsonb)) AS e
+      UNION ALL
+      SELECT e->>'creator_id', e->>'media_pk', (e->>'taken_at')::timestamptz, -1
+      FROM jsonb_array_elements(COALESCE(p_old, '[]'::jsonb)) AS e
+    ),
+    net AS (
+      SELECT creator_id, taken_at, SUM(sign) AS sign
+      FROM stamps
+      WHERE creator_id IS NOT NULL AND taken_at IS NOT NULL
+      GROUP BY creator_id, media_pk, taken_at
+      HAVING SUM(sign) <> 0
+    )
+    SELECT
+      creator_id,
+      bool_or(sign < 0) AS has_removed,
+      array_agg(taken_at ORDER BY taken_at) FILTER (WHERE sign > 0) AS added
+    FROM net
+    GROUP BY creator_id
+  LOOP
+    INSERT INTO instagram_creator_posting_stats (creator_id)
+    VALUES (r.creator_id)
+    ON CONFLICT (creator_id) DO NOTHING;
+
+    SELECT * INTO v_stats
+    FROM instagram_creator_posting_stats
+    WHERE creator_id = r.creator_id
+    FOR UPDATE;
+
+    IF r.has_removed OR r.added[1] < v_stats.last_taken_at THEN
+      -- Deletes and backfilled (older) media split existing intervals; rare, so rescan
+      v_rebuild := array_append(v_rebuild, r.creator_id);
+    ELSE
+      -- Newer media only: new intervals chain on from the previous last_taken_at
+      UPDATE instagram_creator_posting_stats s
+      SET
+        content_count = s.content_count + cardinality(r.added),
+        first_taken_at = COALESCE(s.first_taken_at, r.added[1]),
+        last_taken_at = r.added[cardinality(r.added)],
+        interval_count = s.interval_count + g.n,
+        interval_sum = s.interval_sum + g.total,
+        interval_sumsq = s.interval_sumsq + g.total_sq,
+        updated_at = NOW()
+      FROM (
+        SELECT COUNT(gap) AS n, COALESCE(SUM(gap), 0) AS total, COALESCE(SUM(gap * gap), 0) AS total_sq
+        FROM (
+          SELECT EXTRACT(EPOCH FROM t - LAG(t) OVER (ORDER BY t))::numeric AS gap
+          FROM unnest(array_prepend(v_stats.last_taken_at, r.added)) AS t
+          WHERE t IS NOT NULL
+        ) intervals
+      ) g
+      WHERE s.creator_id = r.creator_id;
+    END IF;
+
+    v_changed := array_append(v_changed, r.creator_id);
+  END LOOP;
+
+  IF cardinality(v_rebuild) > 0 THEN
+    PERFORM recompute_instagram_posting_stats(v_rebuild);
+  END IF;
+
+  IF v_changed IS NOT NULL THEN
+    PERFORM refresh_instagram_creator_averages(ARRAY(SELECT DISTINCT unnest(v_changed)));
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.instagram_reels_aggregates_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_new jsonb;
+  v_old jsonb;
+BEGIN
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'media_pk', n.media_pk,
+      'creator_id', n.creator_id,
+      'taken_at', n.taken_at,
+      'metrics', instagram_media_metrics(
+        'reel', n.play_count, n.like_count, n.comment_count, n.save_count, n.share_count
+      )
+    ))
+    INTO v_new
+    FROM new_rows n;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'media_pk', o.media_pk,
+      'creator_id', o.creator_id,
+      'taken_at', o.taken_at,
+      'metrics', instagram_media_metrics(
+        'reel', o.play_count, o.like_count, o.comment_count, o.save_count, o.share_count
+      )
+    ))
+    INTO v_old
+    FROM old_rows o;
+  END IF;
+
+  PERFORM apply_instagram_media_changes(v_new, v_old);
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.instagram_posts_aggregates_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_new jsonb;
+  v_old jsonb;
+BEGIN
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'media_pk', n.media_pk,
+      'creator_id', n.creator_id,
+      'taken_at', n.taken_at,
+      'metrics', instagram_media_metrics(
+        'post', NULL, n.like_count, n.comment_count, n.save_count, n.share_count
+      )
+    ))
+    INTO v_new
+    FROM new_rows n;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT jsonb_agg(jsonb_build_object(
+      'media_pk', o.media_pk,
+      'creator_id', o.creator_id,
+      'taken_at', o.taken_at,
+      'metrics', instagram_media_metrics(
+        'post', NULL, o.like_count, o.comment_count, o.save_count, o.share_count
+      )
+    ))
+    INTO v_old
+    FROM old_rows o;
+  END IF;
+
+  PERFORM apply_instagram_media_changes(v_new, v_old);
+  RETURN NULL;
+END;
+$$;
+
+-- ============================================================================
+-- Full rebuild (backfill and reconciliation)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.rebuild_instagram_creator_aggregates(p_creator_ids text[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  DELETE FROM instagram_creator_aggregates
+  WHERE p_creator_ids IS NULL OR creator_id = ANY(p_creator_ids);
+
+  INSERT INTO instagram_creator_aggregates (creator_id, metric, value_count, value_sum, value_sumsq)
+  SELECT
+    media.creator_id,
+    m.metric,
+    COUNT(*) FILTER (WHERE m.value::numeric <> 0),
+    SUM(m.value::numeric),
+    SUM(m.value::numeric * m.value::numeric)
+  FROM (
+    SELECT r.creator_id, instagram_media_metrics(
+      'reel', r.play_count, r.like_count, r.comment_count, r.save_count, r.share_count
+    ) AS metrics
+    FROM instagram_reels r
+    WHERE p_creator_ids IS NULL OR r.creator_id = ANY(p_creator_ids)
+    UNION ALL
+    SELECT p.creator_id, instagram_media_metrics(
+      'post', NULL, p.like_count, p.comment_count, p.save_count, p.share_count
+    )
+    FROM instagram_posts p
+    WHERE p_creator_ids IS NULL OR p.creator_id = ANY(p_creator_ids)
+  ) media
+  CROSS JOIN LATERAL jsonb_each(media.metrics) AS m(metric, value)
+  WHERE media.creator_id IS NOT NULL
+  GROUP BY media.creator_id, m.metric;
+
+  PERFORM recompute_instagram_posting_stats(p_creator_ids);
+  RETURN refresh_instagram_creator_averages(p_creator_ids);
+END;
+$$;
+
+-- SECURITY DEFINER: callable by the backend (service role) only, not with the anon key
+REVOKE EXECUTE ON FUNCTION public.recompute_instagram_posting_stats(text[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.apply_instagram_media_changes(jsonb, jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.refresh_instagram_creator_averages(text[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.rebuild_instagram_creator_aggregates(text[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_instagram_creator_averages(text[]) TO service_role;
+GRANT EXECUTE ON FUNCTION public.rebuild_instagram_creator_aggregates(text[]) TO service_role;
+
+-- ============================================================================
+-- Backfill, then keep up to date
+-- ============================================================================
+
+SELECT rebuild_instagram_creator_aggregates();
+
+-- Statement-level triggers see every row of an upsert batch at once
+-- (INSERT ... ON CONFLICT DO UPDATE fires the insert trigger for new rows
+-- and the update trigger for existing ones).
+DROP TRIGGER IF EXISTS instagram_reels_aggregates_insert ON instagram_reels;
+CREATE TRIGGER instagram_reels_aggregates_insert
+  AFTER INSERT ON instagram_reels
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_reels_aggregates_trigger();
+
+DROP TRIGGER IF EXISTS instagram_reels_aggregates_update ON instagram_reels;
+CREATE TRIGGER instagram_reels_aggregates_update
+  AFTER UPDATE ON instagram_reels
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_reels_aggregates_trigger();
+
+DROP TRIGGER IF EXISTS instagram_reels_aggregates_delete ON instagram_reels;
+CREATE TRIGGER instagram_reels_aggregates_delete
+  AFTER DELETE ON instagram_reels
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_reels_aggregates_trigger();
+
+DROP TRIGGER IF EXISTS instagram_posts_aggregates_insert ON instagram_posts;
+CREATE TRIGGER instagram_posts_aggregates_insert
+  AFTER INSERT ON instagram_posts
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_posts_aggregates_trigger();
+
+DROP TRIGGER IF EXISTS instagram_posts_aggregates_update ON instagram_posts;
+CREATE TRIGGER instagram_posts_aggregates_update
+  AFTER UPDATE ON instagram_posts
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_posts_aggregates_trigger();
+
+DROP TRIGGER IF EXISTS instagram_posts_aggregates_delete ON instagram_posts;
+CREATE TRIGGER instagram_posts_aggregates_delete
+  AFTER DELETE ON instagram_posts
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION instagram_posts_aggregates_trigger();
+
+-- Verification query
+-- SELECT metric, value_count, value_sum / NULLIF(value_count, 0) AS average
+-- FROM instagram_creator_aggregates WHERE creator_id = '2017771114' ORDER BY metric;
@@ -0,0 +1,45 @@
+-- Migration: Add content-addressed R2 media index
+-- Date: 2026-10-18
+-- Purpose: Skip redundant CDN downloads and R2 PUTs for media already stored
+--
+-- Context: Reposts across creators, reels that are also posts and unchanged
+-- profile pictures were re-downloaded from the Instagram CDN and re-uploaded to
+-- R2 on every scrape. app/utils/media_index.py consults these tables before any
+-- download/upload:
+--   r2_media_objects: SHA-256 of the bytes -> R2 object (immutable keys only)
+--   r2_media_sources: CDN asset path -> content hash + HTTP validators
+
+CREATE TABLE IF NOT EXISTS public.r2_media_objects (
+  content_hash text PRIMARY KEY,
+  size_bytes bigint NOT NULL,
+  object_key text NOT NULL,
+  public_url text NOT NULL,
+  created_at timestamptz NOT NULL DEFAULT NOW(),
+  updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS public.r2_media_sources (
+  source_key text PRIMARY KEY,
+  content_hash text NOT NULL,
+  etag text,
+  last_modified text,
+  created_at timestamptz NOT NULL DEFAULT NOW(),
+  updated_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_r2_media_objects_object_key
+  ON public.r2_media_objects(object_key);
+
+CREATE INDEX IF NOT EXISTS idx_r2_media_sources_content_hash
+  ON public.r2_media_sources(content_hash);
+
+COMMENT ON TABLE public.r2_media_objects IS 'Content-addressed index of media stored in R2 (sha256 -> object key)';
+COMMENT ON TABLE public.r2_media_sources IS 'Instagram CDN asset path -> content hash, with ETag/Last-Modified for conditional GETs';
+COMMENT ON COLUMN public.r2_media_sources.source_key IS 'CDN URL path without signature params (keeps rendition params such as stp)';
+
+-- Service role only (backend scrapers)
+ALTER TABLE public.r2_media_objects ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.r2_media_sources ENABLE ROW LEVEL SECURITY;
+
+-- Verification query
+-- SELECT COUNT(*) AS objects, pg_size_pretty(SUM(size_bytes)) AS stored FROM r2_media_objects;
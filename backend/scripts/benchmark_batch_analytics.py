@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Batch Analytics Benchmark
+Compares per-creator InstagramAnalytics with the vectorized BatchAnalyticsEngine
+
+Uses synthetic reels/posts (no database or API access) and checks that both
+produce the same metrics before reporting timings.
+
+Usage:
+    python scripts/benchmark_batch_analytics.py --creators 2000 --reels 90 --posts 30
+"""
+
+import argparse
+import logging
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.scrapers.instagram.services.modules.analytics import InstagramAnalytics
+from app.scrapers.instagram.services.modules.batch_analytics import (
+    BatchAnalyticsEngine,
+    MediaColumns,
+)
+
+
+# Day/hour use local time in the per-creator code and UTC in the engine
+SKIP_KEYS = {"most_active_day", "most_active_hour", "catalog_viral_count"}
+
+
+def make_item(rng: random.Random, now: int, is_post: bool) -> dict:
+    """Synthetic API item with the same field shapes the scraper sees"""
+    item = {
+        "like_count": rng.choice([0, rng.randint(1, 50_000)]),
+        "comment_count": rng.choice([0, rng.randint(1, 2_000)]),
+        "save_count": rng.choice([None, 0, rng.randint(1, 1_000)]),
+        "share_count": rng.choice([None, rng.randint(0, 500)]),
+        "taken_at": now - rng.randint(0, 90 * 86400),
+    }
+    if is_post:
+        item["caption"] = {"text": rng.choice(["", "new post", "summer #beach #sun"])}
+    else:
+        item["play_count"] = rng.choice([0, rng.randint(1, 2_000_000)])
+    return item
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creators", type=int, default=2000)
+    parser.add_argument("--reels", type=int, default=90, help="Max reels per creator")
+    parser.add_argument("--posts", type=int, default=30, help="Max posts per creator")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = int(time.time())
+    ids = [str(i) for i in range(args.creators)]
+    followers = [rng.choice([0, rng.randint(1_000, 5_000_000)]) for _ in ids]
+    reels = [[make_item(rng, now, False) for _ in range(rng.randint(0, args.reels))] for _ in ids]
+    posts = [[make_item(rng, now, True) for _ in range(rng.randint(0, args.posts))] for _ in ids]
+    media = sum(map(len, reels)) + sum(map(len, posts))
+
+    config = SimpleNamespace(
+        enable_analytics=True,
+        enable_viral_detection=True,
+        viral_min_views=50000,
+        viral_multiplier=5.0,
+    )
+    logger = logging.getLogger("benchmark")
+    per_creator = InstagramAnalytics(config, logger)
+    engine = BatchAnalyticsEngine(config, logger)
+
+    start = time.perf_counter()
+    expected = [
+        per_creator.calculate_analytics(cid, reels[i], posts[i], {"follower_count": followers[i]})
+        for i, cid in enumerate(ids)
+    ]
+    per_creator_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    MediaColumns.from_items(reels)
+    MediaColumns.from_items(posts, captions=True)
+    extract_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = engine.compute(ids, followers, reels, posts, now=now)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = 0
+    for i, cid in enumerate(ids):
+        got = result.analytics[cid]
+        for key, value in expected[i].items():
+            if key in SKIP_KEYS:
+                continue
+            other = got[key]
+            if isinstance(value, float) or isinstance(other, float):
+                same = (value is None and other is None) or (
+                    value is not None
+                    and other is not None
+                    and math.isclose(value, other, rel_tol=1e-6, abs_tol=1e-3)
+                )
+            else:
+                same = value == other
+            if not same:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  mismatch {cid}.{key}: {value!r} != {other!r}")
+
+    print(f"Creators: {len(ids):,}  Media: {media:,}")
+    print(f"Per-creator analytics: {per_creator_seconds * 1000:8.1f} ms")
+    print(
+        f"Batch engine:          {batch_seconds * 1000:8.1f} ms "
+        f"(field extraction {extract_seconds * 1000:.1f} ms, "
+        f"vectorized {max(batch_seconds - extract_seconds, 0) * 1000:.1f} ms)"
+    )
+    print(f"Speedup: {per_creator_seconds / batch_seconds:.1f}x  Mismatched fields: {mismatches}")
+    print(f"Catalog thresholds: {result.thresholds}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ Provides common test fixtures for mocking external dependencies
 """
 
 import asyncio
-from typing import Generator
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -60,6 +60,191 @@ def mock_supabase():
     return mock
 
 
+class FakeResult:
+    """Response of FakeQuery/FakeRpc.execute()"""
+
+    def __init__(self, data: Any = None):
+        self.data = data
+
+
+def _coerce(stored: Any, value: Any) -> Any:
+    """Compare filter values like PostgREST does (`gt("id", "4")` on an integer column)"""
+    if isinstance(stored, int) and isinstance(value, str):
+        return int(value)
+    return value
+
+
+class FakeQuery:
+    """In-memory PostgREST query builder: filters, order/limit/range and writes"""
+
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.sort: Optional[Tuple[str, bool]] = None
+        self.window: Tuple[int, Optional[int]] = (0, None)
+        self.operation: Tuple[str, Any] = ("select", None)
+        self.conflict_key = "id"
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def _filter(self, column, value, check):
+        self.filters.append(
+            lambda row: row.get(column) is not None
+            and check(row[column], _coerce(row[column], value))
+        )
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == _coerce(row.get(column), value))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(lambda row: row.get(column) != _coerce(row.get(column), value))
+        return self
+
+    def gt(self, column, value):
+        return self._filter(column, value, lambda stored, v: stored > v)
+
+    def gte(self, column, value):
+        return self._filter(column, value, lambda stored, v: stored >= v)
+
+    def lt(self, column, value):
+        return self._filter(column, value, lambda stored, v: stored < v)
+
+    def lte(self, column, value):
+        return self._filter(column, value, lambda stored, v: stored <= v)
+
+    def like(self, column, pattern):
+        needle = pattern.strip("%")
+        self.filters.append(lambda row: needle in str(row.get(column)))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.sort = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.window = (self.window[0], count)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    def insert(self, rows):
+        self.operation = ("insert", rows)
+        return self
+
+    def update(self, values):
+        self.operation = ("update", values)
+        return self
+
+    def upsert(self, rows, on_conflict=None, **_kwargs):
+        self.operation = ("upsert", rows)
+        self.conflict_key = on_conflict or "id"
+        return self
+
+    def execute(self):
+        operation, payload = self.operation
+        self.db.queries += 1
+        self.db._call(self.table, payload, record=operation != "select")
+        rows = self.db.tables.setdefault(self.table, [])
+
+        if operation == "select":
+            matched = [row for row in rows if all(check(row) for check in self.filters)]
+            if self.sort:
+                column, desc = self.sort
+                matched.sort(
+                    key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc
+                )
+            start, count = self.window
+            matched = matched[start:] if count is None else matched[start : start + count]
+            return FakeResult([dict(row) for row in matched])
+
+        if operation == "update":
+            matched = [row for row in rows if all(check(row) for check in self.filters)]
+            for row in matched:
+                row.update(payload)
+            return FakeResult([dict(row) for row in matched])
+
+        written = []
+        for row in payload if isinstance(payload, list) else [payload]:
+            key = row.get(self.conflict_key)
+            stored = None
+            if operation == "upsert" and key is not None:
+                stored = next((r for r in rows if r.get(self.conflict_key) == key), None)
+            if stored is None:
+                rows.append(stored := {"id": len(rows) + 1} if operation == "insert" else {})
+            stored.update(row)  # Columns not in the upsert are kept
+            written.append(dict(stored))
+        return FakeResult(written)
+
+
+class FakeRpc:
+    """Pending RPC call of FakeSupabase"""
+
+    def __init__(self, db: "FakeSupabase", name: str, params: Dict[str, Any]):
+        self.db, self.name, self.params = db, name, params
+
+    def execute(self):
+        self.db._call(self.name, self.params, record=True)
+        handler = self.db.rpc_handlers.get(self.name)
+        return FakeResult(handler(self.db, self.params) if handler else None)
+
+
+class FakeSupabase:
+    """
+    In-memory Supabase client for unit tests
+
+    Args:
+        tables: Table name -> rows (queries filter them; writes change them in place)
+        rpc: RPC name -> handler(db, params) returning the response data
+        fail: Table/RPC name -> predicate(payload) or True; matching calls raise
+            (a predicate may also raise its own error)
+
+    Attributes:
+        calls: (table or RPC name, payload) of every write and RPC, in order
+        queries: Executed table queries (reads and writes)
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        rpc: Optional[Dict[str, Callable[["FakeSupabase", Dict[str, Any]], Any]]] = None,
+        fail: Optional[Dict[str, Any]] = None,
+    ):
+        self.tables = tables if tables is not None else {}
+        self.rpc_handlers = dict(rpc or {})
+        self.fail = dict(fail or {})
+        self.calls: List[Tuple[str, Any]] = []
+        self.queries = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def _call(self, name, payload, record):
+        if record:
+            self.calls.append((name, payload))
+        check = self.fail.get(name)
+        if check is True or (callable(check) and check(payload)):
+            raise Exception("connection reset")
+
+
+@pytest.fixture
+def fake_supabase():
+    """FakeSupabase factory: fake_supabase(tables=..., rpc=..., fail=...)"""
+    return FakeSupabase
+
+
 @pytest.fixture
 def mock_redis():
     """Mock Redis client"""
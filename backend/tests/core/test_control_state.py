@@ -0,0 +1,43 @@
+"""
+Control State Watcher - Unit Tests
+Checks cached reads, missing rows and staleness fallback
+"""
+
+import pytest
+
+from app.core.control_state import CONTROL_TABLE, ControlStateWatcher
+
+
+@pytest.mark.unit
+def test_reads_are_served_from_cache(fake_supabase):
+    row = {"script_name": "instagram_scraper", "enabled": False, "status": "running"}
+    db = fake_supabase(tables={CONTROL_TABLE: [row]})
+    watcher = ControlStateWatcher(db)
+    assert watcher.refresh()
+
+    for _ in range(100):
+        assert watcher.should_run("instagram_scraper") is True
+        assert watcher.is_enabled("instagram_scraper") is False
+    assert db.queries == 1
+
+
+@pytest.mark.unit
+def test_missing_row_is_disabled(fake_supabase):
+    watcher = ControlStateWatcher(fake_supabase(tables={CONTROL_TABLE: []}))
+    watcher.refresh()
+    assert watcher.should_run("reddit_scraper") is False
+    assert not watcher.has_row("reddit_scraper")
+
+
+@pytest.mark.unit
+def test_unknown_until_loaded_and_when_stale(fake_supabase):
+    db = fake_supabase(fail={CONTROL_TABLE: True})
+    watcher = ControlStateWatcher(db, refresh_interval=0.001)
+    assert not watcher.refresh()
+    assert watcher.should_run("instagram_scraper") is None
+
+    db.fail.clear()
+    db.tables[CONTROL_TABLE] = [{"script_name": "instagram_scraper", "enabled": True}]
+    watcher.refresh()
+    watcher._loaded_at -= 1.0  # simulate refreshes failing for a while
+    assert watcher.should_run("instagram_scraper") is None
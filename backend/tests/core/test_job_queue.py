@@ -0,0 +1,134 @@
+"""
+Reliable Job Queue - Unit Tests
+Checks jobs survive crashes, retry with backoff and end up dead-lettered
+"""
+
+import json
+
+import pytest
+
+from app.core.job_queue import ReliableQueue
+
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting in fakeredis
+
+QUEUE = "test_queue"
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _queue(client, worker_id="w1", **kwargs):
+    options = {"visibility_timeout": 60, "max_attempts": 2, "retry_delay": 10}
+    options.update(kwargs)
+    return ReliableQueue(client, QUEUE, worker_id, **options)
+
+
+def _push(client, *creator_ids):
+    for creator_id in creator_ids:
+        client.lpush(QUEUE, json.dumps({"creator_id": creator_id}))
+
+
+@pytest.mark.unit
+def test_claim_is_fifo_and_ack_removes_the_job(client):
+    queue = _queue(client)
+    _push(client, 1, 2)
+
+    job = queue.claim(timeout=0.1)
+    assert job.data == {"creator_id": 1} and job.attempts == 0
+    assert queue.stats() == {"pending": 1, "processing": 1, "delayed": 0, "dead": 0}
+    assert client.lrange(queue.processing, 0, -1) == [job.raw]
+
+    queue.ack(job)
+    assert queue.stats()["processing"] == 0
+    assert client.llen(queue.processing) == 0
+    assert queue.claim(timeout=0.1).data == {"creator_id": 2}
+
+
+@pytest.mark.unit
+def test_enqueue_skips_live_ids_until_ack_or_dead_letter(client):
+    queue = _queue(client, max_attempts=1)
+    jobs = [(i, {"creator_id": i}) for i in range(1, 4)]
+
+    assert queue.enqueue(jobs) == 3
+    assert queue.enqueue([*jobs, (4, {"creator_id": 4})]) == 1  # Only the new creator
+    first, second = queue.claim(timeout=0.1), queue.claim(timeout=0.1)
+    assert (first.data, second.data) == ({"creator_id": 1}, {"creator_id": 2})
+    assert queue.enqueue(jobs[:2]) == 0  # Running jobs still count
+
+    queue.ack(first)
+    queue.fail(second, "boom")  # Dead-lettered
+    assert queue.enqueue(jobs[:2]) == 2
+    assert queue.requeue_dead() == 0  # Creator 2 was queued again meanwhile
+    assert queue.stats()["dead"] == 0
+
+    assert queue.clear() == 4
+    assert client.scard(queue.queued) == 0 and client.hlen(queue.job_ids) == 0
+    assert queue.enqueue(jobs) == 3
+
+
+@pytest.mark.unit
+def test_failures_back_off_then_dead_letter(client, monkeypatch):
+    queue = _queue(client)
+    now = [1000.0]
+    monkeypatch.setattr(ReliableQueue, "_now", staticmethod(lambda: now[0]))
+    _push(client, 1)
+
+    assert queue.fail(queue.claim(timeout=0.1), "boom") is True
+    assert client.zscore(queue.delayed, json.dumps({"creator_id": 1})) == 1010.0
+    assert queue.reap() == (0, 0, 0)  # Not due yet
+
+    now[0] = 1011.0
+    assert queue.reap() == (0, 0, 1)
+    retried = queue.claim(timeout=0.1)
+    assert retried.attempts == 1
+
+    assert queue.fail(retried, "boom again") is False
+    assert queue.stats() == {"pending": 0, "processing": 0, "delayed": 0, "dead": 1}
+    assert queue.dead_letters() == [{"job": retried.raw, "error": "boom again"}]
+
+    assert queue.requeue_dead() == 1
+    assert queue.claim(timeout=0.1).attempts == 0
+
+
+@pytest.mark.unit
+def test_expired_leases_and_crashed_workers_are_recovered(client, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ReliableQueue, "_now", staticmethod(lambda: now[0]))
+    crashed, other = _queue(client, "w1"), _queue(client, "w2", max_attempts=3)
+    _push(client, 1, 2)
+    lost = crashed.claim(timeout=0.1)
+
+    # Another worker reaps the lease once it expires
+    now[0] = 1061.0
+    crashed.claim(timeout=0.1)  # Still leased when the worker dies
+    assert other.reap() == (1, 0, 0)
+    assert other.fail(lost, "late") is False  # No longer held, not counted twice
+    assert client.hget(other.attempts, lost.raw) == "1"
+
+    # The same worker id coming back retries what it still held
+    assert crashed.recover() == 1
+    assert client.llen(crashed.processing) == 0
+
+    # Releasing (shutdown) puts the job next in line without an attempt
+    now[0] = 5000.0
+    other.reap()
+    job = other.claim(timeout=0.1)
+    assert other.release(job) is True
+    assert other.claim(timeout=0.1).raw == job.raw
+
+
+@pytest.mark.unit
+def test_claim_leases_the_job_in_the_same_step(client, monkeypatch):
+    queue = _queue(client)
+    monkeypatch.setattr(ReliableQueue, "_now", staticmethod(lambda: 1000.0))
+    assert queue.claim(timeout=0.05, poll_interval=0.01) is None
+
+    _push(client, 1)
+    job = queue.claim(timeout=0.05)
+    assert client.zscore(queue.leases, job.raw) == 1060.0
+    assert client.hget(queue.owners, job.raw) == "w1"
+    assert client.hget(queue.since, job.raw) is None
@@ -0,0 +1,80 @@
+"""
+Job Scheduler - Unit Tests
+Checks priority jobs jump the backlog and rolling jobs are promoted at a steady rate
+"""
+
+import pytest
+
+from app.core import job_scheduler
+from app.core.job_queue import ReliableQueue
+from app.core.job_scheduler import PRIORITY, JobScheduler
+
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting in fakeredis
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_scheduler.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def scheduler():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    queue = ReliableQueue(client, "q", "w1")
+    return JobScheduler(queue, refresh_interval=100, max_pending=3, burst=2)
+
+
+def _creators(*ids, due=0.0):
+    return [(i, {"creator_id": i}, due) for i in ids]
+
+
+@pytest.mark.unit
+def test_rolling_jobs_follow_the_bucket_and_queue_depth(scheduler, clock):
+    assert scheduler.schedule(_creators(*range(1, 11))) == 10
+    assert scheduler.schedule(_creators(1, due=5000.0)) == 0  # Keeps the earlier due time
+
+    # Bucket starts with `burst` tokens, then refills at lane size / 100 s (8 left)
+    assert scheduler.promote() == (0, 2)
+    assert scheduler.promote() == (0, 0)
+    clock[0] += 15
+    assert scheduler.promote() == (0, 1)
+
+    # Never more than max_pending waiting in the work queue
+    clock[0] += 100
+    assert scheduler.promote() == (0, 0)
+    job = scheduler.queue.claim(timeout=0.1)
+    assert job.data == {"creator_id": 1, "scheduled": True}
+    assert scheduler.promote() == (0, 1)
+
+
+@pytest.mark.unit
+def test_priority_jobs_skip_the_backlog_and_finished_jobs_roll_over(scheduler, clock):
+    scheduler.schedule(_creators(1, 2))
+    scheduler.promote()
+    assert scheduler.schedule_now(3, {"creator_id": 3})
+    assert scheduler.promote() == (1, 0)
+    assert scheduler.stats()[PRIORITY] == 0
+
+    queue = scheduler.queue
+    job = queue.claim(timeout=0.1)
+    assert job.data["creator_id"] == 3
+    queue.ack(job)
+    scheduler.reschedule(3, job.data)
+    assert scheduler.client.zscore(scheduler.lanes["rolling"], "3") == clock[0] + 100
+
+    assert scheduler.unschedule([3]) == 1
+    assert scheduler.stats()["rolling"] == 0
+
+
+@pytest.mark.unit
+def test_due_job_already_queued_stays_on_the_rolling_lane(scheduler, clock):
+    scheduler.queue.enqueue([(1, {"creator_id": 1})])  # e.g. a manual run
+    scheduler.schedule(_creators(1, 2))
+
+    assert scheduler.promote() == (0, 1)
+    assert scheduler.client.zscore(scheduler.lanes["rolling"], "1") == clock[0] + 100
+    assert scheduler.client.zscore(scheduler.lanes["rolling"], "2") is None
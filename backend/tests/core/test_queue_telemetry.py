@@ -0,0 +1,85 @@
+"""
+Queue Telemetry - Unit Tests
+Checks heartbeats, queue lag and the drain estimate read back from Redis
+"""
+
+import pytest
+
+from app.core import queue_telemetry as telemetry_module
+from app.core.job_queue import ReliableQueue
+from app.core.job_scheduler import JobScheduler
+from app.core.queue_telemetry import WorkerTelemetry, queue_telemetry, render_metrics
+
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting in fakeredis
+
+QUEUE = "test_queue"
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(telemetry_module.time, "time", lambda: now[0])
+    monkeypatch.setattr(ReliableQueue, "_now", staticmethod(lambda: now[0]))
+    return now
+
+
+@pytest.mark.unit
+def test_worker_snapshot_rates_and_p95(clock):
+    worker = WorkerTelemetry("w1", concurrency=4, window=120)
+    for seconds in range(1, 21):
+        worker.record(float(seconds), success=seconds != 20)
+    clock[0] += 30  # Young worker: rated over its first minute
+    snapshot = worker.snapshot(in_flight=3)
+    assert snapshot["jobs_per_min"] == 20.0
+    assert snapshot["success_rate"] == 0.95
+    assert snapshot["p95_job_seconds"] == 19.0
+    assert (snapshot["in_flight"], snapshot["processed"]) == (3, 20)
+
+    clock[0] += 200  # Everything left the window
+    snapshot = worker.snapshot(in_flight=0)
+    assert (snapshot["jobs_per_min"], snapshot["success_rate"]) == (0.0, None)
+    assert snapshot["succeeded"] == 19
+
+
+@pytest.mark.unit
+def test_lag_heartbeats_and_drain_eta(client, clock):
+    queue = ReliableQueue(client, QUEUE, "w1")
+    scheduler = JobScheduler(queue, refresh_interval=3600)
+    queue.enqueue((i, {"creator_id": i}) for i in range(1, 4))
+    clock[0] += 90
+    queue.enqueue([(4, {"creator_id": 4})])
+    queue.claim(timeout=0.1)
+    scheduler.schedule([(5, {"creator_id": 5}, clock[0] - 1)])
+
+    fast, slow = WorkerTelemetry("w1", 4), WorkerTelemetry("w2", 2)
+    for _ in range(4):
+        fast.record(10.0, True)
+    slow.record(30.0, False)
+    clock[0] += 60
+    fast.publish(queue, in_flight=1, interval=10)
+    slow.publish(queue, in_flight=0, interval=10)
+
+    report = queue_telemetry(queue, scheduler)
+    assert report["queue"]["pending"] == 3
+    assert report["queue"]["oldest_pending_age_seconds"] == 150.0  # Creator 2 (1 was claimed)
+    assert [worker["worker_id"] for worker in report["workers"]] == ["w1", "w2"]
+    totals = report["totals"]
+    assert (totals["jobs_per_min"], totals["success_rate"]) == (5.0, 0.8)
+    assert (totals["in_flight"], totals["concurrency"], totals["utilization"]) == (1, 6, 0.167)
+    assert (totals["backlog"], totals["eta_seconds"]) == (4, 48)  # 3 pending + 1 due
+
+    metrics = render_metrics(report, QUEUE)
+    assert f'b9_queue_jobs{{queue="{QUEUE}",state="pending"}} 3' in metrics
+    assert f'b9_worker_p95_job_seconds{{queue="{QUEUE}",worker="w2"}} 30.0' in metrics
+
+    slow.retire(queue)
+    client.delete(f"{QUEUE}:worker:w1")  # Expired heartbeat
+    assert queue_telemetry(queue)["totals"]["eta_seconds"] is None
+    assert client.zcard(f"{QUEUE}:workers") == 0
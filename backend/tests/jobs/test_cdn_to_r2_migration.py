@@ -0,0 +1,110 @@
+"""
+CDN to R2 Migration - Unit Tests
+Checks keyset paging, bulk URL writes, cursor resume and the run lease against an in-memory table
+"""
+
+import pytest
+
+from app.jobs.cdn_to_r2_migration import (
+    CLAIM_RPC,
+    CURSOR_TABLE,
+    UPDATES_RPC,
+    CdnMigration,
+    MediaTarget,
+)
+
+
+def apply_updates(db, params):
+    rows = {row["id"]: row for row in db.tables[params["p_table"]]}
+    for update in params["p_updates"]:
+        rows[update["id"]].update(update["fields"])
+    return []
+
+
+def claim(db, params):
+    cursors = db.tables.setdefault(CURSOR_TABLE, [])
+    cursor = next((row for row in cursors if row["media_type"] == params["p_media_type"]), None)
+    if cursor is None:
+        cursors.append(cursor := {"media_type": params["p_media_type"], "locked_by": None})
+    if cursor["locked_by"] not in (None, params["p_owner"]):
+        return []
+    cursor["locked_by"] = params["p_owner"]
+    return [dict(cursor)]
+
+
+def make_target(fail_ids=()):
+    def transfer(row):
+        if row["id"] in fail_ids:
+            return None
+        return row["url"].replace("cdninstagram", "r2")
+
+    return MediaTarget(
+        name="reels",
+        table="media",
+        columns="id, url",
+        url_column="url",
+        transfer=transfer,
+        label=lambda row: str(row["id"]),
+    )
+
+
+def make_db(fake_supabase, count):
+    urls = [
+        f"https://r2.example/{i}.mp4" if i % 3 == 0 else f"https://x.cdninstagram.com/{i}.mp4"
+        for i in range(1, count + 1)
+    ]
+    return fake_supabase(
+        tables={"media": [{"id": i, "url": url} for i, url in enumerate(urls, start=1)]},
+        rpc={UPDATES_RPC: apply_updates, CLAIM_RPC: claim},
+    )
+
+
+@pytest.mark.unit
+def test_migrates_every_cdn_row_with_one_write_per_page(fake_supabase):
+    db = make_db(fake_supabase, 10)
+    stats = CdnMigration(make_target(), db=db, concurrency=4, page_size=4).run()
+
+    assert stats.complete
+    assert stats.migrated == stats.total == 7  # Rows 3, 6 and 9 are already on R2
+    assert [name for name, _ in db.calls].count(UPDATES_RPC) == 2  # 7 CDN rows in pages of 4
+    assert all("cdninstagram" not in row["url"] for row in db.tables["media"])
+
+
+@pytest.mark.unit
+def test_resumes_from_saved_cursor(fake_supabase):
+    db = make_db(fake_supabase, 10)
+    first = CdnMigration(make_target(), db=db, page_size=2).run(max_items=3)
+    assert (first.migrated, first.cursor, first.complete) == (3, "4", False)
+
+    second = CdnMigration(make_target(), db=db, page_size=2).run()
+    assert second.migrated == 4 and second.complete
+
+    (cursor,) = db.tables[CURSOR_TABLE]
+    assert cursor["migrated"] == 7
+    assert cursor["completed_at"] is not None
+
+
+@pytest.mark.unit
+def test_failed_rows_are_reported_and_retried_after_reset(fake_supabase):
+    db = make_db(fake_supabase, 5)
+    stats = CdnMigration(make_target(fail_ids={2}), db=db).run()
+    assert (stats.migrated, stats.failed) == (3, 1)
+    assert stats.errors == ["2: R2 upload returned None"]
+
+    retry = CdnMigration(make_target(), db=db).run(reset=True)
+    assert (retry.total, retry.migrated) == (1, 1)
+
+
+@pytest.mark.unit
+def test_a_held_lease_keeps_other_runs_out_until_released(fake_supabase):
+    db = make_db(fake_supabase, 5)
+    holder = CdnMigration(make_target(), db=db)
+    assert holder._claim() is not None
+
+    blocked = CdnMigration(make_target(), db=db).run()
+    assert (blocked.total, blocked.errors) == (0, ["A reels migration is already running"])
+
+    holder._release()
+    stats = CdnMigration(make_target(), db=db).run()
+    assert stats.migrated == 4
+    assert db.tables[CURSOR_TABLE][0]["locked_by"] is None  # Released after the run
@@ -0,0 +1,100 @@
+"""
+Instagram Analytics Recompute - Unit Tests
+Checks bulk result writes, the run record and the one-running-run guard against in-memory tables
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.jobs import instagram_analytics
+from app.jobs.instagram_analytics import (
+    RUNS_TABLE,
+    UPDATES_RPC,
+    get_recompute_progress,
+    recompute_instagram_analytics,
+)
+
+
+class UniqueViolationError(Exception):
+    code = "23505"
+
+
+def apply_updates(db, params):
+    creators = {row["ig_user_id"]: row for row in db.tables["instagram_creators"]}
+    failed = []
+    for update in params["p_updates"]:
+        if update["ig_user_id"] == "3":
+            failed.append({"creator_id": "3", "error": "check constraint"})
+            continue
+        creators[update["ig_user_id"]].update(update["fields"])
+    return failed
+
+
+@pytest.fixture
+def db(fake_supabase, monkeypatch):
+    now = datetime.now(timezone.utc)
+    creators = [
+        {"ig_user_id": str(i), "followers_count": 1000 * i, "review_status": "ok"}
+        for i in range(1, 6)
+    ]
+    reels = [
+        {
+            "creator_id": str(i),
+            "play_count": 500 * i * (j + 1),
+            "like_count": 50 * i,
+            "comment_count": 5,
+            "taken_at": (now - timedelta(days=j)).isoformat(),
+        }
+        for i in range(1, 6)
+        for j in range(3)
+    ]
+    db = fake_supabase(
+        tables={"instagram_creators": creators, "instagram_reels": reels, "instagram_posts": []},
+        rpc={UPDATES_RPC: apply_updates},
+    )
+
+    def one_running(payload):
+        # Unique index on running rows
+        runs = db.tables.get(RUNS_TABLE, [])
+        if payload == {"status": "running"} and any(r["status"] == "running" for r in runs):
+            raise UniqueViolationError("duplicate key value violates unique constraint")
+        return False
+
+    db.fail[RUNS_TABLE] = one_running
+    monkeypatch.setattr(instagram_analytics, "get_db", lambda: db)
+    return db
+
+
+@pytest.mark.unit
+def test_results_are_written_in_one_rpc_per_chunk(db):
+    summary = recompute_instagram_analytics(chunk_size=2)
+
+    assert summary["success"]
+    assert (summary["creators"], summary["written"], summary["failed"]) == (5, 4, 1)
+    assert [name for name, _ in db.calls].count(UPDATES_RPC) == 3  # 5 creators in chunks of 2
+    assert db.tables["instagram_creators"][0]["analytics_recomputed_at"]
+
+    (run,) = db.tables[RUNS_TABLE]
+    assert (run["status"], run["creators_count"], run["failed_count"]) == ("completed", 5, 1)
+    assert run["computed_at"] and run["progress"]["written"] == 4
+
+    progress = get_recompute_progress()
+    assert not progress["running"]
+    assert progress["runs"][0]["id"] == run["id"]
+
+
+@pytest.mark.unit
+def test_a_running_run_blocks_others_until_its_heartbeat_goes_stale(db):
+    heartbeat = datetime.now(timezone.utc).isoformat()
+    db.tables[RUNS_TABLE] = [{"id": 1, "status": "running", "heartbeat_at": heartbeat}]
+
+    blocked = recompute_instagram_analytics()
+    assert blocked == {"success": False, "error": "An analytics recompute is already running"}
+    assert get_recompute_progress()["running"]
+
+    stale = datetime.now(timezone.utc) - timedelta(seconds=instagram_analytics.RUN_STALE_SECONDS)
+    db.tables[RUNS_TABLE][0]["heartbeat_at"] = (stale - timedelta(minutes=1)).isoformat()
+
+    assert recompute_instagram_analytics()["success"]
+    assert [run["status"] for run in db.tables[RUNS_TABLE]] == ["abandoned", "completed"]
@@ -0,0 +1,78 @@
+"""
+API Usage Tracker - Unit Tests
+Checks calls are accumulated per creator and flushed as one atomic increment RPC
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.api_usage import ApiUsageTracker
+
+
+def _tracker(supabase):
+    return ApiUsageTracker(supabase, logging.getLogger(__name__), cost_per_request=0.01)
+
+
+@pytest.mark.unit
+def test_concurrent_creator_scopes_flush_as_one_increment(fake_supabase):
+    supabase = fake_supabase()
+    tracker = _tracker(supabase)
+
+    async def creator(creator_id, calls):
+        with tracker.creator_scope(creator_id):
+            for _ in range(calls):
+                await asyncio.sleep(0)
+                tracker.record_call()
+
+    async def main():
+        await asyncio.gather(creator("1", 3), creator("2", 2))
+
+    asyncio.run(main())
+    tracker.record_call()  # Outside any scope: not attributed
+
+    assert tracker.calls_for("1") == 3
+    assert tracker.flush() == 2
+    assert supabase.calls == [
+        (
+            ApiUsageTracker.RPC_NAME,
+            {
+                "p_usage": [
+                    {"creator_id": "1", "calls": 3, "cost": 0.03},
+                    {"creator_id": "2", "calls": 2, "cost": 0.02},
+                ]
+            },
+        )
+    ]
+    assert tracker.pending_creators() == 0
+    assert tracker.calls_for("1") == 0
+    assert tracker.flush() == 0
+
+
+@pytest.mark.unit
+def test_flush_of_one_creator_keeps_the_others(fake_supabase):
+    supabase = fake_supabase()
+    tracker = _tracker(supabase)
+    tracker.record_call("1", 2)
+    tracker.record_call("2")
+
+    assert tracker.flush(["1", "3"]) == 1
+    assert supabase.calls[0][1]["p_usage"] == [{"creator_id": "1", "calls": 2, "cost": 0.02}]
+    assert tracker.calls_for("1") == 0
+    assert tracker.calls_for("2") == 1
+    assert tracker.pending_creators() == 1
+
+
+@pytest.mark.unit
+def test_failed_flush_is_retried_by_the_next_one(fake_supabase):
+    supabase = fake_supabase(fail={ApiUsageTracker.RPC_NAME: True})
+    tracker = _tracker(supabase)
+    tracker.record_call("1", 2)
+
+    assert tracker.flush() == 0
+    tracker.record_call("1")
+    supabase.fail.clear()
+
+    assert tracker.flush() == 1
+    assert supabase.calls[-1][1]["p_usage"] == [{"creator_id": "1", "calls": 3, "cost": 0.03}]
@@ -0,0 +1,91 @@
+"""
+Batch Analytics - Unit Tests
+Checks the vectorized engine matches the per-creator InstagramAnalytics
+"""
+
+import logging
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.scrapers.instagram.services.modules.analytics import InstagramAnalytics
+from app.scrapers.instagram.services.modules.batch_analytics import BatchAnalyticsEngine
+
+
+CONFIG = SimpleNamespace(
+    enable_analytics=True,
+    enable_viral_detection=True,
+    viral_min_views=1000,
+    viral_multiplier=2.0,
+)
+NOW = 1_800_000_000
+
+
+def _reel(views, likes, comments, saves=None, age_days=1):
+    return {
+        "play_count": views,
+        "like_count": likes,
+        "comment_count": comments,
+        "save_count": saves,
+        "taken_at": NOW - age_days * 86400,
+    }
+
+
+def _post(likes, comments, caption="", age_days=2):
+    return {
+        "like_count": likes,
+        "comment_count": comments,
+        "caption": {"text": caption},
+        "taken_at": NOW - age_days * 86400,
+    }
+
+
+@pytest.mark.unit
+def test_matches_per_creator_analytics():
+    reels = [
+        [_reel(1000, 50, 5, 3, 1), _reel(0, 10, 0, None, 3), _reel(90000, 900, 40, 10, 8)],
+        [],
+        [_reel(5000, 0, 0, age_days=1)],
+    ]
+    posts = [
+        [_post(100, 10, "hello #a #b", 2), _post(0, 0, "", 5)],
+        [_post(40, 2, "no tags", 1), _post(60, 6, "#x", 9)],
+        [],
+    ]
+    followers = [10000, 500, 0]
+    ids = ["a", "b", "c"]
+
+    result = BatchAnalyticsEngine(CONFIG, logging.getLogger()).compute(
+        ids, followers, reels, posts, now=NOW
+    )
+    per_creator = InstagramAnalytics(CONFIG, logging.getLogger())
+
+    for i, cid in enumerate(ids):
+        expected = per_creator.calculate_analytics(
+            cid, reels[i], posts[i], {"follower_count": followers[i]}
+        )
+        got = result.analytics[cid]
+        for key, value in expected.items():
+            if key in (
+                "most_active_day",
+                "most_active_hour",
+                "days_since_last_post",
+                "last_post_days_ago",
+            ):
+                continue  # local time / wall clock in the per-creator code
+            if isinstance(value, float):
+                assert math.isclose(got[key], value, rel_tol=1e-9), key
+            else:
+                assert got[key] == value, key
+
+
+@pytest.mark.unit
+def test_catalog_thresholds_span_all_creators():
+    reels = [[_reel(v, 1, 0) for v in range(1000, 101000, 1000)], [_reel(500000, 1, 0)]]
+    result = BatchAnalyticsEngine(CONFIG, logging.getLogger(), percentiles=(99,)).compute(
+        ["small", "big"], [0, 0], reels, [[], []], now=NOW
+    )
+    assert result.thresholds["reel_views_p99"] > 99000
+    assert result.analytics["big"]["catalog_viral_count"] == 1
+    assert result.analytics["small"]["catalog_viral_count"] <= 1
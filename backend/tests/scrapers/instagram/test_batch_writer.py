@@ -0,0 +1,50 @@
+"""
+Batch Writer - Unit Tests
+Checks rows from concurrent creators share bulk writes and failures stay per creator
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.batch_writer import BatchWriteError, BatchWriter
+
+
+@pytest.mark.unit
+def test_concurrent_creators_share_one_flush_and_failures_stay_isolated(fake_supabase):
+    supabase = fake_supabase(
+        rpc={BatchWriter.UPDATES_RPC: lambda db, params: [{"creator_id": "2", "error": "check"}]},
+        fail={"instagram_reels": lambda rows: any(r["media_pk"] == "bad" for r in rows)},
+    )
+    writer = BatchWriter(supabase, logging.getLogger(__name__), max_delay=0.01)
+
+    async def main():
+        results = await asyncio.gather(
+            writer.upsert("instagram_reels", [{"media_pk": "a"}, {"media_pk": "b"}], "media_pk"),
+            writer.upsert("instagram_reels", [{"media_pk": "b"}, {"media_pk": "c"}], "media_pk"),
+            writer.upsert("instagram_reels", [{"media_pk": "bad"}], "media_pk"),
+            writer.update_creator("1", {"followers_count": 10}),
+            writer.update_creator("1", {"last_scraped_at": "now"}),
+            writer.update_creator("2", {"followers_count": -1}),
+            return_exceptions=True,
+        )
+        await writer.close()
+        return results
+
+    results = asyncio.run(main())
+
+    assert results[:2] == [2, 2]  # "b" is written once and credited to both creators
+    assert isinstance(results[2], BatchWriteError)
+    assert results[3:5] == [None, None]
+    assert isinstance(results[5], BatchWriteError)
+
+    first_reels, (rpc_name, params) = supabase.calls[0], supabase.calls[-1]
+    assert [r["media_pk"] for r in first_reels[1]] == ["a", "b", "c", "bad"]
+    assert rpc_name == "apply_instagram_creator_updates"
+    assert params["p_updates"][0] == {
+        "ig_user_id": "1",
+        "fields": {"followers_count": 10, "last_scraped_at": "now"},
+    }
+    assert (writer.stats.flushes, writer.stats.failed_rows) == (1, 2)
+    assert sorted(r["media_pk"] for r in supabase.tables["instagram_reels"]) == ["a", "b", "c"]
@@ -0,0 +1,71 @@
+"""
+Creator State Snapshot - Unit Tests
+Covers parsing of get_instagram_creator_states rows, known-media lookups and change detection
+"""
+
+import pytest
+
+from app.scrapers.instagram.services.modules.creator_state import CreatorState
+
+
+ROW = {
+    "ig_user_id": "2017771114",
+    "reels_count": 42,
+    "posts_count": 0,
+    "profile_pic_url": "https://media.b9dashboard.com/profile_pictures/2017771114/profile.jpg",
+    "total_api_calls": 120,
+    "reel_urls": {
+        "111": "https://media.b9dashboard.com/videos/2026/10/2017771114/111.mp4",
+        "222": "https://scontent.cdninstagram.com/v/222.mp4",
+    },
+    "post_image_urls": {"333": None},
+    "last_media_count": 57,
+    "media_refreshed_at": "2026-10-18T10:00:00+00:00",
+    "latest_taken_at": "2026-10-17T08:00:00+00:00",
+}
+
+
+@pytest.mark.unit
+def test_from_row():
+    state = CreatorState.from_row(ROW)
+    assert state.creator_id == "2017771114"
+    assert state.reels_count == 42
+    assert state.total_api_calls == 120
+    assert not state.is_new
+    assert CreatorState.from_row({"ig_user_id": 1}).is_new
+
+
+@pytest.mark.unit
+def test_known_reels_splits_existing_and_r2():
+    state = CreatorState.from_row(ROW)
+    existing, in_r2 = state.known_reels(["111", "222", "999"])
+    assert existing == {"111", "222"}
+    assert list(in_r2) == ["111"]
+
+
+@pytest.mark.unit
+def test_known_posts_without_images():
+    state = CreatorState.from_row(ROW)
+    existing, in_r2 = state.known_posts(["333", "444"])
+    assert existing == {"333"}
+    assert in_r2 == {}
+
+
+@pytest.mark.unit
+def test_media_unchanged():
+    state = CreatorState.from_row(ROW)
+    assert state.media_unchanged(57)
+    assert state.media_unchanged(57, state.latest_taken_at)
+    assert not state.media_unchanged(58)
+    # Same count, but something newer than anything stored (delete + new post)
+    assert not state.media_unchanged(57, state.latest_taken_at + 60)
+    # Never fetched with change detection -> always fetch
+    assert not CreatorState.from_row({**ROW, "last_media_count": None}).media_unchanged(57)
+
+
+@pytest.mark.unit
+def test_refresh_due():
+    state = CreatorState.from_row(ROW)
+    assert not state.refresh_due(86400, now=state.media_refreshed_at + 3600)
+    assert state.refresh_due(86400, now=state.media_refreshed_at + 86400)
+    assert CreatorState(creator_id="1").refresh_due(86400)
@@ -0,0 +1,112 @@
+"""
+Discovery Crawler - Unit Tests
+Checks frontier dedupe, known-creator prefiltering, batched inserts and seed marking
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.discovery_crawler import DiscoveryCrawler
+
+
+class _NoPacing:
+    async def wait(self):
+        pass
+
+
+class _FakeSource:
+    def __init__(self, related, stored=()):
+        self.related_by_seed = related
+        self.stored = set(stored)
+        self.profile_calls = []
+        self.inserts = []
+        self.marked = []
+
+    async def related(self, seed):
+        await asyncio.sleep(0)
+        return self.related_by_seed.get(seed["ig_user_id"])
+
+    async def known(self, nodes):
+        return [node for node in nodes if node["id"] in self.stored]
+
+    async def profile(self, node):
+        self.profile_calls.append(node["username"])
+        if node["username"] == "broken":
+            raise RuntimeError("timeout")
+        return {"id": node["id"], "username": node["username"]}
+
+    async def prepare(self, profile, seed):
+        return {"ig_user_id": profile["id"], "username": profile["username"]}
+
+    async def insert(self, rows):
+        self.inserts.append([row["username"] for row in rows])
+        return len(rows)
+
+    async def mark_processed(self, seeds):
+        self.marked.extend(seed["id"] for seed in seeds)
+
+
+def _node(ig_id, username):
+    return {"id": ig_id, "username": username}
+
+
+def _crawl(source, seeds, **kwargs):
+    crawler = DiscoveryCrawler(
+        source, _NoPacing(), logging.getLogger("test"), concurrency=4, **kwargs
+    )
+    return asyncio.run(crawler.run(seeds))
+
+
+SEEDS = [
+    {"id": 1, "ig_user_id": "s1", "username": "seed_one"},
+    {"id": 2, "ig_user_id": "s2", "username": "seed_two"},
+]
+
+
+@pytest.mark.unit
+def test_only_unknown_unseen_profiles_are_fetched():
+    source = _FakeSource(
+        {
+            "s1": [_node("a", "alpha"), _node("b", "beta"), _node("s2", "seed_two")],
+            "s2": [_node("a", "Alpha"), _node("c", "gamma")],
+        },
+        stored={"b"},
+    )
+    progress = _crawl(source, SEEDS)
+
+    assert sorted(source.profile_calls) == ["alpha", "gamma"]
+    assert (progress.related_found, progress.duplicates, progress.known) == (5, 2, 1)
+    assert progress.created == 2
+    assert sorted(source.marked) == [1, 2]
+
+
+@pytest.mark.unit
+def test_inserts_are_batched():
+    related = {"s1": [_node(str(i), f"user{i}") for i in range(5)]}
+    source = _FakeSource(related)
+    progress = _crawl(source, SEEDS[:1], insert_batch=2)
+
+    assert progress.created == 5
+    assert [len(batch) for batch in source.inserts] == [2, 2, 1]
+
+
+@pytest.mark.unit
+def test_profile_errors_are_counted_and_seed_still_completes():
+    source = _FakeSource({"s1": [_node("x", "broken"), _node("y", "fine")]})
+    progress = _crawl(source, SEEDS[:1])
+
+    assert (progress.created, progress.failed) == (1, 1)
+    assert progress.errors == ["broken: timeout"]
+    assert source.marked == [1]
+
+
+@pytest.mark.unit
+def test_stop_leaves_unfinished_seeds_unmarked():
+    source = _FakeSource({"s1": [_node("a", "alpha")], "s2": [_node("b", "beta")]})
+    progress = _crawl(source, SEEDS, should_stop=lambda: bool(source.profile_calls))
+
+    assert progress.seeds_done < 2
+    assert len(source.marked) == progress.seeds_done
+
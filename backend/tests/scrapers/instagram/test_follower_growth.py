@@ -0,0 +1,49 @@
+"""
+Follower Growth - Unit Tests
+Checks in-process growth matches the record_instagram_follower_sample semantics
+"""
+
+import pytest
+
+from app.scrapers.instagram.services.modules.follower_growth import (
+    DAY_SECONDS,
+    WEEK_SECONDS,
+    FollowerHistory,
+    compute_growth,
+)
+
+
+NOW = 1_800_000_000.0
+
+
+@pytest.mark.unit
+def test_daily_and_weekly_lookbacks():
+    history = FollowerHistory(
+        samples=[
+            (NOW - WEEK_SECONDS - 60, 1000),  # weekly anchor
+            (NOW - 2 * DAY_SECONDS, 1100),  # daily baseline (latest <= 24h ago)
+            (NOW - 3600, 1150),
+        ]
+    )
+    growth = compute_growth(history, 1200, NOW)
+    assert growth["weekly_growth_rate"] == 20.0
+    assert growth["daily_growth_rate"] == 9.09
+    assert growth["previous_followers_count"] == 1150
+
+
+@pytest.mark.unit
+def test_unchanged_count_uses_previous_distinct():
+    history = FollowerHistory(samples=[(NOW - 3600, 500)], previous_distinct=480)
+    growth = compute_growth(history, 500, NOW)
+    assert growth["previous_followers_count"] == 480
+    assert growth["daily_growth_rate"] is None
+
+
+@pytest.mark.unit
+def test_no_history():
+    growth = compute_growth(FollowerHistory(), 500, NOW)
+    assert growth == {
+        "daily_growth_rate": None,
+        "weekly_growth_rate": None,
+        "previous_followers_count": None,
+    }
@@ -0,0 +1,73 @@
+"""
+Request Hedging - Unit Tests
+Checks slow calls get one duplicate within budget and the faster response wins
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.hedging import RequestHedger
+
+
+def _hedger(**kwargs):
+    hedger = RequestHedger(
+        logging.getLogger(__name__), min_delay=0.01, max_delay=0.05, window=1000, **kwargs
+    )
+    for _ in range(500):
+        hedger._record("reels", 0.01)
+    return hedger
+
+
+@pytest.mark.unit
+def test_slow_call_is_hedged_and_duplicate_wins():
+    hedger = _hedger(budget=1.0)
+    delays = iter([1.0, 0.0])  # Original hangs, duplicate answers at once
+    extra_calls = []
+
+    async def call():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    result = asyncio.run(hedger.run("reels", call, on_hedge=lambda: extra_calls.append(1)))
+
+    assert result == 0.0
+    assert (hedger.stats.hedged, hedger.stats.hedge_wins, len(extra_calls)) == (1, 1, 1)
+    assert hedger.stats.as_dict()["win_rate"] == 1.0
+
+
+@pytest.mark.unit
+def test_budget_caps_duplicates():
+    hedger = _hedger(budget=0.05)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    async def main():
+        return [await hedger.run("reels", call) for _ in range(10)]
+
+    assert asyncio.run(main()) == ["ok"] * 10
+    # 5% of 10 requests is less than one duplicate
+    assert (hedger.stats.hedged, hedger.stats.budget_skipped, len(calls)) == (0, 10, 10)
+
+
+@pytest.mark.unit
+def test_every_attempt_is_paced():
+    hedger = _hedger(budget=1.0)
+    delays = iter([1.0, 0.0])
+    paced = []
+
+    async def pace():
+        paced.append(1)
+
+    async def call():
+        await asyncio.sleep(next(delays))
+        return "ok"
+
+    assert asyncio.run(hedger.run("reels", call, pace=pace)) == "ok"
+    assert (hedger.stats.hedged, len(paced)) == (1, 2)
@@ -0,0 +1,102 @@
+"""
+Media Change-Detection Markers - Unit Tests
+Checks a failed reels/posts write leaves last_media_count and media_refreshed_at untouched
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+PROFILE = {"username": "creator", "follower_count": 1000, "media_count": 57}
+
+
+class _FailingUpserts:
+    """Supabase stub whose media upserts fail (creator updates succeed)"""
+
+    def __init__(self):
+        self.upserts = 0
+
+    def table(self, name):
+        return self
+
+    def update(self, *_):
+        return self
+
+    def eq(self, *_):
+        return self
+
+    def upsert(self, *_args, **_kwargs):
+        self.upserts += 1
+        raise Exception("statement timeout")
+
+    def execute(self):
+        return MagicMock(data=[])
+
+
+@pytest.fixture
+def scraper_cls():
+    # The scraper module creates the shared Supabase client on import
+    with patch("app.core.database.supabase_client.create_client", return_value=MagicMock()):
+        from app.scrapers.instagram.services.instagram_scraper import InstagramScraperUnified
+    return InstagramScraperUnified
+
+
+def _scraper(cls, written):
+    scraper = cls.__new__(cls)
+    scraper.supabase = _FailingUpserts()
+    scraper.use_modules = False
+    scraper.batch_writer = None
+    scraper.retry_lane = None
+    scraper.errors = []
+    scraper.creators_processed = 0
+
+    async def fetch_profile(username):
+        return dict(PROFILE)
+
+    async def fetch_media(creator_id, count, **kwargs):
+        return [{"pk": "1"}]
+
+    def prepare(*args, **kwargs):
+        return [{"media_pk": "1"}], 1, 0
+
+    async def write_analytics(creator_id, reels, posts, profile_data, extra_fields=None, **_):
+        written.append(extra_fields)
+        return {}
+
+    scraper._log_to_system = lambda *args, **kwargs: None
+    scraper._get_creator_state = lambda creator_id: None
+    scraper._get_creator_content_counts = lambda creator_id: (10, 10)
+    scraper._api_calls_for = lambda creator_id: 0
+    scraper.should_continue = lambda: True
+    scraper._fetch_profile = fetch_profile
+    scraper._track_follower_growth = lambda *args: {}
+    scraper._fetch_reels = scraper._fetch_posts = fetch_media
+    scraper._prepare_reels = scraper._prepare_posts = prepare
+    scraper._write_analytics = write_analytics
+    scraper._format_analytics_summary = lambda analytics: ""
+    return scraper
+
+
+@pytest.mark.unit
+def test_failed_media_write_keeps_the_markers(scraper_cls):
+    written = []
+    scraper = _scraper(scraper_cls, written)
+
+    assert asyncio.run(scraper._process_creator({"ig_user_id": "42", "username": "creator"}))
+
+    assert scraper.supabase.upserts == 2
+    assert written == [None]  # Analytics still written, without last_media_count/media_refreshed_at
+
+
+@pytest.mark.unit
+def test_stored_media_moves_the_markers(scraper_cls):
+    written = []
+    scraper = _scraper(scraper_cls, written)
+    scraper.supabase.upsert = lambda *args, **kwargs: scraper.supabase
+
+    asyncio.run(scraper._process_creator({"ig_user_id": "42", "username": "creator"}))
+
+    assert written[0]["last_media_count"] == 57
+    assert "media_refreshed_at" in written[0]
@@ -0,0 +1,80 @@
+"""
+Media Record - Unit Tests
+Checks API items are normalized once and analytics reads the records
+"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from app.scrapers.instagram.services.modules.analytics import InstagramAnalytics
+from app.scrapers.instagram.services.modules.media_record import MediaRecord, normalize_media
+
+
+CONFIG = SimpleNamespace(
+    enable_analytics=True,
+    enable_viral_detection=True,
+    viral_min_views=1000,
+    viral_multiplier=2.0,
+)
+
+
+@pytest.mark.unit
+def test_resolves_field_variations_caption_and_urls():
+    reel = MediaRecord.from_item(
+        {
+            "pk": 7,
+            "ig_play_count": 1200,
+            "likes": 30,
+            "comment_count": 4,
+            "caption": {"text": "new drop #summer #fit with @friend"},
+            "video_versions": [{"url": "https://cdn/v.mp4"}],
+            "image_versions2": {"candidates": []},
+            "device_timestamp": 1_700_000_000,
+        },
+        "reels",
+    )
+    assert (reel.views, reel.ig_play_count, reel.likes, reel.comments) == (1200, 1200, 30, 4)
+    assert (reel.saves, reel.shares, reel.engagement) == (None, None, 34)
+    assert reel.hashtags == ["#summer", "#fit"] and reel.mentions == ["@friend"]
+    assert reel.video_url == "https://cdn/v.mp4" and reel.thumbnail_url is None
+    assert reel.taken_at == 1_700_000_000
+
+    post = MediaRecord.from_item(
+        {
+            "pk": 8,
+            "caption": None,
+            "carousel_media": [
+                {"media_type": 1, "image_versions2": {"candidates": [{"url": "a"}]}},
+                {"media_type": 2, "image_versions2": {"candidates": [{"url": "b"}]}},
+                {"media_type": 8},
+            ],
+        },
+        "posts",
+    )
+    assert (post.post_type, post.image_urls, post.views) == ("carousel", ["a", "b"], None)
+    assert (post.caption_text, post.hashtags) == ("", [])
+    assert not hasattr(post, "__dict__")
+
+
+@pytest.mark.unit
+def test_records_pass_through_and_match_raw_item_analytics():
+    reels = [
+        {"play_count": 5000, "like_count": 200, "comment_count": 20, "taken_at": 1_700_000_000},
+        {"play_count": 800, "like_count": 40, "comment_count": 2, "taken_at": 1_700_100_000},
+    ]
+    posts = [{"like_count": 90, "comment_count": 9, "caption": {"text": "#a #b"}, "taken_at": 1}]
+    records = normalize_media(reels, "reels")
+    assert normalize_media(records, "reels")[0] is records[0]
+
+    analytics = InstagramAnalytics(CONFIG, logging.getLogger(__name__))
+    profile = {"follower_count": 10000}
+    from_items = analytics.calculate_analytics("c", reels, posts, profile)
+    from_records = analytics.calculate_analytics(
+        "c", records, normalize_media(posts, "posts"), profile
+    )
+
+    assert from_records == from_items
+    assert from_records["avg_reel_views"] == 2900
+    assert from_records["avg_hashtag_count"] == 2
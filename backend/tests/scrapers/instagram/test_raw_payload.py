@@ -0,0 +1,81 @@
+"""
+Raw Payload Policy - Unit Tests
+Checks each raw_media_json mode and that unchanged payloads are not re-sent
+"""
+
+import gzip
+import json
+
+import pytest
+
+from app.scrapers.instagram.services.modules.raw_payload import RawPayloadPolicy, content_hash
+
+
+ITEM = {
+    "pk": "42",
+    "like_count": 10,
+    "caption": {"text": "hello", "created_at": 1},
+    "usertags": {"in": [{"user": {"username": "a", "pk": 1}}, {"user": {"username": "b"}}]},
+    "image_versions2": {"candidates": [{"url": "https://cdn.example/x.jpg?sig=1&exp=2"}]},
+}
+
+
+@pytest.mark.unit
+def test_hash_ignores_signed_url_parameters():
+    resigned = dict(
+        ITEM, image_versions2={"candidates": [{"url": "https://cdn.example/x.jpg?sig=9"}]}
+    )
+    assert content_hash(ITEM) == content_hash(resigned)
+    assert content_hash(ITEM) != content_hash(dict(ITEM, like_count=11))
+    assert content_hash(ITEM, "full") != content_hash(ITEM, "projected")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        ("full", ITEM),
+        (
+            "projected",
+            {
+                "pk": "42",
+                "like_count": 10,
+                "caption": {"text": "hello"},
+                "usertags": {"in": {"user": {"username": ["a", "b"]}}},
+            },
+        ),
+        ("hash", None),
+    ],
+)
+def test_modes_and_unchanged_payloads(mode, expected):
+    policy = RawPayloadPolicy(mode)
+
+    columns = policy.columns("reels", "42", ITEM)
+    assert columns["raw_media_json"] == expected
+    assert columns["raw_media_hash"] == content_hash(ITEM, mode)
+
+    # Same content next cycle: the blob is left out and the trigger keeps the stored one
+    again = policy.columns("reels", "42", ITEM, stored_hash=columns["raw_media_hash"])
+    assert again == {**columns, "raw_media_json": None}
+    assert policy.unchanged == 1
+
+
+@pytest.mark.unit
+def test_r2_mode_offloads_gzipped_json_and_falls_back_inline():
+    uploads = {}
+
+    def uploader(data, key):
+        uploads[key] = json.loads(gzip.decompress(data))
+        return f"https://media.example/{key}"
+
+    columns = RawPayloadPolicy("r2", uploader=uploader).columns("posts", "42", ITEM)
+    assert columns["raw_media_json"] is None
+    assert columns["raw_media_ref"] == "https://media.example/instagram/raw/posts/42.json.gz"
+    assert uploads["instagram/raw/posts/42.json.gz"] == ITEM
+
+    def failing(data, key):
+        raise OSError("R2 down")
+
+    fallback = RawPayloadPolicy("r2", uploader=failing).columns("posts", "42", ITEM)
+    assert fallback["raw_media_json"]["pk"] == "42"
+    assert (fallback["raw_media_hash"], fallback["raw_media_ref"]) == (None, None)
@@ -0,0 +1,48 @@
+"""
+Refresh Pacer - Unit Tests
+Checks creators are spread over the window and paced within each slice
+"""
+
+import pytest
+
+from app.scrapers.instagram.services.modules.refresh_pacer import RefreshPacer
+
+
+def _creators(count):
+    return [{"username": f"c{i}"} for i in range(count)]
+
+
+@pytest.mark.unit
+def test_pass_is_spread_evenly_over_the_window():
+    pacer = RefreshPacer(window=3600, slice_seconds=300, max_rps=55, calls_per_creator=2.0)
+    pacer.start_pass(_creators(120), now=0)  # One creator every 30s
+
+    batches = []
+    now = 0.0
+    while not pacer.pass_done:
+        batch, rps = pacer.next_slice(now)
+        batches.append((len(batch), rps))
+        now += 300
+
+    assert batches[0] == (11, pytest.approx(11 * 2.0 / 300 * 1.25))  # Starts at 0..300 inclusive
+    assert [size for size, _ in batches[1:]] == [10] * 10 + [9]
+    assert len(batches) == 12 and pacer.next_pass_at() == 3600
+    assert pacer.next_slice(now) == ([], 0.0)
+
+
+@pytest.mark.unit
+def test_catches_up_when_behind_and_learns_calls_per_creator():
+    pacer = RefreshPacer(window=600, slice_seconds=60, max_rps=1, calls_per_creator=2.0)
+    pacer.start_pass(_creators(60), now=0)  # One creator every 10s
+
+    pacer.next_slice(0)
+    batch, rps = pacer.next_slice(300)  # The first slice overran by four minutes
+    assert (len(batch), rps) == (30, 1)  # Everything overdue, capped at the API limit
+
+    pacer.record(creators=10, api_calls=40)
+    assert pacer.calls_per_creator == pytest.approx(2.6)
+    assert pacer.progress()["planned_rps"] == 0.26  # 60 creators * 2.6 calls / 600s
+
+    # A grown catalog gets a shorter slot on the next pass
+    pacer.start_pass(_creators(120), now=600)
+    assert pacer.slot == 5.0
@@ -0,0 +1,74 @@
+"""
+Retry Lane - Unit Tests
+Checks deferred fetches are retried, re-deferred and exhausted with stats
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.retry_lane import DeferredFetch, DeferredRetryLane
+
+
+@pytest.mark.unit
+def test_retries_until_recovered_or_exhausted():
+    exhausted = []
+    lane = DeferredRetryLane(
+        logging.getLogger(__name__), delays=[0.01, 0.02], on_exhausted=exhausted.append
+    )
+    # "slow" returns data on its second retry, "empty" never does
+    attempts = {"slow": 0, "empty": 0}
+
+    async def handler(item):
+        name = item.creator["username"]
+        attempts[name] += 1
+        return name == "slow" and attempts[name] == 2
+
+    async def main():
+        task = asyncio.create_task(lane.run(handler))
+        for name in ("slow", "empty"):
+            lane.defer(DeferredFetch(creator={"username": name}, kind="reels", reason="empty"))
+        lane.close()
+        return await task
+
+    stats = asyncio.run(main())
+
+    assert attempts == {"slow": 2, "empty": 2}
+    assert (stats.deferred, stats.retried, stats.recovered, stats.exhausted) == (2, 4, 1, 1)
+    assert stats.yield_rate == 0.25
+    assert stats.outcomes["reels:empty:2:recovered"] == 1
+    assert [item.creator["username"] for item in exhausted] == ["empty"]
+
+
+@pytest.mark.unit
+def test_stop_drops_queued_items():
+    lane = DeferredRetryLane(logging.getLogger(__name__), delays=[60.0])
+
+    async def main():
+        lane.defer(DeferredFetch(creator={"username": "a"}, kind="posts", reason="timeout"))
+        return await lane.run(lambda item: asyncio.sleep(0, True), should_continue=lambda: False)
+
+    stats = asyncio.run(main())
+    assert (stats.retried, stats.dropped) == (0, 1)
+
+
+@pytest.mark.unit
+def test_async_exhausted_callback_is_awaited_before_run_returns():
+    marked = []
+
+    async def on_exhausted(item):
+        await asyncio.sleep(0.01)
+        marked.append(item.creator["username"])
+
+    lane = DeferredRetryLane(logging.getLogger(__name__), delays=[0.01], on_exhausted=on_exhausted)
+
+    async def main():
+        task = asyncio.create_task(lane.run(lambda item: asyncio.sleep(0, False)))
+        lane.defer(DeferredFetch(creator={"username": "a"}, kind="reels", reason="empty"))
+        lane.close()
+        return await task
+
+    stats = asyncio.run(main())
+    assert stats.exhausted == 1
+    assert marked == ["a"]
@@ -0,0 +1,38 @@
+"""
+Running Aggregates - Unit Tests
+Checks the scraper leaves trigger-maintained averages alone
+"""
+
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.analytics import RUNNING_AGGREGATE_FIELDS
+from app.scrapers.instagram.services.modules.storage import InstagramStorage
+
+
+ANALYTICS = {
+    "avg_reel_views": 1200.0,
+    "avg_likes_per_reel_cached": 80.0,
+    "avg_likes_per_post_cached": 40.0,
+    "engagement_rate": 3.5,
+    "posting_frequency_per_week": 4.0,
+    "last_post_days_ago": 1.5,
+}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("running_aggregates", [True, False])
+def test_update_creator_analytics_skips_aggregate_fields(fake_supabase, running_aggregates):
+    supabase = fake_supabase()
+    storage = InstagramStorage(
+        supabase, logging.getLogger(__name__), running_aggregates=running_aggregates
+    )
+
+    storage.update_creator_analytics("123", ANALYTICS)
+
+    (table, update), *_ = supabase.calls
+    assert table == "instagram_creators"
+    written = set(update)
+    assert {"engagement_rate_cached", "last_post_days_ago", "last_scraped_at"} <= written
+    assert bool(written & RUNNING_AGGREGATE_FIELDS) is not running_aggregates
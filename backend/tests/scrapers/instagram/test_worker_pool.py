@@ -0,0 +1,94 @@
+"""
+Creator Worker Pool - Unit Tests
+Checks bounded concurrency, per-creator timeouts and the drain on stop
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.scrapers.instagram.services.modules.worker_pool import CreatorWorkerPool, PoolProgress
+
+
+def _pool(**kwargs):
+    kwargs.setdefault("start_stagger", 0)
+    return CreatorWorkerPool(logging.getLogger(__name__), **kwargs)
+
+
+@pytest.mark.unit
+def test_concurrency_is_bounded_and_results_are_counted():
+    pool = _pool(concurrency=3)
+    running = []
+    peak = 0
+
+    async def handler(item):
+        nonlocal peak
+        running.append(item)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(item)
+        if item == 4:
+            raise Exception("boom")
+        return item != 5
+
+    progress = asyncio.run(pool.run(range(10), handler))
+
+    assert peak == 3
+    assert (progress.done, progress.failed, progress.in_flight) == (8, 2, 0)
+    assert progress.remaining == 0
+
+
+@pytest.mark.unit
+def test_slow_item_times_out_without_cancelling_the_others():
+    pool = _pool(concurrency=2, item_timeout=0.05)
+
+    async def handler(item):
+        await asyncio.sleep(1 if item == "slow" else 0.01)
+        return True
+
+    progress = asyncio.run(pool.run(["slow", "a", "b", "c"], handler))
+
+    assert progress.done == 3
+    assert progress.failed == progress.timed_out == 1
+
+
+@pytest.mark.unit
+def test_stop_drains_in_flight_items_and_skips_the_rest():
+    pool = _pool(concurrency=2, drain_grace=5)
+    finished = []
+
+    async def handler(item):
+        pool.drain()
+        await asyncio.sleep(0.05)
+        finished.append(item)
+        return True
+
+    progress = asyncio.run(pool.run(range(6), handler))
+
+    assert pool.draining
+    assert sorted(finished) == [0, 1]
+    assert (progress.done, progress.skipped, progress.remaining) == (2, 4, 0)
+
+
+@pytest.mark.unit
+def test_drain_grace_cancels_stuck_items():
+    pool = _pool(concurrency=1, drain_grace=0, should_continue=lambda: False)
+
+    async def handler(item):
+        await asyncio.sleep(10)
+
+    progress = asyncio.run(pool.run(["stuck", "next"], handler))
+
+    assert (progress.failed, progress.skipped, progress.in_flight) == (1, 1, 0)
+
+
+@pytest.mark.unit
+def test_progress_eta_uses_the_completion_rate():
+    progress = PoolProgress(total=10, done=3, failed=1, skipped=2)
+    progress.started_at -= 8
+
+    assert progress.completed == 4
+    assert progress.remaining == 4
+    assert progress.eta_seconds == pytest.approx(8, rel=0.05)
+    assert PoolProgress(total=5).eta_seconds is None
@@ -0,0 +1,61 @@
+"""
+Known-Creator Index - Unit Tests
+Covers paged loading, id/username lookups, stats counting and load failures (no Supabase needed)
+"""
+
+import pytest
+
+from app.utils.creator_index import CREATORS_TABLE, KnownCreatorIndex
+
+
+def _client(fake_supabase, count, **options):
+    rows = [{"id": i, "ig_user_id": 1000 + i, "username": f"User{i}"} for i in range(1, count + 1)]
+    return fake_supabase(tables={CREATORS_TABLE: rows}, **options)
+
+
+@pytest.mark.unit
+def test_loads_every_page_and_matches_id_or_username(fake_supabase):
+    client = _client(fake_supabase, 5)
+    index = KnownCreatorIndex(client, page_size=2)
+
+    assert index.ensure_loaded()
+    assert client.queries == 3
+    assert index.contains(ig_user_id="1003")
+    assert index.contains(username="user5")
+    assert not index.contains(ig_user_id=9, username="someone")
+    nodes = [{"id": "1001", "username": "x"}, {"id": "7", "username": "y"}]
+    assert index.known_profiles(nodes) == nodes[:1]
+
+
+@pytest.mark.unit
+def test_added_creators_are_known_without_reload(fake_supabase):
+    client = _client(fake_supabase, 1)
+    index = KnownCreatorIndex(client)
+    index.ensure_loaded()
+    index.add_rows([{"ig_user_id": 42, "username": "NewOne"}])
+
+    assert index.contains(ig_user_id=42) and index.contains(username="newone")
+    index.ensure_loaded()
+    assert client.queries == 1  # Still fresh
+
+
+@pytest.mark.unit
+def test_uncounted_lookups_leave_stats_alone(fake_supabase):
+    index = KnownCreatorIndex(_client(fake_supabase, 2))
+    index.ensure_loaded()
+    index.contains(ig_user_id=1001)
+    index.contains(username="missing")
+
+    assert index.contains(ig_user_id=1002, count=False)
+    assert not index.contains(username="other", count=False)
+    stats = index.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+@pytest.mark.unit
+def test_failed_load_leaves_index_unusable(fake_supabase):
+    index = KnownCreatorIndex(_client(fake_supabase, 3, fail={CREATORS_TABLE: True}))
+
+    assert not index.ensure_loaded()
+    assert not index.loaded
+    assert index.get_stats()["creators"] == 0
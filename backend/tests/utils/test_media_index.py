@@ -0,0 +1,52 @@
+"""
+Media Content Index - Unit Tests
+Covers CDN source keys and in-memory dedup lookups (no Supabase/R2 needed)
+"""
+
+import pytest
+
+from app.utils.media_index import (
+    MediaContentIndex,
+    MediaObject,
+    MediaSource,
+    cdn_source_key,
+    compute_content_hash,
+)
+
+
+@pytest.mark.unit
+def test_source_key_ignores_signatures_and_edge_host():
+    a = "https://scontent-lax3-1.cdninstagram.com/v/t51.2885-19/123_n.jpg?oh=aaa&oe=111&_nc_ht=x"
+    b = "https://instagram.fmad3-1.fna.fbcdn.net/v/t51.2885-19/123_n.jpg?oh=bbb&oe=222"
+    assert cdn_source_key(a) == cdn_source_key(b) == "/v/t51.2885-19/123_n.jpg"
+
+
+@pytest.mark.unit
+def test_source_key_keeps_rendition_param():
+    small = "https://cdn.example/v/123_n.jpg?stp=dst-jpg_s150x150&oh=a"
+    full = "https://cdn.example/v/123_n.jpg?oh=b"
+    assert cdn_source_key(small) == "/v/123_n.jpg?stp=dst-jpg_s150x150"
+    assert cdn_source_key(small) != cdn_source_key(full)
+
+
+@pytest.mark.unit
+def test_object_lookup_checks_size():
+    index = MediaContentIndex(supabase_client=None)
+    data = b"reel-bytes"
+    content_hash = compute_content_hash(data)
+    index.put_object(MediaObject(content_hash, len(data), "videos/k.mp4", "https://m/videos/k.mp4"))
+
+    assert index.get_object(content_hash, len(data)).object_key == "videos/k.mp4"
+    assert index.get_object(content_hash, len(data) + 1) is None
+    assert index.get_object(compute_content_hash(b"other")) is None
+
+
+@pytest.mark.unit
+def test_cache_is_bounded():
+    index = MediaContentIndex(supabase_client=None, max_cache_entries=2)
+    for key in ("a", "b", "c"):
+        index.put_source(MediaSource(key, compute_content_hash(key.encode())))
+
+    assert index.get_source("a") is None
+    assert index.get_source("c") is not None
+    assert index.get_stats()["cached_sources"] == 2
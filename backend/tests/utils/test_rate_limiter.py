@@ -0,0 +1,85 @@
+"""
+RapidAPI Rate Limiter - Unit Tests
+Checks slot spacing, chained limiters and the Redis timeline shared across processes
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.rate_limiter import RequestRateLimiter, SharedRateLimiter
+
+
+def _elapsed(*waits):
+    async def burst():
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(*(wait() for wait in waits))
+        return asyncio.get_running_loop().time() - start
+
+    return asyncio.run(burst())
+
+
+@pytest.fixture
+def server():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting in fakeredis
+    return fakeredis.FakeServer()
+
+
+def _shared(server, requests_per_second):
+    import fakeredis
+
+    return SharedRateLimiter(
+        fakeredis.FakeRedis(server=server, decode_responses=True), requests_per_second
+    )
+
+
+@pytest.mark.unit
+def test_concurrent_callers_are_spaced():
+    limiter = RequestRateLimiter(50)
+
+    # 6 slots at 50/s: the last starts 0.1 s in
+    assert _elapsed(*[limiter.wait] * 6) >= 0.09
+    assert limiter.requests == 6
+    assert RequestRateLimiter(0).reserve() == 0.0
+
+
+@pytest.mark.unit
+def test_child_requests_count_against_the_parent():
+    shared = RequestRateLimiter(50)
+    discovery = RequestRateLimiter(1000, parent=shared)
+
+    # 3 scraper + 3 discovery requests share the parent's 50/s
+    assert _elapsed(*[shared.wait] * 3, *[discovery.wait] * 3) >= 0.09
+    assert (shared.requests, discovery.requests) == (6, 3)
+
+
+@pytest.mark.unit
+def test_child_rate_does_not_stretch_the_parent():
+    shared = RequestRateLimiter(1000)
+    time_slice = RequestRateLimiter(10, parent=shared)
+    asyncio.run(time_slice.wait())
+
+    assert time_slice.reserve() == pytest.approx(0.1, abs=0.01)
+    assert shared.reserve() < 0.01
+
+
+@pytest.mark.unit
+def test_processes_share_the_redis_timeline(server):
+    # Two limiters on one Redis server stand in for two processes
+    scraper, discovery = _shared(server, 50), _shared(server, 50)
+
+    delays = [limiter.reserve() for limiter in (scraper, discovery) * 3]
+
+    assert delays[-1] == pytest.approx(0.1, abs=0.01)
+    assert delays == sorted(delays)
+    assert _elapsed(scraper.wait, discovery.wait) >= 0.1
+
+
+@pytest.mark.unit
+def test_redis_outage_falls_back_to_local_pacing(server):
+    limiter = _shared(server, 50)
+    server.connected = False
+
+    assert [limiter.reserve() for _ in range(2)][1] == pytest.approx(0.02, abs=0.005)
+    assert limiter.fallbacks == 2
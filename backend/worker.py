@@ -4,25 +4,47 @@ B9 Dashboard Worker - Redis Queue Processor
 Pulls Instagram scraper jobs from Redis queue and processes them
 
 Architecture:
-- Workers pull jobs from Redis queue (BRPOP - blocking pop)
-- Each job contains a creator_id to process
-- Worker fetches creator data from Supabase
+- Workers claim jobs from the Redis queue (moved into a per-worker processing list
+  and leased in one script call)
+- Each job carries the creator's id, ig_user_id, username and niche, so no
+  Supabase fetch is needed before scraping (older payloads fall back to one)
 - Worker runs InstagramScraperUnified on the creator
 - Results are saved back to Supabase
-- Failed jobs can be retried or logged
+- Finished jobs are acknowledged; failed ones are retried with backoff and
+  dead-lettered after WORKER_MAX_ATTEMPTS (see app/core/job_queue.py)
+- Jobs of a crashed worker are retried once their lease expires (every worker
+  runs the reaper) or when a worker with the same WORKER_ID starts again
+- Every worker publishes a heartbeat (jobs/min, success rate, in-flight, p95 job
+  time) read by the queue telemetry endpoint (see app/core/queue_telemetry.py)
+- Every worker also promotes due jobs from the scheduler lanes (priority for new
+  creators, rolling for refreshes; see app/core/job_scheduler.py) and re-schedules
+  each scheduled creator's next refresh after processing it
+- While system_control has instagram_scraper stopped, workers neither claim nor
+  promote jobs; jobs cut short by the stop go back to the queue without using
+  an attempt
+
+Concurrency:
+- Up to WORKER_CONCURRENCY jobs run at once (the work is almost all network waits)
+- Jobs share one warm scraper: its RapidAPI connection pool, rate limiter, Supabase
+  and R2 clients, caches and a batch writer that merges their database writes
+- Each job is cancelled after WORKER_JOB_TIMEOUT seconds
+- On SIGTERM/SIGINT the worker stops pulling and lets in-flight jobs finish
+  (up to WORKER_DRAIN_TIMEOUT seconds)
 
 Usage:
-    WORKER_ID=1 python backend/worker.py
+    WORKER_ID=1 WORKER_CONCURRENCY=4 python backend/worker.py
 """
 
 import asyncio
-import json
 import logging
 import os
 import signal
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Set
 
 import redis
 
@@ -30,7 +52,10 @@ import redis
 # Add backend to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
 
-from app.core.database.supabase_client import get_supabase_client
+from app.core.control_state import get_control_watcher
+from app.core.job_queue import QueueJob, ReliableQueue
+from app.core.job_scheduler import JobScheduler, scheduler_for
+from app.core.queue_telemetry import WorkerTelemetry
 from app.scrapers.instagram.services.instagram_scraper import InstagramScraperUnified
 
 
@@ -46,6 +71,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger = logging.LoggerAdapter(logger, {'worker_id': os.getenv('WORKER_ID', 'unknown')})
 
+# In-worker concurrency
+WORKER_CONCURRENCY = max(1, int(os.getenv('WORKER_CONCURRENCY', 4)))
+JOB_TIMEOUT = float(os.getenv('WORKER_JOB_TIMEOUT', 600))
+DRAIN_TIMEOUT = float(os.getenv('WORKER_DRAIN_TIMEOUT', 300))
+
+# Reliable queue: a claimed job must be acknowledged within the visibility
+# timeout (kept above the job timeout) or the reaper hands it to another worker
+QUEUE_NAME = 'instagram_scraper_queue'
+VISIBILITY_TIMEOUT = float(os.getenv('WORKER_VISIBILITY_TIMEOUT', JOB_TIMEOUT + 300))
+MAX_ATTEMPTS = int(os.getenv('WORKER_MAX_ATTEMPTS', 3))
+RETRY_DELAY = float(os.getenv('WORKER_RETRY_DELAY', 60))
+REAP_INTERVAL = float(os.getenv('WORKER_REAP_INTERVAL', 30))
+PROMOTE_INTERVAL = float(os.getenv('SCHEDULER_PROMOTE_INTERVAL', 2))
+HEARTBEAT_INTERVAL = float(os.getenv('WORKER_HEARTBEAT_INTERVAL', 10))
+
+# system_control row that pauses the workers, and how often a paused worker looks again
+CONTROL_SCRIPT = 'instagram_scraper'
+PAUSE_POLL_INTERVAL = float(os.getenv('WORKER_PAUSE_POLL_INTERVAL', 5))
+
+# Creator columns process_creator reads (fallback fetch for payloads without them)
+CREATOR_FIELDS = 'ig_user_id, username, niche'
+
 # Global flag for graceful shutdown
 should_stop = False
 
@@ -53,16 +100,49 @@ should_stop = False
 def signal_handler(sig, frame):
     """Handle shutdown signals (SIGINT, SIGTERM)"""
     global should_stop
-    logger.info("🛑 Shutdown signal received, finishing current job...")
+    logger.info("🛑 Shutdown signal received, finishing in-flight jobs...")
     should_stop = True
 
 
-async def process_job(job_data: Dict) -> bool:
+@dataclass
+class WorkerStats:
+    """Job counters for the shutdown summary"""
+
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    released: int = 0
+
+
+def scraper_stopped() -> bool:
+    """True while system_control has the Instagram scraper stopped (cached; unknown counts as running)"""
+    return get_control_watcher().should_run(CONTROL_SCRIPT) is False
+
+
+def create_scraper() -> InstagramScraperUnified:
+    """
+    Scraper shared by every job of this worker
+
+    One instance means one rate limiter, one Supabase client, one R2 client and
+    warm caches for all in-flight jobs. The worker session keeps a pooled HTTP
+    session sized for the concurrency level and a batch writer that merges the
+    jobs' writes; close it with scraper.close_worker_session() on shutdown.
+    """
+    scraper = InstagramScraperUnified()
+    scraper.start_worker_session(WORKER_CONCURRENCY)
+    return scraper
+
+
+async def process_job(scraper: InstagramScraperUnified, job_data: Dict) -> bool:
     """
     Process a single scraper job
 
     Args:
-        job_data: Dict with creator_id, username, timestamp
+        scraper: Worker-wide scraper instance
+        job_data: Dict with creator_id, ig_user_id, username, niche, timestamp
 
     Returns:
         bool: True if successful, False otherwise
@@ -73,37 +153,36 @@ async def process_job(job_data: Dict) -> bool:
 
         logger.info(f"🚀 Processing creator: {username} (ID: {creator_id})")
 
-        # Initialize Supabase client
-        supabase = get_supabase_client()
-
-        # Fetch creator data from database
-        creator_result = supabase.table('instagram_creators') \
-            .select('*') \
-            .eq('id', creator_id) \
-            .single() \
-            .execute()
-
-        if not creator_result.data:
-            logger.error(f"❌ Creator not found in database: {creator_id}")
-            return False
-
-        creator = creator_result.data
-
-        # Initialize Instagram scraper
-        scraper = InstagramScraperUnified(supabase_client=supabase)
-
-        # Process the creator (scrape posts, reels, upload to R2, save to DB)
-        success = await scraper.process_creator_async(creator)
+        if job_data.get('ig_user_id'):
+            # The payload carries everything process_creator reads: no pre-fetch
+            creator = {
+                'ig_user_id': job_data['ig_user_id'],
+                'username': username,
+                'niche': job_data.get('niche'),
+            }
+        else:
+            # Jobs enqueued before payloads carried the creator fields
+            # Off the event loop so the other in-flight jobs keep going
+            creator_result = await asyncio.to_thread(
+                scraper.supabase.table('instagram_creators')
+                .select(CREATOR_FIELDS)
+                .eq('id', creator_id)
+                .single()
+                .execute
+            )
+
+            if not creator_result.data:
+                logger.error(f"❌ Creator not found in database: {creator_id}")
+                return False
+
+            creator = creator_result.data
+
+        # Process the creator (scrape posts, reels, upload to R2, save to DB;
+        # the scraper also stamps last_scraped_at)
+        success = await scraper.process_creator(creator)
 
         if success:
             logger.info(f"✅ Successfully processed creator: {username}")
-
-            # Update last_scraped timestamp
-            supabase.table('instagram_creators') \
-                .update({'last_scraped': datetime.now(timezone.utc).isoformat()}) \
-                .eq('id', creator_id) \
-                .execute()
-
             return True
         else:
             logger.error(f"❌ Failed to process creator: {username}")
@@ -114,16 +193,171 @@ async def process_job(job_data: Dict) -> bool:
         return False
 
 
+def connect_redis(host: str, port: int, password: str) -> redis.Redis:
+    """Redis client for the job queue"""
+    return redis.Redis(
+        host=host,
+        port=port,
+        password=password,
+        decode_responses=True,
+        socket_connect_timeout=10,
+        socket_timeout=10,
+        retry_on_timeout=True
+    )
+
+
+def create_queue(r: redis.Redis, worker_id: str) -> ReliableQueue:
+    """Leased job queue consumed by this worker"""
+    return ReliableQueue(
+        r,
+        QUEUE_NAME,
+        worker_id,
+        visibility_timeout=max(VISIBILITY_TIMEOUT, JOB_TIMEOUT + 60),
+        max_attempts=MAX_ATTEMPTS,
+        retry_delay=RETRY_DELAY
+    )
+
+
+async def run_job(scraper: InstagramScraperUnified, queue: ReliableQueue, scheduler: JobScheduler, job: QueueJob, stats: WorkerStats, telemetry: WorkerTelemetry) -> None:
+    """
+    Run one job under the per-job timeout, then acknowledge or fail it
+
+    Args:
+        scraper: Worker-wide scraper instance
+        queue: Queue the job was claimed from
+        scheduler: Re-schedules the next refresh of scheduled jobs
+        job: Claimed job
+        stats: Worker counters
+        telemetry: Sliding-window statistics for the heartbeat
+    """
+    username = job.data.get('username', 'unknown')
+    started = time.monotonic()
+    error = 'job failed (see worker log)'
+    try:
+        success = await asyncio.wait_for(process_job(scraper, job.data), timeout=JOB_TIMEOUT)
+    except asyncio.TimeoutError:
+        stats.timed_out += 1
+        logger.error(f"⏱️ Job for {username} timed out after {JOB_TIMEOUT:.0f}s")
+        error = f'timed out after {JOB_TIMEOUT:.0f}s'
+        success = False
+    except asyncio.CancelledError:
+        # Cancelled by the drain timeout: hand the job back without counting an attempt
+        await asyncio.to_thread(queue.release, job)
+        logger.warning(f"↩️ Released unfinished job for {username}")
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error running job for {username}: {e}", exc_info=True)
+        error = str(e)
+        success = False
+
+    if not success and scraper_stopped():
+        # Cut short by a stop in system_control, not a failure: back to the queue
+        # without using an attempt (claiming resumes once the scraper is started)
+        try:
+            await asyncio.to_thread(queue.release, job)
+            stats.released += 1
+            logger.info(f"↩️ Released {username}: the scraper was stopped")
+        except redis.RedisError as e:
+            logger.error(f"❌ Failed to release {username}: {e}")
+        return
+
+    stats.processed += 1
+    telemetry.record(time.monotonic() - started, success)
+    try:
+        finished = True
+        if success:
+            stats.succeeded += 1
+            await asyncio.to_thread(queue.ack, job)
+            logger.info(
+                f"✅ Job completed in {time.monotonic() - started:.1f}s "
+                f"(Success rate: {stats.succeeded}/{stats.processed})"
+            )
+        else:
+            stats.failed += 1
+            logger.error(f"❌ Job failed (Failure rate: {stats.failed}/{stats.processed})")
+            if await asyncio.to_thread(queue.fail, job, error):
+                stats.retried += 1
+                finished = False
+                logger.info(f"🔄 Scheduled retry {job.attempts + 1}/{queue.max_attempts - 1} for {username}")
+            else:
+                stats.dead_lettered += 1
+                logger.error(f"💀 Dead-lettered {username} after {job.attempts + 1} attempts: {error}")
+
+        # Done with this creator for now: its next refresh is one interval away
+        if finished and job.data.get('scheduled'):
+            await asyncio.to_thread(scheduler.reschedule, job.data['creator_id'], job.data)
+    except redis.RedisError as e:
+        # The lease stays in place, so the reaper retries the job once it expires
+        logger.error(f"❌ Failed to record the outcome for {username}: {e}")
+
+
+async def maintenance_loop(queue: ReliableQueue, scheduler: JobScheduler, telemetry: WorkerTelemetry, in_flight: Set[asyncio.Task]) -> None:
+    """
+    Queue upkeep shared by all workers
+
+    Every PROMOTE_INTERVAL: move due scheduled jobs into the work queue (not
+    while the scraper is stopped, so the backlog waits in the scheduler lanes).
+    Every REAP_INTERVAL: retry abandoned jobs and promote due retries.
+    Every HEARTBEAT_INTERVAL: publish this worker's telemetry.
+    """
+    next_reap = next_heartbeat = 0.0
+    while not should_stop:
+        if time.monotonic() >= next_heartbeat:
+            next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+            try:
+                await asyncio.to_thread(telemetry.publish, queue, len(in_flight), HEARTBEAT_INTERVAL)
+            except Exception as e:
+                logger.error(f"❌ Heartbeat error: {e}")
+
+        try:
+            if not scraper_stopped():
+                urgent, rolled = await asyncio.to_thread(scheduler.promote)
+                if urgent:
+                    logger.info(f"⚡ {urgent} priority jobs moved to the front of the queue")
+                if rolled:
+                    logger.debug(f"🗓️ {rolled} scheduled refreshes are due and queued")
+        except Exception as e:
+            logger.error(f"❌ Promoter error: {e}")
+
+        if time.monotonic() >= next_reap:
+            next_reap = time.monotonic() + REAP_INTERVAL
+            try:
+                retried, buried, promoted = await asyncio.to_thread(queue.reap)
+                if retried or buried:
+                    logger.warning(f"🪦 Reaped {retried + buried} abandoned jobs ({buried} dead-lettered)")
+                if promoted:
+                    logger.info(f"🔄 {promoted} retries are due and back in the queue")
+            except Exception as e:
+                logger.error(f"❌ Reaper error: {e}")
+        await asyncio.sleep(PROMOTE_INTERVAL)
+
+
+async def drain(in_flight: Set[asyncio.Task]) -> None:
+    """Let in-flight jobs finish after a shutdown signal (bounded by DRAIN_TIMEOUT)"""
+    if not in_flight:
+        return
+    logger.info(f"⏳ Draining {len(in_flight)} in-flight jobs (up to {DRAIN_TIMEOUT:.0f}s)...")
+    _, pending = await asyncio.wait(in_flight, timeout=DRAIN_TIMEOUT)
+    if pending:
+        logger.warning(f"⚠️ Cancelling {len(pending)} jobs still running after the drain timeout")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def worker_loop():
     """
     Main worker loop - continuously pulls jobs from Redis queue
 
     Flow:
     1. Connect to Redis server (on API server)
-    2. BRPOP from instagram_scraper_queue (blocks until job available)
-    3. Process job asynchronously
-    4. Log success/failure
-    5. Repeat until shutdown signal
+    2. Retry jobs a previous run of this worker left unfinished, start the
+       promoter/reaper
+    3. Wait for a free job slot (at most WORKER_CONCURRENCY jobs in flight) and
+       for the scraper to be running in system_control
+    4. Claim a job from instagram_scraper_queue (blocks until job available)
+    5. Start the job as a task and go back to 3
+    6. On shutdown signal, stop claiming and drain in-flight jobs
     """
     global should_stop
 
@@ -131,21 +365,13 @@ async def worker_loop():
     redis_host = os.getenv('REDIS_HOST', 'localhost')
     redis_port = int(os.getenv('REDIS_PORT', 6379))
     redis_password = os.getenv('REDIS_PASSWORD', '')
-    queue_name = 'instagram_scraper_queue'
+    queue_name = QUEUE_NAME
 
     logger.info(f"🔗 Connecting to Redis at {redis_host}:{redis_port}...")
 
     # Connect to Redis
     try:
-        r = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            password=redis_password,
-            decode_responses=True,
-            socket_connect_timeout=10,
-            socket_timeout=10,
-            retry_on_timeout=True
-        )
+        r = connect_redis(redis_host, redis_port, redis_password)
 
         # Test connection
         r.ping()
@@ -156,55 +382,81 @@ async def worker_loop():
         logger.error(f"   Check REDIS_HOST ({redis_host}) and REDIS_PASSWORD")
         return
 
-    logger.info(f"👷 Worker {worker_id} is ready to process jobs from '{queue_name}'")
+    queue = create_queue(r, worker_id)
+    scheduler = scheduler_for(queue)
+    try:
+        recovered = queue.recover()
+        if recovered:
+            logger.warning(f"♻️ Recovered {recovered} jobs left unfinished by a previous run")
+    except redis.RedisError as e:
+        logger.error(f"❌ Failed to recover unfinished jobs: {e}")
+
+    scraper = create_scraper()
+    # Start the control watcher here (its first load blocks) rather than on the first check
+    await asyncio.to_thread(get_control_watcher, scraper.supabase)
+    logger.info(
+        f"👷 Worker {worker_id} is ready to process jobs from '{queue_name}' "
+        f"({WORKER_CONCURRENCY} concurrent, {JOB_TIMEOUT:.0f}s per job)"
+    )
 
     # Statistics
-    jobs_processed = 0
-    jobs_succeeded = 0
-    jobs_failed = 0
+    stats = WorkerStats()
     start_time = datetime.now(timezone.utc)
 
+    telemetry = WorkerTelemetry(worker_id, WORKER_CONCURRENCY)
+
+    in_flight: Set[asyncio.Task] = set()
+    # The claim blocks for up to 5s; on its own thread it never holds a default-executor
+    # thread that the in-flight jobs' database writes and uploads need
+    claim_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='queue-claim')
+    loop = asyncio.get_running_loop()
+    maintenance = asyncio.create_task(maintenance_loop(queue, scheduler, telemetry, in_flight))
+    paused = False
+
     while not should_stop:
+        # Only pull a job when there is a slot to run it
+        if len(in_flight) >= WORKER_CONCURRENCY:
+            await asyncio.wait(in_flight, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+            continue
+
+        # Stopped in system_control: leave the queue alone until it is started again
+        if scraper_stopped():
+            if not paused:
+                paused = True
+                logger.info("⏸️ Instagram scraper is stopped, pausing job claims")
+            await asyncio.sleep(PAUSE_POLL_INTERVAL)
+            continue
+        if paused:
+            paused = False
+            logger.info("▶️ Instagram scraper is running again, resuming job claims")
+
         try:
-            # Block and wait for a job (BRPOP waits up to 5 seconds)
-            # Using BRPOP (right pop) to process jobs in FIFO order
-            job = r.brpop(queue_name, timeout=5)
-
-            if job:
-                # job is a tuple: (queue_name, job_data_json)
-                _, job_data_json = job
-
-                # Parse job data
-                try:
-                    job_data = json.loads(job_data_json)
-                except json.JSONDecodeError:
-                    logger.error(f"❌ Invalid JSON in job data: {job_data_json}")
-                    continue
-
-                logger.info(f"📦 Received job: {job_data.get('username', 'unknown')}")
-
-                # Process the job
-                success = await process_job(job_data)
-
-                jobs_processed += 1
-                if success:
-                    jobs_succeeded += 1
-                    logger.info(f"✅ Job completed (Success rate: {jobs_succeeded}/{jobs_processed})")
-                else:
-                    jobs_failed += 1
-                    logger.error(f"❌ Job failed (Failure rate: {jobs_failed}/{jobs_processed})")
-
-                    # Optionally: Re-queue failed jobs with retry count
-                    # retry_count = job_data.get('retry_count', 0)
-                    # if retry_count < 3:
-                    #     job_data['retry_count'] = retry_count + 1
-                    #     r.lpush(queue_name, json.dumps(job_data))
-                    #     logger.info(f"🔄 Re-queued job (retry {retry_count + 1}/3)")
+            # Block and wait for a job (up to 5 seconds), in a thread so the
+            # in-flight jobs keep running meanwhile. The job moves atomically to
+            # this worker's processing list, so a crash cannot lose it
+            # Taking from the right keeps jobs in FIFO order
+            job = await loop.run_in_executor(claim_executor, queue.claim, 5)
 
-            else:
+            if not job:
                 # No jobs available, continue waiting
-                # This is normal - BRPOP returns None after timeout
-                pass
+                # This is normal - the claim returns None after the timeout
+                continue
+
+            if not job.data.get('creator_id'):
+                logger.error(f"❌ Invalid job data: {job.raw}")
+                await asyncio.to_thread(queue.fail, job, 'invalid job data')
+                continue
+
+            logger.info(
+                f"📦 Received job: {job.data.get('username', 'unknown')} "
+                f"({len(in_flight) + 1}/{WORKER_CONCURRENCY} in flight"
+                f"{f', attempt {job.attempts + 1}' if job.attempts else ''})"
+            )
+
+            # Process the job alongside the others already in flight
+            task = asyncio.create_task(run_job(scraper, queue, scheduler, job, stats, telemetry))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
 
         except redis.ConnectionError as e:
             logger.error(f"❌ Redis connection error: {e}")
@@ -213,16 +465,12 @@ async def worker_loop():
 
             # Try to reconnect
             try:
-                r = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    password=redis_password,
-                    decode_responses=True,
-                    socket_connect_timeout=10,
-                    socket_timeout=10,
-                    retry_on_timeout=True
-                )
+                r = connect_redis(redis_host, redis_port, redis_password)
                 r.ping()
+                maintenance.cancel()
+                queue = create_queue(r, worker_id)
+                scheduler = scheduler_for(queue)
+                maintenance = asyncio.create_task(maintenance_loop(queue, scheduler, telemetry, in_flight))
                 logger.info("✅ Reconnected to Redis")
             except Exception as reconnect_error:
                 logger.error(f"❌ Reconnection failed: {reconnect_error}")
@@ -231,13 +479,25 @@ async def worker_loop():
             logger.error(f"❌ Unexpected worker error: {e}", exc_info=True)
             await asyncio.sleep(5)  # Brief pause before continuing
 
+    maintenance.cancel()
+    claim_executor.shutdown(wait=False)
+    await drain(in_flight)
+    await scraper.close_worker_session()
+    try:
+        telemetry.retire(queue)
+    except redis.RedisError as e:
+        logger.error(f"❌ Failed to remove the heartbeat: {e}")
+
     # Shutdown statistics
     runtime = datetime.now(timezone.utc) - start_time
+    processed = stats.processed
     logger.info(f"👋 Worker {worker_id} shutting down gracefully")
     logger.info(f"📊 Runtime: {runtime}")
-    logger.info(f"📊 Jobs processed: {jobs_processed}")
-    logger.info(f"📊 Success: {jobs_succeeded} ({jobs_succeeded/jobs_processed*100:.1f}%)" if jobs_processed > 0 else "📊 No jobs processed")
-    logger.info(f"📊 Failed: {jobs_failed} ({jobs_failed/jobs_processed*100:.1f}%)" if jobs_processed > 0 else "")
+    logger.info(f"📊 Jobs processed: {processed}")
+    logger.info(f"📊 Success: {stats.succeeded} ({stats.succeeded/processed*100:.1f}%)" if processed > 0 else "📊 No jobs processed")
+    logger.info(f"📊 Failed: {stats.failed} ({stats.failed/processed*100:.1f}%), {stats.timed_out} timed out" if processed > 0 else "")
+    logger.info(f"📊 Retries scheduled: {stats.retried}, dead-lettered: {stats.dead_lettered}" if processed > 0 else "")
+    logger.info(f"📊 Released on stop: {stats.released}" if stats.released else "")
 
 
 def main():
@@ -248,6 +508,7 @@ def main():
     logger.info("=" * 60)
     logger.info("🚀 B9 Dashboard Worker Starting...")
     logger.info(f"   Worker ID: {worker_id}")
+    logger.info(f"   Concurrency: {WORKER_CONCURRENCY} jobs")
     logger.info(f"   Redis Host: {os.getenv('REDIS_HOST', 'localhost')}")
     logger.info(f"   Environment: {os.getenv('ENVIRONMENT', 'development')}")
     logger.info("=" * 60)